@@ -0,0 +1,87 @@
+"""Per-request allocation benchmark for a 500-row board.
+
+Seeds a temporary database with *rows* open tasks for one user spread over
+the five sections, then runs ``board_handler`` under ``tracemalloc`` and
+reports wall time, the peak memory allocated while serving one request,
+and the memory still retained after a batch of requests.
+
+Usage::
+
+    python benchmarks/bench_board_memory.py [--rows N] [--requests R]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from openclaw_todo.cmd_board import SECTION_ORDER, board_handler
+from openclaw_todo.db import get_connection
+from openclaw_todo.dispatcher import _init_db  # noqa: F401 — registers migrations
+from openclaw_todo.migrations import migrate
+from openclaw_todo.parser import parse
+
+
+def seed(conn, rows: int) -> None:
+    conn.executemany(
+        "INSERT INTO tasks (title, project_id, section, due, status, created_by) VALUES (?, 1, ?, ?, 'open', 'U001');",
+        (
+            (f"Task number {i}", SECTION_ORDER[i % 3], f"2026-{i % 12 + 1:02d}-{i % 28 + 1:02d}" if i % 2 else None)
+            for i in range(rows)
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO task_assignees (task_id, assignee_user_id) VALUES (?, 'U001');",
+        ((i,) for i in range(1, rows + 1)),
+    )
+    conn.commit()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=500)
+    ap.add_argument("--requests", type=int, default=20)
+    opts = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = get_connection(Path(tmp) / "bench.sqlite3")
+        migrate(conn)
+        seed(conn, opts.rows)
+        parsed = parse(f"board mine limitPerSection:{opts.rows}")
+        context = {"sender_id": "U001"}
+
+        board_handler(parsed, conn, context)  # warm caches / statement cache
+
+        started = time.perf_counter()
+        for _ in range(opts.requests):
+            board_handler(parsed, conn, context)
+        elapsed = time.perf_counter() - started
+
+        tracemalloc.start()
+        peaks: list[int] = []
+        for _ in range(opts.requests):
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            out = board_handler(parsed, conn, context)
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+            del out
+
+        before = tracemalloc.take_snapshot()
+        for _ in range(opts.requests):
+            board_handler(parsed, conn, context)
+        after = tracemalloc.take_snapshot()
+        leaked = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+        tracemalloc.stop()
+        conn.close()
+
+    print(f"rows={opts.rows} requests={opts.requests}")
+    print(f"mean wall time per request:        {elapsed / opts.requests * 1000:.2f} ms")
+    print(f"peak allocation above baseline:    {max(peaks) / 1024:.1f} KiB")
+    print(f"retained after {opts.requests} requests:        {leaked / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Daily digest benchmark: one grouped pass versus one query per user.
+
+Seeds a temporary database with *tasks* open tasks spread over *users*
+assignees (some overdue, some due today, some in ``doing``), then times
+:func:`iter_digests` over every user against the naive approach of running
+``list mine`` once per user.  The naive path is timed on a sample of users
+and extrapolated.
+
+Usage::
+
+    python benchmarks/bench_digest.py [--users N] [--tasks N] [--naive-users N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from openclaw_todo.cmd_digest import iter_digests
+from openclaw_todo.cmd_list import list_handler
+from openclaw_todo.db import get_connection
+from openclaw_todo.dispatcher import _init_db  # noqa: F401 — registers migrations
+from openclaw_todo.migrations import migrate
+from openclaw_todo.parser import parse
+
+_SECTIONS = ["backlog", "backlog", "doing", "waiting"]
+
+
+def seed(conn, users: int, tasks: int) -> None:
+    rng = random.Random(7)
+    today = date.today()
+    rows = []
+    for i in range(tasks):
+        offset = rng.randint(-20, 40)
+        due = (today + timedelta(days=offset)).isoformat() if rng.random() < 0.6 else None
+        rows.append((f"Task {i}", rng.choice(_SECTIONS), due, f"U{rng.randrange(users):05d}"))
+    conn.executemany(
+        "INSERT INTO tasks (title, project_id, section, due, status, created_by) VALUES (?, 1, ?, ?, 'open', ?);",
+        rows,
+    )
+    assignees = set()
+    for task_id, (_, _, _, creator) in enumerate(rows, start=1):
+        assignees.add((task_id, creator))
+        if rng.random() < 0.2:
+            assignees.add((task_id, f"U{rng.randrange(users):05d}"))
+    conn.executemany("INSERT INTO task_assignees (task_id, assignee_user_id) VALUES (?, ?);", sorted(assignees))
+    conn.commit()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--users", type=int, default=10_000)
+    ap.add_argument("--tasks", type=int, default=100_000)
+    ap.add_argument("--naive-users", type=int, default=500)
+    opts = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = get_connection(Path(tmp) / "bench.sqlite3")
+        migrate(conn)
+        seed(conn, opts.users, opts.tasks)
+
+        started = time.perf_counter()
+        digests = tasks = 0
+        for digest in iter_digests(conn):
+            digests += 1
+            tasks += digest.total
+        single_pass = time.perf_counter() - started
+
+        sample = [f"U{i:05d}" for i in range(min(opts.naive_users, opts.users))]
+        parsed = parse("list mine limit:1000")
+        started = time.perf_counter()
+        for user_id in sample:
+            list_handler(parsed, conn, {"sender_id": user_id})
+        naive = (time.perf_counter() - started) / len(sample) * opts.users
+        conn.close()
+
+    print(f"users={opts.users} tasks={opts.tasks}: {digests} digests, {tasks} digest entries")
+    print(f"single grouped pass:          {single_pass * 1000:9.1f} ms")
+    print(f"per-user list (extrapolated): {naive * 1000:9.1f} ms  ({len(sample)} users sampled)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""Parser microbenchmark and equivalence fuzzer.
+
+Compares :func:`openclaw_todo.parser.parse` against the original
+implementation without the memoised due normaliser (kept below as
+``reference_parse``) on a seeded fuzz corpus, asserts both produce identical
+``ParsedCommand`` output (or the same ``ParseError`` message), then times
+both on a few realistic commands.  Each timing is the median of ``--repeat``
+runs, with the two parsers interleaved so drift affects both alike.
+
+Usage::
+
+    python benchmarks/bench_parser.py [--cases N] [--seed S] [--repeat R]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import statistics
+import timeit
+from datetime import date, datetime, timedelta
+
+from openclaw_todo.parser import (
+    FILTER_COMMANDS,
+    PARENT_COMMANDS,
+    VALID_SECTIONS,
+    DateRange,
+    ParsedCommand,
+    ParseError,
+    _parse_closed_filter,
+    _parse_due_filter,
+    _parse_parent,
+    parse,
+)
+
+# --- Reference implementation (pre-memoisation parser) ---
+# Extended with the filters that list/board/search accept (``due:`` ranges,
+# ``overdue``, ``nodue``, ``closed:``) and with ``parent:``, so the two
+# parsers agree on the grammar the fuzz corpus exercises.
+
+_REF_MENTION_RE = re.compile(r"<@(U[A-Z0-9]+)>")
+_REF_DUE_RE = re.compile(r"^due:(.+)$")
+
+
+def _reference_normalise_due(raw: str) -> str:
+    if raw == "-":
+        return "-"
+    try:
+        return datetime.strptime(raw, "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        pass
+    match = re.fullmatch(r"(\d{1,2})-(\d{1,2})", raw)
+    if match:
+        try:
+            return date(date.today().year, int(match.group(1)), int(match.group(2))).isoformat()
+        except ValueError:
+            pass
+    raise ParseError(f"Invalid due date: {raw!r}")
+
+
+def reference_parse(text: str) -> ParsedCommand:
+    tokens = text.strip().split()
+    if not tokens:
+        raise ParseError("Empty command")
+
+    command = tokens[0].lower()
+    remaining = tokens[1:]
+    project = project_visibility = section = due = None
+    mentions: list[str] = []
+    title_tokens: list[str] = []
+    args: list[str] = []
+    due_range = closed_range = parent = None
+    no_due = False
+    filters = command in FILTER_COMMANDS
+    parents = command in PARENT_COMMANDS
+
+    i = 0
+    while i < len(remaining):
+        tok = remaining[i]
+        if tok == "/p":
+            if i + 1 >= len(remaining):
+                raise ParseError("/p requires a project name")
+            project = remaining[i + 1]
+            i += 2
+            if i < len(remaining) and remaining[i].lower() in ("shared", "private"):
+                project_visibility = remaining[i].lower()
+                i += 1
+            continue
+        if tok == "/s":
+            if i + 1 >= len(remaining):
+                raise ParseError("/s requires a section name")
+            sec = remaining[i + 1].lower()
+            if sec not in VALID_SECTIONS:
+                raise ParseError(f"Invalid section: {sec!r}. " f"Must be one of: {', '.join(sorted(VALID_SECTIONS))}")
+            section = sec
+            i += 2
+            continue
+        due_match = _REF_DUE_RE.match(tok)
+        if due_match:
+            value = due_match.group(1)
+            if filters and value == "-":
+                no_due = True
+            elif filters:
+                due_range = _parse_due_filter(value, date.today()).intersect(due_range)
+            else:
+                due = _reference_normalise_due(value)
+            i += 1
+            continue
+        mention_match = _REF_MENTION_RE.fullmatch(tok)
+        if mention_match:
+            mentions.append(mention_match.group(1))
+            i += 1
+            continue
+        if parents and tok.lower().startswith("parent:"):
+            parent = _parse_parent(tok[7:])
+            i += 1
+            continue
+        if filters and tok.lower() == "overdue":
+            due_range = DateRange(end=date.today() - timedelta(days=1)).intersect(due_range)
+        elif filters and tok.lower() == "nodue":
+            no_due = True
+        elif filters and tok.lower().startswith("closed:"):
+            closed_range = _parse_closed_filter(tok[7:], date.today()).intersect(closed_range)
+        else:
+            title_tokens.append(tok)
+        i += 1
+
+    if command in ("move", "done", "drop", "edit") and title_tokens:
+        args.append(title_tokens.pop(0))
+
+    return ParsedCommand(
+        command=command,
+        args=args,
+        project=project,
+        project_visibility=project_visibility,
+        section=section,
+        due=due,
+        mentions=mentions,
+        title_tokens=title_tokens,
+        due_range=due_range,
+        no_due=no_due,
+        closed_range=closed_range,
+        parent=parent,
+        raw_tokens=remaining,
+    )
+
+
+# --- Fuzz corpus ---
+
+_COMMANDS = ["add", "list", "board", "search", "move", "done", "drop", "edit", "project", "help", "ADD", "Edit", "LIST"]
+_ATOMS = [
+    "/p",
+    "/s",
+    "/P",
+    "/pfoo",
+    "/s/",
+    "shared",
+    "private",
+    "SHARED",
+    "doing",
+    "backlog",
+    "Done",
+    "bogus",
+    "due:-",
+    "due:",
+    "due:03-15",
+    "due:3-5",
+    "due:2026-02-29",
+    "due:2028-02-29",
+    "due:2026-13-01",
+    "due:2026-6-1",
+    "due:xx",
+    "due:due:1-1",
+    "<@U123>",
+    "<@UABC9>",
+    "<@u123>",
+    "<@U1>x",
+    "<@U1>>",
+    "<@>",
+    "x<@U1>",
+    "12",
+    "#12",
+    "mine",
+    "all",
+    "open",
+    "limit:5",
+    "limitPerSection:2",
+    "Inbox",
+    "Backend",
+    "Buy",
+    "milk",
+    "한글",
+    "​",
+    "a​b",
+    "overdue",
+    "OVERDUE",
+    "nodue",
+    "NoDue",
+    "due:<7d",
+    "due:>3d",
+    "due:<0d",
+    "due:today",
+    "due:this-week",
+    "due:<2026-03-01",
+    "due:>03-15",
+    "due:>9999-12-31",
+    "due:<99999d",
+    "due:<",
+    "closed:7d",
+    "closed:2026-01-01",
+    "Closed:3d",
+    "closed:",
+    "closed:xx",
+    "closed:9999d",
+    "parent:#3",
+    "parent:7",
+    "parent:-",
+    "PARENT:#2",
+    "parent:",
+    "parent:#0",
+    "parent:x",
+]
+_SPACES = [" ", "  ", "\t", "\n", " \x1c ", "　"]
+
+
+def fuzz_corpus(cases: int, seed: int) -> list[str]:
+    """Return *cases* random command strings built from tricky atoms."""
+    rng = random.Random(seed)
+    corpus = ["", "   ", "add", "add /p", "add /s", "list all"]
+    while len(corpus) < cases:
+        parts = [rng.choice(_COMMANDS)] + [rng.choice(_ATOMS) for _ in range(rng.randint(0, 9))]
+        text = "".join(part + rng.choice(_SPACES) for part in parts)
+        corpus.append(rng.choice(_SPACES) + text if rng.random() < 0.2 else text)
+    return corpus
+
+
+def _outcome(fn, text: str):
+    try:
+        return fn(text)
+    except ParseError as exc:
+        return ("ParseError", str(exc))
+
+
+def check_equivalence(corpus: list[str]) -> None:
+    for text in corpus:
+        expected = _outcome(reference_parse, text)
+        actual = _outcome(parse, text)
+        assert actual == expected, f"mismatch for {text!r}: {actual!r} != {expected!r}"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--cases", type=int, default=20_000)
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--repeat", type=int, default=15)
+    ap.add_argument("--number", type=int, default=5_000)
+    opts = ap.parse_args()
+
+    corpus = fuzz_corpus(opts.cases, opts.seed)
+    check_equivalence(corpus)
+    print(f"equivalence: {len(corpus)} cases identical")
+
+    realistic = [
+        "add Buy milk <@U001> <@U002> /p Backend shared /s doing due:03-15",
+        "list all /p Backend open limit:50",
+        "edit 42 New title due:2026-06-01 <@U003>",
+        "board mine limitPerSection:5",
+    ]
+    parsers = (("reference", reference_parse), ("memoised", parse))
+    totals = {label: 0.0 for label, _ in parsers}
+    print(f"{'us/parse (median of ' + str(opts.repeat) + ')':<44}" + "".join(f"{label:>11}" for label, _ in parsers))
+    for text in realistic:
+        runs: dict[str, list[float]] = {label: [] for label, _ in parsers}
+        for _ in range(opts.repeat):
+            for label, fn in parsers:
+                runs[label].append(timeit.timeit(lambda: _outcome(fn, text), number=opts.number) / opts.number * 1e6)
+        medians = {label: statistics.median(times) for label, times in runs.items()}
+        for label, value in medians.items():
+            totals[label] += value
+        print(f"{text[:42]:<44}" + "".join(f"{medians[label]:11.2f}" for label, _ in parsers))
+    print(f"{'mean':<44}" + "".join(f"{totals[label] / len(realistic):11.2f}" for label, _ in parsers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Title search benchmark: FTS5 index versus ``LIKE`` scan.
+
+Seeds a temporary database with *rows* tasks whose titles are drawn from a
+small vocabulary, then times ``search_handler`` for a few queries with the
+``tasks_fts`` index in place and again after dropping it (the ``LIKE``
+fallback used on SQLite builds without FTS5).
+
+Usage::
+
+    python benchmarks/bench_search.py [--rows N] [--repeat R]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from openclaw_todo.cmd_search import search_handler
+from openclaw_todo.db import get_connection
+from openclaw_todo.dispatcher import _init_db  # noqa: F401 — registers migrations
+from openclaw_todo.migrations import migrate
+from openclaw_todo.parser import parse
+
+_WORDS = [
+    "fix",
+    "write",
+    "review",
+    "deploy",
+    "plan",
+    "update",
+    "login",
+    "billing",
+    "cache",
+    "report",
+    "docs",
+    "api",
+    "staging",
+    "invoice",
+    "budget",
+    "meeting",
+    "release",
+    "migration",
+    "dashboard",
+    "alert",
+    "backup",
+    "search",
+]
+_QUERIES = ["search deploy staging", "search invoice all", "search migr", "search zzz-no-match"]
+
+
+def seed(conn, rows: int) -> None:
+    rng = random.Random(42)
+    conn.executemany(
+        "INSERT INTO tasks (title, project_id, section, status, created_by) VALUES (?, 1, 'backlog', 'open', 'U001');",
+        ((" ".join(rng.choices(_WORDS, k=4)) + f" {i}",) for i in range(rows)),
+    )
+    conn.executemany(
+        "INSERT INTO task_assignees (task_id, assignee_user_id) VALUES (?, 'U001');",
+        ((i,) for i in range(1, rows + 1)),
+    )
+    conn.commit()
+
+
+def run(conn, repeat: int) -> dict[str, float]:
+    context = {"sender_id": "U001"}
+    timings = {}
+    for text in _QUERIES:
+        parsed = parse(text)
+        search_handler(parsed, conn, context)  # warm page cache
+        started = time.perf_counter()
+        for _ in range(repeat):
+            search_handler(parsed, conn, context)
+        timings[text] = (time.perf_counter() - started) / repeat * 1000
+    return timings
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    opts = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = get_connection(Path(tmp) / "bench.sqlite3")
+        migrate(conn)
+        started = time.perf_counter()
+        seed(conn, opts.rows)
+        print(f"rows={opts.rows} seeded in {time.perf_counter() - started:.1f} s")
+
+        fts = run(conn, opts.repeat)
+        conn.execute("DROP TABLE tasks_fts;")
+        like = run(conn, opts.repeat)
+        conn.close()
+
+    print(f"{'query':<28} {'fts5 ms':>10} {'like ms':>10}")
+    for text in _QUERIES:
+        print(f"{text:<28} {fts[text]:>10.2f} {like[text]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
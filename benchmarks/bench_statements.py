@@ -0,0 +1,110 @@
+"""Mutating-command benchmark: SQL statements and latency per command.
+
+Seeds a temporary database with *tasks* tasks, then runs each mutating
+command *runs* times on distinct tasks and reports the number of SQL
+statements each call issued (captured with
+:meth:`sqlite3.Connection.set_trace_callback`, including ``BEGIN`` and
+``COMMIT`` but not the trigger and FTS sub-statements SQLite also reports)
+and its median latency.  ``--no-returning`` measures the
+fallback path used on SQLite builds without ``UPDATE ... RETURNING``.
+
+Usage::
+
+    python benchmarks/bench_statements.py [--tasks N] [--runs N] [--no-returning]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from openclaw_todo import models
+from openclaw_todo.db import get_connection
+from openclaw_todo.dispatcher import _get_handler  # also registers migrations
+from openclaw_todo.migrations import migrate
+from openclaw_todo.parser import parse
+
+SENDER = "U00001"
+
+# (label, command template); {id} is replaced with a fresh task id per run.
+COMMANDS = [
+    ("add", "add Benchmark task <@U00002> /p Inbox due:2030-01-01"),
+    ("move", "move {id} doing"),
+    ("done", "done {id}"),
+    ("drop", "drop {id}"),
+    ("edit title", "edit {id} Renamed task"),
+    ("edit assignees", "edit {id} <@U00002> <@U00003>"),
+    ("edit due+section", "edit {id} due:2031-02-03 /s waiting"),
+]
+
+
+def seed(conn: sqlite3.Connection, tasks: int) -> None:
+    conn.executemany(
+        "INSERT INTO tasks (title, project_id, section, status, created_by, assignees_csv) "
+        "VALUES (?, 1, 'backlog', 'open', ?, ?);",
+        [(f"Task {i}", SENDER, SENDER) for i in range(tasks)],
+    )
+    conn.executemany(
+        "INSERT INTO task_assignees (task_id, assignee_user_id) VALUES (?, ?);",
+        [(task_id, SENDER) for task_id in range(1, tasks + 1)],
+    )
+    conn.commit()
+
+
+def top_level(statements: list[str]) -> int:
+    """Count top-level statements: triggers re-report their statement and log sub-statements as ``-- ...``."""
+    count = 0
+    previous = None
+    for sql in statements:
+        if not sql.startswith("--") and sql != previous:
+            count += 1
+        previous = sql
+    return count
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--tasks", type=int, default=10_000)
+    ap.add_argument("--runs", type=int, default=200)
+    ap.add_argument("--no-returning", action="store_true", help="use the re-read fallback")
+    opts = ap.parse_args()
+    if opts.no_returning:
+        models.HAS_RETURNING = False
+    if opts.runs * len(COMMANDS) > opts.tasks:
+        ap.error("--tasks must be at least --runs times the number of commands")
+
+    context = {"sender_id": SENDER}
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = get_connection(Path(tmp) / "bench.sqlite3")
+        migrate(conn)
+        seed(conn, opts.tasks)
+
+        statements: list[str] = []
+        conn.set_trace_callback(statements.append)
+        next_id = 1
+        print(f"tasks={opts.tasks} runs={opts.runs} returning={models.HAS_RETURNING}")
+        for label, template in COMMANDS:
+            counts = []
+            timings = []
+            for _ in range(opts.runs):
+                parsed = parse(template.format(id=next_id))
+                next_id += 1
+                handler = _get_handler(parsed.command)
+                statements.clear()
+                started = time.perf_counter()
+                handler(parsed, conn, context)
+                timings.append(time.perf_counter() - started)
+                counts.append(top_level(statements))
+            print(
+                f"{label:<18} statements={statistics.median(counts):4.0f}"
+                f"  median={statistics.median(timings) * 1e6:8.1f} µs"
+            )
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Online backfills: data migrations that run in the background.
+
+A schema migration that adds a derived column only changes the schema; the
+rows that already exist are filled in by a *backfill* declared next to it::
+
+    @register_backfill("tasks.foo")
+    def backfill_foo(conn, after, limit):
+        ...  # fill the next *limit* rows with id > *after*
+        return last_id  # or None once no rows are left
+
+New writes must keep the column current themselves (in handler code or a
+trigger), so the backfill only has to walk the existing rows once.  The
+server's :class:`BackfillWorker` runs each pending backfill one batch at a
+time, each batch in its own short transaction with a pause in between, so
+requests keep being served while it runs.  Progress is stored in
+``migration_progress`` (see :func:`openclaw_todo.migrations.run_batches`):
+a restarted server resumes from the last committed batch.
+
+The worker serves the single-database layout; tenant and shard databases
+can be brought up to date offline with :func:`run_all`.  (Schema modules
+register backfills, so this module must not import :mod:`openclaw_todo.sharding`.)
+
+Until :func:`backfill_complete` reports a backfill done, readers must keep
+using the old columns (or computing the value on the fly)::
+
+    if backfill_complete(conn, "tasks.foo"):
+        ...  # read t.foo
+    else:
+        ...  # derive it from the old columns
+
+Environment variables
+---------------------
+OPENCLAW_TODO_BACKFILL_PAUSE_MS  Pause between backfill batches (default 50; -1: worker off)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+from openclaw_todo.db import get_connection
+from openclaw_todo.migrations import (
+    DEFAULT_BATCH_SIZE,
+    BatchedMigration,
+    BatchFn,
+    batch_progress,
+    file_key,
+    migrate,
+    run_batches,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAUSE_SECONDS = 0.05
+
+# Seconds to wait before retrying after a failed batch.
+ERROR_RETRY_SECONDS = 30.0
+
+# Registered backfills, run in registration order.
+_backfills: list[BatchedMigration] = []
+
+# (database file key, backfill name) pairs known to be complete
+_complete: set[tuple[tuple[str, int, int], str]] = set()
+
+
+def register_backfill(name: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Callable[[BatchFn], BatchFn]:
+    """Decorator to register a batch function as the background backfill *name*."""
+
+    def decorator(fn: BatchFn) -> BatchFn:
+        _backfills.append(BatchedMigration(name, fn, batch_size))
+        return fn
+
+    return decorator
+
+
+def backfill_complete(conn: sqlite3.Connection, name: str) -> bool:
+    """Return ``True`` once the backfill *name* has finished on *conn*'s database.
+
+    A completed backfill never becomes pending again, so the answer is
+    cached per database file and later calls cost one ``stat``.
+    """
+    key = file_key(conn)
+    if key is not None and (key, name) in _complete:
+        return True
+    _, done = batch_progress(conn, name)
+    if done and key is not None:
+        _complete.add((key, name))
+    return done
+
+
+def backfill_status(conn: sqlite3.Connection) -> dict[str, dict[str, Any]]:
+    """JSON-ready ``{name: {"cursor": ..., "done": ...}}`` for every registered backfill.
+
+    Only reads: raises :class:`sqlite3.OperationalError` if ``migration_progress`` does not exist.
+    """
+    progress = {
+        name: (cursor, bool(done))
+        for name, cursor, done in conn.execute("SELECT name, cursor, done FROM migration_progress;")
+    }
+    status = {}
+    for backfill in _backfills:
+        cursor, done = progress.get(backfill.name, (None, False))
+        status[backfill.name] = {"cursor": cursor, "done": done}
+    return status
+
+
+class BackfillWorker:
+    """Run pending backfills one batch at a time, pausing *pause* seconds between batches."""
+
+    def __init__(self, db_path: str | Path | None, *, pause: float = DEFAULT_PAUSE_SECONDS) -> None:
+        self.db_path = db_path
+        self.pause = pause
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_once(self, conn: sqlite3.Connection) -> bool:
+        """Run one batch of the first pending backfill; return ``True`` if none are left."""
+        for backfill in _backfills:
+            if backfill_complete(conn, backfill.name):
+                continue
+            if run_batches(conn, backfill, max_batches=1):
+                logger.info("Backfill %s complete", backfill.name)
+            return False
+        return True
+
+    # --- Worker thread ---
+
+    def start(self) -> None:
+        """Start the worker thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="openclaw-todo-backfill", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Stop the worker thread (progress up to the last batch is kept)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        conn: sqlite3.Connection | None = None
+        try:
+            while not self._stop.is_set():
+                try:
+                    if conn is None:
+                        conn = self._connect()
+                    if self.run_once(conn):
+                        return
+                except Exception:
+                    logger.exception("Backfill failed; retrying in %gs", ERROR_RETRY_SECONDS)
+                    self._stop.wait(ERROR_RETRY_SECONDS)
+                    continue
+                self._stop.wait(self.pause)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open and migrate the worker's connection (closed again if migrating fails)."""
+        # Schema modules import this one to register backfills, so the aggregator is loaded here
+        import openclaw_todo.schemas as _schemas  # noqa: F401 — registers migrations
+
+        conn = get_connection(self.db_path)
+        try:
+            migrate(conn)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+
+def backfill_worker_from_env(db_path: str | Path | None) -> BackfillWorker | None:
+    """Build a worker from ``OPENCLAW_TODO_BACKFILL_PAUSE_MS``, or ``None`` if disabled or nothing is registered."""
+    if not _backfills:
+        return None
+    try:
+        pause_ms = float(os.environ.get("OPENCLAW_TODO_BACKFILL_PAUSE_MS", str(DEFAULT_PAUSE_SECONDS * 1000)))
+    except ValueError:
+        logger.warning("Invalid OPENCLAW_TODO_BACKFILL_PAUSE_MS, falling back to %g", DEFAULT_PAUSE_SECONDS * 1000)
+        pause_ms = DEFAULT_PAUSE_SECONDS * 1000
+    if pause_ms < 0:
+        return None
+    return BackfillWorker(db_path, pause=pause_ms / 1000)
+
+
+def run_all(conn: sqlite3.Connection) -> None:
+    """Run every pending backfill to completion on *conn* (offline use and tests)."""
+    for backfill in _backfills:
+        run_batches(conn, backfill)
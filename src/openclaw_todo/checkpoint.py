@@ -0,0 +1,225 @@
+"""Managed WAL checkpoints and database health for the HTTP server.
+
+SQLite's automatic checkpoint runs on the committing connection and only in
+``PASSIVE`` mode, so under steady load with overlapping readers the ``-wal``
+file can keep growing, and every read has to search a larger WAL index.
+:class:`CheckpointManager` runs checkpoints from a background thread:
+
+* every ``interval`` seconds a ``PASSIVE`` checkpoint copies as many frames
+  back to the database as the current readers allow, without blocking them;
+* whenever the WAL file reaches ``truncate_bytes`` a ``TRUNCATE`` checkpoint
+  waits (up to the connection's ``busy_timeout``) for readers to move on,
+  then resets the WAL file to zero bytes.
+
+:func:`database_health` reports the numbers behind ``GET /health?deep=1``.
+
+Environment variables
+---------------------
+OPENCLAW_TODO_CHECKPOINT_SECONDS    Seconds between PASSIVE checkpoints (default 60, 0: manager off)
+OPENCLAW_TODO_WAL_TRUNCATE_BYTES    WAL size that triggers a TRUNCATE checkpoint (default 67108864)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from openclaw_todo.backfill import backfill_status
+from openclaw_todo.db import DEFAULT_DB_DIR, DEFAULT_DB_NAME, get_connection
+from openclaw_todo.sharding import shard_count
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_SECONDS = 60.0
+DEFAULT_TRUNCATE_BYTES = 64 * 1024 * 1024
+
+# Upper bound on how long the worker sleeps between WAL size checks (seconds).
+SIZE_POLL_SECONDS = 5.0
+
+
+@dataclass(slots=True, frozen=True)
+class CheckpointResult:
+    """Outcome of one ``PRAGMA wal_checkpoint`` call."""
+
+    mode: str
+    busy: bool  # the checkpoint could not finish because of other connections
+    log_frames: int
+    checkpointed_frames: int
+    at: float  # wall-clock time (epoch seconds)
+    duration_ms: float
+
+    def as_record(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "busy": self.busy,
+            "log_frames": self.log_frames,
+            "checkpointed_frames": self.checkpointed_frames,
+            "at": datetime.fromtimestamp(self.at, timezone.utc).isoformat(timespec="seconds"),
+            "duration_ms": self.duration_ms,
+        }
+
+
+def database_file(db_path: str | Path | None) -> Path:
+    """Return the database file :func:`~openclaw_todo.db.get_connection` opens for *db_path*."""
+    return Path(db_path) if db_path is not None else DEFAULT_DB_DIR / DEFAULT_DB_NAME
+
+
+def wal_size(db_path: str | Path | None) -> int:
+    """Return the size of *db_path*'s ``-wal`` file in bytes (0 if there is none)."""
+    path = database_file(db_path)
+    try:
+        return path.with_name(path.name + "-wal").stat().st_size
+    except OSError:
+        return 0
+
+
+class CheckpointManager:
+    """Run PASSIVE checkpoints on a schedule and TRUNCATE ones past a WAL size threshold.
+
+    *clock* (wall-clock seconds) is injectable for tests.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path | None,
+        *,
+        interval: float = DEFAULT_INTERVAL_SECONDS,
+        truncate_bytes: int = DEFAULT_TRUNCATE_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.db_path = db_path
+        self.interval = interval
+        self.truncate_bytes = truncate_bytes
+        self._clock = clock
+        self.last: CheckpointResult | None = None
+        self._last_passive: float | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def checkpoint(self, conn, mode: str = "PASSIVE") -> CheckpointResult:
+        """Run one ``wal_checkpoint(mode)`` on *conn* and record the result."""
+        started = time.perf_counter()
+        busy, log_frames, checkpointed = conn.execute(f"PRAGMA wal_checkpoint({mode});").fetchone()
+        result = CheckpointResult(
+            mode=mode,
+            busy=bool(busy),
+            log_frames=log_frames,
+            checkpointed_frames=checkpointed,
+            at=self._clock(),
+            duration_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+        with self._lock:
+            self.last = result
+        if result.busy:
+            logger.info(
+                "WAL checkpoint (%s) blocked by other connections: %d/%d frames", mode, checkpointed, log_frames
+            )
+        else:
+            logger.debug("WAL checkpoint (%s): %d/%d frames", mode, checkpointed, log_frames)
+        return result
+
+    def run_due(self, conn) -> CheckpointResult | None:
+        """Checkpoint if the WAL is over the size threshold or the interval has elapsed."""
+        if wal_size(self.db_path) >= self.truncate_bytes:
+            return self.checkpoint(conn, "TRUNCATE")
+        now = self._clock()
+        if self._last_passive is not None and now - self._last_passive < self.interval:
+            return None
+        self._last_passive = now
+        return self.checkpoint(conn, "PASSIVE")
+
+    def last_record(self) -> dict[str, Any] | None:
+        """JSON-ready result of the most recent checkpoint, if any."""
+        with self._lock:
+            return self.last.as_record() if self.last is not None else None
+
+    # --- Worker thread ---
+
+    def start(self) -> None:
+        """Start the worker thread."""
+        self._stop.clear()
+        self._last_passive = self._clock()
+        self._thread = threading.Thread(target=self._run, name="openclaw-todo-checkpoints", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Stop the worker thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        conn = get_connection(self.db_path)
+        try:
+            while not self._stop.wait(min(self.interval, SIZE_POLL_SECONDS)):
+                try:
+                    self.run_due(conn)
+                except Exception:
+                    logger.exception("WAL checkpoint failed")
+        finally:
+            conn.close()
+
+
+def database_health(db_path: str | Path | None, manager: CheckpointManager | None = None) -> dict[str, Any]:
+    """Deep health report for *db_path*: schema version, backfills, page/freelist counts and WAL state.
+
+    Read-only; the schema version and backfills are ``"absent"`` when their tables do not exist.
+    """
+    conn = get_connection(db_path)
+    try:
+        page_size = conn.execute("PRAGMA page_size;").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count;").fetchone()[0]
+        freelist_count = conn.execute("PRAGMA freelist_count;").fetchone()[0]
+        # Plain reads: a health probe must not create the bookkeeping tables
+        try:
+            row = conn.execute("SELECT version FROM schema_version;").fetchone()
+            version = row[0] if row is not None else "absent"
+        except sqlite3.OperationalError:
+            version = "absent"
+        try:
+            backfills = backfill_status(conn)
+        except sqlite3.OperationalError:
+            backfills = "absent"
+    finally:
+        conn.close()
+    return {
+        "path": str(database_file(db_path)),
+        "schema_version": version,
+        "backfills": backfills,
+        "page_size": page_size,
+        "page_count": page_count,
+        "freelist_count": freelist_count,
+        "wal_bytes": wal_size(db_path),
+        "last_checkpoint": manager.last_record() if manager is not None else None,
+    }
+
+
+def checkpoints_from_env(db_path: str | Path | None) -> CheckpointManager | None:
+    """Build a manager from ``OPENCLAW_TODO_CHECKPOINT_SECONDS`` / ``_WAL_TRUNCATE_BYTES``, or ``None`` if off."""
+    if shard_count():
+        logger.warning("Managed WAL checkpoints are not supported with OPENCLAW_TODO_SHARDS; disabled")
+        return None
+    try:
+        interval = float(os.environ.get("OPENCLAW_TODO_CHECKPOINT_SECONDS", str(DEFAULT_INTERVAL_SECONDS)))
+    except ValueError:
+        logger.warning("Invalid OPENCLAW_TODO_CHECKPOINT_SECONDS, falling back to %g", DEFAULT_INTERVAL_SECONDS)
+        interval = DEFAULT_INTERVAL_SECONDS
+    if interval <= 0:
+        return None
+    try:
+        truncate_bytes = int(os.environ.get("OPENCLAW_TODO_WAL_TRUNCATE_BYTES", str(DEFAULT_TRUNCATE_BYTES)))
+    except ValueError:
+        truncate_bytes = 0
+    if truncate_bytes < 1:
+        logger.warning("Invalid OPENCLAW_TODO_WAL_TRUNCATE_BYTES, falling back to %d", DEFAULT_TRUNCATE_BYTES)
+        truncate_bytes = DEFAULT_TRUNCATE_BYTES
+    return CheckpointManager(db_path, interval=interval, truncate_bytes=truncate_bytes)
@@ -6,8 +6,11 @@ import logging
 import sqlite3
 
 from openclaw_todo.event_logger import log_event
+from openclaw_todo.models import PROJECT_COLUMNS, project_row, query
 from openclaw_todo.parser import DUE_CLEAR, ParsedCommand
-from openclaw_todo.project_resolver import AmbiguousProjectError, Project, ProjectNotFoundError, resolve_project
+from openclaw_todo.permissions import fetch_write_target
+from openclaw_todo.project_resolver import AmbiguousProjectError, ProjectNotFoundError, resolve_project
+from openclaw_todo.subtasks import parent_error, project_mismatch
 
 logger = logging.getLogger(__name__)
 
@@ -15,9 +18,10 @@ logger = logging.getLogger(__name__)
 def add_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> str:
     """Create a new task.
 
-    Resolves the target project (default ``Inbox``), applies defaults for
-    section and assignees, validates the private-project assignee constraint,
-    inserts the task + assignee rows, and logs an event.
+    Resolves the target project (default ``Inbox``, or the parent's project
+    for a ``parent:#N`` subtask), applies defaults for section and
+    assignees, validates the private-project assignee constraint, inserts
+    the task + assignee rows, and logs an event.
     """
     sender_id: str = context["sender_id"]
     title = " ".join(parsed.title_tokens)
@@ -25,11 +29,25 @@ def add_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict)
     if not title:
         return "❌ Title is required. Usage: /todo add <title> [options]"
 
+    # --- Parent task: subtasks go to the parent's project ---
+    parent = None
+    if parsed.parent:
+        parent = fetch_write_target(conn, parsed.parent, sender_id)
+        error = parent_error(parent, parsed.parent)
+        if error:
+            return error
+        if parsed.project and parsed.project.strip() != parent.task.project_name:
+            return project_mismatch(parent)
+
     # --- Resolve project (auto-create as shared if not found) ---
     project_name = parsed.project or "Inbox"
+    visibility = parsed.project_visibility
+    if parent is not None:
+        project_name = parent.task.project_name
+        visibility = parsed.project_visibility or parent.visibility
     project_auto_created = False
     try:
-        project = resolve_project(conn, project_name, sender_id, visibility=parsed.project_visibility)
+        project = resolve_project(conn, project_name, sender_id, visibility=visibility)
     except AmbiguousProjectError:
         return (
             f'❌ Ambiguous project name "{project_name}": both shared and private projects exist. '
@@ -52,14 +70,18 @@ def add_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict)
             # Race condition: another concurrent request already created it
             logger.debug("Concurrent auto-create for project '%s'; falling back to SELECT", stripped)
 
-        row = conn.execute(
-            "SELECT id, name, visibility, owner_user_id FROM projects WHERE name = ? AND visibility = 'shared';",
+        project = query(
+            conn,
+            project_row,
+            f"SELECT {PROJECT_COLUMNS} FROM projects WHERE name = ? AND visibility = 'shared';",
             (stripped,),
         ).fetchone()
-        project = Project(id=row[0], name=row[1], visibility=row[2], owner_user_id=row[3])
         project_auto_created = True
         logger.info("Auto-created shared project '%s' for add command", project_name)
 
+    if parent is not None and project.id != parent.task.project_id:
+        return project_mismatch(parent)
+
     # --- Defaults ---
     section = parsed.section or "backlog"
     due = parsed.due if parsed.due and parsed.due != DUE_CLEAR else None
@@ -76,10 +98,11 @@ def add_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict)
                 f"(요청이 적용되지 않았습니다.)"
             )
 
-    # --- Insert task ---
+    # --- Insert task (the task_assignees triggers fill in assignees_csv) ---
     cursor = conn.execute(
-        "INSERT INTO tasks (title, project_id, section, due, status, created_by) " "VALUES (?, ?, ?, ?, 'open', ?);",
-        (title, project.id, section, due, sender_id),
+        "INSERT INTO tasks (title, project_id, section, due, status, created_by, assignees_csv, parent_id) "
+        "VALUES (?, ?, ?, ?, 'open', ?, '', ?);",
+        (title, project.id, section, due, sender_id, parsed.parent or None),
     )
     task_id = cursor.lastrowid
 
@@ -111,6 +134,7 @@ def add_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict)
             "section": section,
             "due": due,
             "assignees": assignees,
+            "parent_id": parsed.parent or None,
         },
     )
 
@@ -122,6 +146,8 @@ def add_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict)
     due_str = due if due else "-"
     assignee_str = ", ".join(f"<@{a}>" for a in assignees)
     response = f"✅ Added #{task_id} ({project.name}/{section}) due:{due_str} assignees:{assignee_str} — {title}"
+    if parent is not None:
+        response = f"{response} (subtask of #{parsed.parent})"
     if project_auto_created:
         response = f'{response}\nℹ️ Project "{project.name}" was created (shared).'
     return response
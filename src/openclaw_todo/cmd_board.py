@@ -1,14 +1,26 @@
-"""Handler for the ``/todo board`` command."""
+"""Handler for the ``/todo board`` command.
+
+``/todo board more <section> [after:#id] [options]`` pages through one
+section: it shows the section's tasks that sort after task *id* in the board
+order (keyset pagination on ``due_day``/``id``), so a large column can be
+read page by page without re-querying the other sections.  Sections that
+overflow end with the command for their next page, which repeats the
+board's other options (scope, status, ``/p``, ``limitPerSection`` ...) so
+it pages through the same filtered set.
+"""
 
 from __future__ import annotations
 
 import logging
+import re
 import sqlite3
-from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Iterable, Iterator
 
+from openclaw_todo.models import FETCH_BATCH, TASK_COLUMNS, TaskRow, attach_assignees, query, task_row
 from openclaw_todo.parser import ParsedCommand
-from openclaw_todo.project_resolver import AmbiguousProjectError, ProjectNotFoundError, resolve_project
-from openclaw_todo.scope_builder import build_scope_conditions, format_assignees
+from openclaw_todo.task_query import FROM_CLAUSE, ORDER_BY, FilterError, TaskFilter, build_task_filter
+from openclaw_todo.tracing import spanned
 
 logger = logging.getLogger(__name__)
 
@@ -16,118 +28,236 @@ DEFAULT_LIMIT_PER_SECTION = 10
 
 SECTION_ORDER = ("backlog", "doing", "waiting", "done", "drop")
 
+# Returns the displayed rows of one section.
+SectionRows = Callable[[str], Iterable[TaskRow]]
+
+# (due_day, id) of the task a section page continues after.
+CursorKey = tuple[int | None, int]
+
+MORE_USAGE = "❌ Usage: /todo board more <section> [after:#id] [options]"
+
+_AFTER_RE = re.compile(r"after:#?(\d+)", re.IGNORECASE)
+
+
+@dataclass(slots=True, frozen=True)
+class SectionCursor:
+    """A ``board more <section> [after:#id]`` request."""
+
+    section: str
+    after_id: int | None = None
+
 
 def board_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> str:
     """Display tasks grouped by section in kanban board format."""
-    sender_id: str = context["sender_id"]
-
-    # --- Parse scope / limitPerSection from title_tokens ---
-    scope = "mine"
-    scope_user: str | None = None
-    limit_per_section = DEFAULT_LIMIT_PER_SECTION
-
-    tokens = list(parsed.title_tokens)
-
-    status_token: str | None = None
-    for tok in tokens:
-        low = tok.lower()
-        if low in ("mine", "all"):
-            scope = low
-        elif low in ("open", "done", "drop"):
-            status_token = low
-        elif low.startswith("limitpersection:"):
-            try:
-                limit_per_section = int(low.split(":", 1)[1])
-                if limit_per_section < 1:
-                    return f'❌ Invalid limitPerSection value "{tok}". Must be a positive integer.'
-            except ValueError:
-                return f'❌ Invalid limitPerSection value "{tok}". Must be a positive integer.'
-
-    if parsed.mentions:
-        scope = "user"
-        scope_user = parsed.mentions[0]
-
-    # --- Build query (same filtering as list) ---
-    conditions: list[str] = []
-    params: list[str | int] = []
-
-    # Status filter: title_token > /s section > default "open"
-    status_filter = "open"
-    if status_token:
-        status_filter = "dropped" if status_token == "drop" else status_token
-    elif parsed.section in ("done", "drop"):
-        status_filter = "done" if parsed.section == "done" else "dropped"
-
-    conditions.append("t.status = ?")
-    params.append(status_filter)
-
-    # Project filter
-    if parsed.project:
-        try:
-            project = resolve_project(conn, parsed.project, sender_id, visibility=parsed.project_visibility)
-        except AmbiguousProjectError:
-            return (
-                f'❌ Ambiguous project name "{parsed.project}": both shared and private projects exist. '
-                f'Append "shared" or "private" to disambiguate.'
-            )
-        except ProjectNotFoundError:
-            return f'❌ Project "{parsed.project}" not found.'
-        conditions.append("t.project_id = ?")
-        params.append(project.id)
-
-    # Scope filter
-    scope_conds, scope_params = build_scope_conditions(scope, sender_id, scope_user)
-    conditions.extend(scope_conds)
-    params.extend(scope_params)
-
-    where_clause = " AND ".join(conditions)
-
-    query = (
-        "SELECT t.id, t.title, t.section, t.due "
-        "FROM tasks t "
-        "JOIN projects p ON t.project_id = p.id "
-        f"WHERE {where_clause} "
-        "ORDER BY (CASE WHEN t.due IS NOT NULL THEN 0 ELSE 1 END), t.due ASC, t.id DESC"
+    return "\n".join(iter_board_lines(parsed, conn, context))
+
+
+def build_filter(
+    parsed: ParsedCommand, conn: sqlite3.Connection, context: dict, *, after_key: CursorKey | None = None
+) -> TaskFilter:
+    """Resolve *parsed*'s ``/todo board`` options (raises :class:`FilterError`).
+
+    For ``board more <section>`` the filter is restricted to that section
+    (``filt.section``) and, with ``after:#id``, to the tasks sorting after
+    task *id*; *after_key* supplies that task's cursor key when it was
+    already looked up elsewhere.
+    """
+    parsed, cursor = parse_more(parsed)
+    filt = build_task_filter(
+        parsed,
+        conn,
+        context["sender_id"],
+        limit_option="limitPerSection",
+        default_limit=DEFAULT_LIMIT_PER_SECTION,
+        section_filter=False,
+    )
+    if cursor is not None:
+        if cursor.after_id is not None and after_key is None:
+            after_key = cursor_key(conn, cursor.after_id)
+        _restrict_to_section(filt, cursor.section, after_key)
+    return filt
+
+
+def parse_more(parsed: ParsedCommand) -> tuple[ParsedCommand, SectionCursor | None]:
+    """Split a leading ``more <section> [after:#id]`` off *parsed*'s tokens.
+
+    Returns *parsed* unchanged and ``None`` for a plain board.  Raises
+    :class:`FilterError` when the section is missing or unknown.
+    """
+    tokens = parsed.title_tokens
+    if not tokens or tokens[0].lower() != "more":
+        return parsed, None
+    if len(tokens) < 2 or tokens[1].lower() not in SECTION_ORDER:
+        raise FilterError(MORE_USAGE)
+    after_id: int | None = None
+    rest: list[str] = []
+    for tok in tokens[2:]:
+        match = _AFTER_RE.fullmatch(tok)
+        if match:
+            after_id = int(match.group(1))
+        else:
+            rest.append(tok)
+    return replace(parsed, title_tokens=rest), SectionCursor(tokens[1].lower(), after_id)
+
+
+def cursor_key(conn: sqlite3.Connection, task_id: int) -> CursorKey:
+    """Return the board sort key of *task_id* (raises :class:`FilterError` if it does not exist)."""
+    row = conn.execute("SELECT due_day FROM tasks WHERE id = ?;", (task_id,)).fetchone()
+    if row is None:
+        raise FilterError(f"❌ Task #{task_id} not found.")
+    return row[0], task_id
+
+
+def _restrict_to_section(filt: TaskFilter, section: str, after_key: CursorKey | None) -> None:
+    filt.section = section
+    filt.conditions.append("t.section = ?")
+    filt.params.append(section)
+    if after_key is None:
+        return
+    # Rows after the cursor in ORDER_BY (due_day ASC NULLS LAST, id DESC).
+    due_day, after_id = after_key
+    if due_day is None:
+        filt.conditions.append("t.due_day IS NULL AND t.id < ?")
+        filt.params.append(after_id)
+    else:
+        filt.conditions.append("(t.due_day > ? OR t.due_day IS NULL OR (t.due_day = ? AND t.id < ?))")
+        filt.params.extend([due_day, due_day, after_id])
+
+
+def _section_counts(conn: sqlite3.Connection, filt: TaskFilter) -> dict[str, int]:
+    return dict(
+        conn.execute(
+            f"SELECT t.section, COUNT(*) {FROM_CLAUSE} WHERE {filt.where} GROUP BY t.section",
+            filt.params,
+        ).fetchall()
     )
 
-    rows = conn.execute(query, params).fetchall()
 
-    # --- Group by section ---
-    section_tasks: OrderedDict[str, list] = OrderedDict()
-    for s in SECTION_ORDER:
-        section_tasks[s] = []
+def _iter_section(conn: sqlite3.Connection, filt: TaskFilter, section: str) -> Iterator[TaskRow]:
+    """Yield the displayed rows of one section with assignees attached."""
+    cursor = query(
+        conn,
+        task_row,
+        f"SELECT {TASK_COLUMNS} {FROM_CLAUSE} WHERE {filt.where} AND t.section = ? ORDER BY {ORDER_BY} LIMIT ?",
+        [*filt.params, section, filt.limit],
+    )
+    while batch := cursor.fetchmany(FETCH_BATCH):
+        attach_assignees(conn, batch)
+        yield from batch
+
+
+def board_page(
+    parsed: ParsedCommand, conn: sqlite3.Connection, context: dict, *, after_key: CursorKey | None = None
+) -> tuple[TaskFilter, dict[str, int], SectionRows]:
+    """Run the board queries: ``(filter, section counts, section row fetcher)``.
+
+    Section rows are only queried when the fetcher is called.  Raises
+    :class:`FilterError` for invalid options.
+    """
+    return filter_page(build_filter(parsed, conn, context, after_key=after_key), conn)
+
+
+def filter_page(filt: TaskFilter, conn: sqlite3.Connection) -> tuple[TaskFilter, dict[str, int], SectionRows]:
+    """Run the board queries for an already built (or saved) *filt*."""
+    return filt, _section_counts(conn, filt), lambda section: _iter_section(conn, filt, section)
+
+
+def _sections(filt: TaskFilter) -> tuple[str, ...]:
+    """Sections a board shows: all of them, or the one ``board more`` pages through."""
+    return (filt.section,) if filt.section else SECTION_ORDER
+
+
+def filter_options(parsed: ParsedCommand) -> list[str]:
+    """*parsed*'s option tokens as typed, without a ``more <section>`` prefix or ``after:#id``."""
+    tokens = parsed.raw_tokens
+    for i in range(len(tokens) - 1):
+        if tokens[i].lower() == "more" and tokens[i + 1].lower() in SECTION_ORDER:
+            tokens = tokens[:i] + tokens[i + 2 :]
+            break
+    return [tok for tok in tokens if not _AFTER_RE.fullmatch(tok)]
+
 
-    for row in rows:
-        task_id, title, section, due = row
-        if section in section_tasks:
-            section_tasks[section].append((task_id, title, due))
+def more_command(section: str, after_id: int, options: Iterable[str] = ()) -> str:
+    """The command showing the rest of *section* after task *after_id*, with the board's *options*."""
+    return " ".join([f"/todo board more {section} after:#{after_id}", *options])
+
+
+def iter_board_lines(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> Iterator[str]:
+    """Yield the ``/todo board`` response one line at a time.
+
+    Section sizes come from one ``GROUP BY`` query; each section then
+    fetches only its displayed ``limitPerSection`` rows, in batches.
+    """
+    try:
+        filt, counts, section_rows = board_page(parsed, conn, context)
+    except FilterError as exc:
+        yield str(exc)
+        return
+    yield from render_board_lines(parsed, filt, counts, section_rows)
+
+
+@spanned("format")
+def render_board_lines(
+    parsed: ParsedCommand, filt: TaskFilter, counts: dict[str, int], section_rows: SectionRows
+) -> Iterator[str]:
+    """Format a board result (shared by the single-database and sharded paths)."""
 
     logger.info(
         "board: scope=%s project=%s sections=%s",
-        scope,
+        filt.scope,
         parsed.project,
-        {s: len(tasks) for s, tasks in section_tasks.items()},
+        {s: counts.get(s, 0) for s in _sections(filt)},
     )
 
     # --- Format output ---
     project_label = f" /p {parsed.project}" if parsed.project else ""
-    header = f"📊 Board ({scope} / {status_filter}){project_label}"
+    yield f"📊 Board ({filt.scope} / {filt.status}){project_label}"
 
-    lines: list[str] = [header, ""]
+    options = filter_options(parsed)
+    for section in _sections(filt):
+        total = counts.get(section, 0)
+        yield ""
+        yield f"— {section.upper()} ({total}) —"
+        if not total:
+            yield "(empty)"
+            continue
+        last_id = 0
+        for task in section_rows(section):
+            due_str = task.due if task.due else "-"
+            yield f"  #{task.id}  due:{due_str}  {task.assignee_mentions}  {task.display_title}"
+            last_id = task.id
+        overflow = total - filt.limit
+        if overflow > 0:
+            yield f"  ... and {overflow} more ({more_command(section, last_id, options)})"
 
-    for section, tasks in section_tasks.items():
-        lines.append(f"— {section.upper()} ({len(tasks)}) —")
-        if not tasks:
-            lines.append("(empty)")
-        else:
-            displayed = tasks[:limit_per_section]
-            for task_id, title, due in displayed:
-                due_str = due if due else "-"
-                assignee_str = format_assignees(conn, task_id)
-                lines.append(f"  #{task_id}  due:{due_str}  {assignee_str}  {title}")
-            overflow = len(tasks) - limit_per_section
-            if overflow > 0:
-                lines.append(f"  ... and {overflow} more")
-        lines.append("")
-
-    return "\n".join(lines).rstrip()
+
+def board_records(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> dict[str, Any]:
+    """Structured ``/todo board`` result: sections with their displayed tasks.
+
+    Raises :class:`FilterError` for invalid options.
+    """
+    return board_record(parsed, *board_page(parsed, conn, context))
+
+
+@spanned("format")
+def board_record(
+    parsed: ParsedCommand, filt: TaskFilter, counts: dict[str, int], section_rows: SectionRows
+) -> dict[str, Any]:
+    """Build the structured board result from a query page.
+
+    ``next_after`` is the id to pass as ``after:#id`` for the section's next
+    page, or ``None`` when all of its tasks are shown.
+    """
+    sections: list[dict[str, Any]] = []
+    for section in _sections(filt):
+        total = counts.get(section, 0)
+        tasks = [task.as_record() for task in section_rows(section)] if total else []
+        next_after = tasks[-1]["id"] if total > filt.limit else None
+        sections.append({"name": section, "total": total, "tasks": tasks, "next_after": next_after})
+    return {
+        "scope": filt.scope,
+        "status": filt.status,
+        "project": parsed.project,
+        "limit_per_section": filt.limit,
+        "sections": sections,
+    }
@@ -0,0 +1,146 @@
+"""Handler for the ``/todo digest`` command and the per-user digest generator."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import date
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Iterator, Sequence
+
+from openclaw_todo.models import FETCH_BATCH, TASK_COLUMNS, TaskRow, query, task_row
+from openclaw_todo.parser import ParsedCommand
+from openclaw_todo.task_query import epoch_day
+from openclaw_todo.tracing import spanned
+
+logger = logging.getLogger(__name__)
+
+BUCKETS = ("overdue", "due_today", "doing")
+
+_BUCKET_LABELS = {"overdue": "⏰ Overdue", "due_today": "📅 Due today", "doing": "🔨 Doing"}
+
+# One pass over the assignee index: every open task that is overdue, due
+# today or in ``doing``, once per assignee, in assignee order so rows can be
+# grouped without sorting.  A task in ``doing`` that is also overdue is
+# reported as overdue only.  Private projects are included only for the
+# viewer (by default the assignee, since only owners see private projects).
+_DIGEST_SQL = f"""
+    SELECT a.assignee_user_id,
+           CASE WHEN t.due_day < :today THEN 0 WHEN t.due_day = :today THEN 1 ELSE 2 END AS bucket,
+           {TASK_COLUMNS}
+    FROM task_assignees a
+    JOIN tasks t ON t.id = a.task_id
+    JOIN projects p ON p.id = t.project_id
+    WHERE t.status = 'open'
+      AND (t.due_day <= :today OR t.section = 'doing')
+      AND (p.visibility = 'shared' OR p.owner_user_id = {{viewer}})
+      {{user_filter}}
+    ORDER BY a.assignee_user_id, bucket, t.due_day, t.id
+"""
+
+
+@dataclass(slots=True)
+class Digest:
+    """One user's overdue / due-today / doing tasks."""
+
+    user_id: str
+    overdue: list[TaskRow] = field(default_factory=list)
+    due_today: list[TaskRow] = field(default_factory=list)
+    doing: list[TaskRow] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return len(self.overdue) + len(self.due_today) + len(self.doing)
+
+    @spanned("format")
+    def as_record(self) -> dict[str, Any]:
+        """JSON-ready dict for structured responses and digest payloads."""
+        record: dict[str, Any] = {"user_id": self.user_id}
+        for bucket in BUCKETS:
+            record[bucket] = [
+                {"id": t.id, "title": t.title, "project": t.project_name, "section": t.section, "due": t.due}
+                for t in getattr(self, bucket)
+            ]
+        return record
+
+
+def _digest_row(cursor: sqlite3.Cursor, row: tuple) -> tuple[str, int, TaskRow]:
+    return row[0], row[1], task_row(cursor, row[2:])
+
+
+def _iter_cursor(cursor: sqlite3.Cursor) -> Iterator[tuple[str, int, TaskRow]]:
+    while batch := cursor.fetchmany(FETCH_BATCH):
+        yield from batch
+
+
+def iter_digests(
+    conn: sqlite3.Connection,
+    today: date | None = None,
+    user_ids: Sequence[str] | None = None,
+    *,
+    viewer: str | None = None,
+) -> Iterator[Digest]:
+    """Yield a :class:`Digest` per assignee with anything to report, in user ID order.
+
+    All users are computed by a single query over ``task_assignees`` joined
+    with ``tasks``; rows are grouped by assignee as they stream off the
+    cursor, so only one user's digest is held in memory at a time.  Pass
+    *user_ids* to restrict the pass to those assignees, and *viewer* when the
+    digest is shown to someone other than the assignee.
+    """
+    params: dict[str, Any] = {"today": epoch_day(today or date.today()), "viewer": viewer}
+    user_filter = ""
+    if user_ids is not None:
+        names = [f"u{i}" for i in range(len(user_ids))]
+        user_filter = f"AND a.assignee_user_id IN ({', '.join(':' + n for n in names)})"
+        params.update(zip(names, user_ids))
+
+    sql = _DIGEST_SQL.format(user_filter=user_filter, viewer=":viewer" if viewer else "a.assignee_user_id")
+    cursor = query(conn, _digest_row, sql, params)
+    for user_id, rows in groupby(_iter_cursor(cursor), key=itemgetter(0)):
+        digest = Digest(user_id)
+        buckets = (digest.overdue, digest.due_today, digest.doing)
+        for _, bucket, task in rows:
+            buckets[bucket].append(task)
+        yield digest
+
+
+def _digest_for(conn: sqlite3.Connection, user_id: str, viewer: str, today: date) -> Digest:
+    return next(iter_digests(conn, today, [user_id], viewer=viewer), None) or Digest(user_id)
+
+
+def digest_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> str:
+    """Show the sender's (or a mentioned user's) overdue, due-today and doing tasks."""
+    user_id = parsed.mentions[0] if parsed.mentions else context["sender_id"]
+    today = date.today()
+    return render_digest(_digest_for(conn, user_id, context["sender_id"], today), today)
+
+
+@spanned("format")
+def render_digest(digest: Digest, today: date) -> str:
+    """Format a digest as Slack text."""
+    logger.info("digest: user=%s returned %d tasks", digest.user_id, digest.total)
+
+    lines = [f"📰 Digest for <@{digest.user_id}> — {today.isoformat()}"]
+    if digest.total == 0:
+        lines += ["", "Nothing overdue, due today or in progress."]
+        return "\n".join(lines)
+
+    for bucket in BUCKETS:
+        tasks = getattr(digest, bucket)
+        if not tasks:
+            continue
+        lines += ["", f"{_BUCKET_LABELS[bucket]} ({len(tasks)})"]
+        for task in tasks:
+            due_str = task.due if task.due else "-"
+            lines.append(f"#{task.id}  due:{due_str}  ({task.project_name}/{task.section})  {task.title}")
+    return "\n".join(lines)
+
+
+def digest_records(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> dict[str, Any]:
+    """Structured ``/todo digest`` result."""
+    user_id = parsed.mentions[0] if parsed.mentions else context["sender_id"]
+    today = date.today()
+    return {"date": today.isoformat(), **_digest_for(conn, user_id, context["sender_id"], today).as_record()}
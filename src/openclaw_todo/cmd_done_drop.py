@@ -5,9 +5,11 @@ from __future__ import annotations
 import logging
 import sqlite3
 
+from openclaw_todo.db import begin_immediate
 from openclaw_todo.event_logger import log_event
+from openclaw_todo.models import update_task
 from openclaw_todo.parser import ParsedCommand
-from openclaw_todo.permissions import can_write_task
+from openclaw_todo.permissions import fetch_write_target
 
 logger = logging.getLogger(__name__)
 
@@ -39,32 +41,35 @@ def _close_task(
         return f'❌ Invalid task ID "{parsed.args[0]}". Must be a number.'
 
     # --- Check task exists ---
-    row = conn.execute(
-        "SELECT t.title, t.section, t.status, p.name "
-        "FROM tasks t JOIN projects p ON t.project_id = p.id "
-        "WHERE t.id = ?;",
-        (task_id,),
-    ).fetchone()
-    if row is None:
+    target = fetch_write_target(conn, task_id, sender_id)
+    if target is None:
         return f"❌ Task #{task_id} not found."
+    task = target.task
 
-    title, current_section, current_status, project_name = row
+    current_section = task.section
+    current_status = task.status
 
     # --- Already closed? ---
     if current_status in ("done", "dropped"):
         return f"ℹ️ Task #{task_id} is already {current_status}."
 
     # --- Check permission ---
-    if not can_write_task(conn, task_id, sender_id):
+    if not target.writable:
         return f"❌ You don't have permission to modify task #{task_id}."
 
-    # --- Update task ---
-    conn.execute(
-        "UPDATE tasks SET section = ?, status = ?, "
-        "updated_at = datetime('now'), closed_at = datetime('now') "
-        "WHERE id = ?;",
-        (target_section, target_status, task_id),
+    # --- Update task (compare-and-swap on the version read above) ---
+    if not begin_immediate(conn):
+        return f"❌ Task #{task_id} was modified concurrently. Please retry."
+    row = update_task(
+        conn,
+        task_id,
+        "section = ?, status = ?, updated_at = datetime('now'), closed_at = datetime('now')",
+        (target_section, target_status),
+        expected_version=target.version,
     )
+    if row is None:
+        conn.rollback()
+        return f"❌ Task #{task_id} was modified concurrently. Please retry."
 
     # --- Log event ---
     log_event(
@@ -84,7 +89,7 @@ def _close_task(
 
     logger.info("Task #%d %s by %s", task_id, action, sender_id)
 
-    return f"{emoji} {verb} #{task_id} ({project_name}) — {title}"
+    return f"{emoji} {verb} #{task_id} ({task.project_name}) — {task.title}"
 
 
 def done_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> str:
@@ -5,16 +5,19 @@ from __future__ import annotations
 import logging
 import sqlite3
 
+from openclaw_todo.db import begin_immediate
 from openclaw_todo.event_logger import log_event
-from openclaw_todo.parser import DUE_CLEAR, ParsedCommand
-from openclaw_todo.permissions import can_write_task, validate_private_assignees
+from openclaw_todo.models import attach_assignees, update_task
+from openclaw_todo.parser import DUE_CLEAR, PARENT_CLEAR, ParsedCommand
+from openclaw_todo.permissions import fetch_write_target, validate_private_assignees
 from openclaw_todo.project_resolver import AmbiguousProjectError, ProjectNotFoundError, resolve_project
+from openclaw_todo.subtasks import creates_cycle, has_subtasks, parent_error
 
 logger = logging.getLogger(__name__)
 
 
 def edit_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> str:
-    """Edit a task's title, assignees, project, section, or due date."""
+    """Edit a task's title, assignees, project, section, due date, or parent."""
     sender_id: str = context["sender_id"]
 
     # --- Validate task ID ---
@@ -27,17 +30,15 @@ def edit_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict)
         return f'❌ Invalid task ID "{parsed.args[0]}". Must be a number.'
 
     # --- Check task exists ---
-    row = conn.execute(
-        "SELECT title, project_id, section, due, created_by FROM tasks WHERE id = ?;",
-        (task_id,),
-    ).fetchone()
-    if row is None:
+    target = fetch_write_target(conn, task_id, sender_id)
+    if target is None:
         return f"❌ Task #{task_id} not found."
+    task = target.task
 
-    old_title, old_project_id, old_section, old_due, created_by = row
+    old_title, old_project_id, old_section, old_due = task.title, task.project_id, task.section, task.due
 
     # --- Check permission ---
-    if not can_write_task(conn, task_id, sender_id):
+    if not target.writable:
         return f"❌ You don't have permission to modify task #{task_id}."
 
     # --- Collect changes ---
@@ -71,7 +72,8 @@ def edit_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict)
             update_params.append(new_due)
 
     # Project
-    new_project_id = old_project_id
+    visibility, owner_user_id = target.visibility, target.owner_user_id
+    project_id = old_project_id
     if parsed.project:
         try:
             project = resolve_project(conn, parsed.project, sender_id, visibility=parsed.project_visibility)
@@ -83,30 +85,38 @@ def edit_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict)
         except ProjectNotFoundError:
             return f'❌ Project "{parsed.project}" not found.'
         if project.id != old_project_id:
-            # Get old project name for the change log
-            old_proj_name = conn.execute("SELECT name FROM projects WHERE id = ?", (old_project_id,)).fetchone()[0]
-            changes["project"] = (old_proj_name, project.name)
+            changes["project"] = (task.project_name, project.name)
             update_fields.append("project_id = ?")
             update_params.append(project.id)
-            new_project_id = project.id
+            visibility, owner_user_id = project.visibility, project.owner_user_id
+            project_id = project.id
+
+    # Parent (subtasks stay in their parent's project)
+    new_parent = task.parent_id
+    if parsed.parent is not None:
+        new_parent = None if parsed.parent == PARENT_CLEAR else parsed.parent
+        if new_parent is not None and new_parent != task.parent_id:
+            error = parent_error(fetch_write_target(conn, new_parent, sender_id), new_parent, project_id)
+            if error:
+                return error
+        if new_parent != task.parent_id:
+            changes["parent"] = (task.parent_id, new_parent)
+            update_fields.append("parent_id = ?")
+            update_params.append(new_parent)
+    if "project" in changes:
+        if new_parent is not None and "parent" not in changes:
+            return f"❌ Task #{task_id} is a subtask of #{new_parent}; it must stay in its parent's project."
+        if has_subtasks(conn, task_id):
+            return f"❌ Task #{task_id} has subtasks; they must stay in the same project."
 
     # Assignees (full replace if mentions present)
     if parsed.mentions:
-        old_assignees = [
-            r[0]
-            for r in conn.execute(
-                "SELECT assignee_user_id FROM task_assignees WHERE task_id = ? ORDER BY assignee_user_id",
-                (task_id,),
-            ).fetchall()
-        ]
+        attach_assignees(conn, [task])
+        old_assignees = list(task.assignees or ())
         new_assignees = sorted(set(parsed.mentions))
         if old_assignees != new_assignees:
             # Validate private project constraint on target project
-            proj_row = conn.execute(
-                "SELECT visibility, owner_user_id FROM projects WHERE id = ?",
-                (new_project_id,),
-            ).fetchone()
-            warning = validate_private_assignees(proj_row[0], new_assignees, proj_row[1])
+            warning = validate_private_assignees(visibility, new_assignees, owner_user_id)
             if warning:
                 return warning
 
@@ -117,20 +127,30 @@ def edit_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict)
         return f"ℹ️ No changes specified for #{task_id}."
 
     # --- Apply updates ---
-    # Always set updated_at if any changes detected
-    update_fields.append("updated_at = datetime('now')")
-    sql = f"UPDATE tasks SET {', '.join(update_fields)} WHERE id = ?;"
-    update_params.append(task_id)
-    conn.execute(sql, update_params)
-
-    # Apply assignee replacement
+    if not begin_immediate(conn):
+        return f"❌ Task #{task_id} was modified concurrently. Please retry."
+    # Checked under the write lock, so concurrent re-parenting cannot close a cycle.
+    if new_parent is not None and "parent" in changes and creates_cycle(conn, task_id, new_parent):
+        conn.rollback()
+        return (
+            f"❌ Task #{new_parent} cannot be the parent of #{task_id}: "
+            f"it is #{task_id} itself or one of its subtasks."
+        )
+    # Assignees first, so the triggers have refreshed assignees_csv by the
+    # time the UPDATE below returns the row; a version conflict rolls both back.
     if "assignees" in changes:
         conn.execute("DELETE FROM task_assignees WHERE task_id = ?;", (task_id,))
-        for assignee in changes["assignees"][1]:
-            conn.execute(
-                "INSERT INTO task_assignees (task_id, assignee_user_id) VALUES (?, ?);",
-                (task_id, assignee),
-            )
+        conn.executemany(
+            "INSERT INTO task_assignees (task_id, assignee_user_id) VALUES (?, ?);",
+            [(task_id, assignee) for assignee in changes["assignees"][1]],
+        )
+
+    # Always set updated_at if any changes detected
+    update_fields.append("updated_at = datetime('now')")
+    final = update_task(conn, task_id, ", ".join(update_fields), update_params, expected_version=target.version)
+    if final is None:
+        conn.rollback()
+        return f"❌ Task #{task_id} was modified concurrently. Please retry."
 
     # --- Log event ---
     log_event(
@@ -147,20 +167,9 @@ def edit_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict)
     logger.info("Task #%d edited by %s: fields=%s", task_id, sender_id, changed_fields)
 
     # --- Format UX response with current task state ---
-    final_row = conn.execute(
-        "SELECT t.title, t.section, t.due, p.name "
-        "FROM tasks t JOIN projects p ON t.project_id = p.id "
-        "WHERE t.id = ?;",
-        (task_id,),
-    ).fetchone()
-    final_title, final_section, final_due, final_project = final_row
-    due_str = final_due if final_due else "-"
-    assignee_rows = conn.execute(
-        "SELECT assignee_user_id FROM task_assignees WHERE task_id = ? ORDER BY assignee_user_id",
-        (task_id,),
-    ).fetchall()
-    assignee_str = ", ".join(f"<@{r[0]}>" for r in assignee_rows)
+    attach_assignees(conn, [final])
+    due_str = final.due if final.due else "-"
     return (
-        f"✏️ Edited #{task_id} ({final_project}/{final_section})"
-        f" due:{due_str} assignees:{assignee_str} — {final_title}"
+        f"✏️ Edited #{task_id} ({final.project_name}/{final.section})"
+        f" due:{due_str} assignees:{final.assignee_mentions} — {final.title}"
     )
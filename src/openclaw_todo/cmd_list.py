@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import logging
 import sqlite3
+from typing import Any, Iterable, Iterator
 
+from openclaw_todo.models import FETCH_BATCH, TASK_COLUMNS, TaskRow, attach_assignees, query, task_row
 from openclaw_todo.parser import ParsedCommand
-from openclaw_todo.project_resolver import AmbiguousProjectError, ProjectNotFoundError, resolve_project
-from openclaw_todo.scope_builder import build_scope_conditions, format_assignees
+from openclaw_todo.task_query import FROM_CLAUSE, ORDER_BY, FilterError, TaskFilter, build_task_filter
+from openclaw_todo.tracing import spanned
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +19,61 @@ DEFAULT_LIMIT = 30
 def list_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> str:
     """Query and display tasks with filtering, sorting, and scope support.
 
+    See :func:`iter_list_lines` for scope and sorting rules.
+    """
+    return "\n".join(iter_list_lines(parsed, conn, context))
+
+
+def build_filter(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> TaskFilter:
+    """Resolve *parsed*'s ``/todo list`` options (raises :class:`FilterError`)."""
+    return build_task_filter(
+        parsed,
+        conn,
+        context["sender_id"],
+        limit_option="limit",
+        default_limit=DEFAULT_LIMIT,
+        section_filter=True,
+    )
+
+
+def _count(conn: sqlite3.Connection, filt: TaskFilter) -> int:
+    return conn.execute(f"SELECT COUNT(*) {FROM_CLAUSE} WHERE {filt.where}", filt.params).fetchone()[0]
+
+
+def _iter_rows(conn: sqlite3.Connection, filt: TaskFilter) -> Iterator[TaskRow]:
+    """Yield the limited, sorted rows with assignees attached, batch by batch."""
+    cursor = query(
+        conn,
+        task_row,
+        f"SELECT {TASK_COLUMNS} {FROM_CLAUSE} WHERE {filt.where} ORDER BY {ORDER_BY} LIMIT ?",
+        [*filt.params, filt.limit],
+    )
+    while batch := cursor.fetchmany(FETCH_BATCH):
+        attach_assignees(conn, batch)
+        yield from batch
+
+
+def list_page(
+    parsed: ParsedCommand, conn: sqlite3.Connection, context: dict
+) -> tuple[TaskFilter, int, Iterator[TaskRow]]:
+    """Run the list query: ``(filter, total matches, displayed rows)``.
+
+    The rows are read lazily.  Raises :class:`FilterError` for invalid options.
+    """
+    return filter_page(build_filter(parsed, conn, context), conn)
+
+
+def filter_page(filt: TaskFilter, conn: sqlite3.Connection) -> tuple[TaskFilter, int, Iterator[TaskRow]]:
+    """Run the list query for an already built (or saved) *filt*."""
+    return filt, _count(conn, filt), _iter_rows(conn, filt)
+
+
+def iter_list_lines(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> Iterator[str]:
+    """Yield the ``/todo list`` response one line at a time.
+
+    Rows are read from the cursor in batches of ``FETCH_BATCH``, so memory
+    stays bounded however large ``limit:N`` is.
+
     Scope resolution:
     - ``mine`` (default): tasks where sender is an assignee
     - ``all``: shared projects + sender's private (excludes others' private)
@@ -24,127 +81,68 @@ def list_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict)
 
     Sorting: due NOT NULL first, due ASC, id DESC.
     """
-    sender_id: str = context["sender_id"]
-
-    # --- Parse scope from title_tokens ---
-    scope = "mine"
-    scope_user: str | None = None
-    limit = DEFAULT_LIMIT
-
-    tokens = list(parsed.title_tokens)
-
-    # Extract scope, limit, and status from tokens
-    remaining_tokens: list[str] = []
-    status_token: str | None = None
-    for tok in tokens:
-        low = tok.lower()
-        if low in ("mine", "all"):
-            scope = low
-        elif low in ("open", "done", "drop"):
-            status_token = low
-        elif low.startswith("limit:"):
-            try:
-                limit = int(low.split(":", 1)[1])
-                if limit < 1:
-                    return f'❌ Invalid limit value "{tok}". Must be a positive integer.'
-            except ValueError:
-                return f'❌ Invalid limit value "{tok}". Must be a positive integer.'
-        else:
-            remaining_tokens.append(tok)
-
-    # If mentions present in parsed, treat first as scope target
-    if parsed.mentions:
-        scope = "user"
-        scope_user = parsed.mentions[0]
-
-    # --- Build query ---
-    conditions: list[str] = []
-    params: list[str | int] = []
-
-    # Status filter: title_token > /s section > default "open"
-    status_filter = "open"
-    if status_token:
-        status_filter = "dropped" if status_token == "drop" else status_token
-        section_filter = parsed.section if parsed.section not in ("done", "drop") else None
-    elif parsed.section in ("done", "drop"):
-        status_filter = "done" if parsed.section == "done" else "dropped"
-        # Don't also filter by section since we're using status
-        section_filter = None
-    else:
-        section_filter = parsed.section
-
-    conditions.append("t.status = ?")
-    params.append(status_filter)
-
-    # Section filter
-    if section_filter:
-        conditions.append("t.section = ?")
-        params.append(section_filter)
-
-    # Project filter
-    if parsed.project:
-        try:
-            project = resolve_project(conn, parsed.project, sender_id, visibility=parsed.project_visibility)
-        except AmbiguousProjectError:
-            return (
-                f'❌ Ambiguous project name "{parsed.project}": both shared and private projects exist. '
-                f'Append "shared" or "private" to disambiguate.'
-            )
-        except ProjectNotFoundError:
-            return f'❌ Project "{parsed.project}" not found.'
-        conditions.append("t.project_id = ?")
-        params.append(project.id)
-
-    # Scope filter
-    scope_conds, scope_params = build_scope_conditions(scope, sender_id, scope_user)
-    conditions.extend(scope_conds)
-    params.extend(scope_params)
-
-    where_clause = " AND ".join(conditions)
-
-    # --- Count total matching rows ---
-    count_query = "SELECT COUNT(*) " "FROM tasks t " "JOIN projects p ON t.project_id = p.id " f"WHERE {where_clause}"
-    total_count = conn.execute(count_query, params).fetchone()[0]
-
-    # --- Fetch limited rows ---
-    query = (
-        "SELECT t.id, t.title, t.section, t.due, p.name AS project_name "
-        "FROM tasks t "
-        "JOIN projects p ON t.project_id = p.id "
-        f"WHERE {where_clause} "
-        "ORDER BY (CASE WHEN t.due IS NOT NULL THEN 0 ELSE 1 END), t.due ASC, t.id DESC "
-        "LIMIT ?"
-    )
-    fetch_params = list(params) + [limit]
+    try:
+        filt, total_count, rows = list_page(parsed, conn, context)
+    except FilterError as exc:
+        yield str(exc)
+        return
+    yield from render_list_lines(parsed, filt, total_count, rows)
+
 
-    rows = conn.execute(query, fetch_params).fetchall()
+@spanned("format")
+def render_list_lines(
+    parsed: ParsedCommand, filt: TaskFilter, total_count: int, rows: Iterable[TaskRow]
+) -> Iterator[str]:
+    """Format a list result (shared by the single-database and sharded paths)."""
+    displayed = min(filt.limit, total_count)
 
     logger.info(
         "list: scope=%s project=%s returned %d rows",
-        scope,
+        filt.scope,
         parsed.project,
-        len(rows),
+        displayed,
     )
 
     # --- Build header ---
     project_label = f" /p {parsed.project}" if parsed.project else ""
-    section_label = f" /s {parsed.section}" if section_filter else ""
-    header = f"📋 TODO List ({scope} / {status_filter}){project_label}{section_label} — {total_count} tasks"
+    section_label = f" /s {filt.section}" if filt.section else ""
+    yield f"📋 TODO List ({filt.scope} / {filt.status}){project_label}{section_label} — {total_count} tasks"
+    yield ""
 
     if total_count == 0:
-        return f"{header}\n\nNo tasks found."
+        yield "No tasks found."
+        return
 
     # --- Format output ---
-    lines: list[str] = [header, ""]
-    for row in rows:
-        task_id, title, section, due, project_name = row
-        due_str = due if due else "-"
-        assignee_str = format_assignees(conn, task_id)
-        lines.append(f"#{task_id}  due:{due_str}  ({project_name}/{section})  {assignee_str}  {title}")
+    for task in rows:
+        due_str = task.due if task.due else "-"
+        yield (
+            f"#{task.id}  due:{due_str}  ({task.project_name}/{task.section})  "
+            f"{task.assignee_mentions}  {task.display_title}"
+        )
 
     # --- Footer ---
-    displayed = len(rows)
-    lines.append("")
-    lines.append(f"Showing {displayed} of {total_count}. Use limit:N to see more.")
+    yield ""
+    yield f"Showing {displayed} of {total_count}. Use limit:N to see more."
+
 
-    return "\n".join(lines)
+def list_records(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> dict[str, Any]:
+    """Structured ``/todo list`` result: the same query, returned as records.
+
+    Raises :class:`FilterError` for invalid options.
+    """
+    return list_record(parsed, *list_page(parsed, conn, context))
+
+
+@spanned("format")
+def list_record(parsed: ParsedCommand, filt: TaskFilter, total: int, rows: Iterable[TaskRow]) -> dict[str, Any]:
+    """Build the structured list result from a query page."""
+    return {
+        "scope": filt.scope,
+        "status": filt.status,
+        "project": parsed.project,
+        "section": filt.section,
+        "limit": filt.limit,
+        "total": total,
+        "tasks": [task.as_record() for task in rows],
+    }
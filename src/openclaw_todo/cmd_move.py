@@ -5,9 +5,11 @@ from __future__ import annotations
 import logging
 import sqlite3
 
+from openclaw_todo.db import begin_immediate
 from openclaw_todo.event_logger import log_event
+from openclaw_todo.models import update_task
 from openclaw_todo.parser import VALID_SECTIONS, ParsedCommand
-from openclaw_todo.permissions import can_write_task
+from openclaw_todo.permissions import fetch_write_target
 
 logger = logging.getLogger(__name__)
 
@@ -42,27 +44,33 @@ def move_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict)
         return "❌ Target section is required. Usage: /todo move <id> <section>"
 
     # --- Check task exists ---
-    row = conn.execute(
-        "SELECT title, section, project_id FROM tasks WHERE id = ?;",
-        (task_id,),
-    ).fetchone()
-    if row is None:
+    target = fetch_write_target(conn, task_id, sender_id)
+    if target is None:
         return f"❌ Task #{task_id} not found."
+    task = target.task
 
-    title, current_section, project_id = row
+    current_section = task.section
 
     if current_section == target_section:
         return f"ℹ️ Task #{task_id} is already in {target_section}."
 
     # --- Check permission ---
-    if not can_write_task(conn, task_id, sender_id):
+    if not target.writable:
         return f"❌ You don't have permission to modify task #{task_id}."
 
-    # --- Update task ---
-    conn.execute(
-        "UPDATE tasks SET section = ?, updated_at = datetime('now') WHERE id = ?;",
-        (target_section, task_id),
+    # --- Update task (compare-and-swap on the version read above) ---
+    if not begin_immediate(conn):
+        return f"❌ Task #{task_id} was modified concurrently. Please retry."
+    row = update_task(
+        conn,
+        task_id,
+        "section = ?, updated_at = datetime('now')",
+        (target_section,),
+        expected_version=target.version,
     )
+    if row is None:
+        conn.rollback()
+        return f"❌ Task #{task_id} was modified concurrently. Please retry."
 
     # --- Log event ---
     log_event(
@@ -78,9 +86,6 @@ def move_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict)
 
     conn.commit()
 
-    # --- Fetch project name for response ---
-    project_name = conn.execute("SELECT name FROM projects WHERE id = ?", (project_id,)).fetchone()[0]
-
     logger.info("Task #%d moved to %s by %s", task_id, target_section, sender_id)
 
-    return f"➡️ Moved #{task_id} to {target_section} ({project_name}) — {title}"
+    return f"➡️ Moved #{task_id} to {target_section} ({task.project_name}) — {task.title}"
@@ -4,17 +4,17 @@ from __future__ import annotations
 
 import logging
 import sqlite3
+from typing import Any
 
 from openclaw_todo.parser import ParsedCommand
+from openclaw_todo.tracing import spanned
 
 logger = logging.getLogger(__name__)
 
 
-def project_list_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> str:
-    """List all shared projects and the sender's private projects with task counts."""
-    sender_id: str = context["sender_id"]
-
-    rows = conn.execute(
+def visible_projects(conn: sqlite3.Connection, sender_id: str) -> list[tuple]:
+    """Return ``(id, name, visibility, owner_user_id, task_count)`` rows visible to *sender_id*."""
+    return conn.execute(
         "SELECT p.id, p.name, p.visibility, p.owner_user_id, "
         "       COUNT(t.id) AS task_count "
         "FROM projects p "
@@ -26,6 +26,32 @@ def project_list_handler(parsed: ParsedCommand, conn: sqlite3.Connection, contex
         (sender_id,),
     ).fetchall()
 
+
+def project_list_records(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> dict[str, Any]:
+    """Structured ``/todo project list`` result."""
+    return project_list_record(visible_projects(conn, context["sender_id"]))
+
+
+@spanned("format")
+def project_list_record(rows: list[tuple]) -> dict[str, Any]:
+    """Build the structured project list from :func:`visible_projects` rows."""
+    return {
+        "projects": [
+            {"id": pid, "name": name, "visibility": visibility, "owner_user_id": owner, "task_count": task_count}
+            for pid, name, visibility, owner, task_count in rows
+        ]
+    }
+
+
+def project_list_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> str:
+    """List all shared projects and the sender's private projects with task counts."""
+    sender_id: str = context["sender_id"]
+    return render_project_list(visible_projects(conn, sender_id), sender_id)
+
+
+@spanned("format")
+def render_project_list(rows: list[tuple], sender_id: str) -> str:
+    """Format :func:`visible_projects` rows as Slack text."""
     if not rows:
         return "No projects found."
 
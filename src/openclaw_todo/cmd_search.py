@@ -0,0 +1,170 @@
+"""Handler for the ``/todo search`` command."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from typing import Any, Iterable, Iterator
+
+from openclaw_todo.models import FETCH_BATCH, TASK_COLUMNS, TaskRow, attach_assignees, query, task_row
+from openclaw_todo.parser import ParsedCommand
+from openclaw_todo.schema_v2 import FTS_TABLE, has_fts_index
+from openclaw_todo.task_query import FROM_CLAUSE, ORDER_BY, FilterError, TaskFilter, build_task_filter
+from openclaw_todo.tracing import spanned
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 20
+
+USAGE = "Usage: /todo search <terms> [/p project] [open|done|drop] [limit:N]"
+
+
+def _build_filter(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> TaskFilter:
+    filt = build_task_filter(
+        parsed,
+        conn,
+        context["sender_id"],
+        limit_option="limit",
+        default_limit=DEFAULT_LIMIT,
+        section_filter=True,
+        default_scope="all",
+    )
+    if not filt.terms:
+        raise FilterError(f"❌ Search terms are required. {USAGE}")
+    return filt
+
+
+def _match_expression(terms: list[str]) -> str:
+    """Build an FTS5 query: every term must match, each as a quoted prefix.
+
+    Quoting neutralises FTS5 syntax (``AND``, ``NEAR``, ``*``, ``:`` ...) in
+    user input; embedded double quotes are escaped by doubling.
+    """
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _search_sql(conn: sqlite3.Connection, filt: TaskFilter) -> tuple[str, str, list[Any]]:
+    """Return ``(count_sql, select_sql, params)`` for *filt*.
+
+    Uses the FTS5 index ranked by ``bm25`` when present, otherwise an
+    unranked ``LIKE`` scan in the usual list order.  The first selected
+    column is the rank (``0.0`` for the ``LIKE`` scan).
+    """
+    if has_fts_index(conn):
+        source = f"FROM {FTS_TABLE} JOIN tasks t ON t.id = {FTS_TABLE}.rowid JOIN projects p ON t.project_id = p.id"
+        where = f"{FTS_TABLE} MATCH ? AND {filt.where}"
+        params: list[Any] = [_match_expression(filt.terms), *filt.params]
+        rank = f"bm25({FTS_TABLE})"
+        order = f"{rank}, t.id DESC"
+    else:
+        source = FROM_CLAUSE
+        like = " AND ".join("t.title LIKE ? ESCAPE '\\'" for _ in filt.terms)
+        where = f"{like} AND {filt.where}"
+        params = [*(_like_pattern(term) for term in filt.terms), *filt.params]
+        rank = "0.0"
+        order = ORDER_BY
+    count_sql = f"SELECT COUNT(*) {source} WHERE {where}"
+    select_sql = f"SELECT {rank}, {TASK_COLUMNS} {source} WHERE {where} ORDER BY {order} LIMIT ?"
+    return count_sql, select_sql, params
+
+
+def _ranked_row(cursor: sqlite3.Cursor, row: tuple) -> tuple[float, TaskRow]:
+    return row[0], task_row(cursor, row[1:])
+
+
+def _iter_ranked(
+    conn: sqlite3.Connection, select_sql: str, params: list[Any], limit: int
+) -> Iterator[tuple[float, TaskRow]]:
+    cursor = query(conn, _ranked_row, select_sql, [*params, limit])
+    while batch := cursor.fetchmany(FETCH_BATCH):
+        attach_assignees(conn, [task for _, task in batch])
+        yield from batch
+
+
+def search_page(
+    parsed: ParsedCommand, conn: sqlite3.Connection, context: dict
+) -> tuple[TaskFilter, int, Iterator[tuple[float, TaskRow]]]:
+    """Run the search: ``(filter, total matches, (rank, row) pairs)``, best match first.
+
+    The rank is the ``bm25`` score (lower is better).  Rows are read lazily.
+    Raises :class:`FilterError` for missing terms or invalid options.
+    """
+    filt = _build_filter(parsed, conn, context)
+    count_sql, select_sql, params = _search_sql(conn, filt)
+    total_count = conn.execute(count_sql, params).fetchone()[0]
+    return filt, total_count, _iter_ranked(conn, select_sql, params, filt.limit)
+
+
+def search_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> str:
+    """Full-text search over task titles, best matches first."""
+    return "\n".join(iter_search_lines(parsed, conn, context))
+
+
+def iter_search_lines(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> Iterator[str]:
+    """Yield the ``/todo search`` response one line at a time.
+
+    Scope defaults to ``all`` (shared projects plus the sender's private
+    ones); ``mine`` or a mention narrows it exactly as for ``list``.
+    """
+    try:
+        filt, total_count, ranked = search_page(parsed, conn, context)
+    except FilterError as exc:
+        yield str(exc)
+        return
+    yield from render_search_lines(parsed, filt, total_count, (task for _, task in ranked))
+
+
+@spanned("format")
+def render_search_lines(
+    parsed: ParsedCommand, filt: TaskFilter, total_count: int, rows: Iterable[TaskRow]
+) -> Iterator[str]:
+    """Format a search result (shared by the single-database and sharded paths)."""
+    displayed = min(filt.limit, total_count)
+
+    logger.info("search: scope=%s terms=%d matched %d rows", filt.scope, len(filt.terms), total_count)
+
+    project_label = f" /p {parsed.project}" if parsed.project else ""
+    yield f'🔍 Search "{" ".join(filt.terms)}" ({filt.scope} / {filt.status}){project_label} — {total_count} matches'
+    yield ""
+
+    if total_count == 0:
+        yield "No tasks found."
+        return
+
+    for task in rows:
+        due_str = task.due if task.due else "-"
+        yield (
+            f"#{task.id}  due:{due_str}  ({task.project_name}/{task.section})  "
+            f"{task.assignee_mentions}  {task.display_title}"
+        )
+
+    yield ""
+    yield f"Showing {displayed} of {total_count}. Use limit:N to see more."
+
+
+def search_records(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> dict[str, Any]:
+    """Structured ``/todo search`` result.
+
+    Raises :class:`FilterError` for missing terms or invalid options.
+    """
+    filt, total, ranked = search_page(parsed, conn, context)
+    return search_record(parsed, filt, total, (task for _, task in ranked))
+
+
+@spanned("format")
+def search_record(parsed: ParsedCommand, filt: TaskFilter, total: int, rows: Iterable[TaskRow]) -> dict[str, Any]:
+    """Build the structured search result from a query page."""
+    return {
+        "terms": filt.terms,
+        "scope": filt.scope,
+        "status": filt.status,
+        "project": parsed.project,
+        "limit": filt.limit,
+        "total": total,
+        "tasks": [task.as_record() for task in rows],
+    }
@@ -0,0 +1,167 @@
+"""Handler for the ``/todo view`` command: named, precompiled ``list``/``board`` filters.
+
+``/todo view save <name> [list|board] <filter...>`` parses the filter and
+resolves its options (scope, status, section, project, limit) once, and
+stores the resulting WHERE clause and parameters in ``saved_views``
+(schema V8).  ``/todo view <name>`` runs the stored query directly and
+renders it like the original command, so repeated invocations skip the
+parser and project resolution.  Filters with date options are relative to
+the day they run on and are compiled again on each run instead.
+
+Views are personal: each user sees and runs only their own.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import sqlite3
+from typing import Iterator
+
+from openclaw_todo import cmd_board, cmd_list
+from openclaw_todo.parser import ParsedCommand, ParseError, parse
+from openclaw_todo.task_query import FilterError, TaskFilter
+
+logger = logging.getLogger(__name__)
+
+USAGE = (
+    "Usage: /todo view <name> | /todo view save <name> [list|board] <filter...> | "
+    "/todo view list | /todo view delete <name>"
+)
+
+# Subcommands, which cannot be used as view names.
+_SUBCOMMANDS = frozenset({"save", "list", "delete"})
+
+_NAME_RE = re.compile(r"[A-Za-z0-9_-]{1,40}")
+
+# View command -> (filter builder, page runner, renderer)
+_COMMANDS = {
+    "list": (cmd_list.build_filter, cmd_list.filter_page, cmd_list.render_list_lines),
+    "board": (cmd_board.build_filter, cmd_board.filter_page, cmd_board.render_board_lines),
+}
+
+
+def view_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> str:
+    """Save, run, list or delete the sender's saved views."""
+    tokens = parsed.title_tokens
+    if not tokens:
+        return f"❌ View name is required. {USAGE}"
+    sub = tokens[0].lower()
+    sender_id: str = context["sender_id"]
+    if sub == "save":
+        return _save(conn, sender_id, tokens[1:])
+    if sub == "list":
+        return _list(conn, sender_id)
+    if sub == "delete":
+        if len(tokens) < 2:
+            return "❌ View name is required. Usage: /todo view delete <name>"
+        return _delete(conn, sender_id, tokens[1])
+    return "\n".join(_run(conn, sender_id, tokens[0], context))
+
+
+def _compile(
+    command: str, filter_text: str, conn: sqlite3.Connection, context: dict
+) -> tuple[ParsedCommand, TaskFilter]:
+    """Parse *filter_text* as options of *command* and resolve them (raises ParseError/FilterError)."""
+    view_parsed = parse(f"{command} {filter_text}")
+    return view_parsed, _COMMANDS[command][0](view_parsed, conn, context)
+
+
+def _save(conn: sqlite3.Connection, sender_id: str, tokens: list[str]) -> str:
+    if not tokens:
+        return "❌ View name is required. Usage: /todo view save <name> [list|board] <filter...>"
+    name = tokens[0]
+    if not _NAME_RE.fullmatch(name) or name.lower() in _SUBCOMMANDS:
+        return f'❌ Invalid view name "{name}". Use up to 40 letters, digits, "-" or "_" (not save, list or delete).'
+    rest = tokens[1:]
+    command = "list"
+    if rest and rest[0].lower() in _COMMANDS:
+        command = rest.pop(0).lower()
+    filter_text = " ".join(rest)
+
+    try:
+        view_parsed, filt = _compile(command, filter_text, conn, {"sender_id": sender_id})
+    except ParseError as exc:
+        return f"❌ {exc}"
+    except FilterError as exc:
+        return str(exc)
+
+    # Date filters are relative to today, so those views are compiled on each run.
+    dynamic = view_parsed.due_range is not None or view_parsed.closed_range is not None
+    conn.execute(
+        "INSERT INTO saved_views "
+        "(owner_user_id, name, command, filter_text, project, scope, status, section, limit_n, where_sql, params) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (owner_user_id, name) DO UPDATE SET command = excluded.command, "
+        "filter_text = excluded.filter_text, project = excluded.project, scope = excluded.scope, "
+        "status = excluded.status, section = excluded.section, limit_n = excluded.limit_n, "
+        "where_sql = excluded.where_sql, params = excluded.params, updated_at = datetime('now');",
+        (
+            sender_id,
+            name,
+            command,
+            filter_text,
+            view_parsed.project,
+            filt.scope,
+            filt.status,
+            filt.section,
+            filt.limit,
+            None if dynamic else filt.where,
+            None if dynamic else json.dumps(filt.params),
+        ),
+    )
+    conn.commit()
+
+    logger.info("View %r saved by %s: %s %s", name, sender_id, command, filter_text)
+    return f'💾 Saved view "{name}": {command} {filter_text}'.rstrip()
+
+
+def _run(conn: sqlite3.Connection, sender_id: str, name: str, context: dict) -> Iterator[str]:
+    row = conn.execute(
+        "SELECT command, filter_text, project, scope, status, section, limit_n, where_sql, params "
+        "FROM saved_views WHERE owner_user_id = ? AND name = ?;",
+        (sender_id, name),
+    ).fetchone()
+    if row is None:
+        yield f'❌ View "{name}" not found. Use /todo view list to see your views.'
+        return
+    command, filter_text, project, scope, status, section, limit, where_sql, params = row
+    _, page, render = _COMMANDS[command]
+
+    if where_sql is None:
+        try:
+            view_parsed, filt = _compile(command, filter_text, conn, context)
+        except ParseError as exc:
+            yield f"❌ {exc}"
+            return
+        except FilterError as exc:
+            yield str(exc)
+            return
+    else:
+        view_parsed = ParsedCommand(command=command, project=project, raw_tokens=filter_text.split())
+        filt = TaskFilter(scope, status, section, limit, conditions=[where_sql], params=json.loads(params))
+
+    logger.info("View %r run by %s (%s)", name, sender_id, "compiled" if where_sql is None else "stored")
+    yield from render(view_parsed, *page(filt, conn))
+
+
+def _list(conn: sqlite3.Connection, sender_id: str) -> str:
+    rows = conn.execute(
+        "SELECT name, command, filter_text FROM saved_views WHERE owner_user_id = ? ORDER BY name;",
+        (sender_id,),
+    ).fetchall()
+    if not rows:
+        return "🔖 No saved views. Save one with /todo view save <name> [list|board] <filter...>"
+    lines = [f"🔖 Saved views ({len(rows)})", ""]
+    lines.extend(f"{name} — {command} {filter_text}".rstrip() for name, command, filter_text in rows)
+    return "\n".join(lines)
+
+
+def _delete(conn: sqlite3.Connection, sender_id: str, name: str) -> str:
+    cursor = conn.execute("DELETE FROM saved_views WHERE owner_user_id = ? AND name = ?;", (sender_id, name))
+    conn.commit()
+    if not cursor.rowcount:
+        return f'❌ View "{name}" not found.'
+    logger.info("View %r deleted by %s", name, sender_id)
+    return f'🗑️ Deleted view "{name}".'
@@ -0,0 +1,97 @@
+"""Consistency check for denormalised task columns.
+
+``tasks.assignees_csv`` (schema V6) is maintained by triggers on
+``task_assignees``; this tool recomputes it from ``task_assignees`` and
+reports (or, with ``--repair``, rewrites) every task whose cached value
+disagrees.  Rows the backfill has not reached yet (``NULL``) are not
+mismatches, since readers fall back to ``task_assignees`` for them.
+
+Usage::
+
+    python -m openclaw_todo.consistency --db-path ~/.openclaw/workspace/.todo/todo.sqlite3 [--repair]
+
+Exits with status 1 when mismatches were found and not repaired.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import sys
+from dataclasses import dataclass
+from typing import Any, Iterable, TextIO
+
+import openclaw_todo.schemas as _schemas  # noqa: F401 — registers migrations
+from openclaw_todo.db import get_connection
+from openclaw_todo.migrations import migrate
+from openclaw_todo.models import IN_CHUNK
+from openclaw_todo.schema_v6 import ASSIGNEES_CSV_SQL
+
+
+@dataclass(slots=True, frozen=True)
+class Mismatch:
+    """A task whose cached assignee list differs from ``task_assignees``."""
+
+    task_id: int
+    cached: str
+    actual: str
+
+    def as_record(self) -> dict[str, Any]:
+        return {"task_id": self.task_id, "cached": self.cached, "actual": self.actual}
+
+
+def check_assignees_csv(conn: sqlite3.Connection) -> list[Mismatch]:
+    """Return every task whose non-``NULL`` ``assignees_csv`` is stale, in id order."""
+    actual = ASSIGNEES_CSV_SQL.format(task_id="t.id")
+    rows = conn.execute(f"""
+        SELECT id, assignees_csv, actual FROM (
+            SELECT t.id, t.assignees_csv, {actual} AS actual FROM tasks t WHERE t.assignees_csv IS NOT NULL
+        )
+        WHERE assignees_csv != actual
+        ORDER BY id;
+    """).fetchall()
+    return [Mismatch(*row) for row in rows]
+
+
+def repair_assignees_csv(conn: sqlite3.Connection, task_ids: Iterable[int]) -> int:
+    """Recompute ``assignees_csv`` for *task_ids* and commit; return the number of rows updated."""
+    ids = list(task_ids)
+    updated = 0
+    for start in range(0, len(ids), IN_CHUNK):
+        chunk = ids[start : start + IN_CHUNK]
+        placeholders = ", ".join("?" * len(chunk))
+        cursor = conn.execute(
+            f"UPDATE tasks SET assignees_csv = {ASSIGNEES_CSV_SQL.format(task_id='tasks.id')} "
+            f"WHERE id IN ({placeholders});",
+            chunk,
+        )
+        updated += cursor.rowcount
+    conn.commit()
+    return updated
+
+
+def main(argv: list[str] | None = None, out: TextIO = sys.stdout) -> int:
+    ap = argparse.ArgumentParser(prog="python -m openclaw_todo.consistency", description=__doc__.splitlines()[0])
+    ap.add_argument("--db-path", default=os.environ.get("OPENCLAW_TODO_DB_PATH") or None)
+    ap.add_argument("--repair", action="store_true", help="rewrite stale cached values")
+    opts = ap.parse_args(argv)
+
+    conn = get_connection(opts.db_path)
+    try:
+        migrate(conn)
+        mismatches = check_assignees_csv(conn)
+        for m in mismatches:
+            print(f"#{m.task_id}: assignees_csv={m.cached!r}, task_assignees={m.actual!r}", file=out)
+        if mismatches and opts.repair:
+            repaired = repair_assignees_csv(conn, (m.task_id for m in mismatches))
+            print(f"Repaired {repaired} task(s).", file=out)
+            return 0
+    finally:
+        conn.close()
+    print(f"{len(mismatches)} mismatch(es).", file=out)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -11,14 +11,28 @@ logger = logging.getLogger(__name__)
 DEFAULT_DB_DIR = Path.home() / ".openclaw" / "workspace" / ".todo"
 DEFAULT_DB_NAME = "todo.sqlite3"
 
+# How long a statement waits for a lock held by another connection.
+BUSY_TIMEOUT_MS = 3000
 
-def get_connection(db_path: str | Path | None = None) -> sqlite3.Connection:
+# How long :func:`begin_immediate` waits for the write lock before giving up.
+WRITE_LOCK_TIMEOUT_MS = 200
+
+
+def get_connection(
+    db_path: str | Path | None = None,
+    *,
+    check_same_thread: bool = True,
+    factory: type[sqlite3.Connection] = sqlite3.Connection,
+) -> sqlite3.Connection:
     """Open (or create) the SQLite database and apply pragmas.
 
     If *db_path* is ``None`` the default location
     ``~/.openclaw/workspace/.todo/todo.sqlite3`` is used.
 
-    The directory tree is created recursively when absent.
+    The directory tree is created recursively when absent.  Pass
+    ``check_same_thread=False`` for pooled connections that are handed
+    between threads (one at a time), and a :class:`sqlite3.Connection`
+    subclass as *factory* to customise the connection.
     """
     if db_path is None:
         db_path = DEFAULT_DB_DIR / DEFAULT_DB_NAME
@@ -32,9 +46,9 @@ def get_connection(db_path: str | Path | None = None) -> sqlite3.Connection:
         db_dir.mkdir(parents=True, exist_ok=True)
         logger.info("Created DB directory: %s", db_dir)
 
-    conn = sqlite3.connect(str(db_path))
+    conn = sqlite3.connect(str(db_path), check_same_thread=check_same_thread, factory=factory)
     conn.execute("PRAGMA journal_mode=WAL;")
-    conn.execute("PRAGMA busy_timeout=3000;")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS};")
     conn.execute("PRAGMA foreign_keys=ON;")
 
     if is_new:
@@ -43,3 +57,40 @@ def get_connection(db_path: str | Path | None = None) -> sqlite3.Connection:
         logger.debug("Opened database: %s", db_path)
 
     return conn
+
+
+def is_busy(exc: sqlite3.OperationalError) -> bool:
+    """Return whether *exc* is ``SQLITE_BUSY`` (another connection holds the lock)."""
+    code = getattr(exc, "sqlite_errorcode", None)  # Python 3.11+
+    if code is not None:
+        return code & 0xFF == sqlite3.SQLITE_BUSY
+    return "database is locked" in str(exc)
+
+
+def begin_immediate(conn: sqlite3.Connection) -> bool:
+    """Start a write transaction that takes the database write lock up front.
+
+    Handlers read (and validate) outside any transaction, then call this
+    right before their writes, so the write lock is held only for the
+    ``UPDATE``/``INSERT`` statements and the commit.  A deferred transaction
+    would instead take it at the first write, where a stale read snapshot
+    fails with ``SQLITE_BUSY`` instead of waiting.  No-op if *conn* already
+    has a transaction open (the caller's transaction is joined).
+
+    Waits at most ``WRITE_LOCK_TIMEOUT_MS`` for another writer, not the
+    connection's full ``busy_timeout``, and returns ``False`` if the lock
+    was not free by then; callers answer that like a version conflict.
+    """
+    if conn.in_transaction:
+        return True
+    conn.execute(f"PRAGMA busy_timeout={WRITE_LOCK_TIMEOUT_MS};")
+    try:
+        conn.execute("BEGIN IMMEDIATE;")
+    except sqlite3.OperationalError as exc:
+        if not is_busy(exc):
+            raise
+        logger.info("Write lock busy for %d ms; giving up", WRITE_LOCK_TIMEOUT_MS)
+        return False
+    finally:
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS};")
+    return True
@@ -4,43 +4,78 @@ from __future__ import annotations
 
 import logging
 import sqlite3
-from typing import Callable
+from typing import Any, Callable, Iterator
 
-import openclaw_todo.schema_v1 as _schema_v1  # noqa: F401 — registers migrations
+import openclaw_todo.schemas as _schemas  # noqa: F401 — registers migrations
 from openclaw_todo.cmd_add import add_handler as _add_handler  # noqa: E402
 from openclaw_todo.cmd_board import board_handler as _board_handler  # noqa: E402
+from openclaw_todo.cmd_board import board_records as _board_records  # noqa: E402
+from openclaw_todo.cmd_board import iter_board_lines as _iter_board_lines  # noqa: E402
+from openclaw_todo.cmd_digest import digest_handler as _digest_handler  # noqa: E402
+from openclaw_todo.cmd_digest import digest_records as _digest_records  # noqa: E402
 from openclaw_todo.cmd_done_drop import done_handler as _done_handler  # noqa: E402
 from openclaw_todo.cmd_done_drop import drop_handler as _drop_handler  # noqa: E402
 from openclaw_todo.cmd_edit import edit_handler as _edit_handler  # noqa: E402
+from openclaw_todo.cmd_list import iter_list_lines as _iter_list_lines  # noqa: E402
 from openclaw_todo.cmd_list import list_handler as _list_handler  # noqa: E402
+from openclaw_todo.cmd_list import list_records as _list_records  # noqa: E402
 from openclaw_todo.cmd_move import move_handler as _move_handler  # noqa: E402
 from openclaw_todo.cmd_project_create import create_handler as _project_create_handler  # noqa: E402
 from openclaw_todo.cmd_project_delete import delete_handler as _project_delete_handler  # noqa: E402
 from openclaw_todo.cmd_project_list import project_list_handler as _project_list_handler  # noqa: E402
+from openclaw_todo.cmd_project_list import project_list_records as _project_list_records  # noqa: E402
 from openclaw_todo.cmd_project_rename import rename_handler as _project_rename_handler  # noqa: E402
 from openclaw_todo.cmd_project_set_private import set_private_handler as _set_private_handler  # noqa: E402
 from openclaw_todo.cmd_project_set_shared import set_shared_handler as _set_shared_handler  # noqa: E402
+from openclaw_todo.cmd_search import iter_search_lines as _iter_search_lines  # noqa: E402
+from openclaw_todo.cmd_search import search_handler as _search_handler  # noqa: E402
+from openclaw_todo.cmd_search import search_records as _search_records  # noqa: E402
+from openclaw_todo.cmd_view import view_handler as _view_handler  # noqa: E402
 from openclaw_todo.db import get_connection
+from openclaw_todo.event_logger import collect_events
+from openclaw_todo.group_commit import get_committer
 from openclaw_todo.migrations import migrate
+from openclaw_todo.models import attach_assignees, collect_updated_tasks, fetch_task
 from openclaw_todo.parser import ParsedCommand, ParseError, parse
+from openclaw_todo.sharding import ShardRoutingError, get_router
+from openclaw_todo.task_query import FilterError
+from openclaw_todo.tenants import ConnectionPool
+from openclaw_todo.tracing import annotate, span, trace_request, unwatch, watch
 
 # Type alias for command handler functions.
 HandlerFn = Callable[[ParsedCommand, sqlite3.Connection, dict], str]
 
+# Type alias for line-streaming handlers (same arguments, yields response lines).
+LineHandlerFn = Callable[[ParsedCommand, sqlite3.Connection, dict], Iterator[str]]
+
+# Type alias for structured handlers (same arguments, returns JSON-ready data).
+RecordHandlerFn = Callable[[ParsedCommand, sqlite3.Connection, dict], dict[str, Any]]
+
 logger = logging.getLogger(__name__)
 
 HELP_TEXT = """\
 📖 OpenClaw TODO — Commands
 
-/todo add <title> [@user] [/p project [shared|private]] [/s section] [due:date]
-    Create a new task.
+/todo add <title> [@user] [/p project [shared|private]] [/s section] [due:date] [parent:#id]
+    Create a new task (parent:#id makes it a subtask, in the parent's project).
 
 /todo list [mine|all|@user] [/p project [shared|private]] [/s section] [open|done|drop] [limit:N]
-    List tasks.
+    List tasks. Date filters (list/board/search): overdue, nodue, due:today, due:this-week,
+    due:<date>, due:<Nd|date, due:>Nd|date, closed:Nd|date. parent:#id lists a task's subtasks,
+    parent:- top-level tasks only. Tasks with subtasks show their progress as [done/total].
 
 /todo board [mine|all|@user] [/p project [shared|private]] [open|done|drop] [limitPerSection:N]
     Show kanban board view.
 
+/todo board more <section> [after:#id] [board options]
+    Page through one board section, continuing after task #id.
+
+/todo search <terms> [mine|all|@user] [/p project [shared|private]] [open|done|drop] [limit:N]
+    Search task titles (default scope: all visible tasks), best matches first.
+
+/todo digest [@user]
+    Show overdue, due-today and in-progress (doing) tasks.
+
 /todo move <id> <section>
     Move a task to a section (backlog, doing, waiting, done, drop).
 
@@ -50,8 +85,8 @@ HELP_TEXT = """\
 /todo drop <id>
     Drop (cancel) a task.
 
-/todo edit <id> [title] [@user] [/p project [shared|private]] [/s section] [due:date|due:-]
-    Edit a task. Mentions replace all assignees. due:- clears the date.
+/todo edit <id> [title] [@user] [/p project [shared|private]] [/s section] [due:date|due:-] [parent:#id|parent:-]
+    Edit a task. Mentions replace all assignees. due:- clears the date, parent:- the parent.
 
 /todo project list
     Show all visible projects.
@@ -69,15 +104,26 @@ HELP_TEXT = """\
     Make a project private (owner-only).
 
 /todo project set-shared <name>
-    Make a project shared."""
+    Make a project shared.
+
+/todo view save <name> [list|board] <filter...>
+    Save a list or board filter under a name (compiled once, at save time).
+
+/todo view <name> | /todo view list | /todo view delete <name>
+    Run, list or delete your saved views."""
 
 # Keep short USAGE for backward compatibility (used in "Unknown command" responses)
-USAGE = "Usage: /todo <command> [options]\nCommands: add, list, board, move, done, drop, edit, project, help"
+USAGE = (
+    "Usage: /todo <command> [options]\n"
+    "Commands: add, list, board, search, digest, move, done, drop, edit, project, view, help"
+)
 
 PROJECT_USAGE = "Usage: /todo project <subcommand>\nSubcommands: list, create, delete, rename, set-private, set-shared"
 
 # Valid top-level command names
-_VALID_COMMANDS = frozenset({"add", "list", "board", "move", "done", "drop", "edit", "project", "help"})
+_VALID_COMMANDS = frozenset(
+    {"add", "list", "board", "search", "digest", "move", "done", "drop", "edit", "project", "view", "help"}
+)
 
 # Valid project subcommands
 _VALID_PROJECT_SUBS = frozenset({"list", "create", "delete", "rename", "set-private", "set-shared"})
@@ -85,8 +131,11 @@ _VALID_PROJECT_SUBS = frozenset({"list", "create", "delete", "rename", "set-priv
 
 def _init_db(db_path: str | None = None) -> sqlite3.Connection:
     """Open DB connection and ensure schema is up-to-date."""
-    conn = get_connection(db_path)
-    migrate(conn)
+    with span("connect"):
+        conn = get_connection(db_path)
+    watch(conn)
+    with span("migrate_check"):
+        migrate(conn)
     return conn
 
 
@@ -103,6 +152,8 @@ _handlers: dict[str, HandlerFn] = {
     "done": _done_handler,
     "drop": _drop_handler,
     "board": _board_handler,
+    "search": _search_handler,
+    "digest": _digest_handler,
     "edit": _edit_handler,
     "project_create": _project_create_handler,
     "project_delete": _project_delete_handler,
@@ -110,8 +161,54 @@ _handlers: dict[str, HandlerFn] = {
     "project_rename": _project_rename_handler,
     "project_set_private": _set_private_handler,
     "project_set_shared": _set_shared_handler,
+    "view": _view_handler,
+}
+
+
+# Commands whose output can be large enough to be worth streaming line by line.
+# Anything not listed here is streamed as the lines of its normal response.
+_line_handlers: dict[str, LineHandlerFn] = {
+    "list": _iter_list_lines,
+    "board": _iter_board_lines,
+    "search": _iter_search_lines,
+}
+
+
+# Read commands that can return records straight from their query rows.
+_record_handlers: dict[str, RecordHandlerFn] = {
+    "list": _list_records,
+    "board": _board_records,
+    "search": _search_records,
+    "digest": _digest_records,
+    "project_list": _project_list_records,
 }
 
+# Mutations addressing an existing task by id; JSON responses include its final state.
+_TASK_ID_COMMANDS = frozenset({"move", "done", "drop", "edit"})
+
+# Handler keys of commands that write; with group commit on they run on the writer thread.
+_WRITE_COMMANDS = frozenset(
+    {
+        "add",
+        "move",
+        "done",
+        "drop",
+        "edit",
+        "project_create",
+        "project_rename",
+        "project_delete",
+        "project_set_private",
+        "project_set_shared",
+    }
+)
+
+# Text responses starting with these mean the request was not applied.
+_FAILURE_PREFIXES = ("❌", "⚠️")
+
+
+def _is_failure(response: str) -> bool:
+    return response.startswith(_FAILURE_PREFIXES)
+
 
 def _get_handler(command: str) -> HandlerFn:
     """Look up a handler, falling back to stub."""
@@ -123,37 +220,232 @@ def register_handler(command: str, fn: HandlerFn) -> None:
     _handlers[command] = fn
 
 
-def dispatch(text: str, context: dict, db_path: str | None = None) -> str:
+def _acquire(pool: ConnectionPool) -> sqlite3.Connection:
+    with span("connect"):
+        conn = pool.acquire()
+    watch(conn)
+    return conn
+
+
+def _release(conn: sqlite3.Connection, pool: ConnectionPool | None) -> None:
+    unwatch(conn)
+    if pool is not None:
+        pool.release(conn)
+    else:
+        conn.close()
+
+
+def dispatch(
+    text: str,
+    context: dict,
+    db_path: str | None = None,
+    *,
+    response_format: str = "text",
+    pool: ConnectionPool | None = None,
+) -> str | dict[str, Any]:
     """Parse the remainder text and dispatch to the appropriate handler.
 
     *text* is the message content **after** the ``/todo`` prefix has been
     stripped.  *context* must contain at least ``sender_id``.
+
+    With ``response_format="json"`` the result is the structured dict from
+    :func:`dispatch_records` instead of Slack text.  When *pool* is given
+    (a tenant's :class:`~openclaw_todo.tenants.ConnectionPool`), the
+    connection is borrowed from it and *db_path* is ignored.
     """
+    if response_format == "json":
+        return dispatch_records(text, context, db_path=db_path, pool=pool)
+    with trace_request("dispatch"):
+        return _dispatch(text, context, db_path, pool)
+
+
+def _dispatch(text: str, context: dict, db_path: str | None, pool: ConnectionPool | None) -> str:
     try:
-        parsed = parse(text)
+        with span("parse"):
+            parsed = parse(text)
     except ParseError as exc:
         return f"❌ {exc}"
 
     command = parsed.command
+    annotate(command=command)
 
     if command not in _VALID_COMMANDS:
         logger.info("Unknown command: %s", command)
-        return f'❌ Unknown command "{command}". Available: add, list, board, move, done, drop, edit, project'
+        return (
+            f'❌ Unknown command "{command}". '
+            "Available: add, list, board, search, digest, move, done, drop, edit, project, view"
+        )
 
     if command == "help":
         return HELP_TEXT
 
     logger.info("Dispatching command=%s", command)
 
-    conn = _init_db(db_path)
+    committer = get_committer(db_path) if pool is None and _handler_key(parsed) in _WRITE_COMMANDS else None
+    if committer is not None:
+        with collect_events(), span("handler"):
+            return committer.run(lambda conn: _run_handler(parsed, conn, context), rejected=_is_failure)
+
+    router = get_router(db_path) if pool is None else None
+    if pool is not None:
+        conn = _acquire(pool)
+    elif router is None:
+        conn = _init_db(db_path)
+    else:
+        try:
+            shard = router.route(parsed, context)
+        except ShardRoutingError as exc:
+            return str(exc)
+        if shard is None:
+            with span("fan_out"):
+                return router.fan_out(_handler_key(parsed), parsed, context)
+        with span("connect"):
+            conn = router.connect(shard)
+        watch(conn)
+    try:
+        # Event listeners (e.g. the reminder scheduler) only hear about completed handlers
+        with collect_events(), span("handler"):
+            return _run_handler(parsed, conn, context)
+    finally:
+        _release(conn, pool)
+
+
+def dispatch_lines(
+    text: str, context: dict, db_path: str | None = None, *, pool: ConnectionPool | None = None
+) -> Iterator[str]:
+    """Streaming variant of :func:`dispatch`: yield the response line by line.
+
+    ``list`` and ``board`` render lazily from the database cursor, so a
+    ``limit:5000`` export never materialises the whole response.  The DB
+    connection stays open until the generator is exhausted or closed.
+    """
     try:
-        if command == "project":
-            return _dispatch_project(parsed, conn, context)
+        parsed = parse(text)
+    except ParseError:
+        yield from dispatch(text, context, db_path=db_path, pool=pool).split("\n")
+        return
 
-        handler = _get_handler(command)
-        return handler(parsed, conn, context)
+    line_handler = _line_handlers.get(parsed.command)
+    # Sharded results are merged in memory, so they are split like any other response
+    if line_handler is None or (pool is None and get_router(db_path) is not None):
+        yield from dispatch(text, context, db_path=db_path, pool=pool).split("\n")
+        return
+
+    logger.info("Dispatching command=%s (streaming)", parsed.command)
+
+    conn = _acquire(pool) if pool is not None else _init_db(db_path)
+    try:
+        yield from line_handler(parsed, conn, context)
     finally:
-        conn.close()
+        _release(conn, pool)
+
+
+def dispatch_records(
+    text: str, context: dict, db_path: str | None = None, *, pool: ConnectionPool | None = None
+) -> dict[str, Any]:
+    """Structured variant of :func:`dispatch` for machine consumers.
+
+    Returns ``{"ok": True, "command": ..., "data": {...}}`` for commands with
+    a record handler (``list``, ``board``, ``project list``), built directly
+    from the query rows without any text formatting.  Other commands return
+    their Slack text as ``"text"`` (or ``"error"`` when not applied); for
+    ``move``/``done``/``drop``/``edit`` the task's final state is added as
+    ``data.task``.
+    """
+    with trace_request("dispatch"):
+        return _dispatch_records(text, context, db_path, pool)
+
+
+def _dispatch_records(text: str, context: dict, db_path: str | None, pool: ConnectionPool | None) -> dict[str, Any]:
+    try:
+        with span("parse"):
+            parsed = parse(text)
+    except ParseError as exc:
+        return {"ok": False, "command": None, "error": f"❌ {exc}"}
+
+    command = parsed.command
+    if command not in _VALID_COMMANDS or command == "help":
+        return _text_record(command, dispatch(text, context, db_path=db_path, pool=pool))
+
+    key = _handler_key(parsed)
+    annotate(command=key)
+    logger.info("Dispatching command=%s (records)", key)
+
+    committer = get_committer(db_path) if pool is None and key in _WRITE_COMMANDS else None
+    if committer is not None:
+        with collect_events(), span("handler"):
+            return committer.run(
+                lambda conn: _handler_record(key, parsed, conn, context), rejected=lambda record: not record["ok"]
+            )
+
+    router = get_router(db_path) if pool is None else None
+    if pool is not None:
+        conn = _acquire(pool)
+    elif router is None:
+        conn = _init_db(db_path)
+    else:
+        try:
+            shard = router.route(parsed, context)
+            if shard is None:
+                with span("fan_out"):
+                    return {"ok": True, "command": key, "data": router.fan_out_records(key, parsed, context)}
+        except (ShardRoutingError, FilterError) as exc:
+            return {"ok": False, "command": key, "error": str(exc)}
+        with span("connect"):
+            conn = router.connect(shard)
+        watch(conn)
+    try:
+        record_handler = _record_handlers.get(key)
+        if record_handler is not None:
+            try:
+                with span("handler"):
+                    return {"ok": True, "command": key, "data": record_handler(parsed, conn, context)}
+            except FilterError as exc:
+                return {"ok": False, "command": key, "error": str(exc)}
+
+        with collect_events(), span("handler"):
+            return _handler_record(key, parsed, conn, context)
+    finally:
+        _release(conn, pool)
+
+
+def _run_handler(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> str:
+    if parsed.command == "project":
+        return _dispatch_project(parsed, conn, context)
+    return _get_handler(parsed.command)(parsed, conn, context)
+
+
+def _handler_record(key: str, parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> dict[str, Any]:
+    """Run a text handler and wrap its response; task commands add the task's final state."""
+    with collect_updated_tasks() as updated:
+        response = _run_handler(parsed, conn, context)
+    result = _text_record(key, response)
+
+    if result["ok"] and parsed.command in _TASK_ID_COMMANDS:
+        task_id = int(parsed.args[0])
+        # The handler's UPDATE ... RETURNING row; re-read only for no-op responses.
+        task = updated.get(task_id) or fetch_task(conn, task_id)
+        if task is not None:
+            attach_assignees(conn, [task])
+            result["data"] = {"task": task.as_record()}
+    return result
+
+
+def _handler_key(parsed: ParsedCommand) -> str:
+    """Registry key for *parsed*: the command, or ``project_<sub>`` for project subcommands."""
+    if parsed.command != "project":
+        return parsed.command
+    sub_tokens = parsed.title_tokens or parsed.args
+    if not sub_tokens:
+        return "project"
+    return f"project_{sub_tokens[0].lower().replace('-', '_')}"
+
+
+def _text_record(command: str, response: str) -> dict[str, Any]:
+    """Wrap a Slack text response in the structured envelope."""
+    if _is_failure(response):
+        return {"ok": False, "command": command, "error": response}
+    return {"ok": True, "command": command, "text": response}
 
 
 def _dispatch_project(parsed: ParsedCommand, conn: sqlite3.Connection, context: dict) -> str:
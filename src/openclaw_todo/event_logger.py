@@ -3,7 +3,21 @@
 from __future__ import annotations
 
 import json
+import logging
 import sqlite3
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Listener signature: (action, task_id, payload).
+EventListener = Callable[[str, "int | None", dict], None]
+
+_listeners: list[EventListener] = []
+
+# Events logged inside ``collect_events()``, held back until the block exits cleanly.
+_pending: ContextVar[list[tuple[str, int | None, dict]] | None] = ContextVar("openclaw_todo_pending", default=None)
 
 
 def log_event(
@@ -33,3 +47,47 @@ def log_event(
         "INSERT INTO events (actor_user_id, action, task_id, payload) " "VALUES (?, ?, ?, ?);",
         (actor_user_id, action, task_id, json.dumps(payload)),
     )
+    if _listeners:
+        pending = _pending.get()
+        if pending is None:
+            _publish([(action, task_id, payload)])
+        else:
+            pending.append((action, task_id, payload))
+
+
+def subscribe(listener: EventListener) -> None:
+    """Call *listener* for every event logged from now on."""
+    _listeners.append(listener)
+
+
+def unsubscribe(listener: EventListener) -> None:
+    """Remove a listener added with :func:`subscribe` (no-op if absent)."""
+    try:
+        _listeners.remove(listener)
+    except ValueError:
+        pass
+
+
+@contextmanager
+def collect_events() -> Iterator[None]:
+    """Hold back listener notifications until the block exits without raising.
+
+    The dispatcher wraps each handler in this, so listeners only hear about
+    events from handlers that ran to completion (and therefore committed).
+    """
+    pending: list[tuple[str, int | None, dict]] = []
+    token = _pending.set(pending)
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+    _publish(pending)
+
+
+def _publish(events: list[tuple[str, int | None, dict]]) -> None:
+    for action, task_id, payload in events:
+        for listener in list(_listeners):
+            try:
+                listener(action, task_id, payload)
+            except Exception:
+                logger.exception("Event listener failed for %s", action)
@@ -0,0 +1,235 @@
+"""Group commit for mutating commands in the HTTP server.
+
+By default every mutating handler ends with its own ``conn.commit()``, so
+each Slack message costs one WAL fsync.  With group commit on, the server
+runs mutating commands on a single writer thread instead: the first
+command opens a ``BEGIN IMMEDIATE`` transaction, commands arriving within
+the next ``window`` seconds join it, and the group is committed once.
+Callers are answered only after that commit, so a response still means the
+change is durable.
+
+Each command runs inside its own ``SAVEPOINT``.  The writer's connection is
+a :class:`GroupConnection`, whose ``commit()`` is a no-op and whose
+``rollback()`` rolls back to the command's savepoint, so handlers run
+unchanged and one failed or rolled-back command does not undo its
+neighbours.  Commands run in a copy of the caller's context, so event
+collection, ``collect_updated_tasks`` and tracing see them as if they had
+run on the caller's thread.
+
+A command whose result the caller marks as *rejected* (an error reply)
+has its savepoint rolled back too, as it would be by closing the
+connection without a commit.  If the group itself fails (the commit, or a
+savepoint statement after SQLite rolled the transaction back), it is
+rolled back and every command in it fails with that error.
+
+Group commit serves the single-database layout; it is off with tenant
+routing or sharded storage.  Reads keep using their own connections.
+
+Environment variables
+---------------------
+OPENCLAW_TODO_GROUP_COMMIT_MS  Collect mutating commands for this many milliseconds per commit (default 0: off)
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+import openclaw_todo.schemas as _schemas  # noqa: F401 — registers migrations
+from openclaw_todo.db import get_connection
+from openclaw_todo.migrations import migrate
+from openclaw_todo.tracing import unwatch, watch
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Most commands committed together, however many are waiting.
+MAX_GROUP_SIZE = 64
+
+_SAVEPOINT = "group_commit_request"
+
+# str(db_path) -> running committer
+_committers: dict[str, GroupCommitter] = {}
+_committers_lock = threading.Lock()
+
+
+class GroupConnection(sqlite3.Connection):
+    """Connection whose ``commit``/``rollback`` act on the current command's savepoint during a group."""
+
+    in_group = False
+
+    def commit(self) -> None:
+        if not self.in_group:
+            super().commit()
+
+    def rollback(self) -> None:
+        if not self.in_group:
+            super().rollback()
+            return
+        self.execute(f"ROLLBACK TO {_SAVEPOINT};")
+
+
+# A queued command: the job, its rejected-result predicate and the caller's future
+_Job = tuple[Callable[[GroupConnection], Any], Callable[[Any], bool] | None, Future]
+
+
+class GroupCommitter:
+    """Run submitted write jobs on one connection, committing those that arrive within *window* together."""
+
+    def __init__(
+        self, db_path: str | Path | None, *, window: float = 0.002, max_group_size: int = MAX_GROUP_SIZE
+    ) -> None:
+        self.db_path = db_path
+        self.window = window
+        self.max_group_size = max_group_size
+        self.commits = 0
+        self._queue: queue.SimpleQueue[_Job | None] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, fn: Callable[[GroupConnection], T], *, rejected: Callable[[T], bool] | None = None) -> Future[T]:
+        """Queue ``fn(conn)`` for the next group; the future resolves once the group has committed.
+
+        If ``rejected(result)`` is true, ``fn``'s writes are rolled back
+        before the result is returned.
+        """
+        future: Future[T] = Future()
+        ctx = contextvars.copy_context()
+        self._queue.put((lambda conn: ctx.run(_run_watched, fn, conn), rejected, future))
+        return future
+
+    def run(self, fn: Callable[[GroupConnection], T], *, rejected: Callable[[T], bool] | None = None) -> T:
+        """Run ``fn(conn)`` in the next group and return its result after the commit."""
+        return self.submit(fn, rejected=rejected).result()
+
+    def run_group(self, conn: GroupConnection) -> int:
+        """Wait for a job, run it and everything arriving within the window, commit; return the group size.
+
+        Returns 0 when the committer was stopped instead.
+        """
+        job = self._queue.get()
+        if job is None:
+            return 0
+        futures: list[Future] = [job[2]]
+        results: list[tuple[Any, Exception | None]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE;")
+            conn.in_group = True
+            try:
+                deadline = time.monotonic() + self.window
+                while True:
+                    results.append(self._run_job(conn, job[0], job[1]))
+                    if len(futures) >= self.max_group_size:
+                        break
+                    try:
+                        job = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                    except queue.Empty:
+                        break
+                    if job is None:
+                        self._queue.put(None)  # stop after this group
+                        break
+                    futures.append(job[2])
+            finally:
+                conn.in_group = False
+            conn.commit()
+        except Exception as exc:
+            logger.exception("Group commit of %d command(s) failed", len(futures))
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                logger.exception("Rolling back the failed group failed")
+            for future in futures:
+                future.set_exception(exc)
+            return len(futures)
+        self.commits += 1
+        for future, (result, exc) in zip(futures, results):
+            if exc is None:
+                future.set_result(result)
+            else:
+                future.set_exception(exc)
+        logger.debug("Group commit: %d command(s)", len(futures))
+        return len(futures)
+
+    @staticmethod
+    def _run_job(
+        conn: GroupConnection, fn: Callable[[GroupConnection], Any], rejected: Callable[[Any], bool] | None
+    ) -> tuple[Any, Exception | None]:
+        conn.execute(f"SAVEPOINT {_SAVEPOINT};")
+        try:
+            result = fn(conn)
+        except Exception as exc:
+            conn.execute(f"ROLLBACK TO {_SAVEPOINT};")
+            conn.execute(f"RELEASE {_SAVEPOINT};")
+            return None, exc
+        if rejected is not None and rejected(result):
+            conn.execute(f"ROLLBACK TO {_SAVEPOINT};")
+        conn.execute(f"RELEASE {_SAVEPOINT};")
+        return result, None
+
+    # --- Writer thread ---
+
+    def start(self) -> None:
+        """Open and migrate the writer connection, start the writer thread and route *db_path*'s writes to it."""
+        conn = get_connection(self.db_path, check_same_thread=False, factory=GroupConnection)
+        try:
+            migrate(conn)
+        except Exception:
+            conn.close()
+            raise
+        self._thread = threading.Thread(target=self._run, args=(conn,), name="openclaw-todo-writer", daemon=True)
+        self._thread.start()
+        with _committers_lock:
+            _committers[str(self.db_path)] = self
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Stop routing writes here, finish the queued jobs and stop the writer thread."""
+        with _committers_lock:
+            if _committers.get(str(self.db_path)) is self:
+                del _committers[str(self.db_path)]
+        self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self, conn: GroupConnection) -> None:
+        try:
+            while self.run_group(conn):
+                pass
+        finally:
+            conn.close()
+
+
+def _run_watched(fn: Callable[[GroupConnection], T], conn: GroupConnection) -> T:
+    watch(conn)
+    try:
+        return fn(conn)
+    finally:
+        unwatch(conn)
+
+
+def get_committer(db_path: str | Path | None) -> GroupCommitter | None:
+    """Return the running committer for *db_path*, or ``None`` when group commit is off."""
+    if not _committers:
+        return None
+    with _committers_lock:
+        return _committers.get(str(db_path))
+
+
+def group_commit_from_env(db_path: str | Path | None) -> GroupCommitter | None:
+    """Build a committer from ``OPENCLAW_TODO_GROUP_COMMIT_MS``, or ``None`` if group commit is off."""
+    try:
+        window_ms = float(os.environ.get("OPENCLAW_TODO_GROUP_COMMIT_MS", "0"))
+    except ValueError:
+        logger.warning("Invalid OPENCLAW_TODO_GROUP_COMMIT_MS, group commit disabled")
+        return None
+    if window_ms <= 0:
+        return None
+    return GroupCommitter(db_path, window=window_ms / 1000)
@@ -0,0 +1,399 @@
+"""Load generator and soak-test harness for ``openclaw-todo-server``.
+
+Replays a realistic mix of ``/todo`` commands against ``POST /message`` from
+N concurrent clients and prints one report line per interval: throughput,
+latency percentiles, error and ``database is locked`` rates and, when the
+database path / server PID are given, the ``-wal`` file size and server RSS,
+so long runs show WAL growth or memory leaks.
+
+Writes (``add``, ``move``, ``done``, ``edit``) make up ``--write-ratio`` of
+the traffic; reads are ``list``, ``board``, ``search`` and ``digest``.
+Users are picked uniformly from ``--users``; projects follow a Zipf-like
+distribution over ``--projects`` (``--skew`` 0 is uniform), so a few hot
+projects see most of the traffic.
+
+Usage::
+
+    python -m openclaw_todo.loadgen --clients 8 --duration 3600 --interval 30 \\
+        --db-path ~/.openclaw/workspace/.todo/todo.sqlite3 --server-pid 1234
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import itertools
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, TextIO
+
+DEFAULT_URL = "http://127.0.0.1:8200"
+
+READ_COMMANDS = ("list", "list all", "board", "search", "digest", "list /p")
+WRITE_COMMANDS = ("add", "add", "move", "done", "edit")
+
+_SECTIONS = ("backlog", "doing", "waiting")
+_WORDS = ("invoice", "deploy", "review", "report", "budget", "hiring", "design", "release", "bug", "docs")
+_ADDED_RE = re.compile(r"Added #(\d+)")
+
+# Latency histogram buckets: log-spaced 2% apart from 50 µs up to ~2 minutes.
+_BUCKET_BASE = 50e-6
+_BUCKET_RATIO = 1.02
+_BUCKET_BOUNDS = [_BUCKET_BASE * _BUCKET_RATIO**i for i in range(750)]
+
+
+class LatencyHistogram:
+    """Fixed-memory latency histogram (percentiles accurate to ~2%)."""
+
+    __slots__ = ("counts", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.total = 0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(_BUCKET_BOUNDS, seconds)] += 1
+        self.total += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: LatencyHistogram) -> None:
+        for i, n in enumerate(other.counts):
+            if n:
+                self.counts[i] += n
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the *pct*-th percentile, in seconds (0 when empty)."""
+        if not self.total:
+            return 0.0
+        rank = max(math.ceil(self.total * pct / 100), 1)
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(_BUCKET_BOUNDS[i] if i < len(_BUCKET_BOUNDS) else self.max, self.max)
+        return self.max
+
+
+@dataclass
+class Window:
+    """Counters for one reporting interval (or the whole run)."""
+
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    requests: int = 0
+    errors: int = 0  # transport errors and non-200 responses
+    locked: int = 0  # "database is locked" failures (a subset of errors)
+    rejected: int = 0  # 200 responses carrying a ❌ / ⚠️ command error
+    by_command: dict[str, int] = field(default_factory=dict)
+
+    def merge(self, other: Window) -> None:
+        self.latency.merge(other.latency)
+        self.requests += other.requests
+        self.errors += other.errors
+        self.locked += other.locked
+        self.rejected += other.rejected
+        for command, n in other.by_command.items():
+            self.by_command[command] = self.by_command.get(command, 0) + n
+
+
+@dataclass
+class Workload:
+    """Command-mix parameters."""
+
+    write_ratio: float = 0.2
+    users: int = 50
+    projects: int = 10
+    skew: float = 1.1
+
+
+class CommandMix:
+    """Generate ``/todo`` messages for one client; tracks task IDs it created."""
+
+    def __init__(self, workload: Workload, rng: random.Random) -> None:
+        self.workload = workload
+        self.rng = rng
+        weights = [1 / (rank**workload.skew) for rank in range(1, workload.projects + 1)]
+        self._project_cdf = list(itertools.accumulate(weights))
+        self.task_ids: list[int] = []
+
+    def project(self) -> str:
+        i = bisect.bisect_left(self._project_cdf, self.rng.random() * self._project_cdf[-1])
+        return f"Load{i}"
+
+    def _due(self, min_days: int) -> str:
+        return (date.today() + timedelta(days=self.rng.randint(min_days, 30))).isoformat()
+
+    def user(self) -> str:
+        return f"ULOAD{self.rng.randrange(self.workload.users):04d}"
+
+    def next(self) -> tuple[str, str, str]:
+        """Return ``(command kind, message text, sender_id)``."""
+        rng = self.rng
+        sender = self.user()
+        if rng.random() < self.workload.write_ratio:
+            kind = rng.choice(WRITE_COMMANDS)
+            if kind != "add" and not self.task_ids:
+                kind = "add"
+        else:
+            kind = rng.choice(READ_COMMANDS)
+
+        if kind == "add":
+            title = " ".join(rng.sample(_WORDS, 3))
+            due = f" due:{self._due(0)}" if rng.random() < 0.5 else ""
+            return kind, f"/todo add {title} <@{self.user()}> /p {self.project()}{due}", sender
+        if kind == "move":
+            return kind, f"/todo move {rng.choice(self.task_ids)} /s {rng.choice(_SECTIONS)}", sender
+        if kind == "done":
+            task_id = self.task_ids.pop(rng.randrange(len(self.task_ids)))
+            return kind, f"/todo done {task_id}", sender
+        if kind == "edit":
+            return kind, f"/todo edit {rng.choice(self.task_ids)} due:{self._due(1)}", sender
+        if kind == "search":
+            return kind, f"/todo search {rng.choice(_WORDS)}", sender
+        if kind == "list /p":
+            return kind, f"/todo list all /p {self.project()}", sender
+        return kind, f"/todo {kind}", sender
+
+    def observe(self, kind: str, response: Any) -> None:
+        """Remember task IDs created by ``add`` so later writes can target them."""
+        if kind == "add" and isinstance(response, str):
+            match = _ADDED_RE.search(response)
+            if match and len(self.task_ids) < 10_000:
+                self.task_ids.append(int(match.group(1)))
+
+
+def send(url: str, text: str, sender_id: str, timeout: float, tenant_id: str | None = None) -> tuple[int, Any]:
+    """POST one message; return ``(HTTP status, decoded body)`` (status 0 for transport errors)."""
+    body: dict[str, Any] = {"text": text, "sender_id": sender_id}
+    if tenant_id is not None:
+        body["tenant_id"] = tenant_id
+    req = urllib.request.Request(
+        f"{url}/message",
+        data=json.dumps(body).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as exc:
+        try:
+            return exc.code, json.loads(exc.read())
+        except ValueError:
+            return exc.code, None
+    except (OSError, ValueError) as exc:
+        return 0, {"error": str(exc)}
+
+
+class LoadGenerator:
+    """Run *clients* worker threads against *url* and collect per-interval windows."""
+
+    def __init__(
+        self,
+        url: str,
+        workload: Workload,
+        *,
+        clients: int = 4,
+        timeout: float = 10.0,
+        tenants: int = 0,
+        seed: int | None = None,
+        sender: Callable[..., tuple[int, Any]] = send,
+    ) -> None:
+        self.url = url.rstrip("/")
+        self.workload = workload
+        self.clients = clients
+        self.timeout = timeout
+        self.tenants = tenants
+        self.seed = seed
+        self._send = sender
+        self._lock = threading.Lock()
+        self._window = Window()
+        self.total = Window()
+        self._stop = threading.Event()
+
+    def _record(self, kind: str, latency: float, status: int, body: Any) -> None:
+        error = body.get("error") if isinstance(body, dict) else None
+        response = body.get("response") if isinstance(body, dict) else None
+        with self._lock:
+            w = self._window
+            w.requests += 1
+            w.latency.add(latency)
+            w.by_command[kind] = w.by_command.get(kind, 0) + 1
+            if status != 200:
+                w.errors += 1
+                if error and "locked" in str(error):
+                    w.locked += 1
+            elif isinstance(response, str) and response.startswith(("❌", "⚠️")):
+                w.rejected += 1
+
+    def _worker(self, index: int, deadline: float) -> None:
+        rng = random.Random(None if self.seed is None else self.seed + index)
+        mix = CommandMix(self.workload, rng)
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            kind, text, sender = mix.next()
+            tenant = f"TLOAD{rng.randrange(self.tenants):03d}" if self.tenants else None
+            started = time.perf_counter()
+            status, body = self._send(self.url, text, sender, self.timeout, tenant)
+            self._record(kind, time.perf_counter() - started, status, body)
+            if status == 200 and isinstance(body, dict):
+                mix.observe(kind, body.get("response"))
+
+    def take_window(self) -> Window:
+        """Return the counters since the last call and start a new interval."""
+        with self._lock:
+            window, self._window = self._window, Window()
+        self.total.merge(window)
+        return window
+
+    def run(self, duration: float, interval: float, report: Callable[[float, Window], None]) -> Window:
+        """Generate load for *duration* seconds, calling *report* every *interval*; return the totals."""
+        start = time.monotonic()
+        deadline = start + duration
+        threads = [
+            threading.Thread(target=self._worker, args=(i, deadline), name=f"loadgen-{i}", daemon=True)
+            for i in range(self.clients)
+        ]
+        for t in threads:
+            t.start()
+        next_report = start + interval
+        try:
+            while any(t.is_alive() for t in threads):
+                self._stop.wait(max(min(next_report, deadline) - time.monotonic(), 0.01))
+                now = time.monotonic()
+                if now >= next_report:
+                    report(now - start, self.take_window())
+                    next_report += interval
+        except KeyboardInterrupt:
+            self._stop.set()
+        for t in threads:
+            t.join()
+        remaining = self.take_window()
+        if remaining.requests:
+            report(time.monotonic() - start, remaining)
+        return self.total
+
+
+def wal_size(db_path: str | Path | None) -> int | None:
+    """Size in bytes of *db_path*'s ``-wal`` file (0 if absent), or ``None`` without a path."""
+    if db_path is None:
+        return None
+    try:
+        return os.path.getsize(f"{db_path}-wal")
+    except OSError:
+        return 0
+
+
+def rss_bytes(pid: int | None) -> int | None:
+    """Resident set size of *pid* from ``/proc`` (Linux), or ``None`` if unavailable."""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def summarize(elapsed: float, window: Window, seconds: float, *, wal: int | None, rss: int | None) -> dict[str, Any]:
+    """JSON-ready report for one window covering *seconds*."""
+    lat = window.latency
+    requests = window.requests or 1
+    return {
+        "t": round(elapsed, 1),
+        "requests": window.requests,
+        "rps": round(window.requests / seconds, 1) if seconds > 0 else 0.0,
+        "p50_ms": round(lat.percentile(50) * 1000, 2),
+        "p95_ms": round(lat.percentile(95) * 1000, 2),
+        "p99_ms": round(lat.percentile(99) * 1000, 2),
+        "max_ms": round(lat.max * 1000, 2),
+        "error_rate": round(window.errors / requests, 4),
+        "locked_rate": round(window.locked / requests, 4),
+        "rejected_rate": round(window.rejected / requests, 4),
+        "wal_bytes": wal,
+        "rss_bytes": rss,
+    }
+
+
+def format_report(row: dict[str, Any]) -> str:
+    """One human-readable report line."""
+    parts = [
+        f"t={row['t']:>7.1f}s",
+        f"req={row['requests']:>6}",
+        f"rps={row['rps']:>7.1f}",
+        f"p50={row['p50_ms']:.1f}ms",
+        f"p95={row['p95_ms']:.1f}ms",
+        f"p99={row['p99_ms']:.1f}ms",
+        f"max={row['max_ms']:.1f}ms",
+        f"err={row['error_rate']:.2%}",
+        f"locked={row['locked_rate']:.2%}",
+    ]
+    if row["wal_bytes"] is not None:
+        parts.append(f"wal={row['wal_bytes'] / 1e6:.2f}MB")
+    if row["rss_bytes"] is not None:
+        parts.append(f"rss={row['rss_bytes'] / 1e6:.1f}MB")
+    return "  ".join(parts)
+
+
+def main(argv: list[str] | None = None, out: TextIO = sys.stdout) -> int:
+    ap = argparse.ArgumentParser(prog="python -m openclaw_todo.loadgen", description=__doc__.splitlines()[0])
+    ap.add_argument("--url", default=os.environ.get("OPENCLAW_TODO_URL", DEFAULT_URL))
+    ap.add_argument("--clients", type=int, default=4, help="concurrent clients")
+    ap.add_argument("--duration", type=float, default=60.0, help="seconds to run")
+    ap.add_argument("--interval", type=float, default=10.0, help="seconds between report lines")
+    ap.add_argument("--write-ratio", type=float, default=0.2, help="fraction of requests that write")
+    ap.add_argument("--users", type=int, default=50)
+    ap.add_argument("--projects", type=int, default=10)
+    ap.add_argument("--skew", type=float, default=1.1, help="Zipf exponent for project popularity (0 = uniform)")
+    ap.add_argument("--tenants", type=int, default=0, help="spread requests over N tenant_ids (tenant routing)")
+    ap.add_argument("--timeout", type=float, default=10.0, help="per-request timeout in seconds")
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--db-path", default=None, help="server database path, to report WAL size")
+    ap.add_argument("--server-pid", type=int, default=None, help="server PID, to report RSS (Linux)")
+    ap.add_argument("--json", action="store_true", help="emit JSON lines instead of text")
+    opts = ap.parse_args(argv)
+
+    if not 0 <= opts.write_ratio <= 1 or opts.clients < 1 or opts.users < 1 or opts.projects < 1:
+        ap.error("--write-ratio must be within 0..1; --clients, --users and --projects must be >= 1")
+
+    workload = Workload(write_ratio=opts.write_ratio, users=opts.users, projects=opts.projects, skew=opts.skew)
+    gen = LoadGenerator(
+        opts.url, workload, clients=opts.clients, timeout=opts.timeout, tenants=opts.tenants, seed=opts.seed
+    )
+    last = 0.0
+
+    def report(elapsed: float, window: Window) -> None:
+        nonlocal last
+        row = summarize(elapsed, window, elapsed - last, wal=wal_size(opts.db_path), rss=rss_bytes(opts.server_pid))
+        last = elapsed
+        print(json.dumps(row) if opts.json else format_report(row), file=out, flush=True)
+
+    total = gen.run(opts.duration, opts.interval, report)
+    summary = summarize(last, total, last, wal=wal_size(opts.db_path), rss=rss_bytes(opts.server_pid))
+    summary["by_command"] = dict(sorted(total.by_command.items()))
+    if opts.json:
+        print(json.dumps({"summary": summary}), file=out)
+    else:
+        print("total  " + format_report(summary), file=out)
+        print("mix    " + "  ".join(f"{k}={v}" for k, v in summary["by_command"].items()), file=out)
+    return 1 if total.requests and total.errors == total.requests else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,9 +1,26 @@
-"""Sequential schema migration runner for the OpenClaw TODO plugin."""
+"""Sequential schema migration runner for the OpenClaw TODO plugin.
+
+:func:`migrate` runs on every request, so once a database file has been
+verified at the latest version the result is cached per file, keyed by its
+device/inode and validated against SQLite's schema cookie
+(``PRAGMA schema_version``, bumped by every DDL statement, including those
+run by another process).  A steady-state call is then two pragmas and a
+``stat`` — no ``CREATE TABLE IF NOT EXISTS`` or version-table read.
+
+Data migrations that rewrite many rows can be registered as a
+:class:`BatchedMigration`: the runner calls its batch function repeatedly,
+each batch in its own short transaction, and persists the batch cursor in
+``migration_progress`` so an interrupted migration resumes where it stopped
+instead of starting over.  Other connections can write between batches.
+"""
 
 from __future__ import annotations
 
 import logging
+import os
 import sqlite3
+import threading
+from dataclasses import dataclass
 from typing import Callable
 
 logger = logging.getLogger(__name__)
@@ -11,9 +28,20 @@ logger = logging.getLogger(__name__)
 # Type alias for a migration callable: receives a connection, performs DDL/DML.
 MigrationFn = Callable[[sqlite3.Connection], None]
 
+# Type alias for one batch of a batched migration: receives a connection, the
+# cursor returned by the previous batch (``None`` for the first) and the batch
+# size; returns the new cursor, or ``None`` once no rows are left.
+BatchFn = Callable[[sqlite3.Connection, "int | None", int], "int | None"]
+
+DEFAULT_BATCH_SIZE = 500
+
 # Ordered list of migrations. Index 0 = migration to go from version 0 → 1, etc.
 _migrations: list[MigrationFn] = []
 
+# (path, st_dev, st_ino) -> (schema cookie, version) of files verified up to date
+_verified: dict[tuple[str, int, int], tuple[int, int]] = {}
+_verified_lock = threading.Lock()
+
 
 def register(fn: MigrationFn) -> MigrationFn:
     """Decorator to register a migration function."""
@@ -21,40 +49,143 @@ def register(fn: MigrationFn) -> MigrationFn:
     return fn
 
 
-def _ensure_version_table(conn: sqlite3.Connection) -> None:
-    """Create ``schema_version`` table with version=0 if it does not exist."""
+@dataclass(slots=True)
+class BatchedMigration:
+    """A migration whose work is done in resumable batches (see :func:`run_batches`)."""
+
+    name: str
+    batch: BatchFn
+    batch_size: int = DEFAULT_BATCH_SIZE
+
+    def __call__(self, conn: sqlite3.Connection) -> None:
+        run_batches(conn, self)
+
+
+def register_batched(name: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Callable[[BatchFn], BatchFn]:
+    """Decorator to register a batch function as a :class:`BatchedMigration` called *name*."""
+
+    def decorator(fn: BatchFn) -> BatchFn:
+        register(BatchedMigration(name, fn, batch_size))
+        return fn
+
+    return decorator
+
+
+def _ensure_version_table(conn: sqlite3.Connection) -> int:
+    """Create ``schema_version`` table with version=0 if it does not exist; return the version."""
     conn.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL);")
     row = conn.execute("SELECT version FROM schema_version;").fetchone()
     if row is None:
-        conn.execute("INSERT INTO schema_version (version) VALUES (0);")
+        # One statement, so two connections creating the table cannot both insert a row
+        conn.execute("INSERT INTO schema_version (version) SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM schema_version);")
         conn.commit()
+        row = conn.execute("SELECT version FROM schema_version;").fetchone()
+    return row[0]
 
 
 def get_version(conn: sqlite3.Connection) -> int:
     """Return the current schema version."""
-    _ensure_version_table(conn)
-    row = conn.execute("SELECT version FROM schema_version;").fetchone()
-    return row[0]
+    return _ensure_version_table(conn)
+
+
+def _ensure_progress_table(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS migration_progress (
+            name        TEXT PRIMARY KEY,
+            cursor      INTEGER,
+            done        INTEGER NOT NULL DEFAULT 0,
+            updated_at  TEXT NOT NULL DEFAULT (datetime('now'))
+        );
+    """)
+
+
+def batch_progress(conn: sqlite3.Connection, name: str) -> tuple[int | None, bool]:
+    """Return ``(cursor, done)`` for the batched migration *name* (``(None, False)`` if not started)."""
+    _ensure_progress_table(conn)
+    row = conn.execute("SELECT cursor, done FROM migration_progress WHERE name = ?;", (name,)).fetchone()
+    if row is None:
+        return None, False
+    return row[0], bool(row[1])
+
+
+def run_batches(conn: sqlite3.Connection, migration: BatchedMigration, max_batches: int | None = None) -> bool:
+    """Run *migration*'s batches from its saved cursor; return ``True`` once it is complete.
+
+    Each batch and its cursor update commit together, so a crash loses at
+    most the batch in flight.  With *max_batches*, stop after that many
+    batches even if rows remain.
+    """
+    cursor, done = batch_progress(conn, migration.name)
+    conn.commit()
+    batches = 0
+    while not done:
+        if max_batches is not None and batches >= max_batches:
+            return False
+        try:
+            cursor = migration.batch(conn, cursor, migration.batch_size)
+            done = cursor is None
+            conn.execute(
+                "INSERT INTO migration_progress (name, cursor, done) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET cursor = excluded.cursor, done = excluded.done, "
+                "updated_at = datetime('now');",
+                (migration.name, cursor, int(done)),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        batches += 1
+        logger.debug("Batched migration %s: batch %d done, cursor=%s", migration.name, batches, cursor)
+    return True
+
+
+def file_key(conn: sqlite3.Connection) -> tuple[str, int, int] | None:
+    """Identify the main database file of *conn*; ``None`` for in-memory/temporary databases."""
+    path = conn.execute("PRAGMA database_list;").fetchone()[2]
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return path, st.st_dev, st.st_ino
+
+
+def _schema_cookie(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA schema_version;").fetchone()[0]
 
 
 def migrate(conn: sqlite3.Connection) -> int:
     """Apply all outstanding migrations and return the final version.
 
-    Each migration runs inside a transaction.  On failure the transaction
+    Each migration runs inside a ``BEGIN IMMEDIATE`` transaction (a
+    :class:`BatchedMigration` in one transaction per batch) that re-reads
+    the version under the write lock, so connections migrating the same
+    file at once apply each step exactly once.  On failure the transaction
     is rolled back and a ``RuntimeError`` is raised with a clear message.
     """
-    _ensure_version_table(conn)
-    current = get_version(conn)
     target = len(_migrations)
+    key = file_key(conn)
+    if key is not None and _verified.get(key) == (_schema_cookie(conn), target):
+        return target
+
+    current = _ensure_version_table(conn)
 
     if current >= target:
         logger.debug("Schema up-to-date at version %d", current)
+        _remember(conn, key, current, target)
         return current
 
-    for idx in range(current, target):
-        version_to_apply = idx + 1
-        migration_fn = _migrations[idx]
-        logger.info("Migrating from version %d to %d", idx, version_to_apply)
+    while current < target:
+        conn.execute("BEGIN IMMEDIATE;")
+        # Another connection may have migrated while this one waited for the lock
+        current = conn.execute("SELECT version FROM schema_version;").fetchone()[0]
+        if current >= target:
+            conn.commit()
+            break
+        version_to_apply = current + 1
+        migration_fn = _migrations[current]
+        logger.info("Migrating from version %d to %d", current, version_to_apply)
         try:
             migration_fn(conn)
             conn.execute("UPDATE schema_version SET version = ?;", (version_to_apply,))
@@ -62,7 +193,16 @@ def migrate(conn: sqlite3.Connection) -> int:
         except Exception as exc:
             conn.rollback()
             raise RuntimeError(f"Migration to version {version_to_apply} failed: {exc}") from exc
+        current = version_to_apply
 
     final = get_version(conn)
     logger.info("Migrations complete. Schema at version %d", final)
+    _remember(conn, key, final, target)
     return final
+
+
+def _remember(conn: sqlite3.Connection, key: tuple[str, int, int] | None, version: int, target: int) -> None:
+    if key is None or version != target:
+        return
+    with _verified_lock:
+        _verified[key] = (_schema_cookie(conn), version)
@@ -0,0 +1,285 @@
+"""Slotted row models shared by the command handlers.
+
+Queries select a fixed column list (``PROJECT_COLUMNS`` / ``TASK_COLUMNS``)
+and install the matching row factory on their cursor, so every handler gets
+the same typed objects instead of ad-hoc tuples.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+_intern = sys.intern
+
+# Rows fetched (and assignee-batched) per round trip when streaming results.
+FETCH_BATCH = 200
+
+# SQLite's historical default for SQLITE_MAX_VARIABLE_NUMBER is 999.
+IN_CHUNK = 500
+
+PROJECT_COLUMNS = "id, name, visibility, owner_user_id"
+
+# Assumes ``tasks`` is aliased as ``t`` and joined to ``projects`` as ``p``.
+TASK_COLUMNS = (
+    "t.id, t.title, t.project_id, p.name, t.section, t.due, t.status, t.created_by, t.assignees_csv, "
+    "t.parent_id, t.children_done, t.children_total"
+)
+
+# ``TASK_COLUMNS`` for ``UPDATE tasks ... RETURNING``, which cannot join (the
+# project name comes from a scalar subquery instead).
+RETURNING_COLUMNS = (
+    "id, title, project_id, (SELECT name FROM projects WHERE id = tasks.project_id), "
+    "section, due, status, created_by, assignees_csv, parent_id, children_done, children_total"
+)
+
+# ``RETURNING`` needs SQLite 3.35; older libraries re-read the row instead.
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Final state of tasks changed by handlers inside ``collect_updated_tasks()``.
+_updated: ContextVar[dict[int, TaskRow] | None] = ContextVar("openclaw_todo_updated", default=None)
+
+
+@dataclass(frozen=True, slots=True)
+class Project:
+    """Represents a resolved project row."""
+
+    id: int
+    name: str
+    visibility: str  # 'shared' | 'private'
+    owner_user_id: str | None
+
+
+@dataclass(slots=True)
+class TaskRow:
+    """A task joined with its project name.
+
+    ``assignees`` comes from the row's cached ``assignees_csv`` (schema V6)
+    as a tuple shared by every row with the same assignees; it is ``None``
+    for rows not cached yet, which :func:`attach_assignees` fills after the
+    fact.  Not frozen for that reason; treat the other
+    fields as read-only.  ``children_done`` / ``children_total`` are the
+    trigger-maintained progress of the task's subtasks (schema V9).
+    """
+
+    id: int
+    title: str
+    project_id: int
+    project_name: str
+    section: str
+    due: str | None
+    status: str
+    created_by: str
+    assignees: tuple[str, ...] | None = ()
+    parent_id: int | None = None
+    children_done: int = 0
+    children_total: int = 0
+
+    @property
+    def assignee_mentions(self) -> str:
+        """Comma-separated ``<@UID>`` string for the task's assignees."""
+        return ", ".join(f"<@{uid}>" for uid in self.assignees or ())
+
+    @property
+    def display_title(self) -> str:
+        """The title, followed by ``[done/total]`` subtask progress when the task has subtasks."""
+        if not self.children_total:
+            return self.title
+        return f"{self.title} [{self.children_done}/{self.children_total}]"
+
+    def as_record(self) -> dict[str, Any]:
+        """JSON-ready dict for structured responses."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "project_id": self.project_id,
+            "project": self.project_name,
+            "section": self.section,
+            "due": self.due,
+            "status": self.status,
+            "created_by": self.created_by,
+            "assignees": None if self.assignees is None else list(self.assignees),
+            "parent_id": self.parent_id,
+            "children_done": self.children_done,
+            "children_total": self.children_total,
+        }
+
+
+@dataclass(slots=True)
+class AssigneeRow:
+    """A ``task_assignees`` row (not frozen: frozen init is ~4x slower in bulk)."""
+
+    task_id: int
+    user_id: str
+
+
+def project_row(cursor: sqlite3.Cursor, row: tuple) -> Project:
+    """Row factory for queries selecting ``PROJECT_COLUMNS``."""
+    return Project(*row)
+
+
+@lru_cache(maxsize=1024)
+def _assignees(csv: str) -> tuple[str, ...]:
+    """Shared, interned assignee tuple for one ``assignees_csv`` value."""
+    return tuple(_intern(uid) for uid in csv.split(",")) if csv else ()
+
+
+def task_row(cursor: sqlite3.Cursor, row: tuple) -> TaskRow:
+    """Row factory for queries selecting ``TASK_COLUMNS``.
+
+    Low-cardinality values are shared so a large result set holds one object
+    per project name, section, due date, status, creator and assignee set.
+    """
+    (
+        task_id,
+        title,
+        project_id,
+        project_name,
+        section,
+        due,
+        status,
+        created_by,
+        assignees_csv,
+        parent_id,
+        children_done,
+        children_total,
+    ) = row
+    return TaskRow(
+        task_id,
+        title,
+        project_id,
+        _intern(project_name),
+        _intern(section),
+        _intern(due) if due else due,
+        _intern(status),
+        _intern(created_by),
+        None if assignees_csv is None else _assignees(assignees_csv),
+        parent_id,
+        children_done,
+        children_total,
+    )
+
+
+def assignee_row(cursor: sqlite3.Cursor, row: tuple) -> AssigneeRow:
+    """Row factory for ``SELECT task_id, assignee_user_id`` queries."""
+    return AssigneeRow(*row)
+
+
+def query(
+    conn: sqlite3.Connection,
+    factory: Callable[[sqlite3.Cursor, tuple], Any],
+    sql: str,
+    params: Sequence[Any] = (),
+) -> sqlite3.Cursor:
+    """Execute *sql* on a fresh cursor whose rows are built by *factory*."""
+    cursor = conn.cursor()
+    cursor.row_factory = factory
+    return cursor.execute(sql, params)
+
+
+def fetch_task(conn: sqlite3.Connection, task_id: int) -> TaskRow | None:
+    """Return the task with *task_id* (joined with its project), or ``None``."""
+    return query(
+        conn,
+        task_row,
+        f"SELECT {TASK_COLUMNS} FROM tasks t JOIN projects p ON t.project_id = p.id WHERE t.id = ?;",
+        (task_id,),
+    ).fetchone()
+
+
+def fetch_assignees(conn: sqlite3.Connection, task_ids: Iterable[int]) -> dict[int, list[str]]:
+    """Return ``{task_id: [assignee, ...]}`` for *task_ids* in batched queries.
+
+    Assignees are ordered by user ID, matching the primary-key order used by
+    the single-task lookups.
+    """
+    ids = list(task_ids)
+    result: dict[int, list[str]] = {tid: [] for tid in ids}
+    for start in range(0, len(ids), IN_CHUNK):
+        chunk = ids[start : start + IN_CHUNK]
+        placeholders = ", ".join("?" * len(chunk))
+        for row in query(
+            conn,
+            assignee_row,
+            "SELECT task_id, assignee_user_id FROM task_assignees "
+            f"WHERE task_id IN ({placeholders}) ORDER BY task_id, assignee_user_id;",
+            chunk,
+        ):
+            result[row.task_id].append(row.user_id)
+    return result
+
+
+def attach_assignees(conn: sqlite3.Connection, rows: Sequence[TaskRow]) -> None:
+    """Fill ``assignees`` on rows whose ``assignees_csv`` is not cached yet, with one batched lookup.
+
+    Once the ``tasks.assignees_csv`` backfill has run, every row arrives
+    with its assignees and this issues no query at all.
+    """
+    missing = [r for r in rows if r.assignees is None]
+    if not missing:
+        return
+    by_task = fetch_assignees(conn, (r.id for r in missing))
+    for r in missing:
+        r.assignees = tuple(by_task[r.id])
+
+
+def update_task(
+    conn: sqlite3.Connection,
+    task_id: int,
+    assignments: str,
+    params: Sequence[Any] = (),
+    *,
+    expected_version: int | None = None,
+    returning: bool | None = None,
+) -> TaskRow | None:
+    """Run ``UPDATE tasks SET {assignments} WHERE id = ?`` and return the updated row.
+
+    Every update increments ``tasks.version`` (schema V7).  With
+    *expected_version* the update is a compare-and-swap: it only applies if
+    the row still has that version, and ``None`` is returned otherwise (as
+    for a missing task).
+
+    Uses ``UPDATE ... RETURNING`` so the caller needs no follow-up SELECT;
+    without ``RETURNING`` support (or with *returning* false) the row is
+    re-read with :func:`fetch_task`.  The row is also recorded for
+    :func:`collect_updated_tasks`.
+    """
+    if returning is None:
+        returning = HAS_RETURNING
+    sql = f"UPDATE tasks SET {assignments}, version = version + 1 WHERE id = ?"
+    args = [*params, task_id]
+    if expected_version is not None:
+        sql += " AND version = ?"
+        args.append(expected_version)
+    if returning:
+        # fetchall: the statement must run to completion before the commit
+        rows = query(conn, task_row, f"{sql} RETURNING {RETURNING_COLUMNS};", args).fetchall()
+        row = rows[0] if rows else None
+    else:
+        cursor = conn.execute(f"{sql};", args)
+        row = fetch_task(conn, task_id) if cursor.rowcount else None
+    if row is not None:
+        updated = _updated.get()
+        if updated is not None:
+            updated[row.id] = row
+    return row
+
+
+@contextmanager
+def collect_updated_tasks() -> Iterator[dict[int, TaskRow]]:
+    """Collect ``{task_id: row}`` for every :func:`update_task` call in the block.
+
+    The dispatcher uses this to build structured responses from the rows the
+    handler's ``RETURNING`` clause already produced.
+    """
+    updated: dict[int, TaskRow] = {}
+    token = _updated.set(updated)
+    try:
+        yield updated
+    finally:
+        _updated.reset(token)
@@ -5,24 +5,59 @@ from __future__ import annotations
 import logging
 import re
 from dataclasses import dataclass, field
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
 VALID_SECTIONS = frozenset({"backlog", "doing", "waiting", "done", "drop"})
 
+_MM_DD_RE = re.compile(r"(\d{1,2})-(\d{1,2})")
+
+# Relative day offsets in date filters, e.g. ``7d``.
+_DAYS_RE = re.compile(r"(\d{1,4})d")
+
+# Commands that accept date filters (``due:<7d``, ``due:today``, ``overdue``, ``nodue``, ``closed:7d``).
+FILTER_COMMANDS = frozenset({"list", "board", "search"})
+
+# Commands that accept ``parent:#N`` (set the parent, or filter by it) and ``parent:-``.
+PARENT_COMMANDS = FILTER_COMMANDS | {"add", "edit"}
+
+_PARENT_RE = re.compile(r"#?([1-9]\d*)")
+
 _MENTION_RE = re.compile(r"<@(U[A-Z0-9]+)>")
-_DUE_RE = re.compile(r"^due:(.+)$")
+
+# Upper bound for the memoised due-date normaliser.
+_DUE_CACHE_SIZE = 512
 
 # Sentinel value indicating "clear due date"
 DUE_CLEAR = "-"
 
+# ``ParsedCommand.parent`` for ``parent:-``: no parent (task ids start at 1)
+PARENT_CLEAR = 0
+
 
 class ParseError(Exception):
     """Raised when the input cannot be parsed."""
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class DateRange:
+    """Inclusive range of calendar days; a ``None`` bound is open-ended."""
+
+    start: date | None = None
+    end: date | None = None
+
+    def intersect(self, other: DateRange | None) -> DateRange:
+        """Return the overlap of this range and *other* (may be empty)."""
+        if other is None:
+            return self
+        starts = [d for d in (self.start, other.start) if d is not None]
+        ends = [d for d in (self.end, other.end) if d is not None]
+        return DateRange(max(starts) if starts else None, min(ends) if ends else None)
+
+
+@dataclass(slots=True)
 class ParsedCommand:
     """Result of parsing a ``/todo`` message."""
 
@@ -34,6 +69,21 @@ class ParsedCommand:
     due: str | None = None  # YYYY-MM-DD or DUE_CLEAR sentinel
     mentions: list[str] = field(default_factory=list)
     title_tokens: list[str] = field(default_factory=list)
+    due_range: DateRange | None = None  # list/board/search filters only
+    no_due: bool = False
+    closed_range: DateRange | None = None
+    parent: int | None = None  # parent task id, or PARENT_CLEAR
+    raw_tokens: list[str] = field(default_factory=list)  # every token after the command, as typed
+
+
+def _parse_parent(raw: str) -> int:
+    """Parse the value of ``parent:#N`` / ``parent:-``."""
+    if raw == "-":
+        return PARENT_CLEAR
+    match = _PARENT_RE.fullmatch(raw)
+    if not match:
+        raise ParseError(f"Invalid parent: {raw!r}. Use parent:#<id> or parent:-")
+    return int(match.group(1))
 
 
 def _normalise_due(raw: str) -> str:
@@ -43,7 +93,17 @@ def _normalise_due(raw: str) -> str:
     """
     if raw == DUE_CLEAR:
         return DUE_CLEAR
+    return _normalise_due_cached(raw, date.today())
+
+
+@lru_cache(maxsize=_DUE_CACHE_SIZE)
+def _normalise_due_cached(raw: str, today: date) -> str:
+    """Memoised worker for :func:`_normalise_due`.
 
+    *today* is part of the cache key so ``MM-DD`` values roll over to the
+    new year without invalidating the cache by hand.  Invalid dates raise
+    and are therefore never cached.
+    """
     # Try full date first (YYYY-MM-DD)
     try:
         parsed = datetime.strptime(raw, "%Y-%m-%d").date()
@@ -54,10 +114,10 @@ def _normalise_due(raw: str) -> str:
     # Try MM-DD / M-D -- parse month and day as integers and construct with
     # the current year directly. Using strptime("%m-%d") would fail for Feb 29
     # because its default year (1900) is not a leap year.
-    match = re.fullmatch(r"(\d{1,2})-(\d{1,2})", raw)
+    match = _MM_DD_RE.fullmatch(raw)
     if match:
         try:
-            parsed = date(date.today().year, int(match.group(1)), int(match.group(2)))
+            parsed = date(today.year, int(match.group(1)), int(match.group(2)))
             return parsed.isoformat()
         except ValueError:
             pass
@@ -65,17 +125,63 @@ def _normalise_due(raw: str) -> str:
     raise ParseError(f"Invalid due date: {raw!r}")
 
 
+def _parse_date_or_offset(raw: str, today: date, sign: int) -> date:
+    """Resolve ``Nd`` (today + *sign* × N days) or an absolute date."""
+    match = _DAYS_RE.fullmatch(raw)
+    if match:
+        return today + timedelta(days=sign * int(match.group(1)))
+    return date.fromisoformat(_normalise_due_cached(raw, today))
+
+
+def _parse_due_filter(raw: str, today: date) -> DateRange:
+    """Parse the value of a ``due:`` filter into a day range.
+
+    Accepts ``today``, ``this-week`` (Monday to Sunday), a single date, or
+    ``<X`` / ``>X`` where X is ``Nd`` (days from today) or a date.  The
+    ``<`` / ``>`` bounds are exclusive: ``<7d`` is anything due before seven
+    days from now (overdue included), ``>7d`` anything due after that.
+    """
+    low = raw.lower()
+    if low == "today":
+        return DateRange(today, today)
+    if low == "this-week":
+        monday = today - timedelta(days=today.weekday())
+        return DateRange(monday, monday + timedelta(days=6))
+    try:
+        if raw[0] not in "<>":
+            day = date.fromisoformat(_normalise_due_cached(raw, today))
+            return DateRange(day, day)
+        bound = _parse_date_or_offset(raw[1:], today, 1)
+        if raw[0] == "<":
+            return DateRange(end=bound - timedelta(days=1))
+        return DateRange(start=bound + timedelta(days=1))
+    except (ParseError, OverflowError):
+        # OverflowError: an offset or exclusive bound outside year 1..9999
+        raise ParseError(f"Invalid due filter: {raw!r}") from None
+
+
+def _parse_closed_filter(raw: str, today: date) -> DateRange:
+    """Parse ``closed:X``: closed in the last N days (``7d``) or since a date."""
+    try:
+        return DateRange(start=_parse_date_or_offset(raw, today, -1))
+    except (ParseError, OverflowError):
+        raise ParseError(f"Invalid closed filter: {raw!r}") from None
+
+
 def parse(text: str) -> ParsedCommand:
     """Parse the text *after* the ``/todo`` prefix.
 
     Returns a :class:`ParsedCommand` with extracted options.
     """
-    tokens = text.strip().split()
+    tokens = text.split()
     if not tokens:
         raise ParseError("Empty command")
 
     command = tokens[0].lower()
-    remaining = tokens[1:]
+    if command == "view":
+        # A view's filter options are parsed by the view handler, against the
+        # list/board command the view runs (see openclaw_todo.cmd_view).
+        return ParsedCommand(command=command, title_tokens=tokens[1:], raw_tokens=tokens[1:])
 
     project: str | None = None
     project_visibility: str | None = None
@@ -84,49 +190,79 @@ def parse(text: str) -> ParsedCommand:
     mentions: list[str] = []
     title_tokens: list[str] = []
     args: list[str] = []
+    due_range: DateRange | None = None
+    no_due = False
+    closed_range: DateRange | None = None
+    parent: int | None = None
+    filters = command in FILTER_COMMANDS
+    parents = command in PARENT_COMMANDS
+    today: date | None = None  # resolved on the first date filter
 
-    i = 0
-    while i < len(remaining):
-        tok = remaining[i]
+    i = 1
+    n = len(tokens)
+    while i < n:
+        tok = tokens[i]
 
         # /p <project> [shared|private]
         if tok == "/p":
-            if i + 1 >= len(remaining):
+            if i + 1 >= n:
                 raise ParseError("/p requires a project name")
-            project = remaining[i + 1]
+            project = tokens[i + 1]
             i += 2
-            if i < len(remaining) and remaining[i].lower() in ("shared", "private"):
-                project_visibility = remaining[i].lower()
+            if i < n and tokens[i].lower() in ("shared", "private"):
+                project_visibility = tokens[i].lower()
                 i += 1
             continue
 
         # /s <section>
         if tok == "/s":
-            if i + 1 >= len(remaining):
+            if i + 1 >= n:
                 raise ParseError("/s requires a section name")
-            sec = remaining[i + 1].lower()
+            sec = tokens[i + 1].lower()
             if sec not in VALID_SECTIONS:
                 raise ParseError(f"Invalid section: {sec!r}. " f"Must be one of: {', '.join(sorted(VALID_SECTIONS))}")
             section = sec
             i += 2
             continue
 
-        # due:VALUE
-        due_match = _DUE_RE.match(tok)
-        if due_match:
-            due = _normalise_due(due_match.group(1))
+        if tok[:4] == "due:" and len(tok) > 4:
+            value = tok[4:]
+            if filters and value == DUE_CLEAR:
+                # due:- on a query means "no due date", like nodue
+                no_due = True
+            elif filters:
+                # due:today / due:this-week / due:<X / due:>X / due:DATE filter
+                today = today or date.today()
+                due_range = _parse_due_filter(value, today).intersect(due_range)
+            else:
+                # due:VALUE
+                due = _normalise_due(value)
             i += 1
             continue
 
         # <@U...> mention
-        mention_match = _MENTION_RE.fullmatch(tok)
-        if mention_match:
-            mentions.append(mention_match.group(1))
+        mention = _MENTION_RE.fullmatch(tok) if tok[:2] == "<@" else None
+        if mention:
+            mentions.append(mention.group(1))
             i += 1
             continue
 
-        # Everything else: title token or arg
-        title_tokens.append(tok)
+        if parents and tok[:7].lower() == "parent:":
+            parent = _parse_parent(tok[7:])
+            i += 1
+            continue
+        low = tok.lower() if filters else ""
+        if low == "overdue":
+            today = today or date.today()
+            due_range = DateRange(end=today - timedelta(days=1)).intersect(due_range)
+        elif low == "nodue":
+            no_due = True
+        elif low.startswith("closed:"):
+            today = today or date.today()
+            closed_range = _parse_closed_filter(tok[7:], today).intersect(closed_range)
+        else:
+            # Everything else: title token or arg
+            title_tokens.append(tok)
         i += 1
 
     # For commands that take an id as first arg (move, done, drop, edit),
@@ -143,6 +279,11 @@ def parse(text: str) -> ParsedCommand:
         due=due,
         mentions=mentions,
         title_tokens=title_tokens,
+        due_range=due_range,
+        no_due=no_due,
+        closed_range=closed_range,
+        parent=parent,
+        raw_tokens=tokens[1:],
     )
     logger.debug("Parsed: %s", result)
     return result
@@ -4,66 +4,109 @@ from __future__ import annotations
 
 import logging
 import sqlite3
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+from openclaw_todo.models import IN_CHUNK, TASK_COLUMNS, TaskRow, task_row
 
 logger = logging.getLogger(__name__)
 
 
-def can_write_task(conn: sqlite3.Connection, task_id: int, sender_id: str) -> bool:
-    """Check whether *sender_id* is allowed to modify the task.
+def writable_conditions(sender_id: str) -> tuple[list[str], list[str | int]]:
+    """Return SQL WHERE fragments and params selecting tasks *sender_id* may modify.
 
     Rules:
     - Private project: only the project owner can write.
     - Shared project: only an assignee or the task creator can write.
+
+    Like :func:`~openclaw_todo.scope_builder.build_scope_conditions`, the
+    ``(conditions, params)`` are AND-joined into a WHERE clause and assume the
+    query aliases ``tasks`` as ``t`` and ``projects`` as ``p``, so any filtered
+    view can be narrowed to writable tasks.
     """
-    row = conn.execute(
-        """
-        SELECT t.created_by, p.visibility, p.owner_user_id
-        FROM tasks t
-        JOIN projects p ON p.id = t.project_id
-        WHERE t.id = ?;
-        """,
-        (task_id,),
-    ).fetchone()
+    # Every OR branch is indexed on ``t`` (schema V5), so the planner can
+    # serve an unfiltered "all writable tasks" query as a MULTI-INDEX OR; the
+    # second condition then drops creator/assignee matches in other people's
+    # private projects.
+    return [
+        "(t.created_by = ? "
+        "OR t.id IN (SELECT task_id FROM task_assignees WHERE assignee_user_id = ?) "
+        "OR t.project_id IN (SELECT id FROM projects WHERE visibility = 'private' AND owner_user_id = ?))",
+        "(p.visibility = 'shared' OR p.owner_user_id = ?)",
+    ], [sender_id, sender_id, sender_id, sender_id]
+
+
+def select_writable_ids(
+    conn: sqlite3.Connection,
+    sender_id: str,
+    conditions: Sequence[str] = (),
+    params: Sequence[str | int] = (),
+) -> set[int]:
+    """Return the ids of tasks matching *conditions* that *sender_id* may modify, in one query.
+
+    With no *conditions* this is every task *sender_id* can write, served from
+    the creator, assignee and project indexes.
+    """
+    writable, writable_params = writable_conditions(sender_id)
+    where = " AND ".join([*conditions, *writable])
+    rows = conn.execute(
+        f"SELECT t.id FROM tasks t JOIN projects p ON p.id = t.project_id WHERE {where};",
+        [*params, *writable_params],
+    )
+    return {row[0] for row in rows}
+
+
+def writable_task_ids(conn: sqlite3.Connection, task_ids: Iterable[int], sender_id: str) -> set[int]:
+    """Return the subset of *task_ids* that *sender_id* may modify.
+
+    One query per ``IN_CHUNK`` ids, instead of a permission lookup per task;
+    ids that do not exist are simply absent from the result.
+    """
+    ids = list(dict.fromkeys(task_ids))
+    writable: set[int] = set()
+    for start in range(0, len(ids), IN_CHUNK):
+        chunk = ids[start : start + IN_CHUNK]
+        placeholders = ", ".join("?" * len(chunk))
+        writable |= select_writable_ids(conn, sender_id, [f"t.id IN ({placeholders})"], chunk)
+    logger.debug("Permission check: sender=%s writable=%d/%d", sender_id, len(writable), len(ids))
+    return writable
+
 
-    if row is None:
-        logger.debug("Permission check: task=%d not found", task_id)
-        return False
-
-    created_by, visibility, owner_user_id = row
-
-    if visibility == "private":
-        result = sender_id == owner_user_id
-        logger.debug(
-            "Permission check: task=%d sender=%s result=%s (private, owner=%s)",
-            task_id,
-            sender_id,
-            result,
-            owner_user_id,
-        )
-        return result
-
-    # Shared project: check assignee or creator
-    if sender_id == created_by:
-        logger.debug(
-            "Permission check: task=%d sender=%s result=True (creator)",
-            task_id,
-            sender_id,
-        )
-        return True
-
-    assignee_row = conn.execute(
-        "SELECT 1 FROM task_assignees WHERE task_id = ? AND assignee_user_id = ?;",
-        (task_id, sender_id),
+@dataclass(slots=True)
+class WriteTarget:
+    """A task read for modification, with its project's access data and the sender's write permission."""
+
+    task: TaskRow
+    visibility: str
+    owner_user_id: str | None
+    writable: bool
+    version: int  # ``tasks.version`` for compare-and-swap updates
+
+
+def _write_target_row(cursor: sqlite3.Cursor, row: tuple) -> WriteTarget:
+    return WriteTarget(task_row(cursor, row[:-4]), row[-4], row[-3], bool(row[-2]), row[-1])
+
+
+def fetch_write_target(conn: sqlite3.Connection, task_id: int, sender_id: str) -> WriteTarget | None:
+    """Read *task_id* and whether *sender_id* may modify it in one query; ``None`` if it does not exist.
+
+    Replaces the ``fetch_task`` + :func:`can_write_task` pair at the start of
+    every mutating handler.  The permission is :func:`writable_conditions`
+    evaluated as a SELECT-list expression on the task's row.
+    """
+    conditions, params = writable_conditions(sender_id)
+    cursor = conn.cursor()
+    cursor.row_factory = _write_target_row
+    return cursor.execute(
+        f"SELECT {TASK_COLUMNS}, p.visibility, p.owner_user_id, ({' AND '.join(conditions)}), t.version "
+        "FROM tasks t JOIN projects p ON p.id = t.project_id WHERE t.id = ?;",
+        (*params, task_id),
     ).fetchone()
 
-    result = assignee_row is not None
-    logger.debug(
-        "Permission check: task=%d sender=%s result=%s (shared, assignee check)",
-        task_id,
-        sender_id,
-        result,
-    )
-    return result
+
+def can_write_task(conn: sqlite3.Connection, task_id: int, sender_id: str) -> bool:
+    """Check whether *sender_id* is allowed to modify the task (see :func:`writable_conditions`)."""
+    return task_id in writable_task_ids(conn, [task_id], sender_id)
 
 
 def validate_private_assignees(
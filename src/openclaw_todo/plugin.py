@@ -3,31 +3,73 @@
 from __future__ import annotations
 
 import logging
+from typing import Any, Iterator
 
-from openclaw_todo.dispatcher import HELP_TEXT, dispatch
+from openclaw_todo.dispatcher import HELP_TEXT, dispatch, dispatch_lines
+from openclaw_todo.tenants import ConnectionPool
+from openclaw_todo.tracing import trace_request
 
 logger = logging.getLogger(__name__)
 
 _TODO_PREFIX = "/todo"
 
 
-def handle_message(text: str, context: dict, db_path: str | None = None) -> str | None:
+def handle_message(
+    text: str,
+    context: dict,
+    db_path: str | None = None,
+    *,
+    response_format: str = "text",
+    pool: ConnectionPool | None = None,
+) -> str | dict[str, Any] | None:
     """Process an incoming Slack DM message.
 
     Returns a response string for ``/todo`` commands, or ``None`` if the
-    message is not a TODO command.
+    message is not a TODO command.  With ``response_format="json"`` the
+    response is the structured dict described in
+    :func:`openclaw_todo.dispatcher.dispatch_records`.  *pool* serves the
+    command from a tenant's connection pool instead of *db_path*.
     """
     logger.debug("Inbound message: %s", text)
 
-    stripped = text.strip()
-    if not (stripped == _TODO_PREFIX or stripped.startswith(_TODO_PREFIX + " ")):
+    remainder = _strip_prefix(text)
+    if remainder is None:
         return None
 
-    logger.info("/todo prefix matched")
+    if not remainder:
+        if response_format == "json":
+            return {"ok": True, "command": "help", "text": HELP_TEXT}
+        return HELP_TEXT
+
+    with trace_request("message"):
+        return dispatch(remainder, context, db_path=db_path, response_format=response_format, pool=pool)
+
+
+def stream_message(
+    text: str, context: dict, db_path: str | None = None, *, pool: ConnectionPool | None = None
+) -> Iterator[str] | None:
+    """Like :func:`handle_message`, but return an iterator over response lines.
+
+    Returns ``None`` if the message is not a TODO command.
+    """
+    logger.debug("Inbound message (stream): %s", text)
 
-    remainder = stripped[len(_TODO_PREFIX) :].strip()
+    remainder = _strip_prefix(text)
+    if remainder is None:
+        return None
 
     if not remainder:
-        return HELP_TEXT
+        return iter(HELP_TEXT.split("\n"))
+
+    return dispatch_lines(remainder, context, db_path=db_path, pool=pool)
+
+
+def _strip_prefix(text: str) -> str | None:
+    """Return the text after ``/todo``, or ``None`` if it is not a TODO command."""
+    stripped = text.strip()
+    if not (stripped == _TODO_PREFIX or stripped.startswith(_TODO_PREFIX + " ")):
+        return None
+
+    logger.info("/todo prefix matched")
 
-    return dispatch(remainder, context, db_path=db_path)
+    return stripped[len(_TODO_PREFIX) :].strip()
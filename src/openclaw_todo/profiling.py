@@ -0,0 +1,203 @@
+"""On-demand request profiling for ``openclaw-todo-server``.
+
+An admin arms the :class:`Profiler` for the next *N* requests and/or *T*
+seconds; each ``/message`` request served while it is armed is profiled and
+the results are accumulated per command name (``list``, ``board`` ...):
+
+* ``cprofile`` — deterministic :mod:`cProfile`, reported as ``pstats`` text
+  sorted by cumulative time.
+* ``sample`` — a background thread samples the request thread's stack every
+  ``SAMPLE_INTERVAL`` seconds; reported as collapsed stacks
+  (``frame;frame;frame count`` lines, flamegraph input).  Much lower
+  overhead than ``cprofile``, so timings stay realistic.
+
+Only one session is armed at a time; arming again replaces the results.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from types import FrameType
+from typing import Any, Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+MODES = frozenset({"cprofile", "sample"})
+
+MAX_REQUESTS = 1000
+MAX_SECONDS = 3600.0
+
+# Seconds between stack samples in ``sample`` mode.
+SAMPLE_INTERVAL = 0.005
+
+# Functions listed per command in ``cprofile`` output.
+PSTATS_LIMIT = 40
+
+
+class ProfileConfigError(ValueError):
+    """Raised for invalid arm parameters; the message is client-facing."""
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{code.co_name}:{frame.f_lineno}"
+
+
+class StackSampler:
+    """Sample one thread's stack on a timer and count collapsed stacks."""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="openclaw-todo-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels: list[str] = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(labels))] += 1
+
+
+class _CommandProfile:
+    __slots__ = ("requests", "stats", "stacks")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.stats: pstats.Stats | None = None
+        self.stacks: Counter[str] = Counter()
+
+
+class Profiler:
+    """Arms, runs and reports profiling sessions.  *clock* is injectable for tests."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.mode: str | None = None
+        self._remaining: int | None = None
+        self._deadline: float | None = None
+        self._profiles: dict[str, _CommandProfile] = {}
+
+    def arm(self, mode: str = "cprofile", requests: int | None = None, seconds: float | None = None) -> None:
+        """Profile the next *requests* requests and/or the next *seconds* seconds (default: 1 request)."""
+        if mode not in MODES:
+            raise ProfileConfigError(f"invalid mode: must be one of {', '.join(sorted(MODES))}")
+        if requests is None and seconds is None:
+            requests = 1
+        if requests is not None and not (isinstance(requests, int) and 1 <= requests <= MAX_REQUESTS):
+            raise ProfileConfigError(f"requests must be an integer between 1 and {MAX_REQUESTS}")
+        if seconds is not None and not (isinstance(seconds, (int, float)) and 0 < seconds <= MAX_SECONDS):
+            raise ProfileConfigError(f"seconds must be between 0 and {MAX_SECONDS:g}")
+        with self._lock:
+            self.mode = mode
+            self._remaining = requests
+            self._deadline = self._clock() + seconds if seconds is not None else None
+            self._profiles = {}
+        logger.info("Profiler armed: mode=%s requests=%s seconds=%s", mode, requests, seconds)
+
+    def disarm(self) -> None:
+        """Stop profiling further requests (results are kept)."""
+        with self._lock:
+            self._remaining = 0
+
+    @property
+    def armed(self) -> bool:
+        with self._lock:
+            return self._armed()
+
+    def _armed(self) -> bool:
+        if self.mode is None or self._remaining == 0:
+            return False
+        return self._deadline is None or self._clock() < self._deadline
+
+    def _claim(self) -> str | None:
+        """Reserve a profiling slot for one request; return the mode or ``None``."""
+        with self._lock:
+            if not self._armed():
+                return None
+            if self._remaining is not None:
+                self._remaining -= 1
+            return self.mode
+
+    @contextmanager
+    def profile(self, command: str) -> Iterator[None]:
+        """Profile the enclosed request under *command* if a session is armed."""
+        mode = self._claim()
+        if mode is None:
+            yield
+            return
+        if mode == "cprofile":
+            prof = cProfile.Profile()
+            prof.enable()
+            try:
+                yield
+            finally:
+                prof.disable()
+                self._record(command, profile=prof)
+        else:
+            sampler = StackSampler(threading.get_ident())
+            sampler.start()
+            try:
+                yield
+            finally:
+                sampler.stop()
+                self._record(command, stacks=sampler.stacks)
+
+    def _record(self, command: str, *, profile: cProfile.Profile | None = None, stacks: Counter | None = None) -> None:
+        with self._lock:
+            entry = self._profiles.setdefault(command, _CommandProfile())
+            entry.requests += 1
+            if profile is not None:
+                if entry.stats is None:
+                    entry.stats = pstats.Stats(profile)
+                else:
+                    entry.stats.add(profile)
+            if stacks:
+                entry.stacks.update(stacks)
+
+    def report(self) -> dict[str, Any]:
+        """JSON-ready session state and per-command output."""
+        with self._lock:
+            remaining_seconds = None
+            if self._deadline is not None:
+                remaining_seconds = max(round(self._deadline - self._clock(), 3), 0.0)
+            profiles = {}
+            for command, entry in sorted(self._profiles.items()):
+                if entry.stats is not None:
+                    buf = io.StringIO()
+                    entry.stats.stream = buf
+                    entry.stats.sort_stats("cumulative").print_stats(PSTATS_LIMIT)
+                    output = buf.getvalue()
+                else:
+                    output = "".join(f"{stack} {count}\n" for stack, count in entry.stacks.most_common())
+                profiles[command] = {"requests": entry.requests, "output": output}
+            return {
+                "mode": self.mode,
+                "armed": self._armed(),
+                "remaining_requests": self._remaining,
+                "remaining_seconds": remaining_seconds,
+                "profiles": profiles,
+            }
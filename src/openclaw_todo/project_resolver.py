@@ -4,7 +4,10 @@ from __future__ import annotations
 
 import logging
 import sqlite3
-from dataclasses import dataclass
+
+# ``Project`` lives in models; it is re-exported here for existing importers.
+from openclaw_todo.models import PROJECT_COLUMNS, Project, project_row, query
+from openclaw_todo.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -17,16 +20,6 @@ class AmbiguousProjectError(Exception):
     """Raised when both shared and private projects exist with the same name."""
 
 
-@dataclass
-class Project:
-    """Represents a resolved project row."""
-
-    id: int
-    name: str
-    visibility: str  # 'shared' | 'private'
-    owner_user_id: str | None
-
-
 def resolve_project(
     conn: sqlite3.Connection,
     name: str,
@@ -46,94 +39,77 @@ def resolve_project(
     When *visibility* is ``'shared'`` or ``'private'``, only that type is
     queried (no ambiguity check).
     """
+    with span("resolve_project"):
+        return _resolve_project(conn, name, sender_id, visibility)
+
+
+def _resolve_project(conn: sqlite3.Connection, name: str, sender_id: str, visibility: str | None) -> Project:
     if visibility == "private":
-        row = conn.execute(
-            "SELECT id, name, visibility, owner_user_id FROM projects "
-            "WHERE name = ? AND visibility = 'private' AND owner_user_id = ?;",
+        project = query(
+            conn,
+            project_row,
+            f"SELECT {PROJECT_COLUMNS} FROM projects WHERE name = ? AND visibility = 'private' AND owner_user_id = ?;",
             (name, sender_id),
         ).fetchone()
-        if row:
-            return Project(id=row[0], name=row[1], visibility=row[2], owner_user_id=row[3])
+        if project:
+            return project
         raise ProjectNotFoundError(f"Project not found: {name!r}")
 
     if visibility == "shared":
-        row = conn.execute(
-            "SELECT id, name, visibility, owner_user_id FROM projects "
-            "WHERE name = ? AND visibility = 'shared';",
+        project = query(
+            conn,
+            project_row,
+            f"SELECT {PROJECT_COLUMNS} FROM projects WHERE name = ? AND visibility = 'shared';",
             (name,),
         ).fetchone()
-        if row:
-            return Project(id=row[0], name=row[1], visibility=row[2], owner_user_id=row[3])
+        if project:
+            return project
         # Auto-create Inbox as shared
         if name == "Inbox":
-            conn.execute(
-                "INSERT OR IGNORE INTO projects (name, visibility, owner_user_id) "
-                "VALUES ('Inbox', 'shared', NULL);",
-            )
-            conn.commit()
-            row = conn.execute(
-                "SELECT id, name, visibility, owner_user_id FROM projects "
-                "WHERE name = 'Inbox' AND visibility = 'shared';",
-            ).fetchone()
-            return Project(id=row[0], name=row[1], visibility=row[2], owner_user_id=row[3])
+            return _create_inbox(conn)
         raise ProjectNotFoundError(f"Project not found: {name!r}")
 
     # --- No explicit visibility: detect ambiguity ---
     # 1) Private project of sender
-    private_row = conn.execute(
-        "SELECT id, name, visibility, owner_user_id FROM projects "
-        "WHERE name = ? AND visibility = 'private' AND owner_user_id = ?;",
+    private_project = query(
+        conn,
+        project_row,
+        f"SELECT {PROJECT_COLUMNS} FROM projects WHERE name = ? AND visibility = 'private' AND owner_user_id = ?;",
         (name, sender_id),
     ).fetchone()
 
     # 2) Shared project
-    shared_row = conn.execute(
-        "SELECT id, name, visibility, owner_user_id FROM projects "
-        "WHERE name = ? AND visibility = 'shared';",
+    shared_project = query(
+        conn,
+        project_row,
+        f"SELECT {PROJECT_COLUMNS} FROM projects WHERE name = ? AND visibility = 'shared';",
         (name,),
     ).fetchone()
 
     # Both exist → ambiguous
-    if private_row and shared_row:
+    if private_project and shared_project:
         raise AmbiguousProjectError(
             f'Ambiguous project name "{name}": both shared and private projects exist. '
             f'Append "shared" or "private" to disambiguate.'
         )
 
-    if private_row:
-        project = Project(
-            id=private_row[0], name=private_row[1],
-            visibility=private_row[2], owner_user_id=private_row[3],
-        )
+    if private_project:
         logger.debug(
             "Resolved project '%s' -> id=%d vis=%s (private match)",
-            name, project.id, project.visibility,
+            name, private_project.id, private_project.visibility,
         )
-        return project
+        return private_project
 
-    if shared_row:
-        project = Project(
-            id=shared_row[0], name=shared_row[1],
-            visibility=shared_row[2], owner_user_id=shared_row[3],
-        )
+    if shared_project:
         logger.debug(
             "Resolved project '%s' -> id=%d vis=%s (shared match)",
-            name, project.id, project.visibility,
+            name, shared_project.id, shared_project.visibility,
         )
-        return project
+        return shared_project
 
     # 3) Auto-create Inbox as shared
     if name == "Inbox":
-        conn.execute(
-            "INSERT OR IGNORE INTO projects (name, visibility, owner_user_id) "
-            "VALUES ('Inbox', 'shared', NULL);",
-        )
-        conn.commit()
-        row = conn.execute(
-            "SELECT id, name, visibility, owner_user_id FROM projects "
-            "WHERE name = 'Inbox' AND visibility = 'shared';",
-        ).fetchone()
-        project = Project(id=row[0], name=row[1], visibility=row[2], owner_user_id=row[3])
+        project = _create_inbox(conn)
         logger.debug(
             "Resolved project '%s' -> id=%d vis=%s (auto-created)",
             name, project.id, project.visibility,
@@ -142,3 +118,17 @@ def resolve_project(
 
     # 4) Not found
     raise ProjectNotFoundError(f"Project not found: {name!r}")
+
+
+def _create_inbox(conn: sqlite3.Connection) -> Project:
+    """Insert the shared Inbox project if missing and return it."""
+    conn.execute(
+        "INSERT OR IGNORE INTO projects (name, visibility, owner_user_id) "
+        "VALUES ('Inbox', 'shared', NULL);",
+    )
+    conn.commit()
+    return query(
+        conn,
+        project_row,
+        f"SELECT {PROJECT_COLUMNS} FROM projects WHERE name = 'Inbox' AND visibility = 'shared';",
+    ).fetchone()
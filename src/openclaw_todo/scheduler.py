@@ -0,0 +1,322 @@
+"""Due-date reminder scheduler.
+
+Keeps an in-memory min-heap of ``(fire_on, task_id, due)`` entries for open
+tasks with an upcoming due date.  The heap is loaded once at startup with an
+index range scan on ``ix_tasks_due_day`` and then kept current from the
+``task.add`` / ``task.edit`` / ``task.done`` / ``task.drop`` events, so the
+table is never polled.  Superseded heap entries are discarded lazily when
+they reach the top, and every candidate is re-read before a reminder is sent.
+
+With a *digest_hour* set, it also sends each user's daily digest (see
+:func:`openclaw_todo.cmd_digest.iter_digests`) once a day from that hour.
+
+Payloads are JSON-ready dicts handed to a *sink*: anything with an
+``emit(payload)`` method.  :class:`FileSink` appends JSON lines to a file and
+:class:`HttpSink` POSTs each payload to a URL.
+
+The scheduler watches the default database only, so it is off with sharded
+storage (``OPENCLAW_TODO_SHARDS``) or tenant routing (``OPENCLAW_TODO_TENANT_DIR``).
+
+Environment variables
+---------------------
+OPENCLAW_TODO_REMINDER_SINK       File path or ``http(s)://`` URL (unset: scheduler off)
+OPENCLAW_TODO_REMINDER_LEAD_DAYS  Days before the due date to remind (default 0)
+OPENCLAW_TODO_DIGEST_HOUR         Local hour (0-23) to send daily digests (unset: no digests)
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import os
+import threading
+import urllib.request
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Protocol
+
+import openclaw_todo.schemas as _schemas  # noqa: F401 — registers migrations
+from openclaw_todo import event_logger
+from openclaw_todo.cmd_digest import iter_digests
+from openclaw_todo.db import get_connection
+from openclaw_todo.migrations import migrate
+from openclaw_todo.models import IN_CHUNK, TASK_COLUMNS, attach_assignees, query, task_row
+from openclaw_todo.sharding import shard_count
+from openclaw_todo.task_query import FROM_CLAUSE, epoch_day
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on how long the worker sleeps between heap checks (seconds).
+POLL_SECONDS = 60.0
+
+
+class Sink(Protocol):
+    """Destination for scheduler payloads."""
+
+    def emit(self, payload: dict[str, Any]) -> None: ...
+
+
+class FileSink:
+    """Append each payload as one JSON line to *path*."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    def emit(self, payload: dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps(payload) + "\n")
+
+
+class HttpSink:
+    """POST each payload as JSON to *url*."""
+
+    def __init__(self, url: str, timeout: float = 5.0) -> None:
+        self.url = url
+        self.timeout = timeout
+
+    def emit(self, payload: dict[str, Any]) -> None:
+        req = urllib.request.Request(
+            self.url,
+            data=json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            resp.read()
+
+
+def sink_from_target(target: str) -> Sink:
+    """Return an :class:`HttpSink` for ``http(s)://`` targets, else a :class:`FileSink`."""
+    if target.startswith(("http://", "https://")):
+        return HttpSink(target)
+    return FileSink(target)
+
+
+class ReminderScheduler:
+    """Emit a ``reminder`` payload when an open task's due date comes up.
+
+    *lead_days* sends the reminder that many days before the due date.
+    *today* is injectable for tests.  Tasks already overdue at startup are
+    not reminded again, and a server started after *digest_hour* skips that
+    day's digest rather than risk sending it twice.
+    """
+
+    def __init__(
+        self,
+        db_path: str | None,
+        sink: Sink,
+        *,
+        lead_days: int = 0,
+        digest_hour: int | None = None,
+        today: Callable[[], date] = date.today,
+    ) -> None:
+        self.db_path = db_path
+        self.sink = sink
+        self.lead = timedelta(days=lead_days)
+        self._today = today
+        self.digest_hour = digest_hour
+        self._last_digest: str | None = None
+        self._heap: list[tuple[str, int, str]] = []
+        self._due: dict[int, str] = {}  # task_id -> due of its live heap entry
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # --- Queue maintenance ---
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def load(self, conn) -> int:
+        """(Re)build the queue from open tasks due today or later; return its size."""
+        rows = conn.execute(
+            "SELECT id, due FROM tasks WHERE status = 'open' AND due_day >= ?;",
+            (epoch_day(self._today()),),
+        ).fetchall()
+        with self._lock:
+            self._heap.clear()
+            self._due.clear()
+            for task_id, due in rows:
+                self._push(task_id, due)
+        logger.info("Reminder queue loaded: %d task(s)", len(self._due))
+        return len(self._due)
+
+    def schedule(self, task_id: int, due: str) -> None:
+        """Queue (or re-queue) *task_id* for *due*, superseding any earlier entry."""
+        with self._lock:
+            self._push(task_id, due)
+        self._wake.set()
+
+    def cancel(self, task_id: int) -> None:
+        """Forget *task_id*; its heap entry is dropped when it reaches the top."""
+        with self._lock:
+            self._due.pop(task_id, None)
+
+    def on_event(self, action: str, task_id: int | None, payload: dict) -> None:
+        """Event listener keeping the queue in step with task mutations."""
+        if task_id is None:
+            return
+        if action == "task.add":
+            if payload.get("due"):
+                self.schedule(task_id, payload["due"])
+        elif action == "task.edit":
+            if "due" in payload:
+                new_due = payload["due"]["new"]
+                if new_due:
+                    self.schedule(task_id, new_due)
+                else:
+                    self.cancel(task_id)
+        elif action in ("task.done", "task.drop"):
+            self.cancel(task_id)
+
+    def _push(self, task_id: int, due: str) -> None:
+        try:
+            fire_on = (date.fromisoformat(due) - self.lead).isoformat()
+        except ValueError:
+            logger.warning("Task #%d has unparseable due date %r; not scheduled", task_id, due)
+            self._due.pop(task_id, None)
+            return
+        self._due[task_id] = due
+        heapq.heappush(self._heap, (fire_on, task_id, due))
+
+    # --- Firing ---
+
+    def run_pending(self, conn) -> int:
+        """Emit reminders for every entry whose fire date has arrived; return the count."""
+        today = self._today().isoformat()
+        ready: dict[int, str] = {}
+        with self._lock:
+            while self._heap and self._heap[0][0] <= today:
+                _, task_id, due = heapq.heappop(self._heap)
+                if self._due.get(task_id) == due:
+                    del self._due[task_id]
+                    ready[task_id] = due
+        if not ready:
+            return 0
+
+        sent = 0
+        ids = list(ready)
+        for start in range(0, len(ids), IN_CHUNK):
+            chunk = ids[start : start + IN_CHUNK]
+            placeholders = ", ".join("?" * len(chunk))
+            # Re-read: the task may have been closed or re-dated by another process
+            rows = query(
+                conn,
+                task_row,
+                f"SELECT {TASK_COLUMNS} {FROM_CLAUSE} WHERE t.id IN ({placeholders}) AND t.status = 'open' "
+                "ORDER BY t.due, t.id;",
+                chunk,
+            ).fetchall()
+            rows = [r for r in rows if r.due == ready[r.id]]
+            attach_assignees(conn, rows)
+            for row in rows:
+                try:
+                    self.sink.emit({"type": "reminder", "fire_on": today, "task": row.as_record()})
+                except Exception:
+                    logger.exception("Reminder sink failed for task #%d", row.id)
+                    continue
+                sent += 1
+        return sent
+
+    def run_digests(self, conn) -> int:
+        """Emit one ``digest`` payload per user with anything to report; return the count."""
+        today = self._today()
+        self._last_digest = today.isoformat()
+        sent = 0
+        # A single grouped pass over all assignees, streamed one user at a time
+        for digest in iter_digests(conn, today):
+            try:
+                self.sink.emit({"type": "digest", "date": today.isoformat(), **digest.as_record()})
+            except Exception:
+                logger.exception("Digest sink failed for %s", digest.user_id)
+                continue
+            sent += 1
+        logger.info("Daily digest sent to %d user(s)", sent)
+        return sent
+
+    def digest_due(self, now: datetime) -> bool:
+        """Return ``True`` if today's digest has not gone out and *now* is past the digest hour."""
+        if self.digest_hour is None or now.hour < self.digest_hour:
+            return False
+        return self._last_digest != self._today().isoformat()
+
+    def _seconds_until_next(self) -> float:
+        with self._lock:
+            if not self._heap:
+                return POLL_SECONDS
+            fire_on = self._heap[0][0]
+        return 0.0 if fire_on <= self._today().isoformat() else POLL_SECONDS
+
+    # --- Worker thread ---
+
+    def start(self) -> None:
+        """Load the queue, subscribe to task events and start the worker thread."""
+        conn = get_connection(self.db_path)
+        try:
+            migrate(conn)
+            self.load(conn)
+        finally:
+            conn.close()
+        if self.digest_due(datetime.now()):
+            self._last_digest = self._today().isoformat()
+        event_logger.subscribe(self.on_event)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="openclaw-todo-reminders", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Unsubscribe and stop the worker thread."""
+        event_logger.unsubscribe(self.on_event)
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        conn = get_connection(self.db_path)
+        try:
+            while not self._stop.is_set():
+                self._wake.clear()
+                try:
+                    self.run_pending(conn)
+                    if self.digest_due(datetime.now()):
+                        self.run_digests(conn)
+                except Exception:
+                    logger.exception("Reminder run failed")
+                self._wake.wait(self._seconds_until_next())
+        finally:
+            conn.close()
+
+
+def scheduler_from_env(db_path: str | None) -> ReminderScheduler | None:
+    """Build a scheduler from ``OPENCLAW_TODO_REMINDER_*`` variables, or ``None`` if disabled."""
+    target = os.environ.get("OPENCLAW_TODO_REMINDER_SINK")
+    if not target:
+        return None
+    if shard_count():
+        logger.warning("Reminders are not supported with OPENCLAW_TODO_SHARDS; scheduler disabled")
+        return None
+    if os.environ.get("OPENCLAW_TODO_TENANT_DIR"):
+        # Tenant databases are not scanned, and their task ids mean nothing in the default database.
+        logger.warning("Reminders are not supported with OPENCLAW_TODO_TENANT_DIR; scheduler disabled")
+        return None
+    try:
+        lead_days = int(os.environ.get("OPENCLAW_TODO_REMINDER_LEAD_DAYS", "0"))
+    except ValueError:
+        logger.warning("Invalid OPENCLAW_TODO_REMINDER_LEAD_DAYS, falling back to 0")
+        lead_days = 0
+    digest_hour: int | None = None
+    raw_hour = os.environ.get("OPENCLAW_TODO_DIGEST_HOUR")
+    if raw_hour:
+        try:
+            digest_hour = int(raw_hour)
+        except ValueError:
+            digest_hour = -1
+        if not 0 <= digest_hour <= 23:
+            logger.warning("Invalid OPENCLAW_TODO_DIGEST_HOUR, daily digests disabled")
+            digest_hour = None
+    return ReminderScheduler(db_path, sink_from_target(target), lead_days=lead_days, digest_hour=digest_hour)
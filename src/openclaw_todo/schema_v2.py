@@ -0,0 +1,69 @@
+"""V2 schema migration: FTS5 full-text index over task titles."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+
+import openclaw_todo.schema_v1 as _schema_v1  # noqa: F401 — V1 must register first
+from openclaw_todo.migrations import register
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "tasks_fts"
+
+
+def fts5_available(conn: sqlite3.Connection) -> bool:
+    """Return ``True`` if the linked SQLite library was built with FTS5."""
+    return bool(conn.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5');").fetchone()[0])
+
+
+def has_fts_index(conn: sqlite3.Connection) -> bool:
+    """Return ``True`` if the ``tasks_fts`` index exists in this database."""
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?;", (FTS_TABLE,)).fetchone()
+    return row is not None
+
+
+@register
+def migrate_v2(conn: sqlite3.Connection) -> None:
+    """Create an external-content FTS5 index on ``tasks.title`` kept in sync by triggers.
+
+    On SQLite builds without FTS5 the migration is a no-op and ``/todo search``
+    falls back to ``LIKE`` matching.
+    """
+    if not fts5_available(conn):
+        logger.warning("SQLite built without FTS5; /todo search will use LIKE matching")
+        return
+
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+            title,
+            content = 'tasks',
+            content_rowid = 'id',
+            tokenize = 'unicode61 remove_diacritics 2'
+        );
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN
+            INSERT INTO {FTS_TABLE} (rowid, title) VALUES (new.id, new.title);
+        END;
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN
+            INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title) VALUES ('delete', old.id, old.title);
+        END;
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER tasks_fts_au AFTER UPDATE OF title ON tasks BEGIN
+            INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title) VALUES ('delete', old.id, old.title);
+            INSERT INTO {FTS_TABLE} (rowid, title) VALUES (new.id, new.title);
+        END;
+    """)
+
+    # Index any tasks created before this migration
+    conn.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild');")
+
+    logger.info("V2 schema created: %s full-text index + sync triggers", FTS_TABLE)
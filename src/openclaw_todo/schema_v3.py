@@ -0,0 +1,22 @@
+"""V3 schema migration: index open tasks by due date."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+
+import openclaw_todo.schema_v2 as _schema_v2  # noqa: F401 — V2 must register first
+from openclaw_todo.migrations import register
+
+logger = logging.getLogger(__name__)
+
+
+@register
+def migrate_v3(conn: sqlite3.Connection) -> None:
+    """Create ``ix_tasks_status_due`` so due-date scans are index range reads."""
+    conn.execute("""
+        CREATE INDEX ix_tasks_status_due
+        ON tasks(status, due) WHERE due IS NOT NULL;
+    """)
+
+    logger.info("V3 schema created: ix_tasks_status_due")
@@ -0,0 +1,51 @@
+"""V4 schema migration: integer date columns for range scans.
+
+The TEXT columns stay the source of truth (and what every response shows);
+these VIRTUAL generated columns expose them as integers so date filters and
+due-date ordering compare and range-scan integers:
+
+- ``due_day``       days since 1970-01-01 for ``due`` (``NULL`` when unset)
+- ``created_epoch`` Unix seconds for ``created_at`` (UTC)
+- ``closed_epoch``  Unix seconds for ``closed_at`` (UTC, ``NULL`` while open)
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+
+import openclaw_todo.schema_v3 as _schema_v3  # noqa: F401 — V3 must register first
+from openclaw_todo.migrations import register
+
+logger = logging.getLogger(__name__)
+
+# julianday() of 1970-01-01T00:00:00
+_UNIX_EPOCH_JULIAN = 2440587.5
+
+
+@register
+def migrate_v4(conn: sqlite3.Connection) -> None:
+    """Add ``due_day`` / ``created_epoch`` / ``closed_epoch`` and their indexes."""
+    conn.execute(f"""
+        ALTER TABLE tasks ADD COLUMN due_day INTEGER
+        GENERATED ALWAYS AS (CAST(julianday(due) - {_UNIX_EPOCH_JULIAN} AS INTEGER)) VIRTUAL;
+    """)
+    conn.execute("""
+        ALTER TABLE tasks ADD COLUMN created_epoch INTEGER
+        GENERATED ALWAYS AS (CAST(strftime('%s', created_at) AS INTEGER)) VIRTUAL;
+    """)
+    conn.execute("""
+        ALTER TABLE tasks ADD COLUMN closed_epoch INTEGER
+        GENERATED ALWAYS AS (CAST(strftime('%s', closed_at) AS INTEGER)) VIRTUAL;
+    """)
+
+    # Partial and not led by status: an index usable for plain ``status = ?``
+    # lookups would tempt the planner away from the assignee index that
+    # drives ``mine`` / ``@user`` queries.  Range filters imply NOT NULL.
+    conn.execute("CREATE INDEX ix_tasks_due_day ON tasks(due_day) WHERE due_day IS NOT NULL;")
+    conn.execute("CREATE INDEX ix_tasks_closed_epoch ON tasks(closed_epoch) WHERE closed_epoch IS NOT NULL;")
+
+    # Superseded by ix_tasks_due_day
+    conn.execute("DROP INDEX IF EXISTS ix_tasks_status_due;")
+
+    logger.info("V4 schema created: due_day / created_epoch / closed_epoch + indexes")
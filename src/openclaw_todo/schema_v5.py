@@ -0,0 +1,28 @@
+"""V5 schema migration: index tasks by creator and by project.
+
+Write permission is granted to a shared task's creator or assignees and to
+a private project's owner (see :mod:`openclaw_todo.permissions`).  With
+``ix_tasks_created_by`` and ``ix_tasks_project`` next to
+``ix_task_assignees_user``, "every task *sender* may write" is three index
+lookups OR-ed together instead of a full scan of ``tasks``.
+``ix_tasks_project`` also covers the ``tasks.project_id`` foreign key.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+
+import openclaw_todo.schema_v4 as _schema_v4  # noqa: F401 — V4 must register first
+from openclaw_todo.migrations import register
+
+logger = logging.getLogger(__name__)
+
+
+@register
+def migrate_v5(conn: sqlite3.Connection) -> None:
+    """Create ``ix_tasks_created_by`` and ``ix_tasks_project``."""
+    conn.execute("CREATE INDEX ix_tasks_created_by ON tasks(created_by);")
+    conn.execute("CREATE INDEX ix_tasks_project ON tasks(project_id);")
+
+    logger.info("V5 schema created: ix_tasks_created_by, ix_tasks_project")
@@ -0,0 +1,73 @@
+"""V6 schema migration: denormalised assignee list on ``tasks``.
+
+``tasks.assignees_csv`` caches the task's assignee user IDs, sorted and
+comma-separated (``''`` for none), so a task renders from its own row
+without a ``task_assignees`` lookup.  Triggers on ``task_assignees`` keep it
+current for every insert, delete and update, whoever makes them.
+
+Rows that existed before the migration start out ``NULL`` ("not cached");
+the ``tasks.assignees_csv`` backfill fills them in the background, and
+:func:`openclaw_todo.models.attach_assignees` falls back to
+``task_assignees`` for any row that is still ``NULL``.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+
+import openclaw_todo.schema_v5 as _schema_v5  # noqa: F401 — V5 must register first
+from openclaw_todo.backfill import register_backfill
+from openclaw_todo.migrations import register
+
+logger = logging.getLogger(__name__)
+
+# Current assignee list of the task with id ``{task_id}``, in user-ID order.
+ASSIGNEES_CSV_SQL = """
+    COALESCE((SELECT group_concat(assignee_user_id, ',') FROM (
+        SELECT assignee_user_id FROM task_assignees WHERE task_id = {task_id} ORDER BY assignee_user_id
+    )), '')
+"""
+
+
+@register
+def migrate_v6(conn: sqlite3.Connection) -> None:
+    """Add ``tasks.assignees_csv`` and the triggers maintaining it."""
+    conn.execute("ALTER TABLE tasks ADD COLUMN assignees_csv TEXT;")
+
+    for event, ref in (("INSERT", "NEW"), ("DELETE", "OLD")):
+        conn.execute(f"""
+            CREATE TRIGGER tr_task_assignees_{event.lower()}_csv
+            AFTER {event} ON task_assignees
+            BEGIN
+                UPDATE tasks SET assignees_csv = {ASSIGNEES_CSV_SQL.format(task_id=f"{ref}.task_id")}
+                WHERE id = {ref}.task_id;
+            END;
+        """)
+    conn.execute(f"""
+        CREATE TRIGGER tr_task_assignees_update_csv
+        AFTER UPDATE ON task_assignees
+        BEGIN
+            UPDATE tasks SET assignees_csv = {ASSIGNEES_CSV_SQL.format(task_id="tasks.id")}
+            WHERE id IN (OLD.task_id, NEW.task_id);
+        END;
+    """)
+
+    logger.info("V6 schema created: tasks.assignees_csv + triggers")
+
+
+@register_backfill("tasks.assignees_csv")
+def backfill_assignees_csv(conn: sqlite3.Connection, after: int | None, limit: int) -> int | None:
+    """Fill ``assignees_csv`` for the next *limit* tasks after id *after*."""
+    row = conn.execute(
+        "SELECT max(id) FROM (SELECT id FROM tasks WHERE id > ? ORDER BY id LIMIT ?);",
+        (after or 0, limit),
+    ).fetchone()
+    if row[0] is None:
+        return None
+    conn.execute(
+        f"UPDATE tasks SET assignees_csv = {ASSIGNEES_CSV_SQL.format(task_id='tasks.id')} "
+        "WHERE id > ? AND id <= ? AND assignees_csv IS NULL;",
+        (after or 0, row[0]),
+    )
+    return row[0]
@@ -0,0 +1,26 @@
+"""V7 schema migration: row version for optimistic concurrency.
+
+``tasks.version`` starts at 0 and is incremented by every
+:func:`openclaw_todo.models.update_task`.  Mutating handlers read it with
+the task and make their ``UPDATE`` conditional on it (compare-and-swap), so
+a concurrent change to the same task between the read and the write turns
+into a conflict response instead of a lost update.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+
+import openclaw_todo.schema_v6 as _schema_v6  # noqa: F401 — V6 must register first
+from openclaw_todo.migrations import register
+
+logger = logging.getLogger(__name__)
+
+
+@register
+def migrate_v7(conn: sqlite3.Connection) -> None:
+    """Add ``tasks.version``."""
+    conn.execute("ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 0;")
+
+    logger.info("V7 schema created: tasks.version")
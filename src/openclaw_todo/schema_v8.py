@@ -0,0 +1,46 @@
+"""V8 schema migration: saved views.
+
+``saved_views`` stores each user's named ``list``/``board`` filters (see
+:mod:`openclaw_todo.cmd_view`).  A view is parsed and compiled when it is
+saved: ``where_sql``/``params`` hold the finished WHERE clause, with the
+project already resolved to its id, so running the view needs neither the
+parser nor project resolution.  Filters with date options are relative to
+the day they run on; for those ``where_sql`` is ``NULL`` and the view is
+compiled from ``filter_text`` on each run.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+
+import openclaw_todo.schema_v7 as _schema_v7  # noqa: F401 — V7 must register first
+from openclaw_todo.migrations import register
+
+logger = logging.getLogger(__name__)
+
+
+@register
+def migrate_v8(conn: sqlite3.Connection) -> None:
+    """Create ``saved_views``."""
+    conn.execute("""
+        CREATE TABLE saved_views (
+            id              INTEGER PRIMARY KEY,
+            owner_user_id   TEXT NOT NULL,
+            name            TEXT NOT NULL,
+            command         TEXT NOT NULL CHECK (command IN ('list', 'board')),
+            filter_text     TEXT NOT NULL,
+            project         TEXT,
+            scope           TEXT NOT NULL,
+            status          TEXT NOT NULL,
+            section         TEXT,
+            limit_n         INTEGER NOT NULL,
+            where_sql       TEXT,
+            params          TEXT,
+            created_at      TEXT NOT NULL DEFAULT (datetime('now')),
+            updated_at      TEXT NOT NULL DEFAULT (datetime('now')),
+            UNIQUE (owner_user_id, name)
+        );
+    """)
+
+    logger.info("V8 schema created: saved_views")
@@ -0,0 +1,69 @@
+"""V9 schema migration: subtasks and their progress rollups.
+
+``tasks.parent_id`` links a subtask to its parent task (``NULL`` for
+top-level tasks; a partial index serves "children of #N" lookups).  Each
+task also carries the progress of its direct subtasks:
+
+- ``children_total``  subtasks that are not dropped
+- ``children_done``   subtasks that are done
+
+Triggers on ``tasks`` adjust the parent's counters by ±1 whenever a
+subtask is inserted, deleted, re-parented or changes status, so ``list``
+and ``board`` render rollups from the parent's own row instead of counting
+children per task.  The counter updates only touch the counter columns, so
+they fire no further triggers and do not bump the parent's ``version``.
+Existing tasks have no subtasks, so the counters need no backfill.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+
+import openclaw_todo.schema_v8 as _schema_v8  # noqa: F401 — V8 must register first
+from openclaw_todo.migrations import register
+
+logger = logging.getLogger(__name__)
+
+# Apply ``{sign}`` one subtask row ``{ref}`` to its parent's counters.
+_ROLLUP_SQL = """
+    UPDATE tasks SET
+        children_total = children_total {sign} ({ref}.status != 'dropped'),
+        children_done = children_done {sign} ({ref}.status = 'done')
+    WHERE id = {ref}.parent_id;
+"""
+
+
+@register
+def migrate_v9(conn: sqlite3.Connection) -> None:
+    """Add ``parent_id``, the rollup counters, their index and triggers."""
+    conn.execute("ALTER TABLE tasks ADD COLUMN parent_id INTEGER REFERENCES tasks(id);")
+    conn.execute("ALTER TABLE tasks ADD COLUMN children_total INTEGER NOT NULL DEFAULT 0;")
+    conn.execute("ALTER TABLE tasks ADD COLUMN children_done INTEGER NOT NULL DEFAULT 0;")
+    conn.execute("CREATE INDEX ix_tasks_parent ON tasks(parent_id) WHERE parent_id IS NOT NULL;")
+
+    conn.execute(f"""
+        CREATE TRIGGER tr_tasks_insert_rollup
+        AFTER INSERT ON tasks WHEN NEW.parent_id IS NOT NULL
+        BEGIN
+            {_ROLLUP_SQL.format(sign="+", ref="NEW")}
+        END;
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER tr_tasks_delete_rollup
+        AFTER DELETE ON tasks WHEN OLD.parent_id IS NOT NULL
+        BEGIN
+            {_ROLLUP_SQL.format(sign="-", ref="OLD")}
+        END;
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER tr_tasks_update_rollup
+        AFTER UPDATE OF parent_id, status ON tasks
+        WHEN OLD.parent_id IS NOT NEW.parent_id OR OLD.status IS NOT NEW.status
+        BEGIN
+            {_ROLLUP_SQL.format(sign="-", ref="OLD")}
+            {_ROLLUP_SQL.format(sign="+", ref="NEW")}
+        END;
+    """)
+
+    logger.info("V9 schema created: tasks.parent_id + subtask rollup counters")
@@ -0,0 +1,21 @@
+"""Registration of every schema migration, in version order.
+
+Importing this module registers ``migrate_v1`` … ``migrate_vN`` with
+:mod:`openclaw_todo.migrations`.  Modules that call
+:func:`~openclaw_todo.migrations.migrate` import this module rather than
+individual ``schema_vN`` modules; a new schema version is added here only.
+(Each ``schema_vN`` also imports its predecessor, so importing one directly
+for a constant cannot register migrations out of order.)
+"""
+
+from __future__ import annotations
+
+import openclaw_todo.schema_v1 as _schema_v1  # noqa: F401
+import openclaw_todo.schema_v2 as _schema_v2  # noqa: F401
+import openclaw_todo.schema_v3 as _schema_v3  # noqa: F401
+import openclaw_todo.schema_v4 as _schema_v4  # noqa: F401
+import openclaw_todo.schema_v5 as _schema_v5  # noqa: F401
+import openclaw_todo.schema_v6 as _schema_v6  # noqa: F401
+import openclaw_todo.schema_v7 as _schema_v7  # noqa: F401
+import openclaw_todo.schema_v8 as _schema_v8  # noqa: F401
+import openclaw_todo.schema_v9 as _schema_v9  # noqa: F401
@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-import sqlite3
-
 
 def build_scope_conditions(
     scope: str,
@@ -45,12 +43,3 @@ def build_scope_conditions(
         params.append(sender_id)
 
     return conditions, params
-
-
-def format_assignees(conn: sqlite3.Connection, task_id: int) -> str:
-    """Return a comma-separated ``<@UID>`` string for *task_id*'s assignees."""
-    rows = conn.execute(
-        "SELECT assignee_user_id FROM task_assignees WHERE task_id = ?",
-        (task_id,),
-    ).fetchall()
-    return ", ".join(f"<@{r[0]}>" for r in rows)
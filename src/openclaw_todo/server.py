@@ -6,28 +6,73 @@ plugin can call it via ``fetch``.  Uses only the Python stdlib
 
 Environment variables
 ---------------------
-OPENCLAW_TODO_PORT      Server port (default 8200)
-OPENCLAW_TODO_DB_PATH   SQLite database path (default: plugin default)
+OPENCLAW_TODO_PORT         Server port (default 8200)
+OPENCLAW_TODO_DB_PATH      SQLite database path (default: plugin default)
+OPENCLAW_TODO_ADMIN_TOKEN  Enables the admin endpoints below (unset: disabled)
+
+Due-date reminders are enabled with ``OPENCLAW_TODO_REMINDER_SINK``; see
+:mod:`openclaw_todo.scheduler`.  Per-tenant databases are enabled with
+``OPENCLAW_TODO_TENANT_DIR``; see :mod:`openclaw_todo.tenants`.  WAL
+checkpoints are run by :mod:`openclaw_todo.checkpoint` and pending data
+backfills by :mod:`openclaw_todo.backfill`.  With
+``OPENCLAW_TODO_GROUP_COMMIT_MS`` set, requests are served on threads and
+mutating commands are committed in groups; see :mod:`openclaw_todo.group_commit`.
+
+``GET /health`` answers ``{"status": "ok"}``.  ``GET /health?deep=1`` adds a
+``"database"`` report (schema version, backfill progress, page and freelist
+counts, WAL size, last managed checkpoint); with tenant routing on it takes
+a ``tenant_id`` query parameter.
+
+``POST /message`` accepts ``{"text", "sender_id"}`` (plus ``"tenant_id"``
+when tenant routing is on) and answers ``{"response": ...}``.  With
+``"format": "json"`` the response is a structured record dict instead of
+Slack text.  With ``"stream": true`` the response is NDJSON: one
+``{"line": ...}`` record per output line, then ``{"done": true, "lines": N}``.
+
+Admin endpoints (``OPENCLAW_TODO_ADMIN_TOKEN`` set; loopback clients only,
+token in ``X-Admin-Token`` or ``Authorization: Bearer``):
+
+``GET /admin/profile``     Profiling session state and per-command output
+``POST /admin/profile``    Arm profiling: ``{"mode": "cprofile"|"sample", "requests": N, "seconds": T}``
+``DELETE /admin/profile``  Stop profiling (results are kept until re-armed)
 """
 
 from __future__ import annotations
 
+import hmac
 import json
 import logging
 import os
 import signal
+import sqlite3
 import sys
+from contextlib import AbstractContextManager, nullcontext
 from http import HTTPStatus
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from typing import Any
-
-from openclaw_todo.plugin import handle_message
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+from typing import Any, Iterable
+from urllib.parse import parse_qs, urlsplit
+
+import openclaw_todo.schemas as _schemas  # noqa: F401 — registers migrations
+from openclaw_todo.backfill import backfill_worker_from_env
+from openclaw_todo.checkpoint import CheckpointManager, checkpoints_from_env, database_health
+from openclaw_todo.db import get_connection
+from openclaw_todo.group_commit import group_commit_from_env
+from openclaw_todo.migrations import migrate
+from openclaw_todo.plugin import handle_message, stream_message
+from openclaw_todo.profiling import ProfileConfigError, Profiler
+from openclaw_todo.scheduler import scheduler_from_env
+from openclaw_todo.sharding import shard_count
+from openclaw_todo.tenants import InvalidTenantError, TenantRegistry, registry_from_env
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_PORT = 8200
 DEFAULT_HOST = "127.0.0.1"
 MAX_BODY_BYTES = 1_048_576  # 1 MiB — reject oversized payloads
+RESPONSE_FORMATS = frozenset({"text", "json"})
+STREAM_FLUSH_BYTES = 65_536  # NDJSON output is written in chunks of about this size
+ADMIN_PROFILE_PATH = "/admin/profile"
+_LOOPBACK_ADDRESSES = frozenset({"127.0.0.1", "::1", "::ffff:127.0.0.1"})
 
 
 def _get_config() -> tuple[str, int, str | None]:
@@ -52,39 +97,172 @@ def _json_response(handler: BaseHTTPRequestHandler, status: int, body: dict[str,
     handler.wfile.write(payload)
 
 
-def _make_handler_class(db_path: str | None) -> type[BaseHTTPRequestHandler]:
-    """Create a request handler class with the given *db_path* baked in."""
+def _ndjson_response(handler: BaseHTTPRequestHandler, lines: Iterable[str] | None) -> None:
+    """Stream *lines* as NDJSON: one ``{"line": ...}`` record per line.
+
+    The body is terminated by ``{"done": true, "lines": N}`` so clients can
+    detect truncation.  The server speaks HTTP/1.0, so the response is
+    delimited by closing the connection instead of by ``Content-Length``;
+    at most ``STREAM_FLUSH_BYTES`` of output is buffered at a time.
+    """
+    handler.send_response(HTTPStatus.OK)
+    handler.send_header("Content-Type", "application/x-ndjson")
+    handler.send_header("Connection", "close")
+    handler.end_headers()
+
+    buf: list[bytes] = []
+    size = 0
+    count = 0
+    try:
+        for line in lines or ():
+            record = json.dumps({"line": line}).encode() + b"\n"
+            buf.append(record)
+            size += len(record)
+            count += 1
+            if size >= STREAM_FLUSH_BYTES:
+                handler.wfile.write(b"".join(buf))
+                buf.clear()
+                size = 0
+        buf.append(json.dumps({"done": True, "lines": count}).encode() + b"\n")
+        handler.wfile.write(b"".join(buf))
+    finally:
+        # Release the DB connection even if the client went away mid-stream
+        close = getattr(lines, "close", None)
+        if close is not None:
+            close()
+
+
+def _command_name(text: str) -> str:
+    """Profiling tag for a message: the ``/todo`` command word, or ``other``."""
+    parts = text.split(maxsplit=2)
+    if len(parts) >= 2 and parts[0] == "/todo":
+        return parts[1].lower()
+    return "other"
+
+
+def _make_handler_class(
+    db_path: str | None,
+    tenants: TenantRegistry | None = None,
+    admin_token: str | None = None,
+    checkpoints: CheckpointManager | None = None,
+) -> type[BaseHTTPRequestHandler]:
+    """Create a request handler class with the given *db_path* (or tenant registry) baked in.
+
+    With an *admin_token*, the ``/admin/profile`` endpoints are enabled; the
+    class's ``profiler`` attribute is the :class:`Profiler` they control.
+    *checkpoints* is reported by ``/health?deep=1``.
+    """
 
     class TodoHTTPHandler(BaseHTTPRequestHandler):
-        """Handle /health and /message endpoints."""
+        """Handle /health, /message and /admin endpoints."""
+
+        profiler: Profiler | None = Profiler() if admin_token else None
 
         def do_GET(self) -> None:  # noqa: N802
-            if self.path == "/health":
-                _json_response(self, HTTPStatus.OK, {"status": "ok"})
+            url = urlsplit(self.path)
+            if url.path == "/health":
+                query = parse_qs(url.query)
+                if query.get("deep", ["0"])[-1] in ("1", "true"):
+                    self._deep_health(query)
+                else:
+                    _json_response(self, HTTPStatus.OK, {"status": "ok"})
+            elif self.path == ADMIN_PROFILE_PATH:
+                if self._admin_allowed():
+                    _json_response(self, HTTPStatus.OK, self.profiler.report())
             else:
                 _json_response(self, HTTPStatus.NOT_FOUND, {"error": "not found"})
 
-        def do_POST(self) -> None:  # noqa: N802
-            if self.path != "/message":
+        def _deep_health(self, query: dict[str, list[str]]) -> None:
+            if shard_count():
+                _json_response(
+                    self,
+                    HTTPStatus.UNPROCESSABLE_ENTITY,
+                    {"error": "deep health is not available with sharded storage"},
+                )
+                return
+            target, manager = db_path, checkpoints
+            if tenants is not None:
+                tenant_id = query.get("tenant_id", [None])[-1]
+                if tenant_id is None:
+                    _json_response(
+                        self,
+                        HTTPStatus.UNPROCESSABLE_ENTITY,
+                        {"error": "missing required parameter: tenant_id"},
+                    )
+                    return
+                try:
+                    target, manager = tenants.path_for(tenant_id), None
+                except InvalidTenantError as exc:
+                    _json_response(self, HTTPStatus.UNPROCESSABLE_ENTITY, {"error": str(exc)})
+                    return
+                if not target.exists():
+                    _json_response(self, HTTPStatus.NOT_FOUND, {"error": "unknown tenant"})
+                    return
+            try:
+                report = database_health(target, manager)
+            except sqlite3.Error as exc:
+                logger.exception("Deep health check failed")
+                _json_response(
+                    self, HTTPStatus.SERVICE_UNAVAILABLE, {"status": "error", "error": f"database error: {exc}"}
+                )
+                return
+            _json_response(self, HTTPStatus.OK, {"status": "ok", "database": report})
+
+        def do_DELETE(self) -> None:  # noqa: N802
+            if self.path != ADMIN_PROFILE_PATH:
                 _json_response(self, HTTPStatus.NOT_FOUND, {"error": "not found"})
+            elif self._admin_allowed():
+                self.profiler.disarm()
+                _json_response(self, HTTPStatus.OK, self.profiler.report())
+
+        def _admin_allowed(self) -> bool:
+            """Check the admin guards, writing the error response when they fail."""
+            if self.profiler is None:
+                _json_response(self, HTTPStatus.NOT_FOUND, {"error": "not found"})
+                return False
+            if self.client_address[0] not in _LOOPBACK_ADDRESSES:
+                _json_response(self, HTTPStatus.FORBIDDEN, {"error": "admin endpoints are localhost-only"})
+                return False
+            token = self.headers.get("X-Admin-Token", "")
+            auth = self.headers.get("Authorization", "")
+            if not token and auth.startswith("Bearer "):
+                token = auth[len("Bearer ") :]
+            if not hmac.compare_digest(token.encode(), admin_token.encode()):
+                _json_response(self, HTTPStatus.UNAUTHORIZED, {"error": "invalid admin token"})
+                return False
+            return True
+
+        def _arm_profiler(self) -> None:
+            if not self._admin_allowed():
+                return
+            data = self._read_json()
+            if data is None:
                 return
+            try:
+                self.profiler.arm(data.get("mode", "cprofile"), data.get("requests"), data.get("seconds"))
+            except ProfileConfigError as exc:
+                _json_response(self, HTTPStatus.UNPROCESSABLE_ENTITY, {"error": str(exc)})
+                return
+            _json_response(self, HTTPStatus.OK, self.profiler.report())
 
+        def _read_json(self) -> dict[str, Any] | None:
+            """Read and decode a JSON object body, writing the error response on failure."""
             # Read body
             try:
                 content_length = int(self.headers.get("Content-Length", 0))
             except (ValueError, TypeError):
                 _json_response(self, HTTPStatus.BAD_REQUEST, {"error": "invalid Content-Length"})
-                return
+                return None
             if content_length == 0:
                 _json_response(self, HTTPStatus.BAD_REQUEST, {"error": "empty body"})
-                return
+                return None
             if content_length > MAX_BODY_BYTES:
                 _json_response(
                     self,
                     HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
                     {"error": f"body exceeds {MAX_BODY_BYTES} byte limit"},
                 )
-                return
+                return None
 
             raw = self.rfile.read(content_length)
 
@@ -93,11 +271,24 @@ def _make_handler_class(db_path: str | None) -> type[BaseHTTPRequestHandler]:
                 data = json.loads(raw)
             except (json.JSONDecodeError, UnicodeDecodeError):
                 _json_response(self, HTTPStatus.BAD_REQUEST, {"error": "invalid JSON"})
-                return
+                return None
 
             # Validate fields
             if not isinstance(data, dict):
                 _json_response(self, HTTPStatus.BAD_REQUEST, {"error": "invalid JSON"})
+                return None
+            return data
+
+        def do_POST(self) -> None:  # noqa: N802
+            if self.path == ADMIN_PROFILE_PATH:
+                self._arm_profiler()
+                return
+            if self.path != "/message":
+                _json_response(self, HTTPStatus.NOT_FOUND, {"error": "not found"})
+                return
+
+            data = self._read_json()
+            if data is None:
                 return
 
             text = data.get("text")
@@ -110,10 +301,61 @@ def _make_handler_class(db_path: str | None) -> type[BaseHTTPRequestHandler]:
                 )
                 return
 
+            response_format = data.get("format", "text")
+            if response_format not in RESPONSE_FORMATS:
+                _json_response(
+                    self,
+                    HTTPStatus.UNPROCESSABLE_ENTITY,
+                    {"error": f"invalid format: must be one of {', '.join(sorted(RESPONSE_FORMATS))}"},
+                )
+                return
+            if data.get("stream") and response_format != "text":
+                _json_response(
+                    self,
+                    HTTPStatus.UNPROCESSABLE_ENTITY,
+                    {"error": "stream is only supported with format=text"},
+                )
+                return
+
+            # Route to the tenant's database
+            pool = None
+            if tenants is not None:
+                tenant_id = data.get("tenant_id")
+                if tenant_id is None:
+                    _json_response(
+                        self,
+                        HTTPStatus.UNPROCESSABLE_ENTITY,
+                        {"error": "missing required field: tenant_id"},
+                    )
+                    return
+                try:
+                    pool = tenants.pool(str(tenant_id))
+                except InvalidTenantError as exc:
+                    _json_response(self, HTTPStatus.UNPROCESSABLE_ENTITY, {"error": str(exc)})
+                    return
+
             # Dispatch
-            response = handle_message(str(text), {"sender_id": str(sender_id)}, db_path=db_path)
+            context = {"sender_id": str(sender_id)}
+            with self._profiled(str(text)):
+                if data.get("stream"):
+                    _ndjson_response(self, stream_message(str(text), context, db_path=db_path, pool=pool))
+                    return
+                try:
+                    response = handle_message(
+                        str(text), context, db_path=db_path, response_format=response_format, pool=pool
+                    )
+                except sqlite3.OperationalError as exc:
+                    # e.g. "database is locked" after busy_timeout; retryable, so 503 not a dropped connection
+                    logger.exception("Database error handling /message")
+                    _json_response(self, HTTPStatus.SERVICE_UNAVAILABLE, {"error": f"database error: {exc}"})
+                    return
             _json_response(self, HTTPStatus.OK, {"response": response})
 
+        def _profiled(self, text: str) -> AbstractContextManager[None]:
+            if self.profiler is None:
+                return nullcontext()
+            return self.profiler.profile(_command_name(text))
+
         def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
             """Route request logs through the Python logger."""
             logger.info(format, *args)
@@ -121,6 +363,15 @@ def _make_handler_class(db_path: str | None) -> type[BaseHTTPRequestHandler]:
     return TodoHTTPHandler
 
 
+def _migrate_database(db_path: str | None) -> None:
+    """Bring the single database up to date before any worker thread opens it."""
+    conn = get_connection(db_path)
+    try:
+        migrate(conn)
+    finally:
+        conn.close()
+
+
 def run(host: str | None = None, port: int | None = None, db_path: str | None = None) -> None:
     """Start the HTTP server (blocking)."""
     env_host, env_port, env_db_path = _get_config()
@@ -128,13 +379,40 @@ def run(host: str | None = None, port: int | None = None, db_path: str | None =
     port = port if port is not None else env_port
     db_path = db_path or env_db_path
 
-    handler_class = _make_handler_class(db_path)
+    tenants = registry_from_env()
+    admin_token = os.environ.get("OPENCLAW_TODO_ADMIN_TOKEN") or None
+    checkpoints = checkpoints_from_env(db_path) if tenants is None else None
+    backfills = backfill_worker_from_env(db_path) if tenants is None and not shard_count() else None
+    committer = group_commit_from_env(db_path) if tenants is None and not shard_count() else None
+    handler_class = _make_handler_class(db_path, tenants, admin_token, checkpoints)
+
+    # Group commit needs concurrent requests to group, so it serves them on threads
+    server_base = ThreadingHTTPServer if committer is not None else HTTPServer
 
-    class ReusableHTTPServer(HTTPServer):
+    class ReusableHTTPServer(server_base):
         allow_reuse_address = True
 
+        def service_actions(self) -> None:
+            # Called by serve_forever between requests
+            if tenants is not None:
+                tenants.evict_idle()
+
     server = ReusableHTTPServer((host, port), handler_class)
 
+    # Workers and the first request would otherwise race to migrate a fresh database
+    if tenants is None and not shard_count():
+        _migrate_database(db_path)
+
+    scheduler = scheduler_from_env(db_path)
+    if scheduler is not None:
+        scheduler.start()
+    if checkpoints is not None:
+        checkpoints.start()
+    if backfills is not None:
+        backfills.start()
+    if committer is not None:
+        committer.start()
+
     # Graceful shutdown on SIGINT / SIGTERM
     def _shutdown(signum: int, _frame: Any) -> None:
         logger.info("Received signal %d, shutting down...", signum)
@@ -149,4 +427,14 @@ def run(host: str | None = None, port: int | None = None, db_path: str | None =
 
     server.serve_forever()
     server.server_close()
+    if scheduler is not None:
+        scheduler.stop()
+    if checkpoints is not None:
+        checkpoints.stop()
+    if backfills is not None:
+        backfills.stop()
+    if committer is not None:
+        committer.stop()
+    if tenants is not None:
+        tenants.close()
     logger.info("Server stopped.")
@@ -0,0 +1,460 @@
+"""Optional sharded storage: projects partitioned across several SQLite files.
+
+With ``OPENCLAW_TODO_SHARDS=N`` (N >= 2) the single ``todo.sqlite3`` is
+replaced by N shard files next to it (``todo.shard0.sqlite3`` ...) plus a
+small routing catalog (``todo.catalog.sqlite3``).  Every shard is a complete
+database with the usual schema, so the command handlers run unchanged
+against whichever shard a command is routed to.
+
+Routing
+-------
+* Projects are placed by name: a catalog override if one exists (written
+  when a rename would otherwise change the name's shard), else
+  ``crc32(name) % N``.  All projects sharing a name live on the same shard,
+  so the private-first resolver works within a shard.
+* ``Inbox`` exists on every shard; new Inbox tasks go to a shard chosen by
+  the sender's ID, spreading the busiest project's writes.
+* Task IDs are allocated in disjoint blocks of ``ID_BLOCK`` per shard, so a
+  task's shard is ``(id - 1) // ID_BLOCK`` and ``move``/``done``/``drop``/
+  ``edit`` need no lookup.  ``add ... parent:#N`` goes to the parent's
+  shard, since subtasks live in their parent's project.
+* ``list``/``board``/``search`` with a ``/p`` project go to that project's
+  shard.  Without one (or for ``/p Inbox``), and for ``digest`` and
+  ``project list``, the query runs on every shard in parallel and the
+  per-shard results — each already in the shared sort order — are merged.
+
+The shard count is recorded in the catalog; opening the layout with a
+different count is refused, since it would re-route existing projects.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import os
+import sqlite3
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Iterable, TypeVar
+
+import openclaw_todo.schemas as _schemas  # noqa: F401 — registers migrations
+from openclaw_todo import cmd_board, cmd_digest, cmd_list, cmd_project_list, cmd_search
+from openclaw_todo.db import DEFAULT_DB_DIR, DEFAULT_DB_NAME, get_connection
+from openclaw_todo.migrations import migrate
+from openclaw_todo.models import TaskRow
+from openclaw_todo.parser import ParsedCommand
+from openclaw_todo.task_query import FilterError, sort_key
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Task IDs reserved per shard: shard i allocates i*ID_BLOCK+1 .. (i+1)*ID_BLOCK.
+ID_BLOCK = 100_000_000
+
+INBOX = "Inbox"
+
+_TASK_ID_COMMANDS = frozenset({"move", "done", "drop", "edit"})
+_FILTER_COMMANDS = frozenset({"list", "board", "search"})
+
+_CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shard_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS project_routes (
+    name  TEXT PRIMARY KEY,
+    shard INTEGER NOT NULL
+);
+"""
+
+
+class ShardRoutingError(Exception):
+    """Raised when a command cannot be served by a single shard; the message is user-facing."""
+
+
+def shard_count() -> int:
+    """Return the configured shard count (``OPENCLAW_TODO_SHARDS``), or 0 when sharding is off."""
+    raw = os.environ.get("OPENCLAW_TODO_SHARDS")
+    if not raw:
+        return 0
+    try:
+        count = int(raw)
+    except ValueError:
+        count = 0
+    if count < 2:
+        logger.warning("Invalid OPENCLAW_TODO_SHARDS=%r (need an integer >= 2); sharding disabled", raw)
+        return 0
+    return count
+
+
+class ShardRouter:
+    """Routes commands to the shard files of one sharded layout."""
+
+    def __init__(self, db_path: str | Path | None, count: int) -> None:
+        base = Path(db_path) if db_path is not None else DEFAULT_DB_DIR / DEFAULT_DB_NAME
+        self.count = count
+        self.catalog_path = base.with_name(f"{base.stem}.catalog{base.suffix}")
+        self.shard_paths = [base.with_name(f"{base.stem}.shard{i}{base.suffix}") for i in range(count)]
+        self._ready: set[int] = set()
+        self._lock = threading.Lock()
+        self._init_catalog()
+
+    # --- Catalog ---
+
+    def _catalog(self) -> sqlite3.Connection:
+        return get_connection(self.catalog_path)
+
+    def _init_catalog(self) -> None:
+        conn = self._catalog()
+        try:
+            conn.executescript(_CATALOG_SCHEMA)
+            conn.execute("INSERT OR IGNORE INTO shard_meta (key, value) VALUES ('shard_count', ?);", (str(self.count),))
+            conn.commit()
+            stored = int(conn.execute("SELECT value FROM shard_meta WHERE key = 'shard_count';").fetchone()[0])
+        finally:
+            conn.close()
+        if stored != self.count:
+            raise RuntimeError(
+                f"{self.catalog_path} was created for {stored} shards; "
+                f"OPENCLAW_TODO_SHARDS={self.count} would re-route existing projects"
+            )
+
+    def shard_for_project(self, name: str) -> int:
+        """Return the shard holding projects called *name*."""
+        name = name.strip()
+        conn = self._catalog()
+        try:
+            row = conn.execute("SELECT shard FROM project_routes WHERE name = ?;", (name,)).fetchone()
+        finally:
+            conn.close()
+        if row is not None:
+            return row[0]
+        return zlib.crc32(name.encode()) % self.count
+
+    def _pin_project(self, name: str, shard: int) -> None:
+        conn = self._catalog()
+        try:
+            conn.execute(
+                "INSERT INTO project_routes (name, shard) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET shard = excluded.shard;",
+                (name, shard),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def shard_for_task(self, task_id: int) -> int:
+        """Return the shard that allocated *task_id* (shard 0 for out-of-range IDs)."""
+        shard = (task_id - 1) // ID_BLOCK
+        return shard if 0 <= shard < self.count else 0
+
+    def inbox_shard(self, sender_id: str) -> int:
+        """Shard receiving *sender_id*'s new Inbox tasks."""
+        return zlib.crc32(sender_id.encode()) % self.count
+
+    # --- Connections ---
+
+    def connect(self, shard: int) -> sqlite3.Connection:
+        """Open a connection to *shard*, migrating it and reserving its ID block on first use."""
+        conn = get_connection(self.shard_paths[shard])
+        if shard not in self._ready:
+            with self._lock:
+                migrate(conn)
+                _reserve_id_block(conn, shard)
+                self._ready.add(shard)
+        return conn
+
+    def map(self, fn: Callable[[sqlite3.Connection], T]) -> list[T]:
+        """Run *fn* against every shard in parallel (one connection each); results in shard order."""
+
+        def run(shard: int) -> T:
+            conn = self.connect(shard)
+            try:
+                return fn(conn)
+            finally:
+                conn.close()
+
+        return list(_executor(self.count).map(run, range(self.count)))
+
+    # --- Routing ---
+
+    def route(self, parsed: ParsedCommand, context: dict) -> int | None:
+        """Return the shard serving *parsed*, or ``None`` when it must fan out to all shards.
+
+        Raises :class:`ShardRoutingError` for operations that would move data
+        between shards.
+        """
+        command = parsed.command
+        if command == "add":
+            if parsed.parent:
+                return self.shard_for_task(parsed.parent)  # subtasks live in their parent's project
+            project = (parsed.project or INBOX).strip()
+            return self.inbox_shard(context["sender_id"]) if project == INBOX else self.shard_for_project(project)
+
+        if command in _TASK_ID_COMMANDS:
+            try:
+                shard = self.shard_for_task(int(parsed.args[0]))
+            except (IndexError, ValueError):
+                return 0  # the handler reports the bad or missing ID
+            if command == "edit" and parsed.project and parsed.project.strip() != INBOX:
+                if self.shard_for_project(parsed.project) != shard:
+                    raise ShardRoutingError(
+                        f'❌ Task #{parsed.args[0]} cannot be moved to project "{parsed.project}": '
+                        "it is stored in a different shard."
+                    )
+            return shard
+
+        if command in _FILTER_COMMANDS:
+            if parsed.project and parsed.project.strip() != INBOX:
+                return self.shard_for_project(parsed.project)
+            return None
+
+        if command == "digest":
+            return None
+
+        if command == "project":
+            tokens = parsed.title_tokens or parsed.args
+            if not tokens:
+                return 0
+            sub = tokens[0].lower()
+            if sub == "list":
+                return None
+            if len(tokens) < 2:
+                return 0
+            shard = self.shard_for_project(tokens[1])
+            if sub == "rename" and len(tokens) >= 3:
+                self._route_rename(tokens[2].strip(), shard)
+            return shard
+
+        if command == "view":
+            raise ShardRoutingError("❌ Saved views are not available with sharded storage.")
+
+        return 0
+
+    def _route_rename(self, new_name: str, shard: int) -> None:
+        """Keep *new_name* routed to *shard*, the shard of the project being renamed."""
+        if not new_name or new_name == INBOX or self.shard_for_project(new_name) == shard:
+            return
+        for other in range(self.count):
+            if other == shard:
+                continue
+            conn = self.connect(other)
+            try:
+                taken = conn.execute("SELECT 1 FROM projects WHERE name = ? LIMIT 1;", (new_name,)).fetchone()
+            finally:
+                conn.close()
+            if taken:
+                raise ShardRoutingError(
+                    f'❌ Cannot rename to "{new_name}": a project with that name is stored in a different shard.'
+                )
+        self._pin_project(new_name, shard)
+        logger.info("Pinned project name %r to shard %d", new_name, shard)
+
+    # --- Fan-out ---
+
+    def fan_out(self, key: str, parsed: ParsedCommand, context: dict) -> str:
+        """Serve a fan-out command as Slack text."""
+        return _FAN_OUT_TEXT[key](self, parsed, context)
+
+    def fan_out_records(self, key: str, parsed: ParsedCommand, context: dict) -> dict[str, Any]:
+        """Serve a fan-out command as a structured result (raises :class:`FilterError`)."""
+        return _FAN_OUT_RECORDS[key](self, parsed, context)
+
+
+def _reserve_id_block(conn: sqlite3.Connection, shard: int) -> None:
+    """Start *shard*'s task IDs at ``shard * ID_BLOCK + 1`` (a no-op once allocated)."""
+    floor = shard * ID_BLOCK
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'tasks';").fetchone()
+    if row is None:
+        conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('tasks', ?);", (floor,))
+    elif row[0] < floor:
+        conn.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = 'tasks';", (floor,))
+    conn.commit()
+
+
+# One worker pool per shard count, shared by every router with that count.
+_pools: dict[int, ThreadPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _executor(count: int) -> ThreadPoolExecutor:
+    with _pools_lock:
+        pool = _pools.get(count)
+        if pool is None:
+            pool = _pools[count] = ThreadPoolExecutor(max_workers=count, thread_name_prefix="openclaw-todo-shard")
+        return pool
+
+
+_routers: dict[tuple[str, int], ShardRouter] = {}
+_routers_lock = threading.Lock()
+
+
+def get_router(db_path: str | Path | None) -> ShardRouter | None:
+    """Return the (cached) router for *db_path*, or ``None`` when sharding is off."""
+    count = shard_count()
+    if not count:
+        return None
+    key = (str(db_path), count)
+    with _routers_lock:
+        router = _routers.get(key)
+        if router is None:
+            router = _routers[key] = ShardRouter(db_path, count)
+        return router
+
+
+# --- Merging -------------------------------------------------------------
+
+
+def _merge_rows(parts: Iterable[Iterable[TaskRow]], limit: int) -> list[TaskRow]:
+    """Merge per-shard rows already in ``ORDER_BY`` order; keep the first *limit*."""
+    return list(islice(heapq.merge(*parts, key=sort_key), limit))
+
+
+def _list_parts(router: ShardRouter, parsed: ParsedCommand, context: dict):
+    def part(conn: sqlite3.Connection):
+        filt, total, rows = cmd_list.list_page(parsed, conn, context)
+        return filt, total, list(rows)
+
+    parts = router.map(part)
+    filt = parts[0][0]
+    return filt, sum(total for _, total, _ in parts), _merge_rows((rows for _, _, rows in parts), filt.limit)
+
+
+def _list_text(router: ShardRouter, parsed: ParsedCommand, context: dict) -> str:
+    try:
+        page = _list_parts(router, parsed, context)
+    except FilterError as exc:
+        return str(exc)
+    return "\n".join(cmd_list.render_list_lines(parsed, *page))
+
+
+def _list_records(router: ShardRouter, parsed: ParsedCommand, context: dict) -> dict[str, Any]:
+    return cmd_list.list_record(parsed, *_list_parts(router, parsed, context))
+
+
+def _board_cursor_key(router: ShardRouter, parsed: ParsedCommand) -> cmd_board.CursorKey | None:
+    """Look up a ``board more ... after:#id`` cursor once, on the shard holding that task."""
+    _, cursor = cmd_board.parse_more(parsed)
+    if cursor is None or cursor.after_id is None:
+        return None
+    conn = router.connect(router.shard_for_task(cursor.after_id))
+    try:
+        return cmd_board.cursor_key(conn, cursor.after_id)
+    finally:
+        conn.close()
+
+
+def _board_parts(router: ShardRouter, parsed: ParsedCommand, context: dict):
+    after_key = _board_cursor_key(router, parsed)
+
+    def part(conn: sqlite3.Connection):
+        filt, counts, section_rows = cmd_board.board_page(parsed, conn, context, after_key=after_key)
+        return filt, counts, {section: list(section_rows(section)) for section in counts}
+
+    parts = router.map(part)
+    filt = parts[0][0]
+    counts: dict[str, int] = {}
+    for _, shard_counts, _ in parts:
+        for section, n in shard_counts.items():
+            counts[section] = counts.get(section, 0) + n
+    merged = {section: _merge_rows((rows.get(section, ()) for _, _, rows in parts), filt.limit) for section in counts}
+    return filt, counts, lambda section: merged.get(section, [])
+
+
+def _board_text(router: ShardRouter, parsed: ParsedCommand, context: dict) -> str:
+    try:
+        page = _board_parts(router, parsed, context)
+    except FilterError as exc:
+        return str(exc)
+    return "\n".join(cmd_board.render_board_lines(parsed, *page))
+
+
+def _board_records(router: ShardRouter, parsed: ParsedCommand, context: dict) -> dict[str, Any]:
+    return cmd_board.board_record(parsed, *_board_parts(router, parsed, context))
+
+
+def _search_parts(router: ShardRouter, parsed: ParsedCommand, context: dict):
+    def part(conn: sqlite3.Connection):
+        filt, total, ranked = cmd_search.search_page(parsed, conn, context)
+        return filt, total, list(ranked)
+
+    parts = router.map(part)
+    filt = parts[0][0]
+    # bm25 scores are per shard, so this is best-effort relevance; ties (and
+    # the unranked LIKE fallback) fall back to the list order.
+    ranked = sorted((pair for _, _, pairs in parts for pair in pairs), key=lambda pair: (pair[0], *sort_key(pair[1])))
+    return filt, sum(total for _, total, _ in parts), [task for _, task in ranked[: filt.limit]]
+
+
+def _search_text(router: ShardRouter, parsed: ParsedCommand, context: dict) -> str:
+    try:
+        page = _search_parts(router, parsed, context)
+    except FilterError as exc:
+        return str(exc)
+    return "\n".join(cmd_search.render_search_lines(parsed, *page))
+
+
+def _search_records(router: ShardRouter, parsed: ParsedCommand, context: dict) -> dict[str, Any]:
+    return cmd_search.search_record(parsed, *_search_parts(router, parsed, context))
+
+
+def _digest(router: ShardRouter, parsed: ParsedCommand, context: dict, today: date) -> cmd_digest.Digest:
+    user_id = parsed.mentions[0] if parsed.mentions else context["sender_id"]
+    parts = router.map(lambda conn: list(cmd_digest.iter_digests(conn, today, [user_id], viewer=context["sender_id"])))
+    digest = cmd_digest.Digest(user_id)
+    for bucket in cmd_digest.BUCKETS:
+        tasks = [task for shard_digests in parts for d in shard_digests for task in getattr(d, bucket)]
+        # Same order as the digest query: due_day (NULLs first), then id
+        tasks.sort(key=lambda t: (t.due is not None, t.due or "", t.id))
+        setattr(digest, bucket, tasks)
+    return digest
+
+
+def _digest_text(router: ShardRouter, parsed: ParsedCommand, context: dict) -> str:
+    today = date.today()
+    return cmd_digest.render_digest(_digest(router, parsed, context, today), today)
+
+
+def _digest_records(router: ShardRouter, parsed: ParsedCommand, context: dict) -> dict[str, Any]:
+    today = date.today()
+    return {"date": today.isoformat(), **_digest(router, parsed, context, today).as_record()}
+
+
+def _projects(router: ShardRouter, context: dict) -> list[tuple]:
+    """Visible projects across shards; the per-shard Inboxes are reported as one."""
+    merged: dict[tuple, list] = {}
+    for rows in router.map(lambda conn: cmd_project_list.visible_projects(conn, context["sender_id"])):
+        for pid, name, visibility, owner, task_count in rows:
+            entry = merged.setdefault((name, visibility, owner), [pid, name, visibility, owner, 0])
+            entry[4] += task_count
+    return sorted((tuple(entry) for entry in merged.values()), key=lambda row: (row[2], row[1]))
+
+
+def _project_list_text(router: ShardRouter, parsed: ParsedCommand, context: dict) -> str:
+    return cmd_project_list.render_project_list(_projects(router, context), context["sender_id"])
+
+
+def _project_list_records(router: ShardRouter, parsed: ParsedCommand, context: dict) -> dict[str, Any]:
+    return cmd_project_list.project_list_record(_projects(router, context))
+
+
+_FAN_OUT_TEXT: dict[str, Callable[[ShardRouter, ParsedCommand, dict], str]] = {
+    "list": _list_text,
+    "board": _board_text,
+    "search": _search_text,
+    "digest": _digest_text,
+    "project_list": _project_list_text,
+}
+
+_FAN_OUT_RECORDS: dict[str, Callable[[ShardRouter, ParsedCommand, dict], dict[str, Any]]] = {
+    "list": _list_records,
+    "board": _board_records,
+    "search": _search_records,
+    "digest": _digest_records,
+    "project_list": _project_list_records,
+}
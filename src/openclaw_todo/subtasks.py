@@ -0,0 +1,57 @@
+"""Rules for linking subtasks to parent tasks (``parent:#N``, schema V9).
+
+A subtask lives in its parent's project, so both are visible to the same
+people (and, with sharded storage, stored in the same shard); linking needs
+write access to the parent, whose progress counters the link changes.
+Parent chains are walked with a recursive CTE over ``tasks.parent_id``, one
+primary-key lookup per level, to refuse links that would form a cycle.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+from openclaw_todo.permissions import WriteTarget
+
+# ``?`` and all of its ancestors.  UNION (not UNION ALL) stops the walk at a
+# repeated id, so even a corrupted chain terminates.
+_ANCESTORS_SQL = """
+    WITH RECURSIVE ancestors(id) AS (
+        SELECT ?
+        UNION
+        SELECT t.parent_id FROM tasks t JOIN ancestors a ON t.id = a.id WHERE t.parent_id IS NOT NULL
+    )
+"""
+
+
+def parent_error(target: WriteTarget | None, parent_id: int, project_id: int | None = None) -> str | None:
+    """Return why *target* (the pre-read of task *parent_id*) cannot take a subtask, or ``None``.
+
+    With *project_id* the subtask's project must also be the parent's.
+    """
+    if target is None:
+        return f"❌ Parent task #{parent_id} not found."
+    if not target.writable:
+        return f"❌ You don't have permission to add subtasks to task #{parent_id}."
+    if project_id is not None and project_id != target.task.project_id:
+        return project_mismatch(target)
+    return None
+
+
+def project_mismatch(target: WriteTarget) -> str:
+    """Error for a subtask placed outside its parent's project."""
+    return (
+        f"❌ Subtasks must be in the same project as their parent "
+        f'(#{target.task.id} is in "{target.task.project_name}").'
+    )
+
+
+def creates_cycle(conn: sqlite3.Connection, task_id: int, parent_id: int) -> bool:
+    """Return whether making *parent_id* the parent of *task_id* would make a task its own ancestor."""
+    row = conn.execute(f"{_ANCESTORS_SQL} SELECT 1 FROM ancestors WHERE id = ? LIMIT 1;", (parent_id, task_id))
+    return row.fetchone() is not None
+
+
+def has_subtasks(conn: sqlite3.Connection, task_id: int) -> bool:
+    """Return whether any task (dropped ones included) has *task_id* as its parent."""
+    return conn.execute("SELECT 1 FROM tasks WHERE parent_id = ? LIMIT 1;", (task_id,)).fetchone() is not None
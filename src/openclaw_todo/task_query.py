@@ -0,0 +1,191 @@
+"""Shared filter building for task queries (``list``, ``board``, ``search``).
+
+These commands accept the same scope / status / project options; this module
+turns a :class:`ParsedCommand` into SQL WHERE fragments once, so the text
+renderers and the structured (JSON) renderers run the exact same query.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+
+from openclaw_todo.models import TaskRow
+from openclaw_todo.parser import PARENT_CLEAR, DateRange, ParsedCommand
+from openclaw_todo.project_resolver import AmbiguousProjectError, ProjectNotFoundError, resolve_project
+from openclaw_todo.scope_builder import build_scope_conditions
+
+# Assumes the SELECT list refers to ``tasks`` as ``t`` and ``projects`` as ``p``.
+FROM_CLAUSE = "FROM tasks t JOIN projects p ON t.project_id = p.id"
+
+# Shared sort order: due ASC with undated tasks last, then id DESC.  Sorts on
+# the integer ``due_day`` column (schema V4) so it can follow the index.
+ORDER_BY = "t.due_day ASC NULLS LAST, t.id DESC"
+
+
+def sort_key(task: TaskRow) -> tuple[bool, str, int]:
+    """Python equivalent of ``ORDER_BY``, for merging already-sorted result sets."""
+    return task.due is None, task.due or "", -task.id
+
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def epoch_day(day: date) -> int:
+    """Return *day* as days since 1970-01-01, the unit of ``tasks.due_day``."""
+    return day.toordinal() - _EPOCH_ORDINAL
+
+
+def _local_midnight_epoch(day: date) -> int:
+    """Unix seconds at local midnight starting *day* (``closed_epoch`` is UTC-based)."""
+    return int(datetime.combine(day, time()).timestamp())
+
+
+class FilterError(Exception):
+    """Raised for invalid filter options; the message is user-facing."""
+
+
+@dataclass(slots=True)
+class TaskFilter:
+    """A resolved task filter, ready to be AND-joined into a WHERE clause."""
+
+    scope: str  # 'mine' | 'all' | 'user'
+    status: str  # 'open' | 'done' | 'dropped'
+    section: str | None
+    limit: int
+    conditions: list[str] = field(default_factory=list)
+    params: list[str | int] = field(default_factory=list)
+    terms: list[str] = field(default_factory=list)  # title tokens that are not filter options
+
+    @property
+    def where(self) -> str:
+        return " AND ".join(self.conditions)
+
+
+def build_task_filter(
+    parsed: ParsedCommand,
+    conn: sqlite3.Connection,
+    sender_id: str,
+    *,
+    limit_option: str,
+    default_limit: int,
+    section_filter: bool,
+    default_scope: str = "mine",
+) -> TaskFilter:
+    """Resolve scope, status, section, project and limit options.
+
+    *limit_option* is the ``name:N`` token that sets the limit (``limit`` for
+    list, ``limitPerSection`` for board).  When *section_filter* is false a
+    ``/s`` option only selects the done/drop status, as on the board.
+
+    Date filters (``parsed.due_range`` / ``parsed.closed_range``) become
+    integer range predicates on ``due_day`` / ``closed_epoch``;
+    ``parsed.no_due`` selects tasks without a due date.  A closed
+    filter without an explicit status selects ``done`` tasks.
+    ``parent:#N`` selects the subtasks of task N (via the V9
+    ``parent_id`` index), ``parent:-`` top-level tasks only.
+
+    Raises :class:`FilterError` for an invalid limit or unresolvable project.
+    """
+    # --- Parse scope, status and limit from title_tokens ---
+    scope = default_scope
+    scope_user: str | None = None
+    limit = default_limit
+    status_token: str | None = None
+    limit_prefix = limit_option.lower() + ":"
+    terms: list[str] = []
+
+    for tok in parsed.title_tokens:
+        low = tok.lower()
+        if low in ("mine", "all"):
+            scope = low
+        elif low in ("open", "done", "drop"):
+            status_token = low
+        elif low.startswith(limit_prefix):
+            try:
+                limit = int(low.split(":", 1)[1])
+            except ValueError:
+                limit = 0
+            if limit < 1:
+                raise FilterError(f'❌ Invalid {limit_option} value "{tok}". Must be a positive integer.')
+        else:
+            terms.append(tok)
+
+    # If mentions present in parsed, treat first as scope target
+    if parsed.mentions:
+        scope = "user"
+        scope_user = parsed.mentions[0]
+
+    # Status filter: title_token > /s section > default "open"
+    status = "open"
+    section = parsed.section if section_filter else None
+    if status_token:
+        status = "dropped" if status_token == "drop" else status_token
+        if section in ("done", "drop"):
+            section = None
+    elif parsed.section in ("done", "drop"):
+        status = "done" if parsed.section == "done" else "dropped"
+        # Don't also filter by section since we're using status
+        section = None
+    elif parsed.closed_range is not None:
+        status = "done"
+
+    result = TaskFilter(scope=scope, status=status, section=section, limit=limit, terms=terms)
+    result.conditions.append("t.status = ?")
+    result.params.append(status)
+
+    if section:
+        result.conditions.append("t.section = ?")
+        result.params.append(section)
+
+    if parsed.no_due:
+        result.conditions.append("t.due_day IS NULL")
+    if parsed.due_range is not None:
+        _add_day_range(result, parsed.due_range)
+    if parsed.closed_range is not None:
+        _add_closed_range(result, parsed.closed_range)
+    if parsed.parent == PARENT_CLEAR:
+        result.conditions.append("t.parent_id IS NULL")
+    elif parsed.parent is not None:
+        result.conditions.append("t.parent_id = ?")
+        result.params.append(parsed.parent)
+
+    # Project filter
+    if parsed.project:
+        try:
+            project = resolve_project(conn, parsed.project, sender_id, visibility=parsed.project_visibility)
+        except AmbiguousProjectError:
+            raise FilterError(
+                f'❌ Ambiguous project name "{parsed.project}": both shared and private projects exist. '
+                f'Append "shared" or "private" to disambiguate.'
+            ) from None
+        except ProjectNotFoundError:
+            raise FilterError(f'❌ Project "{parsed.project}" not found.') from None
+        result.conditions.append("t.project_id = ?")
+        result.params.append(project.id)
+
+    # Scope filter
+    scope_conds, scope_params = build_scope_conditions(scope, sender_id, scope_user)
+    result.conditions.extend(scope_conds)
+    result.params.extend(scope_params)
+
+    return result
+
+
+def _add_day_range(filt: TaskFilter, rng: DateRange) -> None:
+    if rng.start is not None:
+        filt.conditions.append("t.due_day >= ?")
+        filt.params.append(epoch_day(rng.start))
+    if rng.end is not None:
+        filt.conditions.append("t.due_day <= ?")
+        filt.params.append(epoch_day(rng.end))
+
+
+def _add_closed_range(filt: TaskFilter, rng: DateRange) -> None:
+    if rng.start is not None:
+        filt.conditions.append("t.closed_epoch >= ?")
+        filt.params.append(_local_midnight_epoch(rng.start))
+    if rng.end is not None:
+        filt.conditions.append("t.closed_epoch < ?")
+        filt.params.append(_local_midnight_epoch(rng.end + timedelta(days=1)))
@@ -0,0 +1,188 @@
+"""Per-tenant database routing for the HTTP server.
+
+With ``OPENCLAW_TODO_TENANT_DIR`` set, every ``POST /message`` names a
+tenant (a Slack workspace/team ID) and is served from its own database,
+``<dir>/<tenant_id>.sqlite3``, so one server process can host many
+workspaces.
+
+Each tenant gets a small :class:`ConnectionPool` of already-migrated
+connections.  Pools are created (and the tenant database migrated) on the
+tenant's first request, kept in a bounded LRU, and closed when they fall
+off the LRU or have been idle for longer than the idle timeout.
+
+Environment variables
+---------------------
+OPENCLAW_TODO_TENANT_DIR           Directory of per-tenant databases (unset: single database)
+OPENCLAW_TODO_TENANT_CACHE         Max tenants with open connections (default 128)
+OPENCLAW_TODO_TENANT_IDLE_SECONDS  Close a tenant's connections after this much inactivity (default 600)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+import openclaw_todo.schemas as _schemas  # noqa: F401 — registers migrations
+from openclaw_todo.db import get_connection
+from openclaw_todo.migrations import migrate
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_TENANTS = 128
+DEFAULT_IDLE_SECONDS = 600.0
+
+# Idle connections kept per tenant; extra connections are closed on release.
+POOL_SIZE = 4
+
+# Slack team IDs (``T0123ABCD``) and similar; also keeps IDs safe as file names.
+_TENANT_ID_RE = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+class InvalidTenantError(ValueError):
+    """Raised for a malformed tenant ID; the message is client-facing."""
+
+
+class ConnectionPool:
+    """Reusable connections to one database file, migrated when the pool is created."""
+
+    def __init__(self, db_path: str | Path, size: int = POOL_SIZE) -> None:
+        self.db_path = Path(db_path)
+        self.size = size
+        self.closed = False
+        self._idle: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        conn = self._open()
+        migrate(conn)
+        self._idle.append(conn)
+
+    def _open(self) -> sqlite3.Connection:
+        return get_connection(self.db_path, check_same_thread=False)
+
+    def acquire(self) -> sqlite3.Connection:
+        """Check out a connection (opening a new one if none is idle)."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._open()
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return *conn* to the pool, or close it if the pool is full or closed."""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if not self.closed and len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        """Close idle connections; checked-out ones are closed when released."""
+        with self._lock:
+            self.closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class TenantRegistry:
+    """Bounded LRU of per-tenant connection pools rooted at *root*.
+
+    *clock* is injectable for tests.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        max_tenants: int = DEFAULT_MAX_TENANTS,
+        idle_seconds: float = DEFAULT_IDLE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.root = Path(root)
+        self.max_tenants = max_tenants
+        self.idle_seconds = idle_seconds
+        self._clock = clock
+        # tenant_id -> (pool, last used); least recently used first
+        self._pools: OrderedDict[str, tuple[ConnectionPool, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    def __contains__(self, tenant_id: object) -> bool:
+        return tenant_id in self._pools
+
+    def path_for(self, tenant_id: str) -> Path:
+        """Return the database path of *tenant_id*; raise :class:`InvalidTenantError` if malformed."""
+        if not _TENANT_ID_RE.fullmatch(tenant_id):
+            raise InvalidTenantError("invalid tenant_id: use 1-64 letters, digits, '-' or '_'")
+        return self.root / f"{tenant_id}.sqlite3"
+
+    def pool(self, tenant_id: str) -> ConnectionPool:
+        """Return *tenant_id*'s pool, creating it (and migrating its database) on first use."""
+        path = self.path_for(tenant_id)
+        now = self._clock()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._pools.pop(tenant_id, None)
+            pool = entry[0] if entry is not None else ConnectionPool(path)
+            self._pools[tenant_id] = (pool, now)
+            if entry is None:
+                logger.info("Opened tenant %s (%d open)", tenant_id, len(self._pools))
+            while len(self._pools) > self.max_tenants:
+                evicted, (old, _) = self._pools.popitem(last=False)
+                old.close()
+                logger.info("Evicted least recently used tenant %s", evicted)
+        return pool
+
+    def evict_idle(self) -> int:
+        """Close pools idle for longer than ``idle_seconds``; return how many were closed."""
+        with self._lock:
+            return self._evict_idle(self._clock())
+
+    def _evict_idle(self, now: float) -> int:
+        evicted = 0
+        # LRU order is last-use order, so idle tenants are all at the front
+        while self._pools:
+            tenant_id, (pool, last_used) = next(iter(self._pools.items()))
+            if now - last_used <= self.idle_seconds:
+                break
+            del self._pools[tenant_id]
+            pool.close()
+            evicted += 1
+            logger.info("Evicted idle tenant %s", tenant_id)
+        return evicted
+
+    def close(self) -> None:
+        """Close every pool."""
+        with self._lock:
+            pools, self._pools = self._pools, OrderedDict()
+        for pool, _ in pools.values():
+            pool.close()
+
+
+def registry_from_env() -> TenantRegistry | None:
+    """Build a registry from ``OPENCLAW_TODO_TENANT_*`` variables, or ``None`` if disabled."""
+    root = os.environ.get("OPENCLAW_TODO_TENANT_DIR")
+    if not root:
+        return None
+    try:
+        max_tenants = int(os.environ.get("OPENCLAW_TODO_TENANT_CACHE", str(DEFAULT_MAX_TENANTS)))
+    except ValueError:
+        max_tenants = 0
+    if max_tenants < 1:
+        logger.warning("Invalid OPENCLAW_TODO_TENANT_CACHE, falling back to %d", DEFAULT_MAX_TENANTS)
+        max_tenants = DEFAULT_MAX_TENANTS
+    try:
+        idle_seconds = float(os.environ.get("OPENCLAW_TODO_TENANT_IDLE_SECONDS", str(DEFAULT_IDLE_SECONDS)))
+    except ValueError:
+        logger.warning("Invalid OPENCLAW_TODO_TENANT_IDLE_SECONDS, falling back to %d", DEFAULT_IDLE_SECONDS)
+        idle_seconds = DEFAULT_IDLE_SECONDS
+    return TenantRegistry(root, max_tenants=max_tenants, idle_seconds=idle_seconds)
@@ -0,0 +1,210 @@
+"""Opt-in request tracing and slow-request log.
+
+With ``OPENCLAW_TODO_TRACE_SLOW_MS`` set, each :func:`~openclaw_todo.plugin.handle_message`
+/ :func:`~openclaw_todo.dispatcher.dispatch` call is traced: phases (``parse``,
+``connect``, ``migrate_check``, ``resolve_project``, ``handler``, ``format``,
+``commit`` ...) are recorded as spans, and every SQL statement run on the request's
+connection is captured through :meth:`sqlite3.Connection.set_trace_callback`.
+Requests slower than the threshold are written to the slow log as one JSON
+object, including their spans and statements.
+
+SQLite only reports when a statement starts, so a statement's duration is
+the time until the next statement or phase boundary.  ``format`` covers
+rendering a result as text or records; for streamed reads (``list``,
+``board``, ``search``) rows are fetched while they are rendered, so it also
+includes the fetches (and their statements run inside it).  Shard fan-out queries run on worker threads and are
+covered by a single ``fan_out`` span.
+
+The active trace lives in a context variable, so :func:`span` is a cheap
+no-op when tracing is off.
+
+Environment variables
+---------------------
+OPENCLAW_TODO_TRACE_SLOW_MS  Log requests taking at least this many milliseconds (unset: tracing off)
+OPENCLAW_TODO_TRACE_LOG      Append slow-request records to this JSONL file (default: the logger)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import wraps
+from inspect import isgeneratorfunction
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_current: ContextVar[Trace | None] = ContextVar("openclaw_todo_trace", default=None)
+_log_lock = threading.Lock()
+
+
+def slow_threshold_ms() -> float | None:
+    """Return the slow-request threshold from ``OPENCLAW_TODO_TRACE_SLOW_MS``, or ``None`` if tracing is off."""
+    raw = os.environ.get("OPENCLAW_TODO_TRACE_SLOW_MS")
+    if not raw:
+        return None
+    try:
+        return max(float(raw), 0.0)
+    except ValueError:
+        logger.warning("Invalid OPENCLAW_TODO_TRACE_SLOW_MS, tracing disabled")
+        return None
+
+
+class Trace:
+    """Spans and SQL statements recorded for one request."""
+
+    __slots__ = ("name", "attrs", "start", "spans", "statements", "_statement")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.attrs: dict[str, Any] = {}
+        self.start = time.perf_counter()
+        self.spans: list[list[Any]] = []  # [name, start offset, duration] in start order
+        self.statements: list[tuple[str, float]] = []
+        self._statement: tuple[str, float] | None = None
+
+    def on_statement(self, sql: str) -> None:
+        """``set_trace_callback`` hook: close the running statement and start timing *sql*."""
+        now = time.perf_counter()
+        self.close_statement(now)
+        self._statement = (sql, now)
+
+    def close_statement(self, now: float) -> None:
+        if self._statement is None:
+            return
+        sql, started = self._statement
+        self._statement = None
+        self.statements.append((sql, now - started))
+        if sql.startswith("COMMIT"):
+            self.spans.append(["commit", started - self.start, now - started])
+
+    def as_record(self, total: float) -> dict[str, Any]:
+        """JSON-ready slow-log record (times in milliseconds)."""
+        return {
+            "ts": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "name": self.name,
+            **self.attrs,
+            "total_ms": round(total * 1000, 3),
+            "spans": [
+                {"name": name, "start_ms": round(start * 1000, 3), "ms": round(duration * 1000, 3)}
+                for name, start, duration in sorted(self.spans, key=lambda s: s[1])
+            ],
+            "statements": [{"sql": sql, "ms": round(duration * 1000, 3)} for sql, duration in self.statements],
+        }
+
+
+def current() -> Trace | None:
+    """Return the active trace, if any."""
+    return _current.get()
+
+
+@contextmanager
+def trace_request(name: str) -> Iterator[Trace | None]:
+    """Trace the enclosed request if tracing is on; nested calls join the outer trace."""
+    active = _current.get()
+    if active is not None:
+        yield active
+        return
+    threshold = slow_threshold_ms()
+    if threshold is None:
+        yield None
+        return
+
+    trace = Trace(name)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+        end = time.perf_counter()
+        trace.close_statement(end)
+        total = end - trace.start
+        if total * 1000 >= threshold:
+            _write_slow(trace.as_record(total))
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Record the enclosed block as a phase of the active trace."""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    entry = [name, started - trace.start, 0.0]
+    trace.spans.append(entry)
+    try:
+        yield
+    finally:
+        now = time.perf_counter()
+        trace.close_statement(now)
+        entry[2] = now - started
+
+
+def spanned(name: str) -> Callable[[F], F]:
+    """Decorator: record each call of the function (or the full iteration of a generator) as span *name*."""
+
+    def decorate(fn: F) -> F:
+        if isgeneratorfunction(fn):
+
+            @wraps(fn)
+            def gen_wrapper(*args: Any, **kwargs: Any) -> Iterator[Any]:
+                with span(name):
+                    yield from fn(*args, **kwargs)
+
+            return gen_wrapper  # type: ignore[return-value]
+
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def annotate(**attrs: Any) -> None:
+    """Attach attributes (e.g. ``command``) to the active trace's slow-log record."""
+    trace = _current.get()
+    if trace is not None:
+        trace.attrs.update(attrs)
+
+
+def watch(conn: sqlite3.Connection) -> None:
+    """Capture *conn*'s SQL statements in the active trace."""
+    trace = _current.get()
+    if trace is not None:
+        conn.set_trace_callback(trace.on_statement)
+
+
+def unwatch(conn: sqlite3.Connection) -> None:
+    """Undo :func:`watch` (before a connection is closed or returned to a pool)."""
+    if _current.get() is not None:
+        conn.set_trace_callback(None)
+
+
+def _write_slow(record: dict[str, Any]) -> None:
+    line = json.dumps(record)
+    target = os.environ.get("OPENCLAW_TODO_TRACE_LOG")
+    if not target:
+        logger.warning("Slow request: %s", line)
+        return
+    path = Path(target)
+    try:
+        with _log_lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a", encoding="utf-8") as fh:
+                fh.write(line + "\n")
+    except OSError:
+        logger.exception("Could not write slow-request log %s", path)
@@ -2,21 +2,31 @@
 
 from __future__ import annotations
 
+from contextlib import contextmanager
+
 import pytest
 
 from openclaw_todo.db import get_connection
 from openclaw_todo.migrations import _migrations, migrate
+from openclaw_todo.schema_v1 import migrate_v1
+from openclaw_todo.schema_v2 import migrate_v2
+from openclaw_todo.schema_v3 import migrate_v3
+from openclaw_todo.schema_v4 import migrate_v4
+from openclaw_todo.schema_v5 import migrate_v5
+from openclaw_todo.schema_v6 import migrate_v6
+from openclaw_todo.schema_v7 import migrate_v7
+from openclaw_todo.schema_v8 import migrate_v8
+from openclaw_todo.schema_v9 import migrate_v9
 
 
 @pytest.fixture(autouse=True)
-def _load_v1():
-    """Ensure V1 migration is registered."""
+def _load_schema():
+    """Ensure all schema migrations are registered, in order."""
     saved = _migrations.copy()
     _migrations.clear()
-    from openclaw_todo.schema_v1 import migrate_v1
-
-    if migrate_v1 not in _migrations:
-        _migrations.append(migrate_v1)
+    _migrations.extend(
+        [migrate_v1, migrate_v2, migrate_v3, migrate_v4, migrate_v5, migrate_v6, migrate_v7, migrate_v8, migrate_v9]
+    )
     yield
     _migrations.clear()
     _migrations.extend(saved)
@@ -24,7 +34,7 @@ def _load_v1():
 
 @pytest.fixture()
 def conn(tmp_path):
-    """Return a migrated V1 connection."""
+    """Return a fully migrated connection."""
     c = get_connection(tmp_path / "test.sqlite3")
     migrate(c)
     yield c
@@ -42,6 +52,7 @@ def seed_task(
     created_by="U001",
     assignees=None,
     due=None,
+    parent=None,
 ):
     """Insert a task with associated project and assignees. Returns task_id."""
     row = conn.execute("SELECT id FROM projects WHERE name = ?", (project_name,)).fetchone()
@@ -59,6 +70,8 @@ def seed_task(
         (title, project_id, section, created_by, due),
     )
     task_id = cursor.lastrowid
+    if parent is not None:  # also fires the V9 rollup triggers
+        conn.execute("UPDATE tasks SET parent_id = ? WHERE id = ?;", (parent, task_id))
 
     for assignee in assignees or [created_by]:
         conn.execute(
@@ -67,3 +80,15 @@ def seed_task(
         )
     conn.commit()
     return task_id
+
+
+@contextmanager
+def write_locked(conn):
+    """Hold the write lock of *conn*'s database from a second connection."""
+    other = get_connection(conn.execute("PRAGMA database_list;").fetchone()[2])
+    other.execute("BEGIN IMMEDIATE;")
+    try:
+        yield
+    finally:
+        other.rollback()
+        other.close()
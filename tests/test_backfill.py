@@ -0,0 +1,140 @@
+"""Tests for online background backfills (backfill.py)."""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+
+import pytest
+
+from openclaw_todo import backfill
+from openclaw_todo.backfill import (
+    BackfillWorker,
+    backfill_complete,
+    backfill_status,
+    backfill_worker_from_env,
+    register_backfill,
+    run_all,
+)
+from openclaw_todo.db import get_connection
+from tests.conftest import seed_task
+
+
+@pytest.fixture(autouse=True)
+def _clean_backfills():
+    """Save and restore the global backfill list around each test."""
+    saved = backfill._backfills.copy()
+    backfill._backfills.clear()
+    yield
+    backfill._backfills.clear()
+    backfill._backfills.extend(saved)
+
+
+@pytest.fixture()
+def upper_titles(conn):
+    """A derived column filled by a backfill; new rows are not maintained (not needed here)."""
+    conn.execute("ALTER TABLE tasks ADD COLUMN title_upper TEXT;")
+    for i in range(7):
+        seed_task(conn, title=f"task {i}")
+
+    @register_backfill("tasks.title_upper", batch_size=3)
+    def fill(c: sqlite3.Connection, after: int | None, limit: int) -> int | None:
+        ids = [
+            r[0]
+            for r in c.execute("SELECT id FROM tasks WHERE id > ? ORDER BY id LIMIT ?;", (after or 0, limit)).fetchall()
+        ]
+        if not ids:
+            return None
+        c.execute("UPDATE tasks SET title_upper = upper(title) WHERE id BETWEEN ? AND ?;", (ids[0], ids[-1]))
+        return ids[-1]
+
+    return fill
+
+
+def _filled(conn) -> int:
+    return conn.execute("SELECT count(*) FROM tasks WHERE title_upper IS NOT NULL;").fetchone()[0]
+
+
+class TestBackfillWorker:
+    def test_one_batch_per_call(self, conn, upper_titles):
+        worker = BackfillWorker(None)
+        assert worker.run_once(conn) is False
+        assert _filled(conn) == 3
+        assert backfill_complete(conn, "tasks.title_upper") is False
+        assert backfill_status(conn) == {"tasks.title_upper": {"cursor": 3, "done": False}}
+
+    def test_runs_to_completion(self, conn, upper_titles):
+        worker = BackfillWorker(None)
+        calls = 0
+        while not worker.run_once(conn):
+            calls += 1
+        # three batches of rows, then one batch that finds none
+        assert calls == 4
+        assert _filled(conn) == 7
+        assert backfill_complete(conn, "tasks.title_upper") is True
+
+    def test_other_connections_can_write_between_batches(self, conn, upper_titles, tmp_path):
+        worker = BackfillWorker(None)
+        worker.run_once(conn)
+        assert not conn.in_transaction
+        other = get_connection(tmp_path / "test.sqlite3")
+        try:
+            other.execute("PRAGMA busy_timeout=0;")
+            other.execute("UPDATE tasks SET title = 'renamed' WHERE id = 1;")
+            other.commit()
+        finally:
+            other.close()
+
+    def test_thread_resumes_and_finishes(self, conn, upper_titles, tmp_path):
+        BackfillWorker(None).run_once(conn)
+        worker = BackfillWorker(tmp_path / "test.sqlite3", pause=0.001)
+        worker.start()
+        try:
+            for _ in range(500):
+                if backfill_complete(conn, "tasks.title_upper"):
+                    break
+                time.sleep(0.01)
+        finally:
+            worker.stop()
+        assert _filled(conn) == 7
+
+    def test_thread_survives_failed_migrate(self, conn, upper_titles, tmp_path, monkeypatch):
+        calls = []
+        real_migrate = backfill.migrate
+
+        def flaky_migrate(c):
+            calls.append(c)
+            if len(calls) == 1:
+                raise RuntimeError("Migration to version 1 failed: table projects already exists")
+            return real_migrate(c)
+
+        monkeypatch.setattr(backfill, "migrate", flaky_migrate)
+        monkeypatch.setattr(backfill, "ERROR_RETRY_SECONDS", 0.001)
+        worker = BackfillWorker(tmp_path / "test.sqlite3", pause=0.001)
+        worker.start()
+        try:
+            for _ in range(500):
+                if backfill_complete(conn, "tasks.title_upper"):
+                    break
+                time.sleep(0.01)
+        finally:
+            worker.stop()
+        assert len(calls) == 2
+        assert _filled(conn) == 7
+
+    def test_run_all(self, conn, upper_titles):
+        run_all(conn)
+        assert backfill_complete(conn, "tasks.title_upper") is True
+
+
+class TestFromEnv:
+    def test_nothing_registered(self, tmp_path):
+        assert backfill_worker_from_env(tmp_path / "todo.sqlite3") is None
+
+    def test_pause(self, monkeypatch, tmp_path, upper_titles):
+        monkeypatch.setenv("OPENCLAW_TODO_BACKFILL_PAUSE_MS", "200")
+        assert backfill_worker_from_env(tmp_path / "todo.sqlite3").pause == 0.2
+
+    def test_disabled(self, monkeypatch, tmp_path, upper_titles):
+        monkeypatch.setenv("OPENCLAW_TODO_BACKFILL_PAUSE_MS", "-1")
+        assert backfill_worker_from_env(tmp_path / "todo.sqlite3") is None
@@ -0,0 +1,155 @@
+"""Tests for managed WAL checkpoints and database health (checkpoint.py)."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from openclaw_todo.backfill import run_all
+from openclaw_todo.checkpoint import CheckpointManager, checkpoints_from_env, database_health, wal_size
+from openclaw_todo.db import get_connection
+from openclaw_todo.dispatcher import dispatch
+from openclaw_todo.migrations import _migrations
+
+CTX = {"sender_id": "U001"}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def clock():
+    return Clock()
+
+
+@pytest.fixture()
+def db_path(tmp_path):
+    return tmp_path / "todo.sqlite3"
+
+
+@pytest.fixture()
+def conn(db_path):
+    """Held open while tasks are added, so closing the writers leaves the WAL in place."""
+    dispatch("add Task 0", CTX, db_path=str(db_path))
+    c = get_connection(db_path)
+    c.execute("SELECT count(*) FROM tasks").fetchone()
+    for i in range(1, 20):
+        dispatch(f"add Task {i}", CTX, db_path=str(db_path))
+    yield c
+    c.close()
+
+
+class TestCheckpointManager:
+    def test_passive_on_interval(self, db_path, conn, clock):
+        manager = CheckpointManager(db_path, interval=60, clock=clock)
+        manager._last_passive = clock.now
+        assert manager.run_due(conn) is None
+        clock.now += 61
+        result = manager.run_due(conn)
+        assert result.mode == "PASSIVE"
+        assert result.busy is False
+        assert result.checkpointed_frames == result.log_frames > 0
+        assert manager.run_due(conn) is None
+
+    def test_truncate_over_threshold(self, db_path, conn, clock):
+        assert wal_size(db_path) > 0
+        manager = CheckpointManager(db_path, interval=60, truncate_bytes=1, clock=clock)
+        result = manager.run_due(conn)
+        assert result.mode == "TRUNCATE"
+        assert wal_size(db_path) == 0
+
+    def test_passive_blocked_by_reader(self, db_path, conn, clock):
+        reader = get_connection(db_path)
+        try:
+            reader.execute("BEGIN")
+            reader.execute("SELECT count(*) FROM tasks").fetchone()
+            dispatch("add After reader", CTX, db_path=str(db_path))
+            result = CheckpointManager(db_path, clock=clock).checkpoint(conn)
+            assert result.busy is False
+            assert result.checkpointed_frames < result.log_frames
+        finally:
+            reader.rollback()
+            reader.close()
+
+    def test_last_record(self, db_path, conn, clock):
+        manager = CheckpointManager(db_path, clock=clock)
+        assert manager.last_record() is None
+        manager.checkpoint(conn, "TRUNCATE")
+        record = manager.last_record()
+        assert record["mode"] == "TRUNCATE"
+        assert record["at"] == "2023-11-14T22:13:20+00:00"
+
+    def test_worker_start_stop(self, db_path, conn):
+        manager = CheckpointManager(db_path, interval=0.01, truncate_bytes=1)
+        manager.start()
+        try:
+            for _ in range(200):
+                if manager.last is not None:
+                    break
+                time.sleep(0.01)
+        finally:
+            manager.stop()
+        assert manager.last is not None
+        assert wal_size(db_path) == 0
+
+
+class TestDatabaseHealth:
+    def test_report(self, db_path, conn, clock):
+        manager = CheckpointManager(db_path, clock=clock)
+        manager.checkpoint(conn)
+        report = database_health(db_path, manager)
+        assert report["path"] == str(db_path)
+        assert report["schema_version"] == len(_migrations)
+        assert report["page_count"] > 0
+        assert report["freelist_count"] >= 0
+        assert report["wal_bytes"] == wal_size(db_path)
+        assert report["last_checkpoint"]["mode"] == "PASSIVE"
+
+    def test_no_manager(self, db_path, conn):
+        assert database_health(db_path)["last_checkpoint"] is None
+
+    def test_does_not_create_tables(self, db_path):
+        bare = get_connection(db_path)
+        bare.execute("CREATE TABLE other (id INTEGER PRIMARY KEY);")
+        bare.commit()
+        report = database_health(db_path)
+        assert report["schema_version"] == "absent"
+        assert report["backfills"] == "absent"
+        tables = [r[0] for r in bare.execute("SELECT name FROM sqlite_master WHERE type = 'table';")]
+        bare.close()
+        assert tables == ["other"]
+
+    def test_reports_backfill_progress(self, db_path, conn):
+        assert database_health(db_path)["backfills"] == "absent"  # no backfill has run yet
+        run_all(conn)
+        assert database_health(db_path)["backfills"] == {"tasks.assignees_csv": {"cursor": None, "done": True}}
+
+
+class TestFromEnv:
+    def test_defaults(self, monkeypatch, tmp_path):
+        monkeypatch.delenv("OPENCLAW_TODO_CHECKPOINT_SECONDS", raising=False)
+        monkeypatch.delenv("OPENCLAW_TODO_WAL_TRUNCATE_BYTES", raising=False)
+        manager = checkpoints_from_env(tmp_path / "todo.sqlite3")
+        assert manager.interval == 60
+        assert manager.truncate_bytes == 64 * 1024 * 1024
+
+    def test_disabled(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("OPENCLAW_TODO_CHECKPOINT_SECONDS", "0")
+        assert checkpoints_from_env(tmp_path / "todo.sqlite3") is None
+
+    def test_invalid_threshold_falls_back(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("OPENCLAW_TODO_CHECKPOINT_SECONDS", "5")
+        monkeypatch.setenv("OPENCLAW_TODO_WAL_TRUNCATE_BYTES", "lots")
+        manager = checkpoints_from_env(tmp_path / "todo.sqlite3")
+        assert manager.interval == 5
+        assert manager.truncate_bytes == 64 * 1024 * 1024
+
+    def test_disabled_when_sharded(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("OPENCLAW_TODO_SHARDS", "2")
+        assert checkpoints_from_env(tmp_path / "todo.sqlite3") is None
@@ -6,6 +6,7 @@ import json
 
 from openclaw_todo.cmd_add import add_handler
 from openclaw_todo.parser import ParsedCommand
+from tests.conftest import seed_task
 
 
 def _make_parsed(
@@ -305,3 +306,41 @@ class TestAddAmbiguousProjectDisambiguation:
             "SELECT p.visibility FROM tasks t JOIN projects p ON t.project_id = p.id WHERE t.id = 1",
         ).fetchone()
         assert row[0] == "private"
+
+
+class TestAddSubtask:
+    """parent:#N adds a subtask in the parent's project."""
+
+    def _parent(self, conn, **kwargs):
+        return seed_task(conn, project_name="Backend", title="Parent", **kwargs)
+
+    def test_defaults_to_parent_project(self, conn):
+        parent = self._parent(conn)
+        parsed = _make_parsed(title_tokens=["Child"])
+        parsed.parent = parent
+        result = add_handler(parsed, conn, {"sender_id": "U001"})
+        assert "(Backend/backlog)" in result
+        assert result.endswith(f"(subtask of #{parent})")
+        child = conn.execute("SELECT parent_id FROM tasks WHERE title = 'Child'").fetchone()
+        assert child == (parent,)
+        assert conn.execute("SELECT children_total FROM tasks WHERE id = ?", (parent,)).fetchone() == (1,)
+
+    def test_other_project_rejected(self, conn):
+        parent = self._parent(conn)
+        parsed = _make_parsed(title_tokens=["Child"], project="Elsewhere")
+        parsed.parent = parent
+        result = add_handler(parsed, conn, {"sender_id": "U001"})
+        assert result.startswith("❌ Subtasks must be in the same project")
+        assert conn.execute("SELECT COUNT(*) FROM projects WHERE name = 'Elsewhere'").fetchone() == (0,)
+
+    def test_parent_not_found(self, conn):
+        parsed = _make_parsed(title_tokens=["Child"])
+        parsed.parent = 99
+        assert add_handler(parsed, conn, {"sender_id": "U001"}) == "❌ Parent task #99 not found."
+
+    def test_parent_not_writable(self, conn):
+        parent = self._parent(conn, created_by="U002")
+        parsed = _make_parsed(title_tokens=["Child"])
+        parsed.parent = parent
+        result = add_handler(parsed, conn, {"sender_id": "U001"})
+        assert result == f"❌ You don't have permission to add subtasks to task #{parent}."
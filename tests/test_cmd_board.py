@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-from openclaw_todo.cmd_board import board_handler
-from openclaw_todo.parser import ParsedCommand
+from datetime import date, timedelta
+
+from openclaw_todo.cmd_board import board_handler, filter_options
+from openclaw_todo.parser import ParsedCommand, parse
 from tests.conftest import seed_task as _seed_task
 
 
@@ -311,3 +313,118 @@ class TestBoardAmbiguousProjectDisambiguation:
         result = board_handler(parsed, conn, {"sender_id": "U001"})
         assert "Private board task" in result
         assert "Shared board task" not in result
+
+
+class TestBoardDateFilters:
+    """Date filters narrow every section of the board."""
+
+    def test_overdue_and_nodue(self, conn):
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+        _seed_task(conn, title="Late backlog", section="backlog", due=yesterday)
+        _seed_task(conn, title="Late doing", section="doing", due=yesterday)
+        _seed_task(conn, title="Undated", section="doing")
+        ctx = {"sender_id": "U001"}
+
+        overdue = board_handler(parse("board overdue"), conn, ctx)
+        assert "Late backlog" in overdue
+        assert "Late doing" in overdue
+        assert "Undated" not in overdue
+
+        nodue = board_handler(parse("board nodue"), conn, ctx)
+        assert "Undated" in nodue
+        assert "Late" not in nodue
+
+
+class TestBoardMore:
+    """board more <section> after:#id pages through one section in board order."""
+
+    CTX = {"sender_id": "U001"}
+
+    def _seed(self, conn):
+        today = date.today()
+        ids = [
+            _seed_task(conn, title=f"t{i}", section="doing", due=due)
+            for i, due in enumerate(
+                [None, (today + timedelta(days=2)).isoformat(), None, (today + timedelta(days=1)).isoformat(), None]
+            )
+        ]
+        _seed_task(conn, title="elsewhere", section="backlog")
+        # Board order: due ASC (undated last), then id DESC
+        return [ids[3], ids[1], ids[4], ids[2], ids[0]]
+
+    def _page(self, conn, text):
+        lines = board_handler(parse(text), conn, self.CTX).splitlines()
+        ids = [int(line.split()[0][1:]) for line in lines if line.startswith("  #")]
+        more = [line for line in lines if "... and" in line]
+        return lines, ids, more
+
+    def test_overflow_line_names_next_page(self, conn):
+        order = self._seed(conn)
+        _, ids, more = self._page(conn, "board limitPerSection:2")
+        assert more == [f"  ... and 3 more (/todo board more doing after:#{order[1]} limitPerSection:2)"]
+
+    def test_pages_cover_section_in_order(self, conn):
+        order = self._seed(conn)
+        lines, seen, _ = self._page(conn, "board more doing limitPerSection:2")
+        assert [line for line in lines if line.startswith("—")] == ["— DOING (5) —"]
+        while len(seen) < len(order):
+            _, ids, _ = self._page(conn, f"board more doing after:#{seen[-1]} limitPerSection:2")
+            assert ids
+            seen.extend(ids)
+        assert seen == order
+
+    def test_page_counts_remaining_tasks(self, conn):
+        order = self._seed(conn)
+        lines, ids, more = self._page(conn, f"board more doing after:#{order[2]} limitPerSection:1")
+        assert "— DOING (2) —" in lines
+        assert ids == [order[3]]
+        assert more == [f"  ... and 1 more (/todo board more doing after:#{order[3]} limitPerSection:1)"]
+
+    def test_page_is_stable_under_inserts(self, conn):
+        order = self._seed(conn)
+        _seed_task(conn, title="new, sorts first", section="doing", due=date.today().isoformat())
+        _, ids, _ = self._page(conn, f"board more doing after:#{order[1]} limitPerSection:2")
+        assert ids == order[2:4]
+
+    def test_other_options_still_apply(self, conn):
+        self._seed(conn)
+        done_id = _seed_task(conn, title="finished", section="done")
+        conn.execute("UPDATE tasks SET status = 'done' WHERE id = ?", (done_id,))
+        _, ids, _ = self._page(conn, "board more done done")
+        assert ids == [done_id]
+
+    def test_hint_from_filtered_board_pages_same_set(self, conn):
+        """Following the hints of a filtered board walks exactly that board's tasks."""
+        order = self._seed(conn)
+        backend = [
+            _seed_task(conn, title=f"b{i}", section="doing", project_name="Backend", assignees=["U002"])
+            for i in range(4)
+        ]
+        text = "board all /p Backend limitPerSection:3"
+        _, seen, (hint,) = self._page(conn, text)
+        assert hint.endswith(f"(/todo board more doing after:#{seen[-1]} all /p Backend limitPerSection:3)")
+        while hint:
+            command = hint[hint.index("(/todo ") + 7 : -1]
+            _, ids, more = self._page(conn, command)
+            seen.extend(ids)
+            hint = more[0] if more else None
+        assert seen == sorted(backend, reverse=True)
+        assert not set(seen) & set(order)
+
+    def test_filter_options_strip_paging_tokens(self):
+        assert filter_options(parse("board more doing after:#4 all /p more")) == ["all", "/p", "more"]
+        assert filter_options(parse("board /p more more doing after:#4")) == ["/p", "more"]
+        assert filter_options(parse("board mine open")) == ["mine", "open"]
+
+    def test_invalid_requests(self, conn):
+        self._seed(conn)
+        assert board_handler(parse("board more"), conn, self.CTX).startswith("❌ Usage: /todo board more")
+        assert board_handler(parse("board more later"), conn, self.CTX).startswith("❌ Usage")
+        assert board_handler(parse("board more doing after:#999"), conn, self.CTX) == "❌ Task #999 not found."
+
+
+def test_board_renders_subtask_rollup(conn):
+    parent = _seed_task(conn, title="Parent", section="doing")
+    _seed_task(conn, title="Child", parent=parent)
+    result = board_handler(parse("board"), conn, {"sender_id": "U001"})
+    assert f"#{parent}  due:-  <@U001>  Parent [0/1]" in result
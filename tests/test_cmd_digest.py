@@ -0,0 +1,107 @@
+"""Tests for the /todo digest command and the digest generator."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from openclaw_todo.cmd_digest import digest_handler, digest_records, iter_digests
+from openclaw_todo.parser import parse
+from tests.conftest import seed_task
+
+TODAY = date.today()
+YESTERDAY = (TODAY - timedelta(days=1)).isoformat()
+TOMORROW = (TODAY + timedelta(days=1)).isoformat()
+
+
+def _digest(conn, text="digest", sender="U001"):
+    return digest_handler(parse(text), conn, {"sender_id": sender})
+
+
+class TestIterDigests:
+    def test_buckets_per_assignee(self, conn):
+        overdue = seed_task(conn, title="Late", due=YESTERDAY, assignees=["U001", "U002"])
+        today = seed_task(conn, title="Today", due=TODAY.isoformat(), assignees=["U001"])
+        doing = seed_task(conn, title="Working", section="doing", due=TOMORROW, assignees=["U002"])
+        seed_task(conn, title="Later", due=TOMORROW, assignees=["U001"])
+        seed_task(conn, title="No date", assignees=["U001"])
+
+        digests = list(iter_digests(conn, TODAY))
+        assert [d.user_id for d in digests] == ["U001", "U002"]
+        u1, u2 = digests
+        assert [t.id for t in u1.overdue] == [overdue]
+        assert [t.id for t in u1.due_today] == [today]
+        assert u1.doing == []
+        assert [t.id for t in u2.overdue] == [overdue]
+        assert [t.id for t in u2.doing] == [doing]
+
+    def test_overdue_doing_task_reported_once(self, conn):
+        task_id = seed_task(conn, section="doing", due=YESTERDAY)
+        (digest,) = iter_digests(conn, TODAY)
+        assert [t.id for t in digest.overdue] == [task_id]
+        assert digest.doing == []
+
+    def test_closed_tasks_excluded(self, conn):
+        task_id = seed_task(conn, due=YESTERDAY)
+        conn.execute("UPDATE tasks SET status = 'done', section = 'done' WHERE id = ?", (task_id,))
+        conn.commit()
+        assert list(iter_digests(conn, TODAY)) == []
+
+    def test_overdue_sorted_by_due(self, conn):
+        older = (TODAY - timedelta(days=5)).isoformat()
+        b = seed_task(conn, due=YESTERDAY)
+        a = seed_task(conn, due=older)
+        (digest,) = iter_digests(conn, TODAY)
+        assert [t.id for t in digest.overdue] == [a, b]
+
+    def test_user_filter(self, conn):
+        seed_task(conn, due=YESTERDAY, assignees=["U001"])
+        seed_task(conn, due=YESTERDAY, assignees=["U002"])
+        assert [d.user_id for d in iter_digests(conn, TODAY, ["U002"])] == ["U002"]
+
+    def test_private_project_visible_to_owner_only(self, conn):
+        seed_task(conn, project_name="Mine", visibility="private", owner="U001", due=YESTERDAY, assignees=["U001"])
+        assert [d.user_id for d in iter_digests(conn, TODAY)] == ["U001"]
+        assert list(iter_digests(conn, TODAY, ["U001"], viewer="U002")) == []
+
+    def test_single_query(self, conn):
+        for i in range(5):
+            seed_task(conn, due=YESTERDAY, assignees=[f"U00{i}"])
+        statements = []
+        conn.set_trace_callback(statements.append)
+        try:
+            assert len(list(iter_digests(conn, TODAY))) == 5
+        finally:
+            conn.set_trace_callback(None)
+        assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
+
+
+class TestDigestHandler:
+    def test_sections(self, conn):
+        seed_task(conn, title="Late", due=YESTERDAY)
+        seed_task(conn, title="Working", section="doing")
+        result = _digest(conn)
+        assert result.startswith(f"📰 Digest for <@U001> — {TODAY.isoformat()}")
+        assert "⏰ Overdue (1)" in result
+        assert "🔨 Doing (1)" in result
+        assert "📅 Due today" not in result
+        assert "(Inbox/doing)  Working" in result
+
+    def test_empty(self, conn):
+        assert _digest(conn).endswith("Nothing overdue, due today or in progress.")
+
+    def test_mentioned_user(self, conn):
+        seed_task(conn, title="Theirs", due=TODAY.isoformat(), assignees=["U002"])
+        result = _digest(conn, "digest <@U002>")
+        assert "<@U002>" in result
+        assert "Theirs" in result
+
+    def test_records(self, conn):
+        task_id = seed_task(conn, title="Late", due=YESTERDAY)
+        data = digest_records(parse("digest"), conn, {"sender_id": "U001"})
+        assert data == {
+            "date": TODAY.isoformat(),
+            "user_id": "U001",
+            "overdue": [{"id": task_id, "title": "Late", "project": "Inbox", "section": "backlog", "due": YESTERDAY}],
+            "due_today": [],
+            "doing": [],
+        }
@@ -4,9 +4,11 @@ from __future__ import annotations
 
 import json
 
+import openclaw_todo.cmd_done_drop
 from openclaw_todo.cmd_done_drop import done_handler, drop_handler
 from openclaw_todo.parser import ParsedCommand
 from tests.conftest import seed_task as _seed_task
+from tests.conftest import write_locked
 
 
 def _make_parsed(command, *, args=None) -> ParsedCommand:
@@ -16,6 +18,19 @@ def _make_parsed(command, *, args=None) -> ParsedCommand:
     )
 
 
+def _concurrent_change(monkeypatch, module):
+    """Make the handler's pre-read stale: another writer updates the task right after it."""
+    real = module.fetch_write_target
+
+    def fetch_then_change(conn, task_id, sender_id):
+        target = real(conn, task_id, sender_id)
+        conn.execute("UPDATE tasks SET title = 'theirs', version = version + 1 WHERE id = ?", (task_id,))
+        conn.commit()
+        return target
+
+    monkeypatch.setattr(module, "fetch_write_target", fetch_then_change)
+
+
 class TestDoneSetsFields:
     """done sets section='done', status='done', closed_at."""
 
@@ -153,3 +168,21 @@ class TestEdgeCases:
     def test_nonexistent_task(self, conn):
         result = done_handler(_make_parsed("done", args=["9999"]), conn, {"sender_id": "U001"})
         assert "not found" in result
+
+
+class TestConcurrency:
+    def test_write_lock_busy_is_conflict(self, conn):
+        task_id = _seed_task(conn)
+        with write_locked(conn):
+            result = drop_handler(_make_parsed("drop", args=[str(task_id)]), conn, {"sender_id": "U001"})
+
+        assert result == f"❌ Task #{task_id} was modified concurrently. Please retry."
+        assert conn.execute("SELECT status FROM tasks WHERE id = ?", (task_id,)).fetchone()[0] == "open"
+
+    def test_done_conflict(self, conn, monkeypatch):
+        task_id = _seed_task(conn)
+        _concurrent_change(monkeypatch, openclaw_todo.cmd_done_drop)
+        result = done_handler(_make_parsed("done", args=[str(task_id)]), conn, {"sender_id": "U001"})
+
+        assert "modified concurrently" in result
+        assert conn.execute("SELECT status FROM tasks WHERE id = ?", (task_id,)).fetchone()[0] == "open"
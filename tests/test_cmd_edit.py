@@ -4,9 +4,11 @@ from __future__ import annotations
 
 import json
 
+import openclaw_todo.cmd_edit
 from openclaw_todo.cmd_edit import edit_handler
-from openclaw_todo.parser import ParsedCommand
+from openclaw_todo.parser import PARENT_CLEAR, ParsedCommand
 from tests.conftest import seed_task as _seed_task
+from tests.conftest import write_locked
 
 
 def _make_parsed(**kwargs) -> ParsedCommand:
@@ -15,6 +17,19 @@ def _make_parsed(**kwargs) -> ParsedCommand:
     return ParsedCommand(**defaults)
 
 
+def _concurrent_change(monkeypatch, module):
+    """Make the handler's pre-read stale: another writer updates the task right after it."""
+    real = module.fetch_write_target
+
+    def fetch_then_change(conn, task_id, sender_id):
+        target = real(conn, task_id, sender_id)
+        conn.execute("UPDATE tasks SET title = 'theirs', version = version + 1 WHERE id = ?", (task_id,))
+        conn.commit()
+        return target
+
+    monkeypatch.setattr(module, "fetch_write_target", fetch_then_change)
+
+
 class TestEditTitle:
     """Title updated only if non-option tokens present."""
 
@@ -158,6 +173,24 @@ class TestEditPrivateAssignee:
 
         assert "Edited" in result
 
+    def test_edit_project_change_validates_against_target_project(self, conn):
+        task_id = _seed_task(conn, created_by="UOWNER", assignees=["UOWNER"])
+        conn.execute(
+            "INSERT INTO projects (name, visibility, owner_user_id) VALUES ('Mine', 'private', 'UOWNER');",
+        )
+        conn.commit()
+        parsed = _make_parsed(args=[str(task_id)], project="Mine", mentions=["UOTHER"])
+        result = edit_handler(parsed, conn, {"sender_id": "UOWNER"})
+
+        assert "⚠️" in result
+
+    def test_edit_response_reflects_new_assignees(self, conn):
+        task_id = _seed_task(conn, assignees=["U001"])
+        parsed = _make_parsed(args=[str(task_id)], title_tokens=["Renamed"], mentions=["U003", "U002"])
+        result = edit_handler(parsed, conn, {"sender_id": "U001"})
+
+        assert "assignees:<@U002>, <@U003> — Renamed" in result
+
 
 class TestEditSection:
     """Section editing via /s."""
@@ -304,3 +337,82 @@ class TestEditAmbiguousProjectDisambiguation:
             (task_id,),
         ).fetchone()
         assert row[0] == "private"
+
+
+class TestEditStatements:
+    def test_single_pre_read_and_no_re_read(self, conn):
+        task_id = _seed_task(conn, assignees=["U001"])
+        statements = []
+        conn.set_trace_callback(statements.append)
+        edit_handler(_make_parsed(args=[str(task_id)], title_tokens=["Renamed"]), conn, {"sender_id": "U001"})
+        conn.set_trace_callback(None)
+        selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+        assert len(selects) == 1
+
+
+class TestEditConcurrency:
+    def test_write_lock_busy_is_conflict(self, conn):
+        task_id = _seed_task(conn)
+        with write_locked(conn):
+            result = edit_handler(_make_parsed(args=[str(task_id)], title_tokens=["Mine"]), conn, {"sender_id": "U001"})
+
+        assert result == f"❌ Task #{task_id} was modified concurrently. Please retry."
+        assert not conn.in_transaction
+
+    def test_conflict_rolls_back_assignee_replacement(self, conn, monkeypatch):
+        task_id = _seed_task(conn, assignees=["U001"])
+        _concurrent_change(monkeypatch, openclaw_todo.cmd_edit)
+        parsed = _make_parsed(args=[str(task_id)], title_tokens=["Mine"], mentions=["U002"])
+        result = edit_handler(parsed, conn, {"sender_id": "U001"})
+
+        assert "modified concurrently" in result
+        assert conn.execute("SELECT title, assignees_csv FROM tasks WHERE id = ?", (task_id,)).fetchone() == (
+            "theirs",
+            "U001",
+        )
+
+
+class TestEditParent:
+    """parent:#N / parent:- re-parent a task within its project."""
+
+    CTX = {"sender_id": "U001"}
+
+    def _edit(self, conn, task_id, parent, **kwargs):
+        return edit_handler(_make_parsed(args=[str(task_id)], parent=parent, **kwargs), conn, self.CTX)
+
+    def _parent_of(self, conn, task_id):
+        return conn.execute("SELECT parent_id FROM tasks WHERE id = ?", (task_id,)).fetchone()[0]
+
+    def test_set_and_clear_parent(self, conn):
+        parent = _seed_task(conn, title="Parent")
+        child = _seed_task(conn, title="Child")
+        assert self._edit(conn, child, parent).startswith("✏️ Edited")
+        assert self._parent_of(conn, child) == parent
+        assert self._edit(conn, child, PARENT_CLEAR).startswith("✏️ Edited")
+        assert self._parent_of(conn, child) is None
+        assert self._edit(conn, child, PARENT_CLEAR).startswith("ℹ️ No changes")
+
+    def test_cycle_rejected(self, conn):
+        root = _seed_task(conn)
+        child = _seed_task(conn, parent=root)
+        grandchild = _seed_task(conn, parent=child)
+        result = self._edit(conn, root, grandchild)
+        assert result == (
+            f"❌ Task #{grandchild} cannot be the parent of #{root}: it is #{root} itself or one of its subtasks."
+        )
+        assert self._parent_of(conn, root) is None
+        assert self._edit(conn, root, root).startswith("❌")
+
+    def test_parent_in_other_project_rejected(self, conn):
+        parent = _seed_task(conn, project_name="Backend")
+        child = _seed_task(conn)
+        assert self._edit(conn, child, parent).startswith("❌ Subtasks must be in the same project")
+
+    def test_project_change_keeps_family_together(self, conn):
+        _seed_task(conn, project_name="Backend")
+        parent = _seed_task(conn)
+        child = _seed_task(conn, parent=parent)
+        assert self._edit(conn, child, None, project="Backend").startswith(f"❌ Task #{child} is a subtask")
+        assert self._edit(conn, parent, None, project="Backend").startswith(f"❌ Task #{parent} has subtasks")
+        # Detaching in the same edit is allowed
+        assert self._edit(conn, child, PARENT_CLEAR, project="Backend").startswith("✏️ Edited")
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+from datetime import date, timedelta
+
 from openclaw_todo.cmd_list import list_handler
-from openclaw_todo.parser import ParsedCommand
+from openclaw_todo.parser import ParsedCommand, parse
+from tests.conftest import seed_task
 
 
 def _seed_tasks(conn):
@@ -373,3 +376,87 @@ class TestListAmbiguousProjectDisambiguation:
         result = list_handler(parsed, conn, {"sender_id": "U001"})
         assert "Private task" in result
         assert "Shared task" not in result
+
+
+class TestListDateFilters:
+    """overdue / due:<Nd / closed:Nd filters on the integer date columns."""
+
+    def _ids(self, conn, text):
+        result = list_handler(parse(text), conn, {"sender_id": "U001"})
+        return [int(line.split()[0][1:]) for line in result.split("\n") if line.startswith("#")]
+
+    def test_overdue_and_due_window(self, conn):
+        today = date.today()
+        late = seed_task(conn, due=(today - timedelta(days=2)).isoformat())
+        soon = seed_task(conn, due=(today + timedelta(days=3)).isoformat())
+        seed_task(conn, due=(today + timedelta(days=30)).isoformat())
+        seed_task(conn)
+
+        assert self._ids(conn, "list overdue") == [late]
+        assert self._ids(conn, "list due:<7d") == [late, soon]
+        assert len(self._ids(conn, "list due:>7d")) == 1
+
+    def test_closed_since(self, conn):
+        recent = seed_task(conn)
+        old = seed_task(conn)
+        conn.execute(
+            "UPDATE tasks SET status = 'done', section = 'done', closed_at = datetime('now') WHERE id = ?", (recent,)
+        )
+        conn.execute(
+            "UPDATE tasks SET status = 'done', section = 'done', closed_at = datetime('now', '-30 days') WHERE id = ?",
+            (old,),
+        )
+        conn.commit()
+
+        assert self._ids(conn, "list closed:7d") == [recent]
+        assert self._ids(conn, "list closed:60d") == [old, recent]
+        assert self._ids(conn, "list closed:7d drop") == []
+
+    def test_due_today_this_week_and_nodue(self, conn):
+        today = date.today()
+        due_today = seed_task(conn, due=today.isoformat())
+        undated = seed_task(conn)
+        far = seed_task(conn, due=(today + timedelta(days=14)).isoformat())
+
+        assert self._ids(conn, "list due:today") == [due_today]
+        assert due_today in self._ids(conn, "list due:this-week")
+        assert far not in self._ids(conn, "list due:this-week")
+        assert self._ids(conn, "list nodue") == [undated]
+        assert self._ids(conn, f"list due:>{today.isoformat()}") == [far]
+
+
+class TestListSubtasks:
+    """Subtask progress renders from the parent's row; parent:#N lists a task's subtasks."""
+
+    def _family(self, conn):
+        parent = seed_task(conn, title="Parent")
+        done = seed_task(conn, title="Child done", parent=parent)
+        seed_task(conn, title="Child open", parent=parent)
+        conn.execute("UPDATE tasks SET status = 'done' WHERE id = ?", (done,))
+        conn.commit()
+        return parent
+
+    def test_rollup_rendered(self, conn):
+        self._family(conn)
+        result = list_handler(parse("list"), conn, {"sender_id": "U001"})
+        assert "Parent [1/2]" in result
+        assert "Child open" in result and "Child open [" not in result
+
+    def test_parent_filter(self, conn):
+        parent = self._family(conn)
+        seed_task(conn, title="Unrelated")
+        result = list_handler(parse(f"list parent:#{parent}"), conn, {"sender_id": "U001"})
+        assert "Child open" in result
+        assert "Parent" not in result and "Unrelated" not in result
+        top = list_handler(parse("list parent:-"), conn, {"sender_id": "U001"})
+        assert "Parent" in top and "Unrelated" in top and "Child" not in top
+
+    def test_no_per_task_child_queries(self, conn):
+        for i in range(5):
+            parent = seed_task(conn, title=f"P{i}")
+            seed_task(conn, title=f"C{i}", parent=parent)
+        statements = []
+        conn.set_trace_callback(statements.append)
+        list_handler(parse("list"), conn, {"sender_id": "U001"})
+        conn.set_trace_callback(None)
+        assert len(statements) == 2  # count + page
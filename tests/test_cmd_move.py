@@ -4,9 +4,11 @@ from __future__ import annotations
 
 import json
 
+import openclaw_todo.cmd_move
 from openclaw_todo.cmd_move import move_handler
 from openclaw_todo.parser import ParsedCommand
 from tests.conftest import seed_task as _seed_task
+from tests.conftest import write_locked
 
 
 def _make_parsed(*, args=None, section=None, title_tokens=None) -> ParsedCommand:
@@ -18,6 +20,19 @@ def _make_parsed(*, args=None, section=None, title_tokens=None) -> ParsedCommand
     )
 
 
+def _concurrent_change(monkeypatch, module):
+    """Make the handler's pre-read stale: another writer updates the task right after it."""
+    real = module.fetch_write_target
+
+    def fetch_then_change(conn, task_id, sender_id):
+        target = real(conn, task_id, sender_id)
+        conn.execute("UPDATE tasks SET title = 'theirs', version = version + 1 WHERE id = ?", (task_id,))
+        conn.commit()
+        return target
+
+    monkeypatch.setattr(module, "fetch_write_target", fetch_then_change)
+
+
 class TestMoveValidSection:
     """Move a task to a valid section."""
 
@@ -235,3 +250,51 @@ class TestMoveSharedPermission:
 
         assert "❌" in result
         assert "don't have permission" in result
+
+
+class TestMoveConcurrency:
+    """Compare-and-swap on tasks.version inside a BEGIN IMMEDIATE transaction."""
+
+    def test_write_lock_busy_is_conflict(self, conn):
+        task_id = _seed_task(conn)
+        with write_locked(conn):
+            result = move_handler(_make_parsed(args=[str(task_id)], section="doing"), conn, {"sender_id": "U001"})
+
+        assert result == f"❌ Task #{task_id} was modified concurrently. Please retry."
+        assert conn.execute("SELECT section FROM tasks WHERE id = ?", (task_id,)).fetchone()[0] == "backlog"
+
+    def test_conflict_when_task_changed_after_read(self, conn, monkeypatch):
+        task_id = _seed_task(conn)
+        _concurrent_change(monkeypatch, openclaw_todo.cmd_move)
+        result = move_handler(_make_parsed(args=[str(task_id)], section="doing"), conn, {"sender_id": "U001"})
+
+        assert result == f"❌ Task #{task_id} was modified concurrently. Please retry."
+        assert conn.execute("SELECT section, title FROM tasks WHERE id = ?", (task_id,)).fetchone() == (
+            "backlog",
+            "theirs",
+        )
+        assert conn.execute("SELECT count(*) FROM events WHERE action = 'task.move'").fetchone()[0] == 0
+        assert not conn.in_transaction
+
+    def test_write_transaction_is_immediate(self, conn):
+        task_id = _seed_task(conn)
+        statements = []
+        conn.set_trace_callback(statements.append)
+        move_handler(_make_parsed(args=[str(task_id)], section="doing"), conn, {"sender_id": "U001"})
+        conn.set_trace_callback(None)
+        assert "BEGIN IMMEDIATE;" in statements
+        assert conn.execute("SELECT version FROM tasks WHERE id = ?", (task_id,)).fetchone()[0] == 1
+
+
+class TestMoveStatements:
+    """One pre-read (task + permission) and one UPDATE ... RETURNING."""
+
+    def test_move_statement_count(self, conn):
+        task_id = _seed_task(conn)
+        statements = []
+        conn.set_trace_callback(statements.append)
+        move_handler(_make_parsed(args=[str(task_id)], section="doing"), conn, {"sender_id": "U001"})
+        conn.set_trace_callback(None)
+        top_level = [s for s in statements if not s.startswith("--")]
+        assert len([s for s in top_level if s.lstrip().upper().startswith("SELECT")]) == 1
+        assert len({s for s in top_level if s.lstrip().upper().startswith("UPDATE")}) == 1
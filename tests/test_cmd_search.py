@@ -0,0 +1,103 @@
+"""Tests for the /todo search command handler."""
+
+from __future__ import annotations
+
+import pytest
+
+from openclaw_todo.cmd_search import _match_expression, search_handler, search_records
+from openclaw_todo.parser import parse
+from openclaw_todo.task_query import FilterError
+from tests.conftest import seed_task
+
+
+def _search(conn, text, sender="U001"):
+    return search_handler(parse(f"search {text}"), conn, {"sender_id": sender})
+
+
+@pytest.fixture()
+def seeded(conn):
+    seed_task(conn, title="Fix login bug", created_by="U001")
+    seed_task(conn, title="Write login docs", created_by="U002")
+    seed_task(conn, title="Plan offsite", created_by="U001")
+    seed_task(
+        conn, project_name="Secret", visibility="private", owner="U002", title="Secret login key", created_by="U002"
+    )
+    return conn
+
+
+class TestSearch:
+    def test_matches_visible_tasks_across_assignees(self, seeded):
+        result = _search(seeded, "login")
+        assert '🔍 Search "login" (all / open) — 2 matches' in result
+        assert "Fix login bug" in result
+        assert "Write login docs" in result
+
+    def test_excludes_other_users_private_projects(self, seeded):
+        assert "Secret login key" not in _search(seeded, "login")
+        assert "Secret login key" in _search(seeded, "login", sender="U002")
+
+    def test_all_terms_must_match(self, seeded):
+        result = _search(seeded, "login docs")
+        assert "— 1 matches" in result
+        assert "Write login docs" in result
+
+    def test_prefix_matching(self, seeded):
+        assert "Plan offsite" in _search(seeded, "offs")
+
+    def test_mine_scope(self, seeded):
+        result = _search(seeded, "login mine")
+        assert "Fix login bug" in result
+        assert "Write login docs" not in result
+
+    def test_status_filter(self, seeded):
+        seeded.execute("UPDATE tasks SET status = 'done', section = 'done' WHERE title = 'Fix login bug'")
+        seeded.commit()
+        assert "Fix login bug" not in _search(seeded, "login")
+        assert "Fix login bug" in _search(seeded, "login done")
+
+    def test_project_filter(self, seeded):
+        seed_task(seeded, project_name="Backend", title="Backend login service")
+        result = _search(seeded, "login /p Backend")
+        assert "— 1 matches" in result
+        assert "Backend login service" in result
+
+    def test_ranked_best_match_first(self, conn):
+        seed_task(conn, title="cache notes")
+        best = seed_task(conn, title="cache cache cache")
+        lines = _search(conn, "cache").split("\n")
+        assert lines[2].startswith(f"#{best} ")
+
+    def test_no_results(self, seeded):
+        assert _search(seeded, "nonexistent").endswith("No tasks found.")
+
+    def test_fts_syntax_is_escaped(self, seeded):
+        for text in ('"login', "login AND", "NEAR(login", "title:login", "log*"):
+            assert "❌" not in _search(seeded, text)
+
+    def test_terms_required(self, conn):
+        assert _search(conn, "open").startswith("❌ Search terms are required.")
+
+    def test_limit(self, seeded):
+        result = _search(seeded, "login limit:1")
+        assert "Showing 1 of 2." in result
+
+    def test_like_fallback_without_fts(self, seeded):
+        seeded.execute("DROP TABLE tasks_fts")
+        result = _search(seeded, "LOGIN")
+        assert "— 2 matches" in result
+        assert "— 0 matches" in _search(seeded, "100%")
+
+
+class TestSearchRecords:
+    def test_records(self, seeded):
+        data = search_records(parse("search login"), seeded, {"sender_id": "U001"})
+        assert data["total"] == 2
+        assert {t["title"] for t in data["tasks"]} == {"Fix login bug", "Write login docs"}
+
+    def test_records_missing_terms(self, conn):
+        with pytest.raises(FilterError):
+            search_records(parse("search"), conn, {"sender_id": "U001"})
+
+
+def test_match_expression_quotes_terms():
+    assert _match_expression(['say "hi"', "x"]) == '"say ""hi"""* "x"*'
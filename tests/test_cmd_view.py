@@ -0,0 +1,139 @@
+"""Tests for the /todo view command handler (saved views)."""
+
+from __future__ import annotations
+
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from openclaw_todo import task_query
+from openclaw_todo.cmd_list import iter_list_lines
+from openclaw_todo.cmd_view import view_handler
+from openclaw_todo.parser import parse
+from tests.conftest import seed_task
+
+U1 = {"sender_id": "U001"}
+
+
+def _view(conn, text, context=U1):
+    return view_handler(parse(f"view {text}"), conn, context)
+
+
+@pytest.fixture()
+def seeded(conn):
+    seed_task(conn, title="Inbox task", assignees=["U001"])
+    seed_task(conn, project_name="Backend", title="Backend open", assignees=["U001"])
+    seed_task(conn, project_name="Backend", title="Backend doing", section="doing", assignees=["U002"])
+    conn.commit()
+    return conn
+
+
+def _row(conn, name, owner="U001"):
+    return conn.execute(
+        "SELECT command, where_sql, params FROM saved_views WHERE owner_user_id = ? AND name = ?",
+        (owner, name),
+    ).fetchone()
+
+
+class TestSave:
+    def test_stores_compiled_filter(self, seeded):
+        assert _view(seeded, "save be all /p Backend") == '💾 Saved view "be": list all /p Backend'
+        command, where_sql, params = _row(seeded, "be")
+        assert command == "list"
+        assert "t.project_id = ?" in where_sql
+        backend_id = seeded.execute("SELECT id FROM projects WHERE name = 'Backend'").fetchone()[0]
+        assert backend_id in json.loads(params)
+
+    def test_board_command(self, seeded):
+        assert _view(seeded, "save kb board all").startswith('💾 Saved view "kb": board all')
+        assert _row(seeded, "kb")[0] == "board"
+
+    def test_date_filter_is_compiled_per_run(self, seeded):
+        _view(seeded, "save soon due:<7d")
+        assert _row(seeded, "soon")[1:] == (None, None)
+
+    def test_save_replaces_existing_view(self, seeded):
+        _view(seeded, "save v all")
+        _view(seeded, "save v board mine")
+        assert seeded.execute("SELECT COUNT(*) FROM saved_views").fetchone()[0] == 1
+        assert _row(seeded, "v")[0] == "board"
+
+    def test_unknown_project_is_rejected(self, seeded):
+        assert _view(seeded, "save x /p Nope").startswith("❌")
+        assert _row(seeded, "x") is None
+
+    def test_invalid_option_is_rejected(self, seeded):
+        assert _view(seeded, "save x limit:abc").startswith("❌")
+        assert _row(seeded, "x") is None
+
+    @pytest.mark.parametrize("name", ["list", "delete", "a.b", "x" * 41])
+    def test_invalid_name(self, seeded, name):
+        assert _view(seeded, f"save {name} all").startswith("❌ Invalid view name")
+
+    def test_name_required(self, seeded):
+        assert _view(seeded, "save").startswith("❌ View name is required")
+        assert view_handler(parse("view"), seeded, U1).startswith("❌ View name is required")
+
+
+class TestRun:
+    def test_matches_original_command(self, seeded):
+        _view(seeded, "save be all /p Backend")
+        result = _view(seeded, "be")
+        assert "Backend open" in result and "Backend doing" in result
+        assert "Inbox task" not in result
+        assert result == "\n".join(iter_list_lines(parse("list all /p Backend"), seeded, U1))
+
+    def test_board_view(self, seeded):
+        _view(seeded, "save kb board all /p Backend")
+        result = _view(seeded, "kb")
+        assert "DOING" in result.upper() and "Backend doing" in result
+
+    def test_board_view_more_hint_keeps_filter(self, seeded):
+        seed_task(seeded, project_name="Backend", title="Backend doing 2", section="doing")
+        _view(seeded, "save kb board all /p Backend limitPerSection:1")
+        (hint,) = [line for line in _view(seeded, "kb").splitlines() if "... and" in line]
+        assert hint.endswith(" all /p Backend limitPerSection:1)")
+
+    def test_stored_view_skips_project_resolution(self, seeded, monkeypatch):
+        _view(seeded, "save be all /p Backend")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("project resolved")
+
+        monkeypatch.setattr(task_query, "resolve_project", fail)
+        assert "Backend open" in _view(seeded, "be")
+
+    def test_date_view_is_relative_to_run_day(self, seeded):
+        tomorrow = (date.today() + timedelta(days=1)).isoformat()
+        seeded.execute("UPDATE tasks SET due = ? WHERE title = 'Backend open'", (tomorrow,))
+        seeded.commit()
+        _view(seeded, "save soon all due:<7d")
+        result = _view(seeded, "soon")
+        assert "Backend open" in result and "Inbox task" not in result
+
+    def test_not_found(self, seeded):
+        assert _view(seeded, "nope").startswith('❌ View "nope" not found')
+
+    def test_views_are_personal(self, seeded):
+        _view(seeded, "save be all /p Backend")
+        assert _view(seeded, "be", {"sender_id": "U002"}).startswith("❌")
+
+
+class TestListDelete:
+    def test_list(self, seeded):
+        assert _view(seeded, "list").startswith("🔖 No saved views")
+        _view(seeded, "save b board all")
+        _view(seeded, "save a all /p Backend")
+        assert _view(seeded, "list").splitlines() == [
+            "🔖 Saved views (2)",
+            "",
+            "a — list all /p Backend",
+            "b — board all",
+        ]
+
+    def test_delete(self, seeded):
+        _view(seeded, "save a all")
+        assert _view(seeded, "delete a") == '🗑️ Deleted view "a".'
+        assert _row(seeded, "a") is None
+        assert _view(seeded, "delete a") == '❌ View "a" not found.'
@@ -0,0 +1,46 @@
+"""Tests for the denormalised-column consistency check (consistency.py)."""
+
+from __future__ import annotations
+
+import io
+
+from openclaw_todo.consistency import Mismatch, check_assignees_csv, main, repair_assignees_csv
+from openclaw_todo.db import get_connection
+from openclaw_todo.dispatcher import dispatch
+from tests.conftest import seed_task
+
+
+def test_consistent(conn):
+    seed_task(conn, assignees=["U001", "U002"])
+    assert check_assignees_csv(conn) == []
+
+
+def test_detects_and_repairs_drift(conn):
+    seed_task(conn, title="good", assignees=["U001"])
+    bad = seed_task(conn, title="bad", assignees=["U001", "U002"])
+    uncached = seed_task(conn, title="uncached", assignees=["U003"])
+    conn.execute("UPDATE tasks SET assignees_csv = 'U009' WHERE id = ?", (bad,))
+    conn.execute("UPDATE tasks SET assignees_csv = NULL WHERE id = ?", (uncached,))
+    assert check_assignees_csv(conn) == [Mismatch(bad, "U009", "U001,U002")]
+    assert repair_assignees_csv(conn, [bad]) == 1
+    assert check_assignees_csv(conn) == []
+
+
+def test_cli(tmp_path):
+    db_path = tmp_path / "todo.sqlite3"
+    dispatch("add Pay invoice <@U002>", {"sender_id": "U001"}, db_path=str(db_path))
+    conn = get_connection(db_path)
+    try:
+        conn.execute("UPDATE tasks SET assignees_csv = 'stale'")
+        conn.commit()
+    finally:
+        conn.close()
+
+    out = io.StringIO()
+    assert main(["--db-path", str(db_path)], out) == 1
+    assert "#1: assignees_csv='stale', task_assignees='U002'" in out.getvalue()
+
+    out = io.StringIO()
+    assert main(["--db-path", str(db_path), "--repair"], out) == 0
+    assert "Repaired 1 task(s)." in out.getvalue()
+    assert main(["--db-path", str(db_path)], io.StringIO()) == 0
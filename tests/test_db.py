@@ -1,6 +1,9 @@
 """Tests for the database connection helper."""
 
-from openclaw_todo.db import get_connection
+import sqlite3
+import time
+
+from openclaw_todo.db import BUSY_TIMEOUT_MS, WRITE_LOCK_TIMEOUT_MS, begin_immediate, get_connection
 
 
 def test_creates_directory_and_file(tmp_path):
@@ -49,3 +52,50 @@ def test_two_connections_no_conflict(tmp_path):
     finally:
         conn1.close()
         conn2.close()
+
+
+def test_begin_immediate_takes_write_lock(tmp_path):
+    """begin_immediate locks out other writers until commit, and joins an open transaction."""
+    db_path = tmp_path / "test.sqlite3"
+    conn1 = get_connection(db_path)
+    conn2 = get_connection(db_path)
+    try:
+        conn1.execute("CREATE TABLE t (id INTEGER PRIMARY KEY);")
+        conn1.commit()
+        conn2.execute("PRAGMA busy_timeout=0;")
+        begin_immediate(conn1)
+        assert conn1.in_transaction
+        begin_immediate(conn1)  # already in a transaction: no-op
+        try:
+            conn2.execute("BEGIN IMMEDIATE;")
+        except sqlite3.OperationalError as exc:
+            assert "locked" in str(exc)
+        else:
+            raise AssertionError("second writer was not locked out")
+        conn1.commit()
+        conn2.execute("BEGIN IMMEDIATE;")
+        conn2.rollback()
+    finally:
+        conn1.close()
+        conn2.close()
+
+
+def test_begin_immediate_gives_up_after_write_lock_timeout(tmp_path):
+    """A held write lock makes begin_immediate return False after the short timeout, not busy_timeout."""
+    db_path = tmp_path / "test.sqlite3"
+    holder = get_connection(db_path)
+    conn = get_connection(db_path)
+    try:
+        holder.execute("BEGIN IMMEDIATE;")
+        started = time.monotonic()
+        assert begin_immediate(conn) is False
+        elapsed_ms = (time.monotonic() - started) * 1000
+        assert WRITE_LOCK_TIMEOUT_MS * 0.9 <= elapsed_ms < BUSY_TIMEOUT_MS
+        assert not conn.in_transaction
+        assert conn.execute("PRAGMA busy_timeout;").fetchone()[0] == BUSY_TIMEOUT_MS
+        holder.rollback()
+        assert begin_immediate(conn) is True
+        conn.rollback()
+    finally:
+        holder.close()
+        conn.close()
@@ -9,6 +9,7 @@ import pytest
 from openclaw_todo.dispatcher import (
     _handlers,
     dispatch,
+    dispatch_lines,
     register_handler,
 )
 
@@ -66,6 +67,11 @@ class TestRoutesKnownCommands:
         result = dispatch("edit 1", {"sender_id": "U1"}, db_path=db_path)
         assert "not yet implemented" not in result.lower()
 
+    def test_view_routes_to_handler(self, db_path):
+        """The view command saves and runs views through the view handler."""
+        assert dispatch("view save mine list mine", {"sender_id": "U1"}, db_path=db_path).startswith("💾")
+        assert "not yet implemented" not in dispatch("view mine", {"sender_id": "U1"}, db_path=db_path).lower()
+
     def test_registered_handler_called(self, db_path):
         """A registered handler is called instead of the stub."""
         called_with = {}
@@ -189,3 +195,114 @@ class TestDbInitialization:
         conn.close()
         assert row is not None
         assert row[0] >= 1
+
+
+class TestDispatchLines:
+    """dispatch_lines yields the same text as dispatch, one line at a time."""
+
+    @pytest.mark.parametrize(
+        "text",
+        ["list", "list all limit:1", "board", "board limitPerSection:1", "list limit:0", "add Title", "help", "bogus"],
+    )
+    def test_matches_dispatch(self, db_path, text):
+        ctx = {"sender_id": "U1"}
+        dispatch("add First due:2026-01-01", ctx, db_path=db_path)
+        dispatch("add Second /s doing", ctx, db_path=db_path)
+        if text.startswith("add"):
+            # add is not idempotent; compare shape only
+            assert "Added #" in "\n".join(dispatch_lines(text, ctx, db_path=db_path))
+            return
+        assert "\n".join(dispatch_lines(text, ctx, db_path=db_path)) == dispatch(text, ctx, db_path=db_path)
+
+    def test_board_streams_lazily(self, db_path):
+        ctx = {"sender_id": "U1"}
+        dispatch("add First", ctx, db_path=db_path)
+        lines = dispatch_lines("board", ctx, db_path=db_path)
+        assert next(lines).startswith("📊 Board")
+        lines.close()
+
+
+class TestJsonResponseFormat:
+    """dispatch(..., response_format="json") returns structured records."""
+
+    def test_list_returns_task_records(self, db_path):
+        ctx = {"sender_id": "U1"}
+        dispatch("add Write spec <@U1> <@U2> due:2026-04-01 /s doing", ctx, db_path=db_path)
+        result = dispatch("list", ctx, db_path=db_path, response_format="json")
+        assert result["ok"] is True
+        assert result["command"] == "list"
+        data = result["data"]
+        assert (data["scope"], data["status"], data["total"]) == ("mine", "open", 1)
+        assert data["tasks"] == [
+            {
+                "id": 1,
+                "title": "Write spec",
+                "project_id": 1,
+                "project": "Inbox",
+                "section": "doing",
+                "due": "2026-04-01",
+                "status": "open",
+                "created_by": "U1",
+                "assignees": ["U1", "U2"],
+                "parent_id": None,
+                "children_done": 0,
+                "children_total": 0,
+            }
+        ]
+
+    def test_board_returns_all_sections(self, db_path):
+        ctx = {"sender_id": "U1"}
+        dispatch("add A", ctx, db_path=db_path)
+        dispatch("add B", ctx, db_path=db_path)
+        result = dispatch("board limitPerSection:1", ctx, db_path=db_path, response_format="json")
+        sections = {s["name"]: s for s in result["data"]["sections"]}
+        assert list(sections) == ["backlog", "doing", "waiting", "done", "drop"]
+        assert sections["backlog"]["total"] == 2
+        assert [t["title"] for t in sections["backlog"]["tasks"]] == ["B"]
+        assert sections["backlog"]["next_after"] == 2
+        assert sections["doing"] == {"name": "doing", "total": 0, "tasks": [], "next_after": None}
+
+    def test_project_list_records(self, db_path):
+        ctx = {"sender_id": "U1"}
+        dispatch("add A", ctx, db_path=db_path)
+        result = dispatch("project list", ctx, db_path=db_path, response_format="json")
+        assert result["command"] == "project_list"
+        assert result["data"]["projects"] == [
+            {"id": 1, "name": "Inbox", "visibility": "shared", "owner_user_id": None, "task_count": 1}
+        ]
+
+    def test_filter_error(self, db_path):
+        result = dispatch("list /p Nope", {"sender_id": "U1"}, db_path=db_path, response_format="json")
+        assert result == {"ok": False, "command": "list", "error": '❌ Project "Nope" not found.'}
+
+    def test_mutation_includes_task_state(self, db_path):
+        ctx = {"sender_id": "U1"}
+        dispatch("add A", ctx, db_path=db_path)
+        result = dispatch("move 1 doing", ctx, db_path=db_path, response_format="json")
+        assert result["ok"] is True
+        assert result["text"].startswith("➡️ Moved #1")
+        assert result["data"]["task"]["section"] == "doing"
+
+    def test_mutation_task_state_without_returning(self, db_path, monkeypatch):
+        monkeypatch.setattr("openclaw_todo.models.HAS_RETURNING", False)
+        ctx = {"sender_id": "U1"}
+        dispatch("add A <@U2>", ctx, db_path=db_path)
+        result = dispatch("done 1", ctx, db_path=db_path, response_format="json")
+        assert result["data"]["task"]["status"] == "done"
+        assert result["data"]["task"]["assignees"] == ["U2"]
+
+    def test_noop_mutation_includes_task_state(self, db_path):
+        ctx = {"sender_id": "U1"}
+        dispatch("add A", ctx, db_path=db_path)
+        result = dispatch("move 1 backlog", ctx, db_path=db_path, response_format="json")
+        assert result["data"]["task"]["section"] == "backlog"
+
+    def test_failed_mutation_reports_error(self, db_path):
+        result = dispatch("done 99", {"sender_id": "U1"}, db_path=db_path, response_format="json")
+        assert result == {"ok": False, "command": "done", "error": "❌ Task #99 not found."}
+
+    def test_parse_error_and_unknown_command(self, db_path):
+        assert dispatch("add /s", {"sender_id": "U1"}, db_path=db_path, response_format="json")["ok"] is False
+        unknown = dispatch("bogus", {"sender_id": "U1"}, db_path=db_path, response_format="json")
+        assert unknown["ok"] is False
+        assert unknown["command"] == "bogus"
@@ -0,0 +1,252 @@
+"""Tests for group commit of mutating commands."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+
+import pytest
+
+from openclaw_todo import dispatcher
+from openclaw_todo.db import get_connection
+from openclaw_todo.dispatcher import dispatch
+from openclaw_todo.event_logger import subscribe, unsubscribe
+from openclaw_todo.group_commit import GroupCommitter, GroupConnection, get_committer, group_commit_from_env
+from openclaw_todo.migrations import migrate
+
+
+@pytest.fixture()
+def db_path(tmp_path):
+    path = tmp_path / "todo.sqlite3"
+    conn = get_connection(path)
+    migrate(conn)
+    conn.close()
+    return path
+
+
+@pytest.fixture()
+def writer(db_path):
+    conn = get_connection(db_path, factory=GroupConnection)
+    yield conn
+    conn.close()
+
+
+def _titles(db_path):
+    conn = get_connection(db_path)
+    try:
+        return [r[0] for r in conn.execute("SELECT title FROM tasks ORDER BY id")]
+    finally:
+        conn.close()
+
+
+def _insert(title):
+    def job(conn):
+        conn.execute(
+            "INSERT INTO tasks (title, project_id, section, status, created_by) VALUES (?, 1, 'backlog', 'open', 'U1')",
+            (title,),
+        )
+        conn.commit()  # a no-op inside the group
+        return title
+
+    return job
+
+
+class TestGroupConnection:
+    def test_commit_and_rollback_outside_group(self, db_path, writer):
+        _insert("kept")(writer)
+        writer.execute("UPDATE tasks SET title = 'changed';")
+        writer.rollback()
+        assert _titles(db_path) == ["kept"]
+
+
+class TestRunGroup:
+    def test_queued_jobs_share_one_commit(self, db_path, writer):
+        committer = GroupCommitter(db_path, window=0.05)
+        futures = [committer.submit(_insert(f"T{i}")) for i in range(3)]
+        assert committer.run_group(writer) == 3
+        assert [f.result() for f in futures] == ["T0", "T1", "T2"]
+        assert committer.commits == 1
+        assert _titles(db_path) == ["T0", "T1", "T2"]
+
+    def test_results_wait_for_the_commit(self, db_path, writer):
+        committer = GroupCommitter(db_path, window=0)
+        seen = []
+
+        def job(conn):
+            _insert("A")(conn)
+            seen.append(_titles(db_path))  # another connection: not committed yet
+            return "done"
+
+        future = committer.submit(job)
+        committer.run_group(writer)
+        assert seen == [[]]
+        assert future.result() == "done"
+        assert _titles(db_path) == ["A"]
+
+    def test_failed_job_does_not_roll_back_neighbours(self, db_path, writer):
+        committer = GroupCommitter(db_path, window=0.05)
+
+        def failing(conn):
+            _insert("lost")(conn)
+            raise ValueError("boom")
+
+        ok1 = committer.submit(_insert("A"))
+        bad = committer.submit(failing)
+        ok2 = committer.submit(_insert("B"))
+        committer.run_group(writer)
+
+        assert ok1.result() == "A" and ok2.result() == "B"
+        with pytest.raises(ValueError, match="boom"):
+            bad.result()
+        assert _titles(db_path) == ["A", "B"]
+
+    def test_handler_rollback_undoes_only_its_own_writes(self, db_path, writer):
+        committer = GroupCommitter(db_path, window=0.05)
+
+        def rolled_back(conn):
+            _insert("undone")(conn)
+            conn.rollback()
+            return "❌ conflict"
+
+        committer.submit(_insert("A"))
+        conflict = committer.submit(rolled_back)
+        committer.submit(_insert("B"))
+        committer.run_group(writer)
+
+        assert conflict.result() == "❌ conflict"
+        assert _titles(db_path) == ["A", "B"]
+
+    def test_rejected_result_rolls_back_its_writes(self, db_path, writer):
+        committer = GroupCommitter(db_path, window=0.05)
+
+        def refused(conn):
+            _insert("half done")(conn)
+            return "❌ not applied"
+
+        committer.submit(_insert("A"))
+        reply = committer.submit(refused, rejected=lambda r: r.startswith("❌"))
+        committer.submit(_insert("B"))
+        committer.run_group(writer)
+
+        assert reply.result() == "❌ not applied"
+        assert _titles(db_path) == ["A", "B"]
+
+    def test_lost_transaction_fails_the_whole_group(self, db_path, writer):
+        committer = GroupCommitter(db_path, window=0.05)
+
+        def rolls_back_everything(conn):
+            conn.execute("ROLLBACK;")  # the savepoint is gone, so RELEASE fails
+            return "ok"
+
+        ok = committer.submit(_insert("A"))
+        bad = committer.submit(rolls_back_everything)
+        later = committer.submit(_insert("B"))
+        assert committer.run_group(writer) == 2
+
+        for future in (ok, bad):
+            with pytest.raises(sqlite3.OperationalError):
+                future.result(timeout=0)
+        assert not writer.in_transaction
+        assert _titles(db_path) == []
+
+        # the job queued behind them goes into the next group
+        assert committer.run_group(writer) == 1
+        assert later.result() == "B"
+        assert _titles(db_path) == ["B"]
+
+    def test_group_size_is_bounded(self, db_path, writer):
+        committer = GroupCommitter(db_path, window=0.05, max_group_size=2)
+        for i in range(3):
+            committer.submit(_insert(f"T{i}"))
+        assert committer.run_group(writer) == 2
+        assert committer.run_group(writer) == 1
+        assert committer.commits == 2
+
+
+class TestCommitterThread:
+    def test_dispatch_routes_writes_through_committer(self, db_path):
+        committer = GroupCommitter(db_path, window=0.001)
+        committer.start()
+        events = []
+
+        def listener(action, task_id, payload):
+            events.append(action)
+
+        subscribe(listener)
+        try:
+            assert get_committer(db_path) is committer
+            ctx = {"sender_id": "U1"}
+            assert dispatch("add First", ctx, db_path=str(db_path)).startswith("✅")
+            record = dispatch("move 1 doing", ctx, db_path=str(db_path), response_format="json")
+            assert record["data"]["task"]["section"] == "doing"
+            assert "First" in dispatch("list", ctx, db_path=str(db_path))
+        finally:
+            committer.stop()
+            unsubscribe(listener)
+        assert committer.commits == 2
+        assert events == ["task.add", "task.move"]
+        assert get_committer(db_path) is None
+
+    def test_writer_survives_a_failed_group(self, db_path):
+        committer = GroupCommitter(db_path, window=0.001)
+        committer.start()
+        try:
+            with pytest.raises(sqlite3.OperationalError):
+                committer.run(lambda conn: conn.execute("ROLLBACK;"))
+            assert committer.run(_insert("A")) == "A"
+        finally:
+            committer.stop()
+        assert _titles(db_path) == ["A"]
+
+    def test_error_reply_discards_the_handlers_writes(self, db_path, monkeypatch):
+        def half_done(parsed, conn, context):
+            _insert("half done")(conn)
+            return "❌ not applied"
+
+        monkeypatch.setattr(dispatcher, "_get_handler", lambda command: half_done)
+        committer = GroupCommitter(db_path, window=0.001)
+        committer.start()
+        try:
+            assert dispatch("add Anything", {"sender_id": "U1"}, db_path=str(db_path)) == "❌ not applied"
+            record = dispatch("add Anything", {"sender_id": "U1"}, db_path=str(db_path), response_format="json")
+            assert record["ok"] is False
+        finally:
+            committer.stop()
+        assert _titles(db_path) == []
+
+    def test_concurrent_writers_are_grouped(self, db_path):
+        committer = GroupCommitter(db_path, window=0.2)
+        committer.start()
+        barrier = threading.Barrier(8)
+
+        def add(i):
+            barrier.wait()
+            dispatch(f"add Task {i}", {"sender_id": "U1"}, db_path=str(db_path))
+
+        threads = [threading.Thread(target=add, args=(i,)) for i in range(8)]
+        try:
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            committer.stop()
+        assert len(_titles(db_path)) == 8
+        assert committer.commits < 8
+
+
+class TestFromEnv:
+    def test_off_by_default(self, monkeypatch, tmp_path):
+        monkeypatch.delenv("OPENCLAW_TODO_GROUP_COMMIT_MS", raising=False)
+        assert group_commit_from_env(tmp_path / "db") is None
+
+    def test_window(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("OPENCLAW_TODO_GROUP_COMMIT_MS", "2")
+        assert group_commit_from_env(tmp_path / "db").window == pytest.approx(0.002)
+
+    def test_invalid(self, monkeypatch, tmp_path, caplog):
+        monkeypatch.setenv("OPENCLAW_TODO_GROUP_COMMIT_MS", "soon")
+        with caplog.at_level(logging.WARNING):
+            assert group_commit_from_env(tmp_path / "db") is None
+        assert "OPENCLAW_TODO_GROUP_COMMIT_MS" in caplog.text
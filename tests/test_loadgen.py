@@ -0,0 +1,105 @@
+"""Tests for the load generator."""
+
+from __future__ import annotations
+
+import io
+import json
+import random
+import threading
+from http.server import HTTPServer
+
+import pytest
+
+from openclaw_todo.loadgen import CommandMix, LatencyHistogram, LoadGenerator, Workload, main, summarize, wal_size
+from openclaw_todo.server import _make_handler_class
+
+
+@pytest.fixture()
+def server(tmp_path):
+    db_path = tmp_path / "load.sqlite3"
+    httpd = HTTPServer(("127.0.0.1", 0), _make_handler_class(str(db_path)))
+    t = threading.Thread(target=httpd.serve_forever, daemon=True)
+    t.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", db_path
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestLatencyHistogram:
+    def test_percentiles_within_bucket_precision(self):
+        hist = LatencyHistogram()
+        for ms in range(1, 101):
+            hist.add(ms / 1000)
+        assert hist.percentile(50) == pytest.approx(0.050, rel=0.03)
+        assert hist.percentile(99) == pytest.approx(0.099, rel=0.03)
+        assert hist.percentile(100) == pytest.approx(0.100)
+
+    def test_empty(self):
+        assert LatencyHistogram().percentile(99) == 0.0
+
+    def test_merge(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.add(0.001)
+        b.add(0.5)
+        a.merge(b)
+        assert a.total == 2
+        assert a.max == 0.5
+
+
+class TestCommandMix:
+    def test_write_ratio(self):
+        mix = CommandMix(Workload(write_ratio=0.3), random.Random(1))
+        mix.task_ids = [1, 2, 3]
+        kinds = [mix.next()[0] for _ in range(5000)]
+        writes = sum(k in ("add", "move", "done", "edit") for k in kinds)
+        assert 0.25 < writes / len(kinds) < 0.35
+
+    def test_project_skew(self):
+        mix = CommandMix(Workload(projects=10, skew=1.5), random.Random(1))
+        picks = [mix.project() for _ in range(5000)]
+        assert picks.count("Load0") > 5 * picks.count("Load9")
+
+    def test_writes_need_known_tasks(self):
+        mix = CommandMix(Workload(write_ratio=1.0), random.Random(1))
+        kind, text, _ = mix.next()
+        assert kind == "add"
+        assert text.startswith("/todo add ")
+        mix.observe("add", "✅ Added #42 (Load0/backlog) due:- assignees:<@U1> — x")
+        assert mix.task_ids == [42]
+
+
+class TestRun:
+    def test_short_run_against_server(self, server):
+        url, db_path = server
+        rows = []
+        gen = LoadGenerator(url, Workload(write_ratio=0.5), clients=2, seed=3)
+        total = gen.run(0.6, 0.2, lambda elapsed, window: rows.append(window))
+        assert total.requests > 0
+        assert total.errors == 0
+        assert sum(w.requests for w in rows) == total.requests
+        assert "add" in total.by_command
+        assert wal_size(db_path) is not None
+
+    def test_errors_and_locked_counted(self):
+        responses = iter([(503, {"error": "database error: database is locked"}), (0, {"error": "refused"})])
+
+        def sender(*args):
+            return next(responses, (200, {"response": "📋 ok"}))
+
+        gen = LoadGenerator("http://x", Workload(write_ratio=0.0), clients=1, sender=sender)
+        total = gen.run(0.1, 1.0, lambda *a: None)
+        row = summarize(1.0, total, 1.0, wal=None, rss=None)
+        assert total.errors == 2
+        assert total.locked == 1
+        assert row["locked_rate"] == pytest.approx(1 / total.requests, abs=1e-4)
+
+    def test_main_json_output(self, server):
+        url, db_path = server
+        out = io.StringIO()
+        argv = ["--url", url, "--duration", "0.3", "--interval", "0.1", "--clients", "1", "--json"]
+        code = main([*argv, "--db-path", str(db_path)], out=out)
+        assert code == 0
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        summary = lines[-1]["summary"]
+        assert summary["requests"] > 0
+        assert summary["wal_bytes"] is not None
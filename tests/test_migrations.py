@@ -1,15 +1,21 @@
 """Tests for the schema migration framework."""
 
 import sqlite3
+import threading
+import time
 
 import pytest
 
 from openclaw_todo.db import get_connection
 from openclaw_todo.migrations import (
+    BatchedMigration,
     _migrations,
+    batch_progress,
     get_version,
     migrate,
     register,
+    register_batched,
+    run_batches,
 )
 
 
@@ -96,3 +102,176 @@ def test_rollback_on_failure(conn):
     # t_ok should exist (committed), but nothing from bad migration
     tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table';").fetchall()}
     assert "t_ok" in tables
+
+
+def test_concurrent_migrate_applies_each_step_once(tmp_path):
+    """Connections migrating a fresh file at once must not both apply a step."""
+    applied: list[int] = []
+
+    @register
+    def migration_1(c: sqlite3.Connection) -> None:
+        applied.append(1)
+        time.sleep(0.05)
+        c.execute("CREATE TABLE t1 (id INTEGER PRIMARY KEY);")
+
+    @register
+    def migration_2(c: sqlite3.Connection) -> None:
+        applied.append(2)
+        c.execute("CREATE TABLE t2 (id INTEGER PRIMARY KEY);")
+
+    def run(results: list[object]) -> None:
+        c = get_connection(tmp_path / "race.sqlite3")
+        try:
+            results.append(migrate(c))
+        except Exception as exc:
+            results.append(exc)
+        finally:
+            c.close()
+
+    results: list[object] = []
+    threads = [threading.Thread(target=run, args=(results,)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == [2, 2, 2, 2]
+    assert sorted(applied) == [1, 2]
+    c = get_connection(tmp_path / "race.sqlite3")
+    try:
+        assert c.execute("SELECT version FROM schema_version;").fetchall() == [(2,)]
+    finally:
+        c.close()
+
+
+# --- Verified-schema cache ---
+
+
+def _statements(conn, fn):
+    seen: list[str] = []
+    conn.set_trace_callback(seen.append)
+    try:
+        fn()
+    finally:
+        conn.set_trace_callback(None)
+    return seen
+
+
+def test_steady_state_skips_version_table(conn):
+    """Once verified, migrate only reads the schema cookie."""
+
+    @register
+    def migration_1(c: sqlite3.Connection) -> None:
+        c.execute("CREATE TABLE t1 (id INTEGER PRIMARY KEY);")
+
+    migrate(conn)
+    seen = _statements(conn, lambda: migrate(conn))
+    assert not any("schema_version;" in sql and "PRAGMA" not in sql for sql in seen)
+    assert not any(sql.startswith("CREATE") for sql in seen)
+
+
+def test_cache_invalidated_by_schema_change(conn, tmp_path):
+    """DDL from another connection bumps the schema cookie and forces a re-check."""
+
+    @register
+    def migration_1(c: sqlite3.Connection) -> None:
+        c.execute("CREATE TABLE t1 (id INTEGER PRIMARY KEY);")
+
+    migrate(conn)
+    other = get_connection(tmp_path / "test.sqlite3")
+    try:
+        other.execute("UPDATE schema_version SET version = 0;")
+        other.execute("DROP TABLE t1;")
+        other.commit()
+    finally:
+        other.close()
+    assert migrate(conn) == 1
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 't1';").fetchone() is not None
+
+
+def test_cache_keyed_by_target(conn):
+    """Registering a new migration makes a verified file outdated again."""
+
+    @register
+    def migration_1(c: sqlite3.Connection) -> None:
+        c.execute("CREATE TABLE t1 (id INTEGER PRIMARY KEY);")
+
+    assert migrate(conn) == 1
+
+    @register
+    def migration_2(c: sqlite3.Connection) -> None:
+        c.execute("CREATE TABLE t2 (id INTEGER PRIMARY KEY);")
+
+    assert migrate(conn) == 2
+
+
+def test_in_memory_not_cached():
+    c = sqlite3.connect(":memory:")
+    try:
+
+        @register
+        def migration_1(conn: sqlite3.Connection) -> None:
+            conn.execute("CREATE TABLE t1 (id INTEGER PRIMARY KEY);")
+
+        assert migrate(c) == 1
+        assert migrate(c) == 1
+    finally:
+        c.close()
+
+
+# --- Batched migrations ---
+
+
+@pytest.fixture()
+def items(conn):
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, n INTEGER NOT NULL, doubled INTEGER);")
+    conn.executemany("INSERT INTO items (n) VALUES (?);", [(i,) for i in range(1, 11)])
+    conn.commit()
+    return conn
+
+
+def _double(c: sqlite3.Connection, after: int | None, size: int) -> int | None:
+    ids = [
+        r[0] for r in c.execute("SELECT id FROM items WHERE id > ? ORDER BY id LIMIT ?;", (after or 0, size)).fetchall()
+    ]
+    if not ids:
+        return None
+    c.execute("UPDATE items SET doubled = n * 2 WHERE id BETWEEN ? AND ?;", (ids[0], ids[-1]))
+    return ids[-1]
+
+
+def test_batched_migration_runs_to_completion(items):
+    register_batched("double", batch_size=3)(_double)
+    assert migrate(items) == 1
+    assert items.execute("SELECT count(*) FROM items WHERE doubled = n * 2;").fetchone()[0] == 10
+    assert batch_progress(items, "double") == (None, True)
+
+
+def test_batched_migration_resumes_after_failure(items):
+    calls: list[int | None] = []
+
+    def flaky(c, after, size):
+        calls.append(after)
+        if len(calls) == 3:
+            raise RuntimeError("interrupted")
+        return _double(c, after, size)
+
+    register(BatchedMigration("double", flaky, batch_size=3))
+    with pytest.raises(RuntimeError, match="Migration to version 1 failed"):
+        migrate(items)
+    assert get_version(items) == 0
+    assert batch_progress(items, "double") == (6, False)
+    # Committed batches stay applied; the failed one was rolled back
+    assert items.execute("SELECT count(*) FROM items WHERE doubled IS NOT NULL;").fetchone()[0] == 6
+
+    assert migrate(items) == 1
+    assert calls[3] == 6  # resumed from the saved cursor, not from the start
+    assert items.execute("SELECT count(*) FROM items WHERE doubled = n * 2;").fetchone()[0] == 10
+
+
+def test_run_batches_max_batches(items):
+    migration = BatchedMigration("double", _double, batch_size=4)
+    assert run_batches(items, migration, max_batches=1) is False
+    assert batch_progress(items, "double") == (4, False)
+    assert run_batches(items, migration) is True
+    assert run_batches(items, migration) is True
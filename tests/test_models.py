@@ -0,0 +1,147 @@
+"""Tests for the slotted row models and row factories."""
+
+from __future__ import annotations
+
+import dataclasses
+
+import pytest
+
+from openclaw_todo.models import (
+    PROJECT_COLUMNS,
+    Project,
+    TaskRow,
+    attach_assignees,
+    collect_updated_tasks,
+    fetch_assignees,
+    fetch_task,
+    project_row,
+    query,
+    update_task,
+)
+from openclaw_todo.parser import parse
+from tests.conftest import seed_task
+
+
+class TestSlots:
+    def test_parsed_command_has_no_instance_dict(self):
+        assert not hasattr(parse("add Task"), "__dict__")
+
+    def test_project_is_frozen_and_slotted(self):
+        project = Project(id=1, name="Inbox", visibility="shared", owner_user_id=None)
+        assert not hasattr(project, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            project.name = "Other"
+
+    def test_task_row_is_slotted(self):
+        row = TaskRow(1, "t", 1, "Inbox", "backlog", None, "open", "U001")
+        assert not hasattr(row, "__dict__")
+        assert row.assignees == ()
+
+
+class TestRowFactories:
+    def test_project_row_factory(self, conn):
+        project = query(conn, project_row, f"SELECT {PROJECT_COLUMNS} FROM projects WHERE name = 'Inbox';").fetchone()
+        assert project == Project(id=1, name="Inbox", visibility="shared", owner_user_id=None)
+
+    def test_fetch_task(self, conn):
+        task_id = seed_task(conn, title="Write docs", section="doing", due="2026-05-01")
+        task = fetch_task(conn, task_id)
+        assert isinstance(task, TaskRow)
+        assert (task.title, task.project_name, task.section, task.due, task.status) == (
+            "Write docs",
+            "Inbox",
+            "doing",
+            "2026-05-01",
+            "open",
+        )
+
+    def test_fetch_task_missing(self, conn):
+        assert fetch_task(conn, 999) is None
+
+
+class TestAssignees:
+    def test_fetch_assignees_sorted_per_task(self, conn):
+        t1 = seed_task(conn, assignees=["U003", "U001"])
+        t2 = seed_task(conn, assignees=["U002"])
+        assert fetch_assignees(conn, [t1, t2, 999]) == {t1: ["U001", "U003"], t2: ["U002"], 999: []}
+
+    def test_fetch_assignees_spans_chunks(self, conn):
+        ids = [seed_task(conn, title=f"T{i}", assignees=[f"U{i:04d}"]) for i in range(620)]
+        result = fetch_assignees(conn, ids)
+        assert len(result) == 620
+        assert result[ids[-1]] == ["U0619"]
+
+    def test_rows_carry_cached_assignees(self, conn):
+        task_id = seed_task(conn, assignees=["U002", "U001"])
+        task = fetch_task(conn, task_id)
+        assert task.assignees == ("U001", "U002")
+        statements = []
+        conn.set_trace_callback(statements.append)
+        attach_assignees(conn, [task])
+        conn.set_trace_callback(None)
+        assert statements == []
+
+    def test_rows_share_assignees_and_due(self, conn):
+        ids = [seed_task(conn, title=f"T{i}", due="2026-03-15", assignees=["U002", "U001"]) for i in range(2)]
+        first, second = (fetch_task(conn, tid) for tid in ids)
+        assert first.assignees is second.assignees
+        assert first.due is second.due
+
+    def test_attach_assignees_falls_back_for_uncached_rows(self, conn):
+        cached = seed_task(conn, title="cached", assignees=["U001"])
+        uncached = seed_task(conn, title="uncached", assignees=["U003", "U002"])
+        conn.execute("UPDATE tasks SET assignees_csv = NULL WHERE id = ?", (uncached,))
+        rows = [fetch_task(conn, cached), fetch_task(conn, uncached)]
+        assert rows[1].assignees is None
+        attach_assignees(conn, rows)
+        assert [r.assignees for r in rows] == [("U001",), ("U002", "U003")]
+
+    def test_attach_assignees_mentions(self, conn):
+        task_id = seed_task(conn, assignees=["U002", "U001"])
+        task = fetch_task(conn, task_id)
+        attach_assignees(conn, [task])
+        assert task.assignee_mentions == "<@U001>, <@U002>"
+
+
+class TestUpdateTask:
+    @pytest.mark.parametrize("returning", [True, False])
+    def test_returns_updated_row(self, conn, returning):
+        task_id = seed_task(conn, assignees=["U002", "U001"])
+        row = update_task(conn, task_id, "title = ?, section = ?", ("Renamed", "doing"), returning=returning)
+        conn.commit()
+        assert row == fetch_task(conn, task_id)
+        assert (row.title, row.section, row.project_name) == ("Renamed", "doing", "Inbox")
+        assert row.assignees == ("U001", "U002")
+
+    @pytest.mark.parametrize("returning", [True, False])
+    def test_missing_task(self, conn, returning):
+        assert update_task(conn, 999, "title = ?", ("x",), returning=returning) is None
+
+    @pytest.mark.parametrize("returning", [True, False])
+    def test_compare_and_swap(self, conn, returning):
+        task_id = seed_task(conn)
+        assert update_task(conn, task_id, "title = ?", ("stale",), expected_version=1, returning=returning) is None
+        row = update_task(conn, task_id, "title = ?", ("fresh",), expected_version=0, returning=returning)
+        assert row.title == "fresh"
+        assert update_task(conn, task_id, "title = ?", ("again",), expected_version=0, returning=returning) is None
+        assert fetch_task(conn, task_id).title == "fresh"
+
+    def test_returning_skips_reread(self, conn):
+        task_id = seed_task(conn)
+        statements = []
+        conn.set_trace_callback(statements.append)
+        update_task(conn, task_id, "section = 'doing'", returning=True)
+        conn.set_trace_callback(None)
+        assert [s for s in statements if not s.startswith(("BEGIN", "--"))] == [statements[-1]]
+        assert "RETURNING" in statements[-1]
+
+    def test_collect_updated_tasks(self, conn):
+        first = seed_task(conn, title="first")
+        second = seed_task(conn, title="second")
+        update_task(conn, first, "section = 'doing'")
+        with collect_updated_tasks() as updated:
+            update_task(conn, second, "section = 'doing'")
+            update_task(conn, second, "section = 'waiting'")
+        update_task(conn, first, "section = 'waiting'")
+        assert list(updated) == [second]
+        assert updated[second].section == "waiting"
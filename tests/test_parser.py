@@ -1,10 +1,10 @@
 """Tests for the command parser."""
 
-from datetime import date
+from datetime import date, timedelta
 
 import pytest
 
-from openclaw_todo.parser import DUE_CLEAR, ParseError, parse
+from openclaw_todo.parser import DUE_CLEAR, PARENT_CLEAR, DateRange, ParseError, parse
 
 
 def test_extract_project():
@@ -350,6 +350,35 @@ class TestIdExtractionCommands:
         assert result.title_tokens == ["42", "is", "the", "answer"]
 
 
+class TestViewCommand:
+    """view keeps its raw tokens: the saved filter is parsed when the view is saved."""
+
+    def test_filter_tokens_kept_verbatim(self):
+        result = parse("view save be board all /p Backend due:<7d")
+        assert result.command == "view"
+        assert result.title_tokens == ["save", "be", "board", "all", "/p", "Backend", "due:<7d"]
+        assert result.project is None
+        assert result.due_range is None
+
+
+class TestParentOption:
+    """parent:#N on add/edit and the filter commands."""
+
+    def test_parent_forms(self):
+        assert parse("add Write tests parent:#12").parent == 12
+        assert parse("add Write tests parent:12").title_tokens == ["Write", "tests"]
+        assert parse("edit 3 parent:-").parent == PARENT_CLEAR
+        assert parse("list all parent:#5").parent == 5
+
+    def test_invalid_parent(self):
+        for text in ("add x parent:abc", "add x parent:#0", "edit 1 parent:"):
+            with pytest.raises(ParseError, match="Invalid parent"):
+                parse(text)
+
+    def test_other_commands_keep_token(self):
+        assert parse("move 1 parent:#2").parent is None
+
+
 class TestCommandCaseInsensitive:
     """Command names should be case-insensitive."""
 
@@ -426,3 +455,143 @@ class TestProjectVisibilityQualifier:
         assert result.project == "Work"
         assert result.project_visibility == "private"
         assert result.args == ["3"]
+
+
+class TestTokenClassification:
+    """Options match whole tokens only; partial matches are title tokens."""
+
+    def test_flag_prefix_is_title_token(self):
+        result = parse("add /pfoo /s/ task")
+        assert result.project is None
+        assert result.section is None
+        assert result.title_tokens == ["/pfoo", "/s/", "task"]
+
+    def test_uppercase_flag_is_title_token(self):
+        result = parse("add /P Work")
+        assert result.project is None
+        assert result.title_tokens == ["/P", "Work"]
+
+    def test_mention_with_trailing_chars_is_title_token(self):
+        result = parse("add Task <@U1>x <@U1>> <@u1>")
+        assert result.mentions == []
+        assert result.title_tokens == ["Task", "<@U1>x", "<@U1>>", "<@u1>"]
+
+    def test_bare_due_prefix_is_title_token(self):
+        result = parse("add Task due:")
+        assert result.due is None
+        assert result.title_tokens == ["Task", "due:"]
+
+    def test_project_flag_consumes_option_like_token(self):
+        """/p takes the next token verbatim, even if it looks like an option."""
+        result = parse("add Task /p due:03-15 <@U1>")
+        assert result.project == "due:03-15"
+        assert result.due is None
+        assert result.mentions == ["U1"]
+
+    def test_non_ascii_whitespace_separates_tokens(self):
+        result = parse("add　Buy\x1cmilk")
+        assert result.title_tokens == ["Buy", "milk"]
+
+
+class TestDueCache:
+    """The due-date normaliser is memoised per (raw, today)."""
+
+    def test_repeated_due_hits_cache(self):
+        from openclaw_todo.parser import _normalise_due_cached
+
+        _normalise_due_cached.cache_clear()
+        parse("add A due:2026-06-01")
+        parse("add B due:2026-06-01")
+        info = _normalise_due_cached.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_mm_dd_keyed_by_today(self, monkeypatch):
+        """MM-DD resolves against the year of the *current* day, not the cached one."""
+        import openclaw_todo.parser as parser_mod
+
+        class _FakeDate(date):
+            @classmethod
+            def today(cls):
+                return date(2030, 1, 1)
+
+        assert parse("add A due:03-15").due == f"{date.today().year}-03-15"
+        monkeypatch.setattr(parser_mod, "date", _FakeDate)
+        assert parse("add A due:03-15").due == "2030-03-15"
+
+    def test_invalid_due_not_cached(self):
+        from openclaw_todo.parser import _normalise_due_cached
+
+        _normalise_due_cached.cache_clear()
+        for _ in range(2):
+            with pytest.raises(ParseError, match="Invalid due date"):
+                parse("add Task due:2026-02-30")
+        assert _normalise_due_cached.cache_info().currsize == 0
+
+
+class TestDateFilters:
+    """list/board/search accept due:<X, due:>X, overdue and closed:X."""
+
+    TODAY = date.today()
+
+    def test_due_before_relative(self):
+        result = parse("list due:<7d")
+        assert result.due_range == DateRange(end=self.TODAY + timedelta(days=6))
+        assert result.due is None
+
+    def test_due_after_relative(self):
+        assert parse("board due:>2d").due_range == DateRange(start=self.TODAY + timedelta(days=3))
+
+    def test_overdue(self):
+        result = parse("list all OVERDUE")
+        assert result.due_range == DateRange(end=self.TODAY - timedelta(days=1))
+        assert result.title_tokens == ["all"]
+
+    def test_filters_intersect(self):
+        result = parse("list due:>1d due:<5d")
+        assert result.due_range == DateRange(self.TODAY + timedelta(days=2), self.TODAY + timedelta(days=4))
+
+    def test_closed_relative_and_absolute(self):
+        assert parse("list closed:7d").closed_range == DateRange(start=self.TODAY - timedelta(days=7))
+        assert parse("list closed:2026-01-15").closed_range == DateRange(start=date(2026, 1, 15))
+
+    def test_invalid_filters(self):
+        with pytest.raises(ParseError, match="Invalid due filter"):
+            parse("list due:<soon")
+        with pytest.raises(ParseError, match="Invalid closed filter"):
+            parse("list closed:yesterday")
+
+    @pytest.mark.parametrize("text", ["list due:>9999-12-31", "list due:<0001-01-01"])
+    def test_exclusive_bound_past_date_range(self, text):
+        """An exclusive bound one day past date.min/date.max is a ParseError, not an OverflowError."""
+        with pytest.raises(ParseError, match="Invalid due filter"):
+            parse(text)
+
+    def test_other_commands_unaffected(self):
+        assert parse("add overdue report").title_tokens == ["overdue", "report"]
+        with pytest.raises(ParseError, match="Invalid due date"):
+            parse("add Thing due:<7d")
+
+    def test_due_today_and_exact_date(self):
+        assert parse("list due:today").due_range == DateRange(self.TODAY, self.TODAY)
+        assert parse("list due:2026-03-15").due_range == DateRange(date(2026, 3, 15), date(2026, 3, 15))
+
+    def test_due_this_week(self):
+        rng = parse("board due:this-week").due_range
+        assert rng.start.weekday() == 0
+        assert rng.end - rng.start == timedelta(days=6)
+        assert rng.start <= self.TODAY <= rng.end
+
+    def test_due_absolute_bounds(self):
+        assert parse("list due:<2026-03-15").due_range == DateRange(end=date(2026, 3, 14))
+        assert parse("list due:>2026-03-15").due_range == DateRange(start=date(2026, 3, 16))
+
+    def test_nodue(self):
+        assert parse("list nodue").no_due
+        assert parse("list due:-").no_due
+        assert parse("list NoDue").title_tokens == []
+        assert not parse("add nodue thing").no_due
+
+    def test_edit_due_today_still_a_date(self):
+        with pytest.raises(ParseError, match="Invalid due date"):
+            parse("edit 1 due:today")
@@ -7,7 +7,13 @@ import pytest
 import openclaw_todo.schema_v1  # noqa: F401 — register V1 migration
 from openclaw_todo.db import get_connection
 from openclaw_todo.migrations import migrate
-from openclaw_todo.permissions import can_write_task, validate_private_assignees
+from openclaw_todo.permissions import (
+    can_write_task,
+    fetch_write_target,
+    select_writable_ids,
+    validate_private_assignees,
+    writable_task_ids,
+)
 
 
 @pytest.fixture()
@@ -86,6 +92,98 @@ class TestCanWriteTask:
         assert can_write_task(conn, 99999, "U_ANY") is False
 
 
+class TestWritableTaskIds:
+    @pytest.fixture()
+    def tasks(self, conn):
+        private = _create_project(conn, "MyPrivate", "private", "U_OWNER")
+        shared = _create_project(conn, "TeamProject", "shared")
+        ids = {
+            "private": _create_task(conn, private, "owned", "U_OWNER"),
+            # Creator who does not own the private project cannot write
+            "private_foreign": _create_task(conn, private, "foreign", "U_ME"),
+            "created": _create_task(conn, shared, "created", "U_ME"),
+            "assigned": _create_task(conn, shared, "assigned", "U_OTHER"),
+            "unrelated": _create_task(conn, shared, "unrelated", "U_OTHER"),
+        }
+        _assign(conn, ids["assigned"], "U_ME")
+        return ids
+
+    def test_matches_can_write_task(self, conn, tasks):
+        for user in ("U_OWNER", "U_ME", "U_OTHER", "U_STRANGER"):
+            expected = {tid for tid in tasks.values() if can_write_task(conn, tid, user)}
+            assert writable_task_ids(conn, tasks.values(), user) == expected
+
+    def test_subset(self, conn, tasks):
+        ids = [tasks["created"], tasks["assigned"], tasks["unrelated"], 99999]
+        assert writable_task_ids(conn, ids, "U_ME") == {tasks["created"], tasks["assigned"]}
+        assert writable_task_ids(conn, [], "U_ME") == set()
+
+    def test_chunks_large_id_lists(self, conn, tasks, monkeypatch):
+        monkeypatch.setattr("openclaw_todo.permissions.IN_CHUNK", 2)
+        assert writable_task_ids(conn, sorted(tasks.values()), "U_OWNER") == {
+            tasks["private"],
+            tasks["private_foreign"],
+        }
+
+    def test_one_query_per_chunk(self, conn, tasks):
+        statements = []
+        conn.set_trace_callback(statements.append)
+        writable_task_ids(conn, tasks.values(), "U_ME")
+        conn.set_trace_callback(None)
+        assert len(statements) == 1
+
+    def test_filter(self, conn, tasks):
+        assert select_writable_ids(conn, "U_ME") == {tasks["created"], tasks["assigned"]}
+        assert select_writable_ids(conn, "U_ME", ["t.title = ?"], ["assigned"]) == {tasks["assigned"]}
+
+    def test_unfiltered_query_uses_indexes(self, conn):
+        statements = []
+        conn.set_trace_callback(statements.append)
+        select_writable_ids(conn, "U_ME")
+        conn.set_trace_callback(None)
+        plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {statements[0]}"))
+        assert "MULTI-INDEX OR" in plan
+        assert "ix_tasks_created_by" in plan
+        assert "SCAN t" not in plan
+
+
+class TestFetchWriteTarget:
+    def test_matches_can_write_task(self, conn):
+        private = _create_project(conn, "MyPrivate", "private", "U_OWNER")
+        shared = _create_project(conn, "TeamProject", "shared")
+        ids = [
+            _create_task(conn, private, "owned", "U_OWNER"),
+            _create_task(conn, private, "foreign", "U_ME"),
+            _create_task(conn, shared, "created", "U_ME"),
+            _create_task(conn, shared, "assigned", "U_OTHER"),
+        ]
+        _assign(conn, ids[3], "U_ME")
+        for user in ("U_OWNER", "U_ME", "U_OTHER", "U_STRANGER"):
+            for tid in ids:
+                assert fetch_write_target(conn, tid, user).writable is can_write_task(conn, tid, user)
+
+    def test_carries_task_and_project_access(self, conn):
+        pid = _create_project(conn, "MyPrivate", "private", "U_OWNER")
+        tid = _create_task(conn, pid, "task1", "U_OWNER")
+        target = fetch_write_target(conn, tid, "U_OWNER")
+        assert (target.task.id, target.task.title, target.task.project_name) == (tid, "task1", "MyPrivate")
+        assert (target.visibility, target.owner_user_id) == ("private", "U_OWNER")
+
+    def test_nonexistent_task(self, conn):
+        assert fetch_write_target(conn, 99999, "U_ANY") is None
+
+    def test_single_primary_key_lookup(self, conn):
+        pid = _create_project(conn, "TeamProject", "shared")
+        tid = _create_task(conn, pid, "task1", "U_CREATOR")
+        statements = []
+        conn.set_trace_callback(statements.append)
+        fetch_write_target(conn, tid, "U_CREATOR")
+        conn.set_trace_callback(None)
+        assert len(statements) == 1
+        plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {statements[0]}"))
+        assert "SCAN" not in plan
+
+
 class TestValidatePrivateAssignees:
     def test_validate_private_assignees_warning(self):
         result = validate_private_assignees("private", ["U_OWNER", "U_OTHER"], "U_OWNER")
@@ -48,3 +48,10 @@ def test_todo_help_command(db_path):
     assert "📖 OpenClaw TODO" in result
     assert "/todo add" in result
     assert "/todo project" in result
+
+
+def test_bare_todo_json_format_returns_help_record(db_path):
+    """Bare /todo in JSON mode wraps the help text in the record envelope."""
+    result = handle_message("/todo", {"sender_id": "U1"}, db_path=db_path, response_format="json")
+    assert result["ok"] is True
+    assert result["command"] == "help"
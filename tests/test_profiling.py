@@ -0,0 +1,91 @@
+"""Tests for the on-demand request profiler."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from openclaw_todo.profiling import ProfileConfigError, Profiler
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _busy(seconds=0.03):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(100))
+
+
+class TestArming:
+    def test_idle_by_default(self):
+        profiler = Profiler()
+        assert not profiler.armed
+        with profiler.profile("list"):
+            pass
+        assert profiler.report()["profiles"] == {}
+
+    def test_request_budget(self):
+        profiler = Profiler()
+        profiler.arm("cprofile", requests=2)
+        for _ in range(3):
+            with profiler.profile("board"):
+                _busy(0.001)
+        report = profiler.report()
+        assert report["profiles"]["board"]["requests"] == 2
+        assert report["remaining_requests"] == 0
+        assert not report["armed"]
+
+    def test_time_budget(self):
+        clock = Clock()
+        profiler = Profiler(clock)
+        profiler.arm("cprofile", seconds=10)
+        assert profiler.armed
+        clock.now += 10
+        assert not profiler.armed
+
+    def test_disarm_keeps_results(self):
+        profiler = Profiler()
+        profiler.arm("cprofile", requests=5)
+        with profiler.profile("list"):
+            pass
+        profiler.disarm()
+        assert not profiler.armed
+        assert profiler.report()["profiles"]["list"]["requests"] == 1
+
+    @pytest.mark.parametrize(
+        "kwargs", [{"mode": "perf"}, {"requests": 0}, {"requests": "3"}, {"seconds": -1}, {"seconds": 99999}]
+    )
+    def test_invalid_parameters(self, kwargs):
+        with pytest.raises(ProfileConfigError):
+            Profiler().arm(**kwargs)
+
+
+class TestOutput:
+    def test_cprofile_pstats_per_command(self):
+        profiler = Profiler()
+        profiler.arm("cprofile", requests=2)
+        with profiler.profile("board"):
+            _busy(0.001)
+        with profiler.profile("list"):
+            pass
+        profiles = profiler.report()["profiles"]
+        assert set(profiles) == {"board", "list"}
+        assert "_busy" in profiles["board"]["output"]
+        assert "cumulative" in profiles["board"]["output"]
+
+    def test_sampler_collapsed_stacks(self):
+        profiler = Profiler()
+        profiler.arm("sample")
+        with profiler.profile("board"):
+            _busy()
+        output = profiler.report()["profiles"]["board"]["output"]
+        stack, count = output.splitlines()[0].rsplit(" ", 1)
+        assert int(count) >= 1
+        assert "tests.test_profiling:_busy" in stack
@@ -0,0 +1,294 @@
+"""Tests for the due-date reminder scheduler."""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+
+import pytest
+
+from openclaw_todo import event_logger
+from openclaw_todo.dispatcher import _init_db, dispatch
+from openclaw_todo.scheduler import FileSink, HttpSink, ReminderScheduler, scheduler_from_env, sink_from_target
+from tests.conftest import seed_task
+
+
+class ListSink:
+    def __init__(self):
+        self.payloads = []
+
+    def emit(self, payload):
+        self.payloads.append(payload)
+
+
+class Clock:
+    def __init__(self, today):
+        self.today = today
+
+    def __call__(self):
+        return self.today
+
+
+@pytest.fixture()
+def sink():
+    return ListSink()
+
+
+@pytest.fixture()
+def clock():
+    return Clock(date(2026, 3, 10))
+
+
+@pytest.fixture()
+def scheduler(conn, sink, clock):
+    return ReminderScheduler(None, sink, today=clock)
+
+
+def _fired(sink):
+    return [p["task"]["id"] for p in sink.payloads]
+
+
+class TestLoad:
+    def test_loads_upcoming_open_tasks_only(self, conn, scheduler):
+        upcoming = seed_task(conn, due="2026-03-12")
+        seed_task(conn, due="2026-03-01")  # already overdue
+        seed_task(conn)  # no due date
+        closed = seed_task(conn, due="2026-03-15")
+        conn.execute("UPDATE tasks SET status = 'done' WHERE id = ?", (closed,))
+        conn.commit()
+
+        assert scheduler.load(conn) == 1
+        assert scheduler._due == {upcoming: "2026-03-12"}
+
+    def test_load_uses_due_index(self, conn):
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id, due FROM tasks WHERE status = 'open' AND due_day >= ?;", (20522,)
+        ).fetchall()
+        assert "ix_tasks_due_day (due_day>?)" in plan[0][3]
+
+
+class TestRunPending:
+    def test_fires_in_due_order_when_date_arrives(self, conn, scheduler, sink, clock):
+        later = seed_task(conn, title="Later", due="2026-03-12", assignees=["U002"])
+        sooner = seed_task(conn, title="Sooner", due="2026-03-11")
+        scheduler.load(conn)
+
+        assert scheduler.run_pending(conn) == 0
+        clock.today = date(2026, 3, 12)
+        assert scheduler.run_pending(conn) == 2
+        assert _fired(sink) == [sooner, later]
+        assert sink.payloads[1] == {
+            "type": "reminder",
+            "fire_on": "2026-03-12",
+            "task": {
+                "id": later,
+                "title": "Later",
+                "project_id": 1,
+                "project": "Inbox",
+                "section": "backlog",
+                "due": "2026-03-12",
+                "status": "open",
+                "created_by": "U001",
+                "assignees": ["U002"],
+                "parent_id": None,
+                "children_done": 0,
+                "children_total": 0,
+            },
+        }
+
+    def test_fires_once(self, conn, scheduler, sink, clock):
+        seed_task(conn, due="2026-03-10")
+        scheduler.load(conn)
+        assert scheduler.run_pending(conn) == 1
+        assert scheduler.run_pending(conn) == 0
+        assert len(scheduler) == 0
+
+    def test_lead_days(self, conn, sink, clock):
+        seed_task(conn, due="2026-03-12")
+        scheduler = ReminderScheduler(None, sink, lead_days=2, today=clock)
+        scheduler.load(conn)
+        assert scheduler.run_pending(conn) == 1
+
+    def test_revalidates_against_database(self, conn, scheduler, sink):
+        closed = seed_task(conn, due="2026-03-10")
+        redated = seed_task(conn, due="2026-03-10")
+        scheduler.load(conn)
+        # Changed behind the scheduler's back (no events)
+        conn.execute("UPDATE tasks SET status = 'done' WHERE id = ?", (closed,))
+        conn.execute("UPDATE tasks SET due = '2026-04-01' WHERE id = ?", (redated,))
+        conn.commit()
+        assert scheduler.run_pending(conn) == 0
+
+    def test_sink_failure_does_not_stop_other_reminders(self, conn, clock):
+        class FlakySink(ListSink):
+            def emit(self, payload):
+                if not self.payloads:
+                    self.payloads.append(None)
+                    raise OSError("sink down")
+                super().emit(payload)
+
+        seed_task(conn, due="2026-03-10")
+        seed_task(conn, due="2026-03-10")
+        sink = FlakySink()
+        scheduler = ReminderScheduler(None, sink, today=clock)
+        scheduler.load(conn)
+        assert scheduler.run_pending(conn) == 1
+
+
+class TestDigests:
+    def test_run_digests_emits_one_payload_per_user(self, conn, sink, clock):
+        seed_task(conn, title="Late", due="2026-03-09", assignees=["U001", "U002"])
+        seed_task(conn, title="Working", section="doing", assignees=["U003"])
+        scheduler = ReminderScheduler(None, sink, digest_hour=8, today=clock)
+
+        assert scheduler.run_digests(conn) == 3
+        assert [p["user_id"] for p in sink.payloads] == ["U001", "U002", "U003"]
+        assert sink.payloads[0]["type"] == "digest"
+        assert sink.payloads[0]["date"] == "2026-03-10"
+        assert [t["title"] for t in sink.payloads[2]["doing"]] == ["Working"]
+
+    def test_digest_due_once_per_day_after_hour(self, conn, sink, clock):
+        scheduler = ReminderScheduler(None, sink, digest_hour=8, today=clock)
+        assert not scheduler.digest_due(datetime(2026, 3, 10, 7, 59))
+        assert scheduler.digest_due(datetime(2026, 3, 10, 8, 0))
+        scheduler.run_digests(conn)
+        assert not scheduler.digest_due(datetime(2026, 3, 10, 9, 0))
+        clock.today = date(2026, 3, 11)
+        assert scheduler.digest_due(datetime(2026, 3, 11, 8, 30))
+
+    def test_digests_disabled_by_default(self, scheduler):
+        assert not scheduler.digest_due(datetime(2026, 3, 10, 12, 0))
+
+
+class TestEvents:
+    @pytest.fixture()
+    def subscribed(self, tmp_path, sink, clock):
+        db_path = str(tmp_path / "test.sqlite3")
+        scheduler = ReminderScheduler(db_path, sink, today=clock)
+        event_logger.subscribe(scheduler.on_event)
+        yield scheduler, db_path
+        event_logger.unsubscribe(scheduler.on_event)
+
+    def test_add_schedules(self, subscribed):
+        scheduler, db_path = subscribed
+        dispatch("add Pay invoice due:2026-03-11", {"sender_id": "U001"}, db_path=db_path)
+        assert list(scheduler._due.values()) == ["2026-03-11"]
+
+    def test_edit_reschedules_and_clears(self, subscribed, sink, clock):
+        scheduler, db_path = subscribed
+        ctx = {"sender_id": "U001"}
+        dispatch("add Pay invoice due:2026-03-10", ctx, db_path=db_path)
+        dispatch("edit 1 due:2026-03-20", ctx, db_path=db_path)
+        assert scheduler._due == {1: "2026-03-20"}
+
+        conn = _init_db(db_path)
+        assert scheduler.run_pending(conn) == 0  # stale 03-10 entry skipped
+        dispatch("edit 1 due:-", ctx, db_path=db_path)
+        assert len(scheduler) == 0
+        clock.today = date(2026, 3, 20)
+        assert scheduler.run_pending(conn) == 0
+        conn.close()
+
+    @pytest.mark.parametrize("command", ["done", "drop"])
+    def test_done_drop_cancel(self, subscribed, command):
+        scheduler, db_path = subscribed
+        ctx = {"sender_id": "U001"}
+        dispatch("add Pay invoice due:2026-03-11", ctx, db_path=db_path)
+        dispatch(f"{command} 1", ctx, db_path=db_path)
+        assert len(scheduler) == 0
+
+    def test_failed_command_not_published(self, subscribed):
+        scheduler, db_path = subscribed
+        dispatch("edit 99 due:2026-03-11", {"sender_id": "U001"}, db_path=db_path)
+        assert len(scheduler) == 0
+
+    def test_listener_error_does_not_break_command(self, subscribed):
+        _, db_path = subscribed
+
+        def broken(action, task_id, payload):
+            raise RuntimeError("boom")
+
+        event_logger.subscribe(broken)
+        try:
+            result = dispatch("add Pay invoice", {"sender_id": "U001"}, db_path=db_path)
+        finally:
+            event_logger.unsubscribe(broken)
+        assert result.startswith("✅")
+
+    def test_collect_events_discards_on_error(self, conn):
+        heard = []
+
+        def listener(*args):
+            heard.append(args)
+
+        event_logger.subscribe(listener)
+        try:
+            with pytest.raises(RuntimeError):
+                with event_logger.collect_events():
+                    event_logger.log_event(conn, actor_user_id="U001", action="task.add", payload={}, task_id=1)
+                    raise RuntimeError
+            assert heard == []
+
+            with event_logger.collect_events():
+                event_logger.log_event(conn, actor_user_id="U001", action="task.add", payload={}, task_id=1)
+                assert heard == []
+            assert heard == [("task.add", 1, {})]
+        finally:
+            event_logger.unsubscribe(listener)
+
+
+class TestWorker:
+    def test_start_fires_due_today(self, tmp_path, sink, clock):
+        db_path = str(tmp_path / "test.sqlite3")
+        dispatch("add Pay invoice due:2026-03-10", {"sender_id": "U001"}, db_path=db_path)
+        scheduler = ReminderScheduler(db_path, sink, today=clock)
+        scheduler.start()
+        try:
+            dispatch("add Call bank due:2026-03-10", {"sender_id": "U001"}, db_path=db_path)
+            for _ in range(100):
+                if len(sink.payloads) == 2:
+                    break
+                scheduler._stop.wait(0.02)
+        finally:
+            scheduler.stop()
+        assert sorted(_fired(sink)) == [1, 2]
+        assert scheduler.on_event not in event_logger._listeners
+
+
+class TestSinks:
+    def test_file_sink_appends_json_lines(self, tmp_path):
+        path = tmp_path / "out" / "reminders.jsonl"
+        sink = FileSink(path)
+        sink.emit({"a": 1})
+        sink.emit({"b": 2})
+        assert [json.loads(line) for line in path.read_text().splitlines()] == [{"a": 1}, {"b": 2}]
+
+    def test_sink_from_target(self, tmp_path):
+        assert isinstance(sink_from_target("https://example.invalid/hook"), HttpSink)
+        assert isinstance(sink_from_target(str(tmp_path / "r.jsonl")), FileSink)
+
+    def test_scheduler_from_env(self, monkeypatch, tmp_path):
+        monkeypatch.delenv("OPENCLAW_TODO_REMINDER_SINK", raising=False)
+        assert scheduler_from_env(None) is None
+        monkeypatch.setenv("OPENCLAW_TODO_REMINDER_SINK", str(tmp_path / "r.jsonl"))
+        monkeypatch.setenv("OPENCLAW_TODO_REMINDER_LEAD_DAYS", "bogus")
+        scheduler = scheduler_from_env(None)
+        assert scheduler is not None
+        assert scheduler.lead.days == 0
+        assert scheduler.digest_hour is None
+
+    @pytest.mark.parametrize(("raw", "expected"), [("7", 7), ("24", None), ("x", None)])
+    def test_scheduler_from_env_digest_hour(self, monkeypatch, tmp_path, raw, expected):
+        monkeypatch.setenv("OPENCLAW_TODO_REMINDER_SINK", str(tmp_path / "r.jsonl"))
+        monkeypatch.setenv("OPENCLAW_TODO_DIGEST_HOUR", raw)
+        assert scheduler_from_env(None).digest_hour == expected
+
+    def test_scheduler_from_env_disabled_when_sharded(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("OPENCLAW_TODO_REMINDER_SINK", str(tmp_path / "r.jsonl"))
+        monkeypatch.setenv("OPENCLAW_TODO_SHARDS", "2")
+        assert scheduler_from_env(None) is None
+
+    def test_scheduler_from_env_disabled_with_tenants(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("OPENCLAW_TODO_REMINDER_SINK", str(tmp_path / "r.jsonl"))
+        monkeypatch.setenv("OPENCLAW_TODO_TENANT_DIR", str(tmp_path / "tenants"))
+        assert scheduler_from_env(None) is None
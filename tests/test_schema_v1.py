@@ -4,7 +4,19 @@ import sqlite3
 
 import pytest
 
-from openclaw_todo.migrations import get_version
+from openclaw_todo.db import get_connection
+from openclaw_todo.migrations import _migrations, get_version, migrate
+from openclaw_todo.schema_v1 import migrate_v1
+
+
+@pytest.fixture()
+def conn(tmp_path):
+    """Return a connection migrated with V1 only."""
+    _migrations[:] = [migrate_v1]
+    c = get_connection(tmp_path / "test.sqlite3")
+    migrate(c)
+    yield c
+    c.close()
 
 
 def test_v1_tables_exist(conn):
@@ -0,0 +1,57 @@
+"""Tests for V2 schema migration: FTS5 title index and sync triggers."""
+
+from openclaw_todo.db import get_connection
+from openclaw_todo.migrations import _migrations, get_version, migrate
+from openclaw_todo.schema_v1 import migrate_v1
+from openclaw_todo.schema_v2 import has_fts_index, migrate_v2
+from tests.conftest import seed_task
+
+
+def _fts_ids(conn, expr):
+    return [r[0] for r in conn.execute("SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ? ORDER BY rowid", (expr,))]
+
+
+def test_v2_schema_version(conn):
+    assert get_version(conn) >= 2
+    assert has_fts_index(conn)
+
+
+def test_insert_trigger_indexes_title(conn):
+    task_id = seed_task(conn, title="Deploy staging cluster")
+    assert _fts_ids(conn, "staging") == [task_id]
+
+
+def test_update_trigger_reindexes_title(conn):
+    task_id = seed_task(conn, title="Old wording")
+    conn.execute("UPDATE tasks SET title = 'Fresh wording' WHERE id = ?", (task_id,))
+    conn.commit()
+    assert _fts_ids(conn, "old") == []
+    assert _fts_ids(conn, "fresh") == [task_id]
+
+
+def test_non_title_update_keeps_index(conn):
+    task_id = seed_task(conn, title="Review budget")
+    conn.execute("UPDATE tasks SET section = 'doing' WHERE id = ?", (task_id,))
+    conn.commit()
+    assert _fts_ids(conn, "budget") == [task_id]
+
+
+def test_delete_trigger_removes_title(conn):
+    task_id = seed_task(conn, title="Temporary item")
+    conn.execute("DELETE FROM task_assignees WHERE task_id = ?", (task_id,))
+    conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+    conn.commit()
+    assert _fts_ids(conn, "temporary") == []
+
+
+def test_migration_indexes_existing_tasks(tmp_path):
+    """Tasks created under V1 are searchable once V2 is applied."""
+    _migrations[:] = [migrate_v1]
+    conn = get_connection(tmp_path / "upgrade.sqlite3")
+    migrate(conn)
+    task_id = seed_task(conn, title="Legacy report")
+
+    _migrations[:] = [migrate_v1, migrate_v2]
+    assert migrate(conn) == 2
+    assert _fts_ids(conn, "legacy") == [task_id]
+    conn.close()
@@ -0,0 +1,52 @@
+"""Tests for V4 schema migration: integer date columns and their indexes."""
+
+from datetime import date
+
+from openclaw_todo.migrations import get_version
+from openclaw_todo.task_query import epoch_day
+from tests.conftest import seed_task
+
+
+def _row(conn, task_id):
+    return conn.execute(
+        "SELECT due_day, created_epoch, closed_epoch, strftime('%s', created_at) FROM tasks WHERE id = ?", (task_id,)
+    ).fetchone()
+
+
+def test_v4_schema_version(conn):
+    assert get_version(conn) >= 4
+
+
+def test_due_day_tracks_due_text(conn):
+    task_id = seed_task(conn, due="2026-03-10")
+    assert _row(conn, task_id)[0] == epoch_day(date(2026, 3, 10)) == 20522
+
+    conn.execute("UPDATE tasks SET due = '2026-03-11' WHERE id = ?", (task_id,))
+    assert _row(conn, task_id)[0] == 20523
+
+    conn.execute("UPDATE tasks SET due = NULL WHERE id = ?", (task_id,))
+    assert _row(conn, task_id)[0] is None
+
+
+def test_epoch_columns(conn):
+    task_id = seed_task(conn)
+    due_day, created_epoch, closed_epoch, created_text = _row(conn, task_id)
+    assert created_epoch == int(created_text)
+    assert closed_epoch is None
+
+    conn.execute("UPDATE tasks SET closed_at = '2026-03-10 12:00:00' WHERE id = ?", (task_id,))
+    assert _row(conn, task_id)[2] == 1773144000
+
+
+def test_range_filters_use_indexes(conn):
+    def plan(where):
+        return conn.execute(f"EXPLAIN QUERY PLAN SELECT id FROM tasks WHERE {where}").fetchall()[0][3]
+
+    assert "ix_tasks_due_day (due_day<?)" in plan("status = 'open' AND due_day < 20522")
+    assert "ix_tasks_closed_epoch (closed_epoch>?)" in plan("status = 'done' AND closed_epoch > 0")
+
+
+def test_v3_due_index_dropped(conn):
+    names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "ix_tasks_status_due" not in names
+    assert {"ix_tasks_due_day", "ix_tasks_closed_epoch"} <= names
@@ -0,0 +1,17 @@
+"""Tests for V5 schema migration: creator and project indexes on tasks."""
+
+from openclaw_todo.migrations import get_version
+
+
+def test_v5_schema_version(conn):
+    assert get_version(conn) >= 5
+
+
+def test_indexes_created(conn):
+    names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"ix_tasks_created_by", "ix_tasks_project"} <= names
+
+
+def test_created_by_lookup_uses_index(conn):
+    plan = conn.execute("EXPLAIN QUERY PLAN SELECT id FROM tasks WHERE created_by = 'U001'").fetchall()[0][3]
+    assert "ix_tasks_created_by" in plan
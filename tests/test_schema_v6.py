@@ -0,0 +1,48 @@
+"""Tests for V6 schema migration: trigger-maintained ``tasks.assignees_csv``."""
+
+from openclaw_todo.backfill import backfill_complete, run_all
+from openclaw_todo.migrations import get_version
+from openclaw_todo.schema_v6 import backfill_assignees_csv
+from tests.conftest import seed_task
+
+
+def _csv(conn, task_id):
+    return conn.execute("SELECT assignees_csv FROM tasks WHERE id = ?", (task_id,)).fetchone()[0]
+
+
+def test_v6_schema_version(conn):
+    assert get_version(conn) >= 6
+
+
+def test_insert_keeps_sorted_list(conn):
+    task_id = seed_task(conn, assignees=["U003", "U001", "U002"])
+    assert _csv(conn, task_id) == "U001,U002,U003"
+
+
+def test_delete_and_update(conn):
+    task_id = seed_task(conn, assignees=["U001", "U002"])
+    conn.execute("DELETE FROM task_assignees WHERE task_id = ? AND assignee_user_id = 'U001'", (task_id,))
+    assert _csv(conn, task_id) == "U002"
+    conn.execute("UPDATE task_assignees SET assignee_user_id = 'U000' WHERE task_id = ?", (task_id,))
+    assert _csv(conn, task_id) == "U000"
+    conn.execute("DELETE FROM task_assignees WHERE task_id = ?", (task_id,))
+    assert _csv(conn, task_id) == ""
+
+
+def test_update_moving_assignee_between_tasks(conn):
+    t1 = seed_task(conn, title="one", assignees=["U001"])
+    t2 = seed_task(conn, title="two", assignees=["U002"])
+    conn.execute("UPDATE task_assignees SET task_id = ? WHERE task_id = ?", (t2, t1))
+    assert _csv(conn, t1) == ""
+    assert _csv(conn, t2) == "U001,U002"
+
+
+def test_backfill_fills_uncached_rows(conn):
+    ids = [seed_task(conn, title=f"T{i}", assignees=[f"U{i:03d}"]) for i in range(5)]
+    conn.execute("UPDATE tasks SET assignees_csv = NULL")
+    conn.commit()
+    assert backfill_assignees_csv(conn, None, 2) == ids[1]
+    assert [_csv(conn, i) for i in ids] == ["U000", "U001", None, None, None]
+    run_all(conn)
+    assert [_csv(conn, i) for i in ids] == ["U000", "U001", "U002", "U003", "U004"]
+    assert backfill_complete(conn, "tasks.assignees_csv")
@@ -0,0 +1,24 @@
+"""Tests for V7 schema migration: ``tasks.version`` for compare-and-swap updates."""
+
+from openclaw_todo.migrations import get_version
+from openclaw_todo.models import update_task
+from tests.conftest import seed_task
+
+
+def _version(conn, task_id):
+    return conn.execute("SELECT version FROM tasks WHERE id = ?", (task_id,)).fetchone()[0]
+
+
+def test_v7_schema_version(conn):
+    assert get_version(conn) >= 7
+
+
+def test_new_tasks_start_at_zero(conn):
+    assert _version(conn, seed_task(conn)) == 0
+
+
+def test_update_task_increments_version(conn):
+    task_id = seed_task(conn)
+    update_task(conn, task_id, "section = 'doing'")
+    update_task(conn, task_id, "section = 'waiting'", expected_version=1)
+    assert _version(conn, task_id) == 2
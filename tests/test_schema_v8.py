@@ -0,0 +1,31 @@
+"""Tests for V8 schema migration: ``saved_views``."""
+
+import sqlite3
+
+import pytest
+
+from openclaw_todo.migrations import get_version
+
+
+def _insert(conn, owner="U001", name="v", command="list"):
+    conn.execute(
+        "INSERT INTO saved_views (owner_user_id, name, command, filter_text, scope, status, limit_n) "
+        "VALUES (?, ?, ?, '', 'mine', 'open', 30)",
+        (owner, name, command),
+    )
+
+
+def test_v8_schema_version(conn):
+    assert get_version(conn) >= 8
+
+
+def test_names_are_unique_per_owner(conn):
+    _insert(conn)
+    _insert(conn, owner="U002")
+    with pytest.raises(sqlite3.IntegrityError):
+        _insert(conn)
+
+
+def test_command_is_checked(conn):
+    with pytest.raises(sqlite3.IntegrityError):
+        _insert(conn, command="search")
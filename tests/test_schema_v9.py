@@ -0,0 +1,58 @@
+"""Tests for V9 schema migration: ``tasks.parent_id`` and trigger-maintained subtask rollups."""
+
+from openclaw_todo.migrations import get_version
+from tests.conftest import seed_task
+
+
+def _rollup(conn, task_id):
+    return conn.execute("SELECT children_done, children_total FROM tasks WHERE id = ?", (task_id,)).fetchone()
+
+
+def test_v9_schema_version(conn):
+    assert get_version(conn) >= 9
+
+
+def test_insert_counts_subtask(conn):
+    parent = seed_task(conn, title="Parent")
+    assert _rollup(conn, parent) == (0, 0)
+    seed_task(conn, title="A", parent=parent)
+    seed_task(conn, title="B", parent=parent)
+    assert _rollup(conn, parent) == (0, 2)
+
+
+def test_status_changes_update_rollup(conn):
+    parent = seed_task(conn)
+    a = seed_task(conn, parent=parent)
+    b = seed_task(conn, parent=parent)
+    conn.execute("UPDATE tasks SET status = 'done' WHERE id = ?", (a,))
+    assert _rollup(conn, parent) == (1, 2)
+    conn.execute("UPDATE tasks SET status = 'dropped' WHERE id = ?", (b,))
+    assert _rollup(conn, parent) == (1, 1)
+    conn.execute("UPDATE tasks SET status = 'open' WHERE id = ?", (a,))
+    assert _rollup(conn, parent) == (0, 1)
+
+
+def test_reparent_and_delete(conn):
+    first = seed_task(conn)
+    second = seed_task(conn)
+    child = seed_task(conn, parent=first)
+    conn.execute("UPDATE tasks SET status = 'done' WHERE id = ?", (child,))
+    conn.execute("UPDATE tasks SET parent_id = ? WHERE id = ?", (second, child))
+    assert _rollup(conn, first) == (0, 0)
+    assert _rollup(conn, second) == (1, 1)
+    conn.execute("DELETE FROM task_assignees WHERE task_id = ?", (child,))
+    conn.execute("DELETE FROM tasks WHERE id = ?", (child,))
+    assert _rollup(conn, second) == (0, 0)
+
+
+def test_other_updates_leave_parent_untouched(conn):
+    parent = seed_task(conn)
+    child = seed_task(conn, parent=parent)
+    conn.execute("UPDATE tasks SET title = 'x', section = 'doing' WHERE id = ?", (child,))
+    conn.execute("UPDATE tasks SET status = 'done' WHERE id = ?", (child,))
+    assert conn.execute("SELECT version FROM tasks WHERE id = ?", (parent,)).fetchone() == (0,)
+
+
+def test_children_lookup_uses_parent_index(conn):
+    plan = conn.execute("EXPLAIN QUERY PLAN SELECT id FROM tasks WHERE parent_id = ?", (1,)).fetchall()
+    assert "ix_tasks_parent" in plan[0][3]
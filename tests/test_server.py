@@ -9,6 +9,7 @@ from http.server import HTTPServer
 
 import pytest
 
+from openclaw_todo.migrations import _migrations
 from openclaw_todo.server import _make_handler_class
 
 
@@ -57,6 +58,21 @@ class TestHealthEndpoint:
         assert status == 200
         assert body == {"status": "ok"}
 
+    def test_deep_health_reports_database(self, server_url):
+        _post(f"{server_url}/message", json.dumps({"text": "/todo add Buy milk", "sender_id": "U001"}).encode())
+        status, body = _get(f"{server_url}/health?deep=1")
+        assert status == 200
+        assert body["status"] == "ok"
+        database = body["database"]
+        assert database["schema_version"] == len(_migrations)
+        assert database["page_count"] > 0
+        assert {"freelist_count", "wal_bytes", "last_checkpoint", "backfills"} <= set(database)
+
+    def test_shallow_health_ignores_other_params(self, server_url):
+        status, body = _get(f"{server_url}/health?deep=0")
+        assert status == 200
+        assert body == {"status": "ok"}
+
     def test_unknown_get_path_404(self, server_url):
         status, body = _get(f"{server_url}/nonexistent")
         assert status == 404
@@ -157,3 +173,183 @@ class TestErrorHandling:
             status, body = e.code, json.loads(e.read())
         assert status == 413
         assert "limit" in body["error"]
+
+    def test_database_locked_503(self, server_url, monkeypatch):
+        import sqlite3
+
+        from openclaw_todo import server
+
+        def locked(*args, **kwargs):
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(server, "handle_message", locked)
+        status, body = _post(f"{server_url}/message", json.dumps({"text": "/todo list", "sender_id": "U1"}).encode())
+        assert status == 503
+        assert body["error"] == "database error: database is locked"
+
+
+# --- Streaming (NDJSON) mode ---
+
+
+def _post_stream(url: str, payload: dict) -> tuple[int, str, list[dict]]:
+    """Helper: POST with stream=true, return (status, content_type, records)."""
+    req = urllib.request.Request(url, data=json.dumps({**payload, "stream": True}).encode(), method="POST")
+    req.add_header("Content-Type", "application/json")
+    resp = urllib.request.urlopen(req)
+    records = [json.loads(line) for line in resp.read().splitlines()]
+    return resp.status, resp.headers["Content-Type"], records
+
+
+class TestStreamingMessage:
+    def test_list_streams_one_record_per_line(self, server_url):
+        for i in range(3):
+            _post(f"{server_url}/message", json.dumps({"text": f"/todo add Task {i}", "sender_id": "U001"}).encode())
+
+        status, ctype, records = _post_stream(
+            f"{server_url}/message", {"text": "/todo list limit:2", "sender_id": "U001"}
+        )
+        assert status == 200
+        assert ctype == "application/x-ndjson"
+        assert records[-1] == {"done": True, "lines": len(records) - 1}
+        lines = [r["line"] for r in records[:-1]]
+
+        _status, body = _post(
+            f"{server_url}/message", json.dumps({"text": "/todo list limit:2", "sender_id": "U001"}).encode()
+        )
+        assert "\n".join(lines) == body["response"]
+        assert lines[-1] == "Showing 2 of 3. Use limit:N to see more."
+
+    def test_non_streaming_command_is_split_into_lines(self, server_url):
+        _status, _ctype, records = _post_stream(
+            f"{server_url}/message", {"text": "/todo add Streamed", "sender_id": "U001"}
+        )
+        assert len(records) == 2
+        assert "Streamed" in records[0]["line"]
+
+    def test_non_todo_streams_only_terminator(self, server_url):
+        _status, _ctype, records = _post_stream(f"{server_url}/message", {"text": "hello", "sender_id": "U001"})
+        assert records == [{"done": True, "lines": 0}]
+
+
+class TestJsonFormat:
+    def test_format_json_returns_records(self, server_url):
+        _post(f"{server_url}/message", json.dumps({"text": "/todo add Buy milk", "sender_id": "U001"}).encode())
+        payload = json.dumps({"text": "/todo list", "sender_id": "U001", "format": "json"}).encode()
+        status, body = _post(f"{server_url}/message", payload)
+        assert status == 200
+        assert body["response"]["ok"] is True
+        assert body["response"]["data"]["tasks"][0]["title"] == "Buy milk"
+
+    def test_invalid_format_422(self, server_url):
+        payload = json.dumps({"text": "/todo list", "sender_id": "U001", "format": "xml"}).encode()
+        status, body = _post(f"{server_url}/message", payload)
+        assert status == 422
+        assert "format" in body["error"]
+
+    def test_stream_with_json_format_422(self, server_url):
+        payload = json.dumps({"text": "/todo list", "sender_id": "U001", "format": "json", "stream": True}).encode()
+        status, _body = _post(f"{server_url}/message", payload)
+        assert status == 422
+
+
+class TestTenantRouting:
+    @pytest.fixture()
+    def tenant_url(self, tmp_path):
+        from openclaw_todo.tenants import TenantRegistry
+
+        registry = TenantRegistry(tmp_path / "tenants")
+        server = HTTPServer(("127.0.0.1", 0), _make_handler_class(None, registry))
+        t = threading.Thread(target=server.serve_forever, daemon=True)
+        t.start()
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+        server.shutdown()
+        server.server_close()
+        registry.close()
+
+    def _message(self, url, text, **extra):
+        body = {"text": text, "sender_id": "U001", **extra}
+        return _post(f"{url}/message", json.dumps(body).encode())
+
+    def test_routes_by_tenant(self, tenant_url):
+        self._message(tenant_url, "/todo add Team A task", tenant_id="TA")
+        status, body = self._message(tenant_url, "/todo list", tenant_id="TB")
+        assert status == 200
+        assert "Team A task" not in body["response"]
+        _, body = self._message(tenant_url, "/todo list", tenant_id="TA")
+        assert "Team A task" in body["response"]
+
+    def test_missing_tenant_422(self, tenant_url):
+        status, body = self._message(tenant_url, "/todo list")
+        assert status == 422
+        assert "tenant_id" in body["error"]
+
+    def test_deep_health_per_tenant(self, tenant_url):
+        assert _get(f"{tenant_url}/health?deep=1")[0] == 422
+        assert _get(f"{tenant_url}/health?deep=1&tenant_id=TA")[0] == 404
+        self._message(tenant_url, "/todo add Team A task", tenant_id="TA")
+        status, body = _get(f"{tenant_url}/health?deep=1&tenant_id=TA")
+        assert status == 200
+        assert body["database"]["path"].endswith("TA.sqlite3")
+
+    def test_invalid_tenant_422(self, tenant_url):
+        status, body = self._message(tenant_url, "/todo list", tenant_id="../x")
+        assert status == 422
+        assert "invalid tenant_id" in body["error"]
+
+
+class TestAdminProfile:
+    TOKEN = "s3cret"
+
+    @pytest.fixture()
+    def admin_url(self, tmp_path):
+        handler_class = _make_handler_class(str(tmp_path / "test_todo.db"), admin_token=self.TOKEN)
+        server = HTTPServer(("127.0.0.1", 0), handler_class)
+        t = threading.Thread(target=server.serve_forever, daemon=True)
+        t.start()
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+        server.shutdown()
+        server.server_close()
+
+    def _admin(self, url, method="GET", body=None, token=TOKEN):
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(f"{url}/admin/profile", data=data, method=method)
+        if token:
+            req.add_header("Authorization", f"Bearer {token}")
+        try:
+            resp = urllib.request.urlopen(req)
+            return resp.status, json.loads(resp.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_disabled_without_token(self, server_url):
+        status, _ = self._admin(server_url)
+        assert status == 404
+
+    def test_requires_token(self, admin_url):
+        assert self._admin(admin_url, token=None)[0] == 401
+        assert self._admin(admin_url, token="wrong")[0] == 401
+
+    def test_profiles_next_requests_by_command(self, admin_url):
+        status, body = self._admin(admin_url, "POST", {"mode": "cprofile", "requests": 2})
+        assert status == 200
+        assert body["armed"] is True
+
+        for text in ("/todo add Profile me", "/todo board", "/todo list"):
+            _post(f"{admin_url}/message", json.dumps({"text": text, "sender_id": "U1"}).encode())
+
+        status, body = self._admin(admin_url)
+        assert status == 200
+        assert body["armed"] is False
+        assert set(body["profiles"]) == {"add", "board"}
+        assert "board_handler" in body["profiles"]["board"]["output"]
+
+    def test_invalid_arm_422(self, admin_url):
+        status, body = self._admin(admin_url, "POST", {"mode": "perf"})
+        assert status == 422
+        assert "mode" in body["error"]
+
+    def test_delete_disarms(self, admin_url):
+        self._admin(admin_url, "POST", {"seconds": 60})
+        status, body = self._admin(admin_url, "DELETE")
+        assert status == 200
+        assert body["armed"] is False
@@ -0,0 +1,224 @@
+"""Tests for the sharded storage mode (OPENCLAW_TODO_SHARDS)."""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from openclaw_todo.dispatcher import dispatch, dispatch_lines
+from openclaw_todo.parser import parse
+from openclaw_todo.sharding import ID_BLOCK, ShardRouter, get_router, shard_count
+
+CTX = {"sender_id": "U001"}
+TOMORROW = (date.today() + timedelta(days=1)).isoformat()
+NEXT_WEEK = (date.today() + timedelta(days=7)).isoformat()
+
+
+@pytest.fixture()
+def db_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENCLAW_TODO_SHARDS", "2")
+    return str(tmp_path / "todo.sqlite3")
+
+
+@pytest.fixture()
+def router(db_path):
+    return get_router(db_path)
+
+
+def _names_on_each_shard(router: ShardRouter) -> tuple[str, str]:
+    """Two project names that hash to shard 0 and shard 1 respectively."""
+    found: dict[int, str] = {}
+    for i in range(100):
+        found.setdefault(router.shard_for_project(f"Proj{i}"), f"Proj{i}")
+        if len(found) == 2:
+            return found[0], found[1]
+    raise AssertionError("no names on both shards")
+
+
+def _task_ids(conn: sqlite3.Connection) -> list[int]:
+    return [row[0] for row in conn.execute("SELECT id FROM tasks ORDER BY id")]
+
+
+def _run(*commands: str, db_path: str, ctx: dict = CTX) -> list[str]:
+    return [dispatch(command, ctx, db_path=db_path) for command in commands]
+
+
+class TestConfig:
+    @pytest.mark.parametrize(("raw", "expected"), [(None, 0), ("", 0), ("1", 0), ("x", 0), ("4", 4)])
+    def test_shard_count(self, monkeypatch, raw, expected):
+        if raw is None:
+            monkeypatch.delenv("OPENCLAW_TODO_SHARDS", raising=False)
+        else:
+            monkeypatch.setenv("OPENCLAW_TODO_SHARDS", raw)
+        assert shard_count() == expected
+
+    def test_unsharded_by_default(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("OPENCLAW_TODO_SHARDS", raising=False)
+        assert get_router(str(tmp_path / "todo.sqlite3")) is None
+
+    def test_layout(self, router, tmp_path):
+        assert router.catalog_path == tmp_path / "todo.catalog.sqlite3"
+        assert router.shard_paths == [tmp_path / "todo.shard0.sqlite3", tmp_path / "todo.shard1.sqlite3"]
+
+    def test_shard_count_change_refused(self, router, db_path):
+        with pytest.raises(RuntimeError, match="created for 2 shards"):
+            ShardRouter(db_path, 3)
+
+
+class TestRouting:
+    def test_task_ids_allocated_in_shard_blocks(self, router, db_path):
+        first, second = _names_on_each_shard(router)
+        _run(f"add A /p {first}", f"add B /p {second}", f"add C /p {second}", db_path=db_path)
+        conn0, conn1 = router.connect(0), router.connect(1)
+        try:
+            assert _task_ids(conn0) == [1]
+            assert _task_ids(conn1) == [ID_BLOCK + 1, ID_BLOCK + 2]
+        finally:
+            conn0.close()
+            conn1.close()
+        assert router.shard_for_task(ID_BLOCK + 2) == 1
+
+    def test_task_commands_go_to_owning_shard(self, router, db_path):
+        _, second = _names_on_each_shard(router)
+        _run(f"add Pay invoice /p {second}", db_path=db_path)
+        result = dispatch(f"done {ID_BLOCK + 1}", CTX, db_path=db_path)
+        assert result.startswith("✅")
+        conn = router.connect(1)
+        try:
+            assert conn.execute("SELECT status FROM tasks").fetchone() == ("done",)
+        finally:
+            conn.close()
+
+    def test_edit_into_project_on_other_shard_refused(self, router, db_path):
+        first, second = _names_on_each_shard(router)
+        _run(f"add Pay invoice /p {first}", f"project create {second}", db_path=db_path)
+        result = dispatch(f"edit 1 /p {second}", CTX, db_path=db_path)
+        assert result.startswith("❌")
+        assert "different shard" in result
+
+    def test_saved_views_refused(self, router, db_path):
+        assert dispatch("view save all list all", CTX, db_path=db_path).startswith("❌ Saved views are not available")
+
+    def test_subtask_goes_to_parent_shard(self, router, db_path):
+        first, second = _names_on_each_shard(router)
+        _run(f"project create {second}", f"add Parent /p {second}", db_path=db_path)
+        parent = ID_BLOCK + 1 if router.shard_for_project(second) == 1 else 1
+        result = dispatch(f"add Child parent:#{parent}", CTX, db_path=db_path)
+        assert f"({second}/backlog)" in result
+        assert router.shard_for_task(int(result.split("#")[1].split()[0])) == router.shard_for_project(second)
+
+    def test_project_filter_goes_to_one_shard(self, router, db_path):
+        first, second = _names_on_each_shard(router)
+        _run(f"add Only here /p {second}", f"add Elsewhere /p {first}", db_path=db_path)
+        result = dispatch(f"list all /p {second}", CTX, db_path=db_path)
+        assert "Only here" in result
+        assert "Elsewhere" not in result
+
+    def test_inbox_exists_on_every_shard(self, router, db_path):
+        home = router.inbox_shard("U001")
+        other = next(f"U{i:03d}" for i in range(2, 100) if router.inbox_shard(f"U{i:03d}") != home)
+        _run("add Mine", db_path=db_path)
+        _run("add Theirs", db_path=db_path, ctx={"sender_id": other})
+        result = dispatch("list all /p Inbox", CTX, db_path=db_path)
+        assert "Mine" in result
+        assert "Theirs" in result
+
+    def test_rename_pins_new_name_to_shard(self, router, db_path):
+        first, _ = _names_on_each_shard(router)
+        new_name = next(f"New{i}" for i in range(100) if router.shard_for_project(f"New{i}") != 0)
+        _run(f"add Pay invoice /p {first}", f"project rename {first} {new_name}", db_path=db_path)
+        assert router.shard_for_project(new_name) == 0
+        assert "Pay invoice" in dispatch(f"list /p {new_name}", CTX, db_path=db_path)
+        assert dispatch(f"add Follow up /p {new_name}", CTX, db_path=db_path).startswith("✅")
+        conn = router.connect(0)
+        try:
+            assert len(_task_ids(conn)) == 2
+        finally:
+            conn.close()
+
+    def test_rename_onto_name_used_on_other_shard_refused(self, router, db_path):
+        first, second = _names_on_each_shard(router)
+        _run(f"project create {first}", f"project create {second}", db_path=db_path)
+        result = dispatch(f"project rename {first} {second}", CTX, db_path=db_path)
+        assert result.startswith("❌")
+
+
+class TestFanOut:
+    @pytest.fixture()
+    def seeded(self, router, db_path):
+        first, second = _names_on_each_shard(router)
+        _run(
+            f"add Later /p {first} due:{NEXT_WEEK}",
+            f"add Soon /p {second} due:{TOMORROW}",
+            f"add Undated /p {first}",
+            f"add Undated too /p {second}",
+            db_path=db_path,
+        )
+        return first, second
+
+    def test_list_merges_in_sort_order(self, seeded, db_path):
+        lines = dispatch("list", CTX, db_path=db_path).split("\n")
+        titles = [line.rsplit("  ", 1)[1] for line in lines if line.startswith("#")]
+        # due ASC, undated last, then id DESC (shard 1 ids are higher)
+        assert titles == ["Soon", "Later", "Undated too", "Undated"]
+        assert lines[-1].startswith("Showing 4 of 4")
+
+    def test_list_limit_and_total(self, seeded, db_path):
+        data = dispatch("list limit:2", CTX, db_path=db_path, response_format="json")["data"]
+        assert data["total"] == 4
+        assert [t["title"] for t in data["tasks"]] == ["Soon", "Later"]
+
+    def test_board_sums_sections(self, seeded, db_path):
+        dispatch(f"move {ID_BLOCK + 1} /s doing", CTX, db_path=db_path)
+        data = dispatch("board", CTX, db_path=db_path, response_format="json")["data"]
+        sections = {s["name"]: s for s in data["sections"]}
+        assert sections["backlog"]["total"] == 3
+        assert [t["title"] for t in sections["backlog"]["tasks"]] == ["Later", "Undated too", "Undated"]
+        assert [t["title"] for t in sections["doing"]["tasks"]] == ["Soon"]
+
+    def test_board_more_continues_across_shards(self, seeded, db_path):
+        # Backlog order: Soon (shard 1), Later (shard 0), Undated too (shard 1), Undated (shard 0)
+        result = dispatch(f"board more backlog after:#{ID_BLOCK + 1} limitPerSection:2", CTX, db_path=db_path)
+        assert "— BACKLOG (3) —" in result
+        assert [line.rsplit("  ", 1)[1] for line in result.split("\n") if line.startswith("  #")] == [
+            "Later",
+            "Undated too",
+        ]
+        assert result.endswith(f"... and 1 more (/todo board more backlog after:#{ID_BLOCK + 2} limitPerSection:2)")
+
+    def test_search(self, seeded, db_path):
+        data = dispatch("search undated", CTX, db_path=db_path, response_format="json")["data"]
+        assert data["total"] == 2
+        assert {t["title"] for t in data["tasks"]} == {"Undated", "Undated too"}
+
+    def test_digest(self, seeded, router, db_path):
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+        first, second = seeded
+        _run(f"add Late one /p {first} due:{yesterday}", f"add Late two /p {second} due:{yesterday}", db_path=db_path)
+        data = dispatch("digest", CTX, db_path=db_path, response_format="json")["data"]
+        assert [t["title"] for t in data["overdue"]] == ["Late one", "Late two"]
+
+    def test_project_list_merges_inbox(self, seeded, db_path):
+        _run("add Inbox task", db_path=db_path)
+        result = dispatch("project list", CTX, db_path=db_path)
+        first, second = seeded
+        assert result.count("Inbox") == 1
+        assert "Inbox (1 tasks)" in result
+        assert f"{first} (2 tasks)" in result
+        assert f"{second} (2 tasks)" in result
+
+    def test_filter_error(self, seeded, db_path):
+        assert dispatch("list limit:0", CTX, db_path=db_path).startswith("❌")
+        assert dispatch("list limit:0", CTX, db_path=db_path, response_format="json")["ok"] is False
+
+    def test_streaming_falls_back_to_text(self, seeded, db_path):
+        expected = dispatch("list", CTX, db_path=db_path).split("\n")
+        assert list(dispatch_lines("list", CTX, db_path=db_path)) == expected
+
+    def test_parsed_commands_route_to_fan_out(self, router):
+        assert router.route(parse("list all"), CTX) is None
+        assert router.route(parse("board /p Inbox"), CTX) is None
+        assert router.route(parse("project list"), CTX) is None
+        assert router.route(parse("digest"), CTX) is None
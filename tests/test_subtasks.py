@@ -0,0 +1,51 @@
+"""Tests for subtask linking rules."""
+
+from __future__ import annotations
+
+from openclaw_todo.permissions import fetch_write_target
+from openclaw_todo.subtasks import creates_cycle, has_subtasks, parent_error
+from tests.conftest import seed_task
+
+
+class TestCreatesCycle:
+    def test_chain(self, conn):
+        root = seed_task(conn)
+        child = seed_task(conn, parent=root)
+        grandchild = seed_task(conn, parent=child)
+        other = seed_task(conn)
+        assert creates_cycle(conn, root, grandchild)
+        assert creates_cycle(conn, root, root)
+        assert not creates_cycle(conn, grandchild, root)
+        assert not creates_cycle(conn, root, other)
+
+    def test_terminates_on_existing_cycle(self, conn):
+        a = seed_task(conn)
+        b = seed_task(conn, parent=a)
+        conn.execute("UPDATE tasks SET parent_id = ? WHERE id = ?", (b, a))
+        c = seed_task(conn)
+        assert not creates_cycle(conn, c, a)
+
+
+def test_has_subtasks(conn):
+    parent = seed_task(conn)
+    assert not has_subtasks(conn, parent)
+    seed_task(conn, parent=parent)
+    assert has_subtasks(conn, parent)
+
+
+class TestParentError:
+    def test_not_found(self, conn):
+        assert parent_error(None, 9) == "❌ Parent task #9 not found."
+
+    def test_requires_write_access(self, conn):
+        parent = seed_task(conn, created_by="U002")
+        target = fetch_write_target(conn, parent, "U001")
+        assert "permission" in parent_error(target, parent)
+
+    def test_project_must_match(self, conn):
+        parent = seed_task(conn, project_name="Backend")
+        target = fetch_write_target(conn, parent, "U001")
+        assert parent_error(target, parent, target.task.project_id) is None
+        assert parent_error(target, parent, 1) == (
+            f'❌ Subtasks must be in the same project as their parent (#{parent} is in "Backend").'
+        )
@@ -0,0 +1,128 @@
+"""Tests for per-tenant database routing (tenants.py)."""
+
+from __future__ import annotations
+
+import pytest
+
+from openclaw_todo.dispatcher import dispatch, dispatch_lines
+from openclaw_todo.tenants import ConnectionPool, InvalidTenantError, TenantRegistry, registry_from_env
+
+CTX = {"sender_id": "U001"}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def clock():
+    return Clock()
+
+
+@pytest.fixture()
+def registry(tmp_path, clock):
+    reg = TenantRegistry(tmp_path / "tenants", max_tenants=2, idle_seconds=60, clock=clock)
+    yield reg
+    reg.close()
+
+
+class TestConnectionPool:
+    def test_migrates_on_creation(self, tmp_path):
+        pool = ConnectionPool(tmp_path / "t.sqlite3")
+        conn = pool.acquire()
+        try:
+            assert conn.execute("SELECT name FROM projects").fetchall() == [("Inbox",)]
+        finally:
+            pool.release(conn)
+            pool.close()
+
+    def test_reuses_connections(self, tmp_path):
+        pool = ConnectionPool(tmp_path / "t.sqlite3")
+        first = pool.acquire()
+        pool.release(first)
+        assert pool.acquire() is first
+        pool.release(first)
+        pool.close()
+
+    def test_release_rolls_back_open_transaction(self, tmp_path):
+        pool = ConnectionPool(tmp_path / "t.sqlite3")
+        conn = pool.acquire()
+        conn.execute("INSERT INTO projects (name, visibility) VALUES ('Stray', 'shared')")
+        pool.release(conn)
+        conn = pool.acquire()
+        assert conn.execute("SELECT COUNT(*) FROM projects WHERE name = 'Stray'").fetchone() == (0,)
+        pool.release(conn)
+        pool.close()
+
+    def test_connection_closed_when_released_after_close(self, tmp_path):
+        pool = ConnectionPool(tmp_path / "t.sqlite3")
+        conn = pool.acquire()
+        pool.close()
+        pool.release(conn)
+        with pytest.raises(Exception, match="closed"):
+            conn.execute("SELECT 1")
+
+
+class TestTenantRegistry:
+    def test_separate_databases(self, registry, tmp_path):
+        dispatch("add Team A task", CTX, pool=registry.pool("TA"))
+        dispatch("add Team B task", CTX, pool=registry.pool("TB"))
+        assert (tmp_path / "tenants" / "TA.sqlite3").exists()
+        a = dispatch("list", CTX, pool=registry.pool("TA"))
+        assert "Team A task" in a
+        assert "Team B task" not in a
+
+    def test_same_pool_while_cached(self, registry):
+        assert registry.pool("TA") is registry.pool("TA")
+
+    @pytest.mark.parametrize("tenant_id", ["", "../etc", "a" * 65, "T 1"])
+    def test_invalid_tenant_id(self, registry, tenant_id):
+        with pytest.raises(InvalidTenantError):
+            registry.pool(tenant_id)
+
+    def test_lru_eviction(self, registry):
+        a = registry.pool("TA")
+        registry.pool("TB")
+        registry.pool("TA")  # TB is now least recently used
+        registry.pool("TC")
+        assert "TB" not in registry
+        assert len(registry) == 2
+        assert not a.closed
+
+    def test_idle_eviction(self, registry, clock):
+        a = registry.pool("TA")
+        dispatch("add Kept", CTX, pool=a)
+        clock.now += 30
+        registry.pool("TB")
+        clock.now += 45
+        assert registry.evict_idle() == 1
+        assert a.closed
+        assert "TB" in registry
+        # Re-opening an evicted tenant keeps its data
+        reopened = registry.pool("TA")
+        assert reopened is not a
+        assert "Kept" in dispatch("list", CTX, pool=reopened)
+
+    def test_streaming_uses_pool(self, registry):
+        pool = registry.pool("TA")
+        dispatch("add Streamed", CTX, pool=pool)
+        assert any("Streamed" in line for line in dispatch_lines("list", CTX, pool=pool))
+
+
+class TestRegistryFromEnv:
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("OPENCLAW_TODO_TENANT_DIR", raising=False)
+        assert registry_from_env() is None
+
+    def test_settings(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("OPENCLAW_TODO_TENANT_DIR", str(tmp_path))
+        monkeypatch.setenv("OPENCLAW_TODO_TENANT_CACHE", "0")
+        monkeypatch.setenv("OPENCLAW_TODO_TENANT_IDLE_SECONDS", "30")
+        registry = registry_from_env()
+        assert registry.root == tmp_path
+        assert registry.max_tenants == 128
+        assert registry.idle_seconds == 30
@@ -0,0 +1,111 @@
+"""Tests for request tracing and the slow-request log."""
+
+from __future__ import annotations
+
+import json
+import logging
+
+import pytest
+
+from openclaw_todo import tracing
+from openclaw_todo.dispatcher import dispatch
+from openclaw_todo.plugin import handle_message
+
+CTX = {"sender_id": "U001"}
+
+
+@pytest.fixture()
+def slow_log(tmp_path, monkeypatch):
+    path = tmp_path / "slow.jsonl"
+    monkeypatch.setenv("OPENCLAW_TODO_TRACE_SLOW_MS", "0")
+    monkeypatch.setenv("OPENCLAW_TODO_TRACE_LOG", str(path))
+    return path
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()] if path.exists() else []
+
+
+class TestThreshold:
+    @pytest.mark.parametrize(("raw", "expected"), [(None, None), ("", None), ("x", None), ("250", 250.0)])
+    def test_slow_threshold(self, monkeypatch, raw, expected):
+        if raw is None:
+            monkeypatch.delenv("OPENCLAW_TODO_TRACE_SLOW_MS", raising=False)
+        else:
+            monkeypatch.setenv("OPENCLAW_TODO_TRACE_SLOW_MS", raw)
+        assert tracing.slow_threshold_ms() == expected
+
+    def test_off_by_default(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("OPENCLAW_TODO_TRACE_SLOW_MS", raising=False)
+        with tracing.trace_request("x") as trace:
+            assert trace is None
+            with tracing.span("noop"):
+                pass
+
+    def test_fast_requests_not_logged(self, slow_log, monkeypatch):
+        monkeypatch.setenv("OPENCLAW_TODO_TRACE_SLOW_MS", "60000")
+        with tracing.trace_request("x"):
+            pass
+        assert _records(slow_log) == []
+
+
+class TestDispatchTrace:
+    def test_records_phases_and_statements(self, slow_log, tmp_path):
+        db_path = str(tmp_path / "test.sqlite3")
+        handle_message("/todo add Pay invoice /p Inbox", CTX, db_path=db_path)
+
+        (record,) = _records(slow_log)
+        assert record["name"] == "message"
+        assert record["command"] == "add"
+        names = [s["name"] for s in record["spans"]]
+        for phase in ("parse", "connect", "migrate_check", "handler", "resolve_project", "commit"):
+            assert phase in names
+        statements = [s["sql"] for s in record["statements"]]
+        assert any(sql.startswith("INSERT INTO tasks") for sql in statements)
+        assert "COMMIT" in statements
+        assert record["total_ms"] >= max(s["ms"] for s in record["spans"])
+
+    @pytest.mark.parametrize("response_format", ["text", "json"])
+    def test_format_span_inside_handler(self, slow_log, tmp_path, response_format):
+        db_path = str(tmp_path / "test.sqlite3")
+        handle_message("/todo list", CTX, db_path=db_path, response_format=response_format)
+        (record,) = _records(slow_log)
+        spans = {s["name"]: s for s in record["spans"]}
+        handler, fmt = spans["handler"], spans["format"]
+        assert handler["start_ms"] <= fmt["start_ms"]
+        assert fmt["start_ms"] + fmt["ms"] <= handler["start_ms"] + handler["ms"] + 0.001
+
+    def test_spanned_off_without_trace(self, monkeypatch):
+        monkeypatch.delenv("OPENCLAW_TODO_TRACE_SLOW_MS", raising=False)
+        render = tracing.spanned("format")(lambda n: "x" * n)
+        lines = tracing.spanned("format")(lambda: (yield from ["a", "b"]))
+        assert render(2) == "xx"
+        assert list(lines()) == ["a", "b"]
+
+    def test_nested_dispatch_joins_outer_trace(self, slow_log, tmp_path):
+        handle_message("/todo list", CTX, db_path=str(tmp_path / "test.sqlite3"), response_format="json")
+        (record,) = _records(slow_log)
+        assert record["name"] == "message"
+        assert record["command"] == "list"
+
+    def test_parse_error_still_traced(self, slow_log, tmp_path):
+        dispatch("add Pay due:2026-13-45", CTX, db_path=str(tmp_path / "test.sqlite3"))
+        (record,) = _records(slow_log)
+        assert [s["name"] for s in record["spans"]] == ["parse"]
+
+    def test_trace_callback_removed_after_request(self, slow_log, tmp_path):
+        from openclaw_todo.tenants import ConnectionPool
+
+        pool = ConnectionPool(tmp_path / "test.sqlite3")
+        dispatch("add First", CTX, pool=pool)
+        dispatch("add Second", CTX, pool=pool)
+        first, second = _records(slow_log)
+        assert not any("Second" in str(s) for s in first["statements"])
+        pool.close()
+
+    def test_logger_fallback(self, tmp_path, monkeypatch, caplog):
+        monkeypatch.setenv("OPENCLAW_TODO_TRACE_SLOW_MS", "0")
+        monkeypatch.delenv("OPENCLAW_TODO_TRACE_LOG", raising=False)
+        with caplog.at_level(logging.WARNING, logger="openclaw_todo.tracing"):
+            dispatch("list", CTX, db_path=str(tmp_path / "test.sqlite3"))
+        assert any(r.getMessage().startswith("Slow request: ") for r in caplog.records)